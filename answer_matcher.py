@@ -0,0 +1,295 @@
+"""
+Answer Matcher
+One matching engine for every answer check (practice, speed drills, task
+scenarios and batch grading): cached normalization, a banded edit distance
+that gives up once the typo budget is exceeded, and a classification of
+near misses against the verb's other conjugations
+"""
+
+import unicodedata
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from conjugation_engine import PERSON_LABELS, TENSE_NAMES, SpanishConjugator
+from metrics import registry
+
+STRICTNESS_LEVELS = ('strict', 'normal', 'lenient')
+
+# Result kinds, from best to worst
+EXACT = 'exact'
+ACCENT = 'accent'
+TYPO = 'typo'
+WRONG_PERSON = 'wrong_person'
+WRONG_TENSE = 'wrong_tense'
+WRONG = 'wrong'
+KINDS = (EXACT, ACCENT, TYPO, WRONG_PERSON, WRONG_TENSE, WRONG)
+
+# Lenient mode accepts this many edits per character of the answer, which
+# matches the old difflib ratio > 0.85 rule: one typo from 7 letters on,
+# where swapping two adjacent letters counts as a single typo
+TYPO_RATE = 0.15
+
+# Display tense names ('Present') -> engine tense names ('present')
+_TENSE_KEYS = {name: key for key, name in TENSE_NAMES.items()}
+
+
+@lru_cache(maxsize=8192)
+def normalize(text: str) -> str:
+    """Casefold and collapse whitespace: ' Me  Levanto ' -> 'me levanto'."""
+    return ' '.join(text.casefold().split())
+
+
+@lru_cache(maxsize=8192)
+def fold(text: str) -> str:
+    """``normalize`` and drop diacritics, so 'Habláis' and 'hablais' fold alike."""
+    decomposed = unicodedata.normalize('NFKD', normalize(text))
+    return ''.join(c for c in decomposed if not unicodedata.combining(c))
+
+
+def typo_budget(answer: str) -> int:
+    """Edits lenient mode forgives in ``answer`` (0 for words under 7 letters)."""
+    return int(len(answer) * TYPO_RATE)
+
+
+def bounded_edit_distance(a: str, b: str, limit: int) -> int:
+    """
+    Edit distance between ``a`` and ``b`` if it is at most ``limit``.
+
+    Levenshtein distance plus adjacent transpositions at cost 1 (optimal
+    string alignment), so 'habalmos' is one typo away from 'hablamos'.
+    Only the diagonal band ``|i - j| <= limit`` of the DP table is filled and
+    the scan stops as soon as a whole row exceeds ``limit``, so the cost is
+    O(limit * len) rather than O(len(a) * len(b)).
+
+    Returns:
+        The distance, or ``limit + 1`` when it is larger than ``limit``.
+    """
+    if a == b:
+        return 0
+    limit = max(limit, 0)
+    over = limit + 1
+    if abs(len(a) - len(b)) > limit:
+        return over
+
+    # Common prefix and suffix never change the distance
+    start = 0
+    while start < len(a) and start < len(b) and a[start] == b[start]:
+        start += 1
+    end_a, end_b = len(a), len(b)
+    while end_a > start and end_b > start and a[end_a - 1] == b[end_b - 1]:
+        end_a -= 1
+        end_b -= 1
+    a, b = a[start:end_a], b[start:end_b]
+    if len(a) > len(b):
+        a, b = b, a
+    if not a:
+        return len(b) if len(b) <= limit else over
+
+    width = len(b)
+    before = None  # row i - 2, for transpositions
+    previous = [j if j <= limit else over for j in range(width + 1)]
+    for i in range(1, len(a) + 1):
+        char = a[i - 1]
+        low = max(1, i - limit)
+        high = min(width, i + limit)
+        current = [over] * (width + 1)
+        if i <= limit:
+            current[0] = i
+        row_min = current[0]
+        for j in range(low, high + 1):
+            cost = previous[j - 1] + (char != b[j - 1])
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            if (before is not None and j > 1 and char == b[j - 2] and a[i - 2] == b[j - 1]
+                    and before[j - 2] + 1 < cost):
+                cost = before[j - 2] + 1
+            if cost > over:
+                cost = over
+            current[j] = cost
+            if cost < row_min:
+                row_min = cost
+        if row_min > limit:
+            return over
+        before, previous = previous, current
+    return previous[width] if previous[width] <= limit else over
+
+
+def person_index(person: Any) -> Optional[int]:
+    """Person index 0-5 from an index, a PERSON_LABELS label or one of its pronouns."""
+    if isinstance(person, int) and 0 <= person < len(PERSON_LABELS):
+        return person
+    if isinstance(person, str):
+        for index, label in enumerate(PERSON_LABELS):
+            if person == label or person in label.split('/'):
+                return index
+    return None
+
+
+def tense_key(tense: Any) -> Optional[str]:
+    """Engine tense name from an engine name or a TENSE_NAMES display name."""
+    if tense in TENSE_NAMES:
+        return tense
+    return _TENSE_KEYS.get(tense)
+
+
+class MatchResult(NamedTuple):
+    """Verdict on one answer."""
+    kind: str
+    correct: bool
+    distance: int
+    feedback: str
+    # (tense, person) the answer actually is, for wrong_person / wrong_tense
+    form_of: Optional[Tuple[str, int]] = None
+
+
+class AnswerMatcher:
+    """
+    Grade answers against expected forms.
+
+    Normalized and folded strings are cached module-wide, and with a
+    conjugator each verb's full conjugation table is folded once and kept,
+    so a wrong answer can be recognized as another person or tense of the
+    right verb without re-conjugating.
+    """
+
+    def __init__(self, conjugator: Optional[SpanishConjugator] = None) -> None:
+        self.conjugator = conjugator
+        self._forms: Dict[str, Dict[str, List[Tuple[str, int]]]] = {}
+
+    def verb_forms(self, verb: str) -> Dict[str, List[Tuple[str, int]]]:
+        """Folded form -> every ``(tense, person)`` of ``verb`` producing it."""
+        verb = normalize(verb)
+        forms = self._forms.get(verb)
+        if forms is None:
+            forms = {}
+            if self.conjugator is not None:
+                for tense in self.conjugator.regular_endings:
+                    for person in range(len(PERSON_LABELS)):
+                        form = self.conjugator.conjugate(verb, tense, person)
+                        if form:
+                            forms.setdefault(fold(form), []).append((tense, person))
+            self._forms[verb] = forms
+        return forms
+
+    def match(self,
+              user_answer: str,
+              correct_answer: str,
+              strictness: str = 'normal',
+              verb: Optional[str] = None,
+              tense: Any = None,
+              person: Any = None) -> MatchResult:
+        """
+        Classify ``user_answer`` against ``correct_answer``.
+
+        Args:
+            user_answer: The answer provided by the user
+            correct_answer: The expected correct answer
+            strictness: "strict" accepts exact matches only, "normal" also
+                accent-only differences, "lenient" also small typos
+            verb, tense, person: Exercise metadata when known; with a
+                conjugator they let wrong answers be classified as another
+                person or tense of ``verb``
+
+        Returns:
+            A MatchResult whose ``feedback`` is the text shown to the learner.
+        """
+        user_norm = normalize(user_answer)
+        correct_norm = normalize(correct_answer)
+        if user_norm == correct_norm:
+            return MatchResult(EXACT, True, 0, "Correct! Great job!")
+
+        user_fold = fold(user_norm)
+        correct_fold = fold(correct_norm)
+        if user_fold == correct_fold:
+            accepted = strictness in ('normal', 'lenient')
+            return MatchResult(ACCENT, accepted, 0,
+                               "Correct! (Accent marks differ)" if accepted
+                               else self._incorrect(correct_answer, "Check the accent marks."))
+
+        budget = typo_budget(correct_fold)
+        distance = bounded_edit_distance(user_fold, correct_fold, budget)
+        # Another conjugation of the right verb is a grammar mistake, never a typo
+        if verb and self.conjugator is not None:
+            result = self._other_form(user_fold, correct_answer, distance,
+                                      verb, tense_key(tense), person_index(person))
+            if result is not None:
+                return result
+        if distance <= budget:
+            if strictness == 'lenient':
+                return MatchResult(TYPO, True, distance,
+                                   f"Close enough! The exact answer is '{correct_answer}'.")
+            return MatchResult(TYPO, False, distance, self._incorrect(correct_answer))
+        return MatchResult(WRONG, False, distance, self._incorrect(correct_answer))
+
+    def match_many(self,
+                   answers: Iterable[Sequence[Any]],
+                   strictness: str = 'normal') -> List[MatchResult]:
+        """
+        Grade a batch of ``(user_answer, correct_answer[, verb, tense, person])``.
+
+        Identical submissions are graded once, which is common when a class
+        answers the same worksheet.
+        """
+        seen: Dict[Tuple[Any, ...], MatchResult] = {}
+        results = []
+        for item in answers:
+            key = tuple(item)
+            result = seen.get(key)
+            if result is None:
+                result = seen[key] = self.match(item[0], item[1], strictness, *item[2:5])
+            results.append(result)
+        return results
+
+    def _other_form(self,
+                    user_fold: str,
+                    correct_answer: str,
+                    distance: int,
+                    verb: str,
+                    tense: Optional[str],
+                    person: Optional[int]) -> Optional[MatchResult]:
+        analyses = self.verb_forms(verb).get(user_fold)
+        if not analyses:
+            return None
+        # Same tense, other person is the more specific mistake
+        for form_tense, form_person in analyses:
+            if tense in (None, form_tense) and person is not None and form_person != person:
+                return MatchResult(WRONG_PERSON, False, distance, self._incorrect(
+                    correct_answer, f"That is the {PERSON_LABELS[form_person]} form."), (form_tense, form_person))
+        for form_tense, form_person in analyses:
+            if tense is not None and form_tense != tense:
+                return MatchResult(WRONG_TENSE, False, distance, self._incorrect(
+                    correct_answer, f"That is the {TENSE_NAMES[form_tense].lower()} tense."),
+                    (form_tense, form_person))
+        return None
+
+    @staticmethod
+    def _incorrect(correct_answer: str, hint: str = '') -> str:
+        message = f"Incorrect. The correct answer is '{correct_answer}'."
+        return f"{message} {hint}" if hint else message
+
+
+_default_matcher: Optional[AnswerMatcher] = None
+
+
+def get_matcher() -> AnswerMatcher:
+    """Process-wide matcher backed by a SpanishConjugator."""
+    global _default_matcher
+    if _default_matcher is None:
+        _default_matcher = AnswerMatcher(SpanishConjugator())
+    return _default_matcher
+
+
+_CACHE_HITS = registry.gauge("answer_cache_hits", "Normalization cache hits since start")
+_CACHE_MISSES = registry.gauge("answer_cache_misses", "Normalization cache misses since start")
+
+
+def _collect_cache_metrics() -> None:
+    for name, cached in (('normalize', normalize), ('fold', fold)):
+        info = cached.cache_info()
+        _CACHE_HITS.set(info.hits, cache=name)
+        _CACHE_MISSES.set(info.misses, cache=name)
+
+
+registry.add_collector(_collect_cache_metrics)
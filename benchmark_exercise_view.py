@@ -0,0 +1,165 @@
+"""
+Exercise View Benchmark
+Measures the latency of switching to the next exercise in the main window
+(updateExercise plus the resulting layout and paint) headlessly, for the
+pooled choice widgets and for the legacy rebuild-every-time approach
+
+Usage:
+    python benchmark_exercise_view.py --switches 500
+    python benchmark_exercise_view.py --json --fail-p95 5
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Dict, List, Optional
+
+# Headless by default; an explicit platform (e.g. xcb) still wins
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtCore import QEvent
+from PyQt5.QtWidgets import QApplication, QButtonGroup, QRadioButton, QWidget
+
+from benchmark_online import percentile
+
+STRATEGIES = ("pool", "rebuild")
+CHOICES = ["hablo", "hablas", "habla", "hablamos", "habláis", "hablan"]
+
+
+def sample_exercises(count: int, seed: int = 1) -> List[Dict[str, Any]]:
+    """Exercises with 3-5 choices, so the view also shows and hides buttons."""
+    rng = random.Random(seed)
+    exercises = []
+    for i in range(count):
+        choices = rng.sample(CHOICES, rng.randint(3, 5))
+        exercises.append({
+            "sentence": f"Frase número {i}: Yo ______ con mis amigos.",
+            "answer": choices[0],
+            "choices": choices,
+            "translation": f"Sentence number {i}: I speak with my friends.",
+        })
+    return exercises
+
+
+def _legacy_populate(window) -> None:
+    """The pre-pool populateMultipleChoice: delete and recreate every button."""
+    page = window.choice_pool.parentWidget()
+    layout = page.layout()
+    state = {"group": QButtonGroup(page), "buttons": []}
+    window.choice_pool.hide()
+
+    def populate(choices: List[str]) -> None:
+        for button in state["buttons"]:
+            layout.removeWidget(button)
+            button.deleteLater()
+        state["group"] = QButtonGroup()
+        state["buttons"] = []
+        for choice in choices:
+            radio = QRadioButton(choice)
+            state["group"].addButton(radio)
+            layout.insertWidget(0, radio)
+            state["buttons"].append(radio)
+        if state["buttons"]:
+            state["buttons"][0].setChecked(True)
+
+    window.populateMultipleChoice = populate
+
+
+def _count_widgets(root: QWidget) -> int:
+    return len(root.findChildren(QWidget))
+
+
+def run_benchmark(switches: int = 200, exercises: int = 20, strategy: str = "pool",
+                  warmup: int = 10, seed: int = 1) -> Dict[str, Any]:
+    """
+    Switch exercises ``switches`` times in multiple-choice mode.
+
+    Each sample is the time for ``updateExercise`` followed by processing the
+    events it posted (deferred deletes, layout and paint). The window reads
+    and writes its data files in the current directory.
+    """
+    app = QApplication.instance() or QApplication(sys.argv[:1])
+    from main import SpanishConjugationGUI
+
+    window = SpanishConjugationGUI()
+    window.session.load(sample_exercises(exercises, seed))
+    window.mode_combo.setCurrentIndex(1)  # Multiple Choice
+    if strategy == "rebuild":
+        _legacy_populate(window)
+    window.show()
+    app.processEvents()
+    random.seed(seed)
+
+    samples: List[float] = []
+    for i in range(warmup + switches):
+        window.session.current = (i + 1) % window.total_exercises
+        start = time.perf_counter()
+        window.updateExercise()
+        app.processEvents()
+        # processEvents() outside exec_() leaves deleteLater() objects alive
+        app.sendPostedEvents(None, QEvent.DeferredDelete)
+        if i >= warmup:
+            samples.append((time.perf_counter() - start) * 1000)
+
+    widgets = _count_widgets(window)
+    window.dedup_index.close()
+    window.journal.close()
+    window.progress_tracker.close()
+    window.hide()
+    window.deleteLater()
+    app.processEvents()
+
+    return {
+        "strategy": strategy,
+        "switches": switches,
+        "p50_ms": percentile(samples, 50),
+        "p95_ms": percentile(samples, 95),
+        "p99_ms": percentile(samples, 99),
+        "mean_ms": statistics.fmean(samples) if samples else 0.0,
+        "widgets_after": widgets,
+    }
+
+
+def format_report(results: List[Dict[str, Any]]) -> str:
+    """Render the results as a fixed-width table."""
+    lines = [f"{'strategy':<10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'mean ms':>10}{'widgets':>9}"]
+    for r in results:
+        lines.append(f"{r['strategy']:<10}{r['p50_ms']:>10.3f}{r['p95_ms']:>10.3f}"
+                     f"{r['p99_ms']:>10.3f}{r['mean_ms']:>10.3f}{r['widgets_after']:>9}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark switching exercises in the main window")
+    parser.add_argument("--switches", type=int, default=200)
+    parser.add_argument("--exercises", type=int, default=20)
+    parser.add_argument("--strategies", nargs="+", choices=STRATEGIES, default=list(STRATEGIES))
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    parser.add_argument("--fail-p95", type=float,
+                        help="Exit with status 1 if the pooled view's p95 exceeds this many ms")
+    args = parser.parse_args(argv)
+
+    # Keep the benchmark's sessions, journal and logs out of the real data files
+    workdir = tempfile.mkdtemp(prefix="exercise_view_bench_")
+    os.chdir(workdir)
+    results = [run_benchmark(args.switches, args.exercises, strategy, seed=args.seed)
+               for strategy in args.strategies]
+    print(json.dumps(results, indent=2) if args.json else format_report(results))
+
+    if args.fail_p95 is not None:
+        pooled = [r for r in results if r["strategy"] == "pool"]
+        if pooled and pooled[0]["p95_ms"] > args.fail_p95:
+            print(f"pooled view p95 {pooled[0]['p95_ms']:.2f} ms above {args.fail_p95:.2f} ms",
+                  file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,213 @@
+"""
+Online Path Benchmark
+Drives the generate, explain, hint and summary flows through AsyncLLMClient
+against a local stand-in server (or any OpenAI-compatible endpoint) and
+reports latency percentiles, throughput and retries per flow
+
+Usage:
+    python benchmark_online.py --requests 50 --latency 0.2 --jitter 0.05
+    python benchmark_online.py --base-url http://127.0.0.1:8000/v1 --json
+"""
+
+import argparse
+import json
+import math
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+from llm_client import AsyncLLMClient
+from llm_standin_server import LLMStandInServer
+from prompts import build_exercise_prompt, build_explanation_prompt, build_hint_prompt
+from session_summary import RollingSessionSummary
+
+FLOWS = ("generate", "explain", "hint", "summary")
+
+# Token budgets match what the GUI sends for each flow
+FLOW_MAX_TOKENS = {"generate": 600, "explain": 600, "hint": 100, "summary": 200}
+
+
+def _sample_prompt(flow: str, index: int) -> str:
+    """Build a realistic prompt for a flow, varied by index."""
+    sentence = f"Ayer nosotros ______ al parque número {index}."
+    if flow == "generate":
+        return build_exercise_prompt(5, "Intermediate", "present, preterite",
+                                     "yo, tú, nosotros")
+    if flow == "explain":
+        return build_explanation_prompt(sentence, "fuimos", "vamos", False)
+    if flow == "hint":
+        return build_hint_prompt(sentence, "fuimos")
+    summary = RollingSessionSummary(update_every=10)
+    for i in range(25):
+        exercise = {"answer": "fuimos", "verb": "ir", "tense": "preterite", "person": 3}
+        summary.record(exercise, "fuimos" if i % 3 else "vamos", bool(i % 3))
+    return summary.build_prompt()
+
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of ``values`` (0 when empty)."""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100.0 * len(ordered)))
+    return ordered[min(rank, len(ordered)) - 1]
+
+
+def _summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    return {
+        "requests": len(latencies) + errors,
+        "errors": errors,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": (statistics.fmean(latencies) * 1000) if latencies else 0.0,
+        "throughput_rps": (len(latencies) / elapsed) if elapsed > 0 else 0.0,
+    }
+
+
+def _run_flow(client: AsyncLLMClient, flow: str, requests: int,
+              concurrency: int, call: Callable[[str, str], Any]) -> Dict[str, Any]:
+    """Issue ``requests`` calls for one flow and collect per-call latency."""
+    latencies: List[float] = []
+    errors = 0
+    lock = threading.Lock()
+
+    def one(index: int) -> None:
+        nonlocal errors
+        prompt = _sample_prompt(flow, index)
+        start = time.perf_counter()
+        try:
+            call(flow, prompt)
+        except Exception:
+            with lock:
+                errors += 1
+            return
+        with lock:
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(one, range(requests)))
+    return _summarize(latencies, errors, time.perf_counter() - start)
+
+
+def run_benchmark(base_url: str,
+                  requests: int = 20,
+                  concurrency: int = 4,
+                  flows: Optional[List[str]] = None,
+                  stream: bool = False,
+                  max_retries: int = 2,
+                  server: Optional[LLMStandInServer] = None) -> Dict[str, Any]:
+    """
+    Run every flow against ``base_url`` and return the report.
+
+    Concurrency is capped at the client's pool size so the measured latency
+    is service time rather than queueing time. When ``server`` is the
+    stand-in that answered the calls, the report also counts retries as
+    the difference between requests it received and requests issued.
+    """
+    flows = list(flows or FLOWS)
+    client = AsyncLLMClient(api_key="sk-benchmark", base_url=base_url,
+                            max_concurrency=concurrency, max_retries=max_retries)
+
+    def call(flow: str, prompt: str) -> Any:
+        return client.submit(prompt, max_tokens=FLOW_MAX_TOKENS[flow]).result()
+
+    def first_token(flow: str, prompt: str) -> Any:
+        async def consume() -> None:
+            deltas = client.stream(prompt, max_tokens=FLOW_MAX_TOKENS[flow])
+            try:
+                await deltas.__anext__()
+            finally:
+                await deltas.aclose()
+        return client.run(consume()).result()
+
+    report: Dict[str, Any] = {
+        "base_url": base_url,
+        "requests_per_flow": requests,
+        "concurrency": concurrency,
+        "flows": {},
+    }
+    try:
+        for flow in flows:
+            if server is not None:
+                server.reset_stats()
+            result = _run_flow(client, flow, requests, concurrency, call)
+            if server is not None:
+                result["retries"] = max(0, server.request_count - requests)
+            if stream:
+                ttft = _run_flow(client, flow, requests, concurrency, first_token)
+                result["ttft_p50_ms"] = ttft["p50_ms"]
+                result["ttft_p95_ms"] = ttft["p95_ms"]
+            report["flows"][flow] = result
+    finally:
+        client.close()
+    return report
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Render the report as a fixed-width table."""
+    lines = [
+        f"Endpoint: {report['base_url']}  "
+        f"requests/flow: {report['requests_per_flow']}  concurrency: {report['concurrency']}",
+        f"{'flow':<10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'mean ms':>10}"
+        f"{'req/s':>9}{'errors':>8}{'retries':>9}",
+    ]
+    for flow, stats in report["flows"].items():
+        lines.append(
+            f"{flow:<10}{stats['p50_ms']:>10.1f}{stats['p95_ms']:>10.1f}"
+            f"{stats['p99_ms']:>10.1f}{stats['mean_ms']:>10.1f}"
+            f"{stats['throughput_rps']:>9.1f}{stats['errors']:>8}"
+            f"{str(stats.get('retries', '-')):>9}"
+        )
+        if "ttft_p50_ms" in stats:
+            lines.append(f"{'':<10}first token p50 {stats['ttft_p50_ms']:.1f} ms, "
+                         f"p95 {stats['ttft_p95_ms']:.1f} ms")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the online LLM request path")
+    parser.add_argument("--base-url", help="Existing OpenAI-compatible endpoint; "
+                                           "a local stand-in server is started when omitted")
+    parser.add_argument("--requests", type=int, default=20, help="Requests per flow")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--flows", nargs="+", choices=FLOWS, default=list(FLOWS))
+    parser.add_argument("--stream", action="store_true", help="Also measure time to first token")
+    parser.add_argument("--latency", type=float, default=0.05, help="Stand-in base latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Stand-in latency jitter (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Stand-in injected error rate")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--fail-p95", type=float,
+                        help="Exit with status 1 if any flow's p95 exceeds this many ms")
+    args = parser.parse_args(argv)
+
+    server = None
+    base_url = args.base_url
+    if base_url is None:
+        server = LLMStandInServer(latency=args.latency, jitter=args.jitter,
+                                  error_rate=args.error_rate, seed=args.seed)
+        base_url = server.start()
+    try:
+        report = run_benchmark(base_url, args.requests, args.concurrency,
+                               args.flows, args.stream, server=server)
+    finally:
+        if server is not None:
+            server.stop()
+
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+    if args.fail_p95 is not None:
+        slow = [flow for flow, stats in report["flows"].items() if stats["p95_ms"] > args.fail_p95]
+        if slow:
+            print(f"p95 above {args.fail_p95:.0f} ms for: {', '.join(slow)}", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
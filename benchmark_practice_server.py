@@ -0,0 +1,161 @@
+"""
+Practice Server Benchmark
+Simulates many concurrent learners against the practice server, each on
+its own keep-alive connection (create a session, then answer and advance
+through every exercise), and reports throughput and latency percentiles
+
+Usage:
+    python benchmark_practice_server.py --learners 50 --exercises 10
+    python benchmark_practice_server.py --url http://127.0.0.1:8765 --json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from benchmark_online import percentile
+from practice_server import PracticeServer
+
+
+class LearnerConnection:
+    """Minimal HTTP/1.1 JSON client over one persistent connection."""
+
+    def __init__(self, host: str, port: int) -> None:
+        self.host = host
+        self.port = port
+        self.reader: Optional[asyncio.StreamReader] = None
+        self.writer: Optional[asyncio.StreamWriter] = None
+
+    async def __aenter__(self) -> "LearnerConnection":
+        self.reader, self.writer = await asyncio.open_connection(self.host, self.port)
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.writer.close()
+
+    async def request(self, method: str, path: str, payload: Any = None) -> Tuple[int, Any]:
+        body = json.dumps(payload).encode("utf-8") if payload is not None else b""
+        self.writer.write(
+            f"{method} {path} HTTP/1.1\r\nHost: {self.host}\r\n"
+            f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1")
+            + body)
+        await self.writer.drain()
+        head = await self.reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        status = int(lines[0].split(" ", 2)[1])
+        length = 0
+        for line in lines[1:]:
+            if line.lower().startswith("content-length:"):
+                length = int(line.split(":", 1)[1])
+        data = await self.reader.readexactly(length)
+        return status, json.loads(data) if data else None
+
+
+async def _learner(host: str, port: int, exercises: int, rng: random.Random,
+                   latencies: List[float], failures: List[int]) -> None:
+    async def timed(conn: LearnerConnection, method: str, path: str, payload: Any = None) -> Any:
+        start = time.perf_counter()
+        status, data = await conn.request(method, path, payload)
+        latencies.append(time.perf_counter() - start)
+        if status >= 400:
+            failures.append(status)
+        return data
+
+    async with LearnerConnection(host, port) as conn:
+        view = await timed(conn, "POST", "/sessions", {"count": exercises})
+        session = f"/sessions/{view['session']}"
+        for _ in range(view["total"]):
+            choices = (view.get("exercise") or {}).get("choices") or ["hablo"]
+            await timed(conn, "POST", f"{session}/answer", {"answer": rng.choice(choices)})
+            view = await timed(conn, "POST", f"{session}/next")
+        await timed(conn, "GET", f"{session}/stats")
+        await timed(conn, "DELETE", session)
+
+
+async def run_load(url: str, learners: int = 20, exercises: int = 10, seed: int = 1) -> Dict[str, Any]:
+    """Run ``learners`` concurrent learners against ``url`` and summarize."""
+    parts = urlsplit(url)
+    rng = random.Random(seed)
+    latencies: List[float] = []
+    failures: List[int] = []
+
+    start = time.perf_counter()
+    results = await asyncio.gather(
+        *(_learner(parts.hostname, parts.port, exercises, random.Random(rng.random()), latencies, failures)
+          for _ in range(learners)),
+        return_exceptions=True)
+    elapsed = time.perf_counter() - start
+    crashed = [r for r in results if isinstance(r, Exception)]
+
+    async with LearnerConnection(parts.hostname, parts.port) as conn:
+        _, server_stats = await conn.request("GET", "/stats")
+
+    return {
+        "url": url,
+        "learners": learners,
+        "exercises_per_learner": exercises,
+        "requests": len(latencies),
+        "errors": len(failures) + len(crashed),
+        "elapsed_s": elapsed,
+        "throughput_rps": len(latencies) / elapsed if elapsed > 0 else 0.0,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p95_ms": percentile(latencies, 95) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+        "mean_ms": statistics.fmean(latencies) * 1000 if latencies else 0.0,
+        "server": server_stats,
+    }
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    server = report["server"]["latency_ms"]
+    return "\n".join([
+        f"{report['learners']} learners x {report['exercises_per_learner']} exercises "
+        f"against {report['url']}",
+        f"requests   {report['requests']:>8}   errors {report['errors']}",
+        f"throughput {report['throughput_rps']:>8.1f} req/s",
+        f"client ms  p50 {report['p50_ms']:.2f}  p95 {report['p95_ms']:.2f}  "
+        f"p99 {report['p99_ms']:.2f}  mean {report['mean_ms']:.2f}",
+        f"server ms  p50 {server['p50']:.3f}  p95 {server['p95']:.3f}  p99 {server['p99']:.3f}",
+    ])
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Load-test the practice server")
+    parser.add_argument("--url", help="Running server; an in-process server is started when omitted")
+    parser.add_argument("--learners", type=int, default=20)
+    parser.add_argument("--exercises", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    parser.add_argument("--min-rps", type=float,
+                        help="Exit with status 1 if throughput is below this many requests/s")
+    args = parser.parse_args(argv)
+
+    server = None
+    url = args.url
+    if url is None:
+        server = PracticeServer(port=0, max_sessions=max(args.learners, 1), seed=args.seed)
+        url = server.start()
+    try:
+        report = asyncio.run(run_load(url, args.learners, args.exercises, args.seed))
+    finally:
+        if server is not None:
+            server.stop()
+
+    print(json.dumps(report, indent=2) if args.json else format_report(report))
+
+    if report["errors"]:
+        return 1
+    if args.min_rps is not None and report["throughput_rps"] < args.min_rps:
+        print(f"throughput {report['throughput_rps']:.1f} req/s below {args.min_rps:.1f}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
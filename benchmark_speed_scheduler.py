@@ -0,0 +1,112 @@
+"""
+Speed Scheduler Benchmark
+Compares speed-round selection policies on simulated learners whose recall
+of each item speeds up with practice, and times item selection for large
+item pools
+
+Usage:
+    python benchmark_speed_scheduler.py --learners 50 --answers 300
+    python benchmark_speed_scheduler.py --policies thompson ucb --json
+"""
+
+import argparse
+import json
+import math
+import random
+import statistics
+import sys
+import time
+from typing import Any, Dict, List, Optional
+
+from speed_scheduler import CONVERSATIONAL_SECONDS, POLICIES, SpeedScheduler
+
+LEARNING_RATE = 0.93  # latent recall time multiplier per practice
+ERROR_RATE_AT_3S = 0.2  # slower items are also answered wrong more often
+
+
+class SimulatedLearner:
+    """Hidden per-item recall times that shrink each time an item is drilled."""
+
+    def __init__(self, items: int, rng: random.Random) -> None:
+        self.rng = rng
+        # Median 2.5 s, a long tail of slow items
+        self.latent = [rng.lognormvariate(math.log(2.5), 0.45) for _ in range(items)]
+
+    def answer(self, item: int):
+        latent = self.latent[item]
+        response_time = latent * self.rng.lognormvariate(0.0, 0.2)
+        correct = self.rng.random() > min(0.9, ERROR_RATE_AT_3S * latent / CONVERSATIONAL_SECONDS)
+        self.latent[item] = max(0.6, latent * LEARNING_RATE)
+        return correct, response_time
+
+    def slow_items(self) -> int:
+        return sum(latent >= CONVERSATIONAL_SECONDS for latent in self.latent)
+
+
+def simulate(policy: str, learners: int = 20, items: int = 60, answers: int = 300,
+             seed: int = 1) -> Dict[str, Any]:
+    """Drill each simulated learner ``answers`` times and measure what is left slow."""
+    rng = random.Random(seed)
+    slow_before, slow_after, mean_after = [], [], []
+    for _ in range(learners):
+        learner = SimulatedLearner(items, random.Random(rng.random()))
+        scheduler = SpeedScheduler(range(items), policy, random.Random(rng.random()))
+        slow_before.append(learner.slow_items())
+        for _ in range(answers):
+            item = scheduler.next_item()
+            correct, response_time = learner.answer(item)
+            scheduler.record(item, correct, response_time)
+        slow_after.append(learner.slow_items())
+        mean_after.append(statistics.fmean(learner.latent))
+    return {
+        "policy": policy,
+        "slow_items_before": statistics.fmean(slow_before),
+        "slow_items_after": statistics.fmean(slow_after),
+        "mean_recall_s_after": statistics.fmean(mean_after),
+    }
+
+
+def time_selection(policy: str, items: int, picks: int = 5000, seed: int = 1) -> float:
+    """Microseconds per next_item() + record() cycle with ``items`` items."""
+    rng = random.Random(seed)
+    scheduler = SpeedScheduler(range(items), policy, random.Random(seed))
+    start = time.perf_counter()
+    for _ in range(picks):
+        item = scheduler.next_item()
+        scheduler.record(item, rng.random() < 0.8, rng.uniform(0.5, 5.0))
+    return (time.perf_counter() - start) / picks * 1e6
+
+
+def format_report(results: List[Dict[str, Any]], sizes: List[int]) -> str:
+    lines = [f"{'policy':<10}{'slow before':>13}{'slow after':>12}{'mean s after':>14}"
+             + ''.join(f"{f'us@{n}':>11}" for n in sizes)]
+    for r in results:
+        lines.append(f"{r['policy']:<10}{r['slow_items_before']:>13.1f}{r['slow_items_after']:>12.1f}"
+                     f"{r['mean_recall_s_after']:>14.2f}"
+                     + ''.join(f"{r['selection_us'][str(n)]:>11.2f}" for n in sizes))
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare speed-round selection policies")
+    parser.add_argument("--policies", nargs="+", choices=list(POLICIES), default=list(POLICIES))
+    parser.add_argument("--learners", type=int, default=20)
+    parser.add_argument("--items", type=int, default=60, help="Items per learner (20 verbs x 3 persons)")
+    parser.add_argument("--answers", type=int, default=300, help="Answers per learner")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[60, 10_000],
+                        help="Item pool sizes for the selection timing")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--json", action="store_true", help="Print the results as JSON")
+    args = parser.parse_args(argv)
+
+    results = []
+    for policy in args.policies:
+        result = simulate(policy, args.learners, args.items, args.answers, args.seed)
+        result["selection_us"] = {str(n): time_selection(policy, n, seed=args.seed) for n in args.sizes}
+        results.append(result)
+    print(json.dumps(results, indent=2) if args.json else format_report(results, args.sizes))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
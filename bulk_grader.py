@@ -0,0 +1,267 @@
+"""
+Bulk Grader
+Grades class submissions from a CSV of (student, sentence, verb, tense,
+person, answer) rows. Rows are streamed in chunks to a process pool whose
+workers each hold a warmed conjugator and answer matcher; graded rows and
+per-student totals are written as they complete, in input order, with a
+bounded number of chunks in flight
+
+Usage:
+    python bulk_grader.py submissions.csv -o graded.csv --summary students.csv
+    python bulk_grader.py submissions.csv --workers 8 --strictness lenient
+
+Input columns:
+    student, sentence, verb, tense, person, answer   (required)
+    expected                                          (optional; conjugated from
+                                                       verb/tense/person when empty)
+"""
+
+import argparse
+import collections
+import csv
+import os
+import sys
+import time
+from concurrent.futures import Future, ProcessPoolExecutor
+from functools import lru_cache
+from typing import Counter, Deque, Dict, Iterable, Iterator, List, NamedTuple, Optional, Sequence, Tuple
+
+from answer_matcher import KINDS, STRICTNESS_LEVELS, AnswerMatcher, person_index, tense_key
+from conjugation_engine import COMMON_VERBS, SpanishConjugator
+
+REQUIRED_COLUMNS = ('student', 'sentence', 'verb', 'tense', 'person', 'answer')
+GRADED_COLUMNS = REQUIRED_COLUMNS + ('expected', 'correct', 'kind', 'distance')
+INVALID = 'invalid'  # kind for rows whose expected form cannot be determined
+DEFAULT_CHUNK_SIZE = 2000
+
+# (student, sentence, verb, tense, person, answer, expected)
+Submission = Tuple[str, str, str, str, str, str, str]
+
+
+class GradedRow(NamedTuple):
+    student: str
+    sentence: str
+    verb: str
+    tense: str
+    person: str
+    answer: str
+    expected: str
+    correct: bool
+    kind: str
+    distance: int
+
+
+class StudentSummary:
+    """Running totals for one student; invalid rows are tallied but not attempted."""
+
+    __slots__ = ('attempted', 'correct', 'kinds')
+
+    def __init__(self) -> None:
+        self.attempted = 0
+        self.correct = 0
+        self.kinds: Counter[str] = collections.Counter()
+
+    def add(self, row: GradedRow) -> None:
+        self.kinds[row.kind] += 1
+        if row.kind == INVALID:
+            return
+        self.attempted += 1
+        self.correct += row.correct
+
+    @property
+    def accuracy(self) -> float:
+        return self.correct / self.attempted * 100 if self.attempted else 0.0
+
+
+# -------------------------------------------------------
+# Worker side
+# -------------------------------------------------------
+_matcher: Optional[AnswerMatcher] = None
+
+
+def _init_worker() -> None:
+    """Build the worker's matcher and fold the common verbs' tables up front."""
+    global _matcher
+    _matcher = AnswerMatcher(SpanishConjugator())
+    for verb in COMMON_VERBS['irregular'] + COMMON_VERBS['stem_changing']:
+        _matcher.verb_forms(verb)
+
+
+@lru_cache(maxsize=16384)
+def _expected_form(verb: str, tense: str, person: str) -> str:
+    engine_tense = tense_key(tense)
+    index = person_index(int(person) if person.isdigit() else person)
+    if not verb or engine_tense is None or index is None:
+        return ''
+    return _matcher.conjugator.conjugate(verb.strip().lower(), engine_tense, index) or ''
+
+
+def _grade_chunk(chunk: Sequence[Submission], strictness: str) -> List[Tuple[str, bool, str, int]]:
+    """Grade one chunk; returns ``(expected, correct, kind, distance)`` per row."""
+    if _matcher is None:
+        _init_worker()
+    results = []
+    for _student, _sentence, verb, tense, person, answer, expected in chunk:
+        expected = expected or _expected_form(verb, tense, person)
+        if not expected:
+            results.append(('', False, INVALID, -1))
+            continue
+        match = _matcher.match(answer, expected, strictness, verb=verb, tense=tense,
+                               person=int(person) if person.isdigit() else person)
+        results.append((expected, match.correct, match.kind, match.distance))
+    return results
+
+
+# -------------------------------------------------------
+# Driver side
+# -------------------------------------------------------
+def read_submissions(lines: Iterable[str]) -> Iterator[Submission]:
+    """
+    Parse CSV lines (with a header) into submissions, lazily.
+
+    Raises:
+        ValueError: If a required column is missing from the header.
+    """
+    reader = csv.DictReader(lines)
+    missing = [column for column in REQUIRED_COLUMNS if column not in (reader.fieldnames or ())]
+    if missing:
+        raise ValueError(f"Missing CSV column(s): {', '.join(missing)}")
+    for record in reader:
+        yield tuple((record.get(column) or '').strip()
+                    for column in REQUIRED_COLUMNS + ('expected',))
+
+
+def _chunks(submissions: Iterable[Submission], size: int) -> Iterator[List[Submission]]:
+    chunk: List[Submission] = []
+    for submission in submissions:
+        chunk.append(submission)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def grade_submissions(submissions: Iterable[Submission],
+                      strictness: str = 'normal',
+                      workers: Optional[int] = None,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[GradedRow]:
+    """
+    Grade ``submissions`` in input order.
+
+    Args:
+        submissions: Rows as produced by ``read_submissions``
+        strictness: Matching strictness ("strict", "normal" or "lenient")
+        workers: Worker processes (default: CPU count); 0 grades in-process
+        chunk_size: Rows sent to a worker at a time
+
+    At most ``2 * workers`` chunks are pending at once, so memory stays
+    bounded however long the input is.
+    """
+    if strictness not in STRICTNESS_LEVELS:
+        raise ValueError(f"Unknown strictness: {strictness}")
+    workers = (os.cpu_count() or 1) if workers is None else workers
+    chunks = _chunks(submissions, max(1, chunk_size))
+
+    def emit(chunk: Sequence[Submission], grades: Sequence[Tuple[str, bool, str, int]]) -> Iterator[GradedRow]:
+        for submission, grade in zip(chunk, grades):
+            yield GradedRow(*submission[:6], *grade)
+
+    if workers <= 0:
+        for chunk in chunks:
+            yield from emit(chunk, _grade_chunk(chunk, strictness))
+        return
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        pending: Deque[Tuple[List[Submission], Future]] = collections.deque()
+        for chunk in chunks:
+            pending.append((chunk, pool.submit(_grade_chunk, chunk, strictness)))
+            if len(pending) >= 2 * workers:
+                done, future = pending.popleft()
+                yield from emit(done, future.result())
+        while pending:
+            done, future = pending.popleft()
+            yield from emit(done, future.result())
+
+
+class GradeReport(NamedTuple):
+    rows: int
+    correct: int
+    invalid: int
+    students: int
+    elapsed_s: float
+
+    @property
+    def rows_per_s(self) -> float:
+        return self.rows / self.elapsed_s if self.elapsed_s > 0 else 0.0
+
+
+def grade_csv(input_path: str,
+              output_path: str,
+              summary_path: Optional[str] = None,
+              strictness: str = 'normal',
+              workers: Optional[int] = None,
+              chunk_size: int = DEFAULT_CHUNK_SIZE) -> GradeReport:
+    """
+    Grade ``input_path`` into ``output_path`` and, optionally, write one
+    row of totals per student (in order of first appearance) to ``summary_path``.
+    """
+    start = time.perf_counter()
+    students: Dict[str, StudentSummary] = {}
+    rows = correct = invalid = 0
+
+    with open(input_path, newline='', encoding='utf-8-sig') as source, \
+            open(output_path, 'w', newline='', encoding='utf-8') as target:
+        writer = csv.writer(target)
+        writer.writerow(GRADED_COLUMNS)
+        for row in grade_submissions(read_submissions(source), strictness, workers, chunk_size):
+            writer.writerow(row)
+            students.setdefault(row.student, StudentSummary()).add(row)
+            rows += 1
+            correct += row.correct
+            invalid += row.kind == INVALID
+
+    if summary_path:
+        write_summary(summary_path, students)
+    return GradeReport(rows, correct, invalid, len(students), time.perf_counter() - start)
+
+
+def write_summary(path: str, students: Dict[str, StudentSummary]) -> None:
+    kinds = KINDS + (INVALID,)
+    with open(path, 'w', newline='', encoding='utf-8') as target:
+        writer = csv.writer(target)
+        writer.writerow(('student', 'attempted', 'correct', 'accuracy') + kinds)
+        for student, summary in students.items():
+            writer.writerow((student, summary.attempted, summary.correct, f"{summary.accuracy:.1f}",
+                             *(summary.kinds[kind] for kind in kinds)))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Grade a CSV of class submissions")
+    parser.add_argument("input", help="CSV with student, sentence, verb, tense, person, answer columns")
+    parser.add_argument("-o", "--output", help="Graded CSV (default: <input>_graded.csv)")
+    parser.add_argument("--summary", help="Per-student totals CSV")
+    parser.add_argument("--strictness", choices=STRICTNESS_LEVELS, default="normal")
+    parser.add_argument("--workers", type=int, help="Worker processes (default: CPU count; 0 = in-process)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    output = args.output or f"{os.path.splitext(args.input)[0]}_graded.csv"
+    try:
+        report = grade_csv(args.input, output, args.summary, args.strictness, args.workers, args.chunk_size)
+    except (OSError, ValueError) as e:
+        print(f"bulk_grader: {e}", file=sys.stderr)
+        return 1
+
+    gradable = report.rows - report.invalid
+    accuracy = report.correct / gradable * 100 if gradable else 0.0
+    print(f"{report.rows} rows from {report.students} students graded in {report.elapsed_s:.2f}s "
+          f"({report.rows_per_s:.0f} rows/s), {accuracy:.1f}% correct, {report.invalid} ungradable")
+    print(f"graded rows: {output}")
+    if args.summary:
+        print(f"student totals: {args.summary}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,297 @@
+"""
+Config Store
+One in-process store per configuration file: a cached snapshot that every
+config class reads, change notifications, debounced write-behind
+persistence via atomic temp-file-plus-rename, and reload when the file
+is changed by another process
+"""
+
+import atexit
+import copy
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Mapping, Optional, Tuple
+
+from sampling_profiler import profiler
+
+DEFAULT_WRITE_DELAY = 0.5    # seconds of quiet before a write
+DEFAULT_MAX_WRITE_DELAY = 5.0  # a write is never postponed longer than this
+DEFAULT_RELOAD_INTERVAL = 2.0  # minimum seconds between file stat checks
+
+ChangeCallback = Callable[[Dict[str, Any]], None]
+
+_MISSING = object()
+_stores: Dict[str, "ConfigStore"] = {}
+_stores_lock = threading.Lock()
+
+
+class ConfigStore:
+    """
+    Cached, write-behind JSON configuration document.
+
+    Reads are served from memory. ``set``/``update``/``replace`` change the
+    snapshot, notify subscribers with the changed keys and schedule a write
+    once changes stop for ``write_delay`` seconds, so a burst of UI toggles
+    becomes one write on a timer thread. ``flush`` writes synchronously.
+    Writes go to a temporary file that is renamed over the target, so a
+    crash never leaves a half-written config. Reads re-check the file's
+    mtime at most every ``reload_interval`` seconds and reload it if another
+    process changed it (unless local changes are still pending).
+
+    Use ``get_config_store`` so all config classes share one store per file.
+    """
+
+    def __init__(self,
+                 path: str,
+                 initial: Optional[Mapping[str, Any]] = None,
+                 write_delay: float = DEFAULT_WRITE_DELAY,
+                 max_write_delay: float = DEFAULT_MAX_WRITE_DELAY,
+                 reload_interval: float = DEFAULT_RELOAD_INTERVAL) -> None:
+        self.path = str(path)
+        self.write_delay = write_delay
+        self.max_write_delay = max_write_delay
+        self.reload_interval = reload_interval
+        self.writes = 0
+
+        self._lock = threading.RLock()
+        self._write_lock = threading.Lock()
+        self._generation = 0
+        self._subscribers: list = []
+        self._timer: Optional[threading.Timer] = None
+        self._dirty_since: Optional[float] = None
+        self._stamp: Optional[Tuple[int, int]] = None
+        self._last_check = time.monotonic()
+
+        loaded = self._read_file()
+        self._data: Dict[str, Any] = loaded if loaded is not None else dict(initial or {})
+
+    # -------------------------------------------------------
+    # Reads
+    # -------------------------------------------------------
+    @property
+    def data(self) -> Dict[str, Any]:
+        """The live snapshot (treat as read-only; change it via ``set``)."""
+        self._maybe_reload()
+        return self._data
+
+    @property
+    def exists(self) -> bool:
+        """Whether the file existed at the last load or write."""
+        return self._stamp is not None
+
+    @property
+    def dirty(self) -> bool:
+        """Whether changes are waiting to be written."""
+        return self._dirty_since is not None
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return self.data.get(key, default)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.data
+
+    # -------------------------------------------------------
+    # Writes
+    # -------------------------------------------------------
+    def set(self, key: str, value: Any) -> None:
+        self.update({key: value})
+
+    def update(self, changes: Mapping[str, Any]) -> None:
+        """Apply ``changes``; notify and schedule a write if anything changed."""
+        with self._lock:
+            changed = {k: v for k, v in changes.items() if self._data.get(k, _MISSING) != v}
+            if not changed:
+                return
+            self._data.update(changed)
+            self._schedule_write()
+        self._notify(changed)
+
+    def replace(self, document: Mapping[str, Any]) -> None:
+        """Replace the whole document (deep-copied) and schedule a write."""
+        document = copy.deepcopy(dict(document))
+        with self._lock:
+            changed = {k: v for k, v in document.items() if self._data.get(k, _MISSING) != v}
+            changed.update({k: None for k in self._data if k not in document})
+            self._data = document
+            self._schedule_write()
+        if changed:
+            self._notify(changed)
+
+    def flush(self, force: bool = False) -> bool:
+        """
+        Write pending changes now (always write with ``force``).
+
+        Returns:
+            True on success or when there was nothing to write.
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            if not force and self._dirty_since is None:
+                return True
+            try:
+                text = json.dumps(self._data, indent=2, ensure_ascii=False)
+            except (TypeError, ValueError) as e:
+                logging.error("Error serializing config %s: %s", self.path, e)
+                return False
+            generation = self._generation
+
+        # Disk I/O happens outside the data lock so readers and setters never wait on it
+        with self._write_lock:
+            if not self._write_file(text):
+                return False
+        with self._lock:
+            if self._generation == generation:
+                self._dirty_since = None
+        return True
+
+    # -------------------------------------------------------
+    # Notifications
+    # -------------------------------------------------------
+    def subscribe(self, callback: ChangeCallback) -> None:
+        """Call ``callback(changes)`` after every change, local or reloaded."""
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: ChangeCallback) -> None:
+        if callback in self._subscribers:
+            self._subscribers.remove(callback)
+
+    def _notify(self, changes: Dict[str, Any]) -> None:
+        for callback in list(self._subscribers):
+            try:
+                callback(changes)
+            except Exception as e:
+                logging.error("Config change callback failed: %s", e)
+
+    # -------------------------------------------------------
+    # Reload
+    # -------------------------------------------------------
+    def reload(self, force: bool = False) -> bool:
+        """
+        Re-read the file if it changed on disk (or always with ``force``).
+
+        Pending local changes win: nothing is reloaded while dirty.
+
+        Returns:
+            True if the snapshot was replaced.
+        """
+        self._last_check = time.monotonic()
+        with self._lock:
+            if self._dirty_since is not None:
+                return False
+            if not force and self._file_stamp() == self._stamp:
+                return False
+            loaded = self._read_file()
+            if loaded is None:
+                return False
+            changed = {k: v for k, v in loaded.items() if self._data.get(k, _MISSING) != v}
+            changed.update({k: None for k in self._data if k not in loaded})
+            self._data = loaded
+        if changed:
+            self._notify(changed)
+        return bool(changed)
+
+    def _maybe_reload(self) -> None:
+        if time.monotonic() - self._last_check >= self.reload_interval:
+            self.reload()
+
+    # -------------------------------------------------------
+    # File I/O
+    # -------------------------------------------------------
+    def _file_stamp(self) -> Optional[Tuple[int, int]]:
+        try:
+            st = os.stat(self.path)
+        except OSError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _read_file(self) -> Optional[Dict[str, Any]]:
+        stamp = self._file_stamp()
+        if stamp is None:
+            return None
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                loaded = json.load(f)
+        except Exception as e:
+            logging.error("Error loading config %s: %s", self.path, e)
+            return None
+        if not isinstance(loaded, dict):
+            logging.error("Ignoring config %s: not a JSON object", self.path)
+            return None
+        self._stamp = stamp
+        return loaded
+
+    def _write_file(self, text: str) -> bool:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        tmp_path = os.path.join(directory, f".{os.path.basename(self.path)}.{os.getpid()}.tmp")
+        try:
+            os.makedirs(directory, exist_ok=True)
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logging.error("Error saving config %s: %s", self.path, e)
+            try:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+            except OSError:
+                pass
+            return False
+        self._stamp = self._file_stamp()
+        self.writes += 1
+        return True
+
+    def _schedule_write(self) -> None:
+        # Caller holds the lock
+        self._generation += 1
+        now = time.monotonic()
+        if self._dirty_since is None:
+            self._dirty_since = now
+        if self._timer is not None:
+            if now - self._dirty_since >= self.max_write_delay:
+                return  # Let the pending timer fire; don't postpone any further
+            self._timer.cancel()
+        self._timer = threading.Timer(self.write_delay, self._timer_flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    @profiler.profiled("config_store.flush")
+    def _timer_flush(self) -> None:
+        with self._lock:
+            self._timer = None
+        self.flush()
+
+
+def get_config_store(path: Any, initial: Optional[Mapping[str, Any]] = None) -> ConfigStore:
+    """
+    The shared store for ``path``, created on first use.
+
+    ``initial`` seeds a new store when the file is missing or unreadable;
+    for an existing store the file is re-checked for outside changes.
+    """
+    key = os.path.abspath(str(path))
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = ConfigStore(str(path), initial)
+            _stores[key] = store
+            return store
+    store.reload()
+    return store
+
+
+def flush_all() -> None:
+    """Write every store's pending changes (runs at interpreter exit)."""
+    with _stores_lock:
+        stores = list(_stores.values())
+    for store in stores:
+        store.flush()
+
+
+atexit.register(flush_all)
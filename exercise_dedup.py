@@ -0,0 +1,201 @@
+"""
+Exercise Dedup Index
+Persistent index of normalized exercise-sentence hashes in SQLite, with an
+in-memory Bloom filter in front, so duplicate checks stay O(1) however
+long the generation history grows
+"""
+
+import argparse
+import hashlib
+import logging
+import math
+import os
+import re
+import sqlite3
+import unicodedata
+from typing import Iterable, List, Optional
+
+DEFAULT_DB_PATH = "progress.db"
+DEFAULT_BLOOM_CAPACITY = 100_000
+DEFAULT_BLOOM_ERROR_RATE = 0.01
+
+_WHITESPACE = re.compile(r"\s+")
+_BLANK = re.compile(r"_+")
+
+
+def normalize_sentence(sentence: str) -> str:
+    """
+    Canonical form used for dedup.
+
+    Case, accents, whitespace runs and the length of the ``____`` blank do
+    not make two exercises different.
+    """
+    text = unicodedata.normalize("NFKD", sentence.casefold())
+    text = "".join(c for c in text if not unicodedata.combining(c))
+    text = _BLANK.sub("_", text)
+    return _WHITESPACE.sub(" ", text).strip()
+
+
+def sentence_hash(sentence: str) -> bytes:
+    """64-bit hash of the normalized sentence."""
+    return hashlib.blake2b(normalize_sentence(sentence).encode("utf-8"), digest_size=8).digest()
+
+
+class BloomFilter:
+    """
+    Fixed-size Bloom filter over 64-bit hashes.
+
+    Sized for ``capacity`` items at ``error_rate`` false positives; uses
+    double hashing of the two 32-bit halves of each hash.
+    """
+
+    def __init__(self,
+                 capacity: int = DEFAULT_BLOOM_CAPACITY,
+                 error_rate: float = DEFAULT_BLOOM_ERROR_RATE) -> None:
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: bytes):
+        h1 = int.from_bytes(key[:4], "little")
+        h2 = int.from_bytes(key[4:8], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, key: bytes) -> None:
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key: bytes) -> bool:
+        return all(self.bits[position >> 3] & (1 << (position & 7))
+                   for position in self._positions(key))
+
+
+class ExerciseDedupIndex:
+    """
+    Persistent set of exercise sentences seen before.
+
+    Hashes live in an ``exercise_hashes`` table (primary-key lookups);
+    with ``use_bloom`` the table is scanned once at open into a Bloom
+    filter so most new sentences are rejected without touching SQLite.
+    ``legacy_log`` is the old ``exercise_log.txt``; it is imported the
+    first time the index is opened and recorded so it is never re-read.
+    """
+
+    def __init__(self,
+                 db_path: str = DEFAULT_DB_PATH,
+                 legacy_log: Optional[str] = None,
+                 use_bloom: bool = True,
+                 bloom_capacity: int = DEFAULT_BLOOM_CAPACITY) -> None:
+        self.db_path = db_path
+        self.conn = sqlite3.connect(db_path)
+        self.create_tables()
+
+        self.bloom: Optional[BloomFilter] = None
+        if use_bloom:
+            count = self.conn.execute("SELECT COUNT(*) FROM exercise_hashes").fetchone()[0]
+            self.bloom = BloomFilter(max(bloom_capacity, count * 2))
+            for (key,) in self.conn.execute("SELECT hash FROM exercise_hashes"):
+                self.bloom.add(key)
+
+        if legacy_log:
+            self.import_log(legacy_log)
+
+    def create_tables(self) -> None:
+        """Create the index tables if needed."""
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS exercise_hashes (
+                hash BLOB PRIMARY KEY,
+                created DATETIME DEFAULT CURRENT_TIMESTAMP
+            ) WITHOUT ROWID
+        ''')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS exercise_index_meta (
+                key TEXT PRIMARY KEY,
+                value TEXT
+            )
+        ''')
+        self.conn.commit()
+
+    # -------------------------------------------------------
+    # Lookup and insert
+    # -------------------------------------------------------
+    def _contains_hash(self, key: bytes) -> bool:
+        if self.bloom is not None and key not in self.bloom:
+            return False
+        row = self.conn.execute("SELECT 1 FROM exercise_hashes WHERE hash = ?", (key,)).fetchone()
+        return row is not None
+
+    def __contains__(self, sentence: str) -> bool:
+        return self._contains_hash(sentence_hash(sentence))
+
+    def __len__(self) -> int:
+        return self.conn.execute("SELECT COUNT(*) FROM exercise_hashes").fetchone()[0]
+
+    def add(self, sentence: str) -> bool:
+        """Record ``sentence``; return False if it was already known."""
+        return bool(self.add_many([sentence]))
+
+    def add_many(self, sentences: Iterable[str]) -> List[str]:
+        """Record sentences in one transaction; return those that were new."""
+        added = []
+        with self.conn:
+            for sentence in sentences:
+                key = sentence_hash(sentence)
+                if self._contains_hash(key):
+                    continue
+                self.conn.execute("INSERT OR IGNORE INTO exercise_hashes (hash) VALUES (?)", (key,))
+                if self.bloom is not None:
+                    self.bloom.add(key)
+                added.append(sentence)
+        return added
+
+    # -------------------------------------------------------
+    # Legacy import
+    # -------------------------------------------------------
+    def import_log(self, log_path: str, force: bool = False) -> int:
+        """
+        Import a one-sentence-per-line exercise log.
+
+        Returns:
+            Number of new sentences added; 0 if this log was already imported
+            (unless ``force``) or does not exist.
+        """
+        marker = "imported:" + os.path.abspath(log_path)
+        already = self.conn.execute(
+            "SELECT 1 FROM exercise_index_meta WHERE key = ?", (marker,)
+        ).fetchone()
+        if (already and not force) or not os.path.exists(log_path):
+            return 0
+
+        with open(log_path, "r", encoding="utf-8") as f:
+            added = self.add_many(line.strip() for line in f if line.strip())
+        with self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO exercise_index_meta (key, value) VALUES (?, ?)",
+                (marker, str(len(added)))
+            )
+        logging.info("Imported %d sentences from %s into the dedup index.", len(added), log_path)
+        return len(added)
+
+    def close(self) -> None:
+        """Close the database connection."""
+        self.conn.close()
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Import an exercise log into the dedup index")
+    parser.add_argument("log", nargs="?", default="exercise_log.txt")
+    parser.add_argument("--db", default=DEFAULT_DB_PATH)
+    parser.add_argument("--force", action="store_true", help="Re-import even if already imported")
+    args = parser.parse_args(argv)
+
+    index = ExerciseDedupIndex(args.db, use_bloom=False)
+    added = index.import_log(args.log, force=args.force)
+    print(f"Imported {added} new sentences; index now holds {len(index)}.")
+    index.close()
+
+
+if __name__ == "__main__":
+    main()
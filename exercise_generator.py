@@ -5,8 +5,15 @@ Enhanced with discourse coherence and communicative context
 """
 
 import random
+import time
 from typing import List, Dict, Any, Optional
 from conjugation_engine import SpanishConjugator, COMMON_VERBS, PERSON_LABELS, TENSE_NAMES
+from metrics import registry
+
+GENERATION_SECONDS = registry.histogram(
+    "exercise_generation_seconds", "Local exercise generation time per batch or story")
+EXERCISES_GENERATED = registry.counter(
+    "exercises_generated_total", "Exercises generated locally")
 
 class ExerciseGenerator:
     """Generate conjugation exercises locally."""
@@ -235,6 +242,7 @@ class ExerciseGenerator:
                       persons: List[int] = None,
                       difficulty: str = 'intermediate') -> List[Dict[str, Any]]:
         """Generate a batch of exercises."""
+        start = time.perf_counter()
         exercises = []
         
         for _ in range(count):
@@ -246,6 +254,8 @@ class ExerciseGenerator:
             exercise = self.generate_exercise(verb, tense, person, difficulty)
             exercises.append(exercise)
         
+        GENERATION_SECONDS.observe(time.perf_counter() - start, kind="batch")
+        EXERCISES_GENERATED.inc(len(exercises), kind="batch")
         return exercises
     
     def generate_story_sequence(self, tense: str = 'preterite', length: int = 5) -> List[Dict[str, Any]]:
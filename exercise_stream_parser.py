@@ -0,0 +1,158 @@
+"""
+Incremental Exercise Parser
+Parses a streamed GPT exercise array chunk by chunk and yields each
+exercise object as soon as its closing brace arrives
+"""
+
+import json
+import logging
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence
+
+# Keys every exercise needs besides its sentence ("sentence" or "exercise")
+REQUIRED_EXERCISE_KEYS = ("answer", "choices", "translation")
+SENTENCE_KEYS = ("sentence", "exercise")
+
+
+def validate_exercise(item: Any,
+                      required_keys: Sequence[str] = REQUIRED_EXERCISE_KEYS) -> bool:
+    """Return True if ``item`` is a usable exercise dictionary."""
+    if not isinstance(item, dict):
+        return False
+    if not any(isinstance(item.get(key), str) and item[key].strip() for key in SENTENCE_KEYS):
+        return False
+    if any(key not in item for key in required_keys):
+        return False
+    return "choices" not in required_keys or isinstance(item["choices"], list)
+
+
+class ExerciseStreamParser:
+    """
+    Incremental parser for a JSON array of exercise objects.
+
+    ``feed`` accepts arbitrary text chunks (markdown fences and prose around
+    the array are skipped) and returns the exercises completed by that
+    chunk. Only the text of the object currently being built is buffered,
+    so total work is linear in the response length. Items are the objects
+    directly inside the first array encountered, which also covers
+    responses wrapped as ``{"exercises": [...]}``.
+
+    Attributes:
+        emitted (int): Valid exercises returned so far.
+        rejected (int): Complete objects dropped by validation or JSON errors.
+    """
+
+    def __init__(self, required_keys: Sequence[str] = REQUIRED_EXERCISE_KEYS) -> None:
+        self.required_keys = tuple(required_keys)
+        self.emitted = 0
+        self.rejected = 0
+
+        self._stack: List[str] = []
+        self._item_depth: Optional[int] = None
+        self._in_string = False
+        self._escaped = False
+        self._item_chunks: List[str] = []
+        self._array_closed = False
+
+    @property
+    def truncated(self) -> bool:
+        """Whether input so far ends inside the exercise array."""
+        return not self._array_closed and self._item_depth is not None
+
+    def feed(self, chunk: str) -> List[Dict[str, Any]]:
+        """Consume ``chunk`` and return any exercises it completed."""
+        completed: List[Dict[str, Any]] = []
+        item_start = 0 if self._in_item() else None
+
+        for index, char in enumerate(chunk):
+            if self._array_closed:
+                break
+            if not self._stack:
+                # Outside any JSON value: skip prose, fences and whitespace
+                if char in "[{":
+                    self._open(char)
+                    if self._in_item():
+                        item_start = index
+                continue
+
+            if self._in_string:
+                if self._escaped:
+                    self._escaped = False
+                elif char == "\\":
+                    self._escaped = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "[{":
+                self._open(char)
+                if item_start is None and self._in_item():
+                    item_start = index
+            elif char in "]}":
+                closing_item = (char == "}" and len(self._stack) == self._item_depth)
+                if self._stack:
+                    self._stack.pop()
+                if closing_item:
+                    self._item_chunks.append(chunk[item_start:index + 1])
+                    self._finish_item(completed)
+                    item_start = None
+                elif self._item_depth is not None and len(self._stack) < self._item_depth - 1:
+                    if self.emitted or self.rejected:
+                        # The exercise array itself closed
+                        self._array_closed = True
+                    else:
+                        # An empty or non-object array (e.g. "[5]" in prose); keep looking
+                        self._item_depth = None
+
+        if item_start is not None:
+            self._item_chunks.append(chunk[item_start:])
+        return completed
+
+    def close(self) -> List[Dict[str, Any]]:
+        """Finish the stream; an unterminated trailing object is discarded."""
+        if self._item_chunks:
+            logging.warning("Exercise stream ended mid-object; %d complete exercise(s) kept.",
+                            self.emitted)
+            self._item_chunks = []
+        return []
+
+    def _open(self, char: str) -> None:
+        self._stack.append(char)
+        if char == "[" and self._item_depth is None:
+            self._item_depth = len(self._stack) + 1
+
+    def _in_item(self) -> bool:
+        return (self._item_depth is not None and len(self._stack) >= self._item_depth
+                and self._stack[self._item_depth - 1] == "{")
+
+    def _finish_item(self, completed: List[Dict[str, Any]]) -> None:
+        text = "".join(self._item_chunks)
+        self._item_chunks = []
+        try:
+            item = json.loads(text)
+        except json.JSONDecodeError as e:
+            logging.error("Skipping malformed exercise object: %s", e)
+            self.rejected += 1
+            return
+        if validate_exercise(item, self.required_keys):
+            self.emitted += 1
+            completed.append(item)
+        else:
+            logging.info("Skipping exercise missing required keys: %s", sorted(item) if isinstance(item, dict) else item)
+            self.rejected += 1
+
+
+def iter_exercises(chunks: Iterable[str],
+                   required_keys: Sequence[str] = REQUIRED_EXERCISE_KEYS) -> Iterator[Dict[str, Any]]:
+    """Yield valid exercises from an iterable of text chunks."""
+    parser = ExerciseStreamParser(required_keys)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+    yield from parser.close()
+
+
+def parse_exercises(text: str,
+                    required_keys: Sequence[str] = REQUIRED_EXERCISE_KEYS) -> List[Dict[str, Any]]:
+    """Parse a complete (or truncated) response into its valid exercises."""
+    return list(iter_exercises([text], required_keys))
@@ -0,0 +1,179 @@
+"""
+Batched GPT Explanations
+Collects submitted answers for a short window and explains them all with a
+single structured LLM call instead of one round-trip per answer
+"""
+
+import asyncio
+import json
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+from llm_client import AsyncLLMClient, describe_api_error
+from prompts import build_batch_explanation_prompt, build_explanation_prompt
+from task_scheduler import Priority
+
+DEFAULT_BATCH_WINDOW = 1.5  # seconds to wait for more answers
+DEFAULT_BATCH_SIZE = 5      # flush immediately once this many are queued
+DEFAULT_TOKENS_PER_ITEM = 200
+
+
+def parse_batch_response(text: str) -> Dict[int, str]:
+    """
+    Extract ``{id: explanation}`` from a batch response.
+
+    Tolerates markdown fences and leading/trailing prose; returns an empty
+    dict when no usable JSON array is found.
+    """
+    array_start = text.find("[")
+    array_end = text.rfind("]") + 1
+    if array_start < 0 or array_end <= array_start:
+        return {}
+    try:
+        data = json.loads(text[array_start:array_end])
+    except json.JSONDecodeError as e:
+        logging.error("Batch explanation parse error: %s", e)
+        return {}
+
+    explanations: Dict[int, str] = {}
+    if not isinstance(data, list):
+        return explanations
+    for entry in data:
+        if not isinstance(entry, dict):
+            continue
+        try:
+            item_id = int(entry.get("id"))
+        except (TypeError, ValueError):
+            continue
+        explanation = entry.get("explanation")
+        if isinstance(explanation, str) and explanation.strip():
+            explanations[item_id] = explanation.strip()
+    return explanations
+
+
+class ExplanationBatcher:
+    """
+    Coalesce explanation requests into batched LLM calls.
+
+    ``add`` may be called from any thread. Items are queued on the LLM
+    client's event loop; a batch is sent when ``max_items`` are waiting or
+    ``window_seconds`` after the first item arrived, whichever is first.
+    Each item's callback receives its own explanation text (or a
+    user-facing error message) on the loop thread. Items the batch response
+    does not cover are retried individually.
+    """
+
+    def __init__(self,
+                 client: AsyncLLMClient,
+                 window_seconds: float = DEFAULT_BATCH_WINDOW,
+                 max_items: int = DEFAULT_BATCH_SIZE,
+                 model: str = "gpt-4o",
+                 tokens_per_item: int = DEFAULT_TOKENS_PER_ITEM,
+                 temperature: float = 0.5) -> None:
+        self.client = client
+        self.window_seconds = window_seconds
+        self.max_items = max(1, int(max_items))
+        self.model = model
+        self.tokens_per_item = tokens_per_item
+        self.temperature = temperature
+
+        # Loop-thread state
+        self._pending: List[Dict[str, Any]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._next_id = 1
+        self.batches_sent = 0
+
+    def add(self,
+            sentence: str,
+            correct_answer: str,
+            user_answer: str,
+            is_correct: bool,
+            callback: Callable[[str], Any]) -> None:
+        """Queue one answer for explanation."""
+        item = {
+            "sentence": sentence,
+            "correct_answer": correct_answer,
+            "user_answer": user_answer,
+            "is_correct": is_correct,
+            "callback": callback,
+        }
+        self.client.call_soon(self._enqueue, item)
+
+    def flush(self) -> None:
+        """Send whatever is queued now instead of waiting for the window."""
+        self.client.call_soon(self._flush)
+
+    # -------------------------------------------------------
+    # Loop-thread internals
+    # -------------------------------------------------------
+    def _enqueue(self, item: Dict[str, Any]) -> None:
+        item["id"] = self._next_id
+        self._next_id += 1
+        self._pending.append(item)
+
+        if len(self._pending) >= self.max_items:
+            self._flush()
+        elif self._timer is None:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self.window_seconds, self._flush)
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        # The learner is waiting on every explanation in the batch
+        self.client.schedule(self._send, batch, priority=Priority.INTERACTIVE)
+
+    async def _send(self, batch: List[Dict[str, Any]]) -> None:
+        if len(batch) == 1:
+            await self._send_single(batch[0])
+            return
+
+        self.batches_sent += 1
+        try:
+            text = await self.client.complete(
+                build_batch_explanation_prompt(batch),
+                model=self.model,
+                max_tokens=self.tokens_per_item * len(batch),
+                temperature=self.temperature,
+            )
+        except Exception as e:
+            message = describe_api_error(e)
+            for item in batch:
+                self._deliver(item, message)
+            return
+
+        explanations = parse_batch_response(text)
+        logging.info("Batch explanation received: %d of %d items.",
+                     len(explanations), len(batch))
+        missing = []
+        for item in batch:
+            if item["id"] in explanations:
+                self._deliver(item, explanations[item["id"]])
+            else:
+                missing.append(item)
+        if missing:
+            await asyncio.gather(*(self._send_single(item) for item in missing))
+
+    async def _send_single(self, item: Dict[str, Any]) -> None:
+        try:
+            text = await self.client.complete(
+                build_explanation_prompt(item["sentence"], item["correct_answer"],
+                                         item["user_answer"], item["is_correct"]),
+                model=self.model,
+                max_tokens=self.tokens_per_item,
+                temperature=self.temperature,
+            )
+        except Exception as e:
+            text = describe_api_error(e)
+        self._deliver(item, text)
+
+    @staticmethod
+    def _deliver(item: Dict[str, Any], text: str) -> None:
+        try:
+            item["callback"](text)
+        except Exception as e:
+            logging.error("Explanation callback failed: %s", e)
@@ -0,0 +1,262 @@
+"""
+Lexicon Browser
+Conjugation reference for the whole lexicon: every verb in every tense,
+computed once, served to a QTableView by a lazily fetched table model and
+searched through a prefix index
+"""
+
+from bisect import bisect_left
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+from PyQt5.QtCore import QAbstractTableModel, QModelIndex, Qt
+from PyQt5.QtWidgets import (QDialog, QDialogButtonBox, QHeaderView, QLabel,
+                             QLineEdit, QTableView, QVBoxLayout, QWidget)
+
+from answer_matcher import fold
+from conjugation_engine import COMMON_VERBS, TENSE_NAMES, SpanishConjugator
+
+PERSON_HEADERS = ['yo', 'tú', 'él/ella', 'nosotros', 'vosotros', 'ellos']
+HEADERS = ['Verb', 'Tense'] + PERSON_HEADERS
+ROW_BATCH = 256  # rows handed to the view per fetchMore()
+
+
+class LexiconEntry(NamedTuple):
+    """One verb in one tense: the six forms, '-' where the engine has none."""
+    verb: str
+    tense: str
+    forms: Tuple[str, ...]
+
+
+class PrefixIndex:
+    """
+    Sorted (key, row) pairs over every verb, form and tense name.
+
+    A prefix maps to one contiguous slice found by binary search, and a
+    longer prefix's slice lies inside the shorter one's, so typing narrows
+    the search range instead of rescanning the index.
+    """
+
+    def __init__(self, entries: Sequence[LexiconEntry]) -> None:
+        pairs = set()
+        for row, entry in enumerate(entries):
+            words = {entry.verb, *entry.forms, *TENSE_NAMES.get(entry.tense, entry.tense).split()}
+            words.discard('-')
+            pairs.update((fold(word), row) for word in words)
+        ordered = sorted(pairs)
+        self._keys = [key for key, _ in ordered]
+        self._rows = [row for _, row in ordered]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def range(self, prefix: str, within: Optional[Tuple[int, int]] = None) -> Tuple[int, int]:
+        """Slice of keys starting with ``prefix`` (already folded), searched inside ``within``."""
+        lo, hi = within if within is not None else (0, len(self._keys))
+        start = bisect_left(self._keys, prefix, lo, hi)
+        end = bisect_left(self._keys, prefix + '\uffff', start, hi)
+        return start, end
+
+    def rows(self, span: Tuple[int, int]) -> set:
+        return set(self._rows[span[0]:span[1]])
+
+
+class Lexicon:
+    """Every conjugation of every known verb, computed once and indexed."""
+
+    def __init__(self, entries: List[LexiconEntry]) -> None:
+        self.entries = entries
+        self.verbs = frozenset(entry.verb for entry in entries)
+        self.index = PrefixIndex(entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __contains__(self, verb: str) -> bool:
+        return verb in self.verbs
+
+    @classmethod
+    def build(cls,
+              conjugator: Optional[SpanishConjugator] = None,
+              extra_verbs: Iterable[str] = ()) -> "Lexicon":
+        """Conjugate the engine's verbs plus ``extra_verbs`` in every tense."""
+        conjugator = conjugator or SpanishConjugator()
+        entries = []
+        for verb in lexicon_verbs(conjugator, extra_verbs):
+            for tense in TENSE_NAMES:
+                forms = tuple(conjugator.conjugate(verb, tense, person) or '-' for person in range(6))
+                if any(form != '-' for form in forms):
+                    entries.append(LexiconEntry(verb, tense, forms))
+        return cls(entries)
+
+
+def lexicon_verbs(conjugator: SpanishConjugator, extra_verbs: Iterable[str] = ()) -> List[str]:
+    """Sorted, de-duplicated infinitives known to the engine plus ``extra_verbs``."""
+    verbs = {verb for group in COMMON_VERBS['regular'].values() for verb in group}
+    verbs.update(COMMON_VERBS['irregular'], COMMON_VERBS['stem_changing'])
+    verbs.update(conjugator.irregular_verbs, conjugator.stem_changes)
+    verbs.update(verb.strip().lower() for verb in extra_verbs if verb and verb.strip())
+    return sorted(verbs, key=lambda verb: (fold(verb), verb))
+
+
+def exercise_verbs(exercises: Iterable[Dict[str, Any]]) -> List[str]:
+    """Verbs named by exercises (e.g. from GPT) that the browser should also list."""
+    return [exercise['verb'] for exercise in exercises if isinstance(exercise.get('verb'), str)]
+
+
+class LexiconTableModel(QAbstractTableModel):
+    """
+    Read-only table over a Lexicon: one row per verb and tense.
+
+    Cells are produced in ``data`` straight from the precomputed entries, so
+    no per-cell items are allocated. Rows are exposed ``batch`` at a time
+    through ``canFetchMore``/``fetchMore`` as the view scrolls, and
+    ``setFilter`` narrows the rows through the prefix index.
+    """
+
+    def __init__(self, lexicon: Lexicon, batch: int = ROW_BATCH,
+                 parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self.lexicon = lexicon
+        self.batch = batch
+        self._rows: Sequence[int] = range(len(lexicon))
+        self._loaded = min(batch, len(lexicon))
+        self._tokens: List[str] = []
+        self._spans: List[Tuple[int, int]] = []
+
+    # -------------------------------------------------------
+    # QAbstractTableModel interface
+    # -------------------------------------------------------
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        entry = self.lexicon.entries[self._rows[index.row()]]
+        column = index.column()
+        if column == 0:
+            return entry.verb
+        if column == 1:
+            return TENSE_NAMES.get(entry.tense, entry.tense)
+        return entry.forms[column - 2]
+
+    def headerData(self, section: int, orientation: int, role: int = Qt.DisplayRole) -> Any:
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return HEADERS[section]
+        return None
+
+    def canFetchMore(self, parent: QModelIndex = QModelIndex()) -> bool:
+        return not parent.isValid() and self._loaded < len(self._rows)
+
+    def fetchMore(self, parent: QModelIndex = QModelIndex()) -> None:
+        count = min(self.batch, len(self._rows) - self._loaded)
+        if parent.isValid() or count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+    # -------------------------------------------------------
+    # Filtering
+    # -------------------------------------------------------
+    @property
+    def matchCount(self) -> int:
+        """Rows matching the filter, including those not fetched yet."""
+        return len(self._rows)
+
+    def entry(self, row: int) -> LexiconEntry:
+        return self.lexicon.entries[self._rows[row]]
+
+    def setFilter(self, text: str) -> None:
+        """
+        Show rows where every word of ``text`` prefixes a verb, form or tense.
+
+        A token that extends the same token of the previous filter is
+        searched inside that token's previous range.
+        """
+        tokens = fold(text).split()
+        spans = []
+        for i, token in enumerate(tokens):
+            within = None
+            if i < len(self._tokens) and token.startswith(self._tokens[i]):
+                within = self._spans[i]
+            spans.append(self.lexicon.index.range(token, within))
+        self._tokens, self._spans = tokens, spans
+
+        if spans:
+            matched = self.lexicon.index.rows(min(spans, key=lambda s: s[1] - s[0]))
+            for span in spans:
+                if not matched:
+                    break
+                matched &= self.lexicon.index.rows(span)
+            rows: Sequence[int] = sorted(matched)
+        else:
+            rows = range(len(self.lexicon))
+
+        self.beginResetModel()
+        self._rows = rows
+        self._loaded = min(self.batch, len(rows))
+        self.endResetModel()
+
+
+class LexiconBrowser(QDialog):
+    """Searchable conjugation reference for the whole lexicon."""
+
+    def __init__(self, lexicon: Lexicon, query: str = '', parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self.setWindowTitle("Verb Reference")
+        self.resize(820, 520)
+        self.model = LexiconTableModel(lexicon, parent=self)
+
+        layout = QVBoxLayout(self)
+        self.search = QLineEdit(self)
+        self.search.setPlaceholderText("Search verbs, forms or tenses (e.g. 'tengo' or 'hablar pret')")
+        self.search.setClearButtonEnabled(True)
+        layout.addWidget(self.search)
+
+        self.count_label = QLabel(self)
+        layout.addWidget(self.count_label)
+
+        self.table = QTableView(self)
+        self.table.setModel(self.model)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setAlternatingRowColors(True)
+        self.table.setWordWrap(False)
+        # Fixed row heights and column widths: the view never measures row contents
+        rows = self.table.verticalHeader()
+        rows.hide()
+        rows.setSectionResizeMode(QHeaderView.Fixed)
+        rows.setDefaultSectionSize(self.fontMetrics().height() + 8)
+        columns = self.table.horizontalHeader()
+        columns.setSectionResizeMode(QHeaderView.Interactive)
+        columns.setDefaultSectionSize(95)
+        columns.setStretchLastSection(True)
+        layout.addWidget(self.table)
+
+        tips = QLabel(
+            "💡 Quick Tips:\n"
+            "• Regular -AR: o, as, a, amos, áis, an\n"
+            "• Regular -ER: o, es, e, emos, éis, en\n"
+            "• Regular -IR: o, es, e, imos, ís, en"
+        )
+        layout.addWidget(tips)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok)
+        buttons.accepted.connect(self.accept)
+        layout.addWidget(buttons)
+
+        self.search.setText(query)
+        self.applyFilter(query)
+        self.search.textChanged.connect(self.applyFilter)
+
+    def applyFilter(self, text: str) -> None:
+        self.model.setFilter(text)
+        self.table.scrollToTop()
+        total = len(self.model.lexicon)
+        shown = self.model.matchCount
+        self.count_label.setText(
+            f"{total} conjugation tables" if shown == total else f"{shown} of {total} conjugation tables")
@@ -0,0 +1,353 @@
+"""
+Asynchronous LLM Client
+Runs every chat-completion call on one background asyncio event loop that
+shares a pooled, keep-alive HTTP client, admitted in priority order by a
+task scheduler
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Mapping, Optional
+
+from metrics import registry
+from task_scheduler import CancellationToken, DeadlineExceeded, Priority, TaskScheduler
+
+# Same tutor persona the GUI workers have always sent
+DEFAULT_SYSTEM_PROMPT = (
+    "You are an expert Spanish tutor specializing in LATAM Spanish. "
+    "Your guidance should always reflect real-life conversational tone, "
+    "using authentic expressions and culturally relevant details."
+)
+
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 60.0
+DEFAULT_MAX_CONCURRENCY = 4
+DEFAULT_KEEPALIVE_EXPIRY = 30.0
+
+# Latency includes waiting for a concurrency slot: it is what the learner waits
+REQUEST_SECONDS = registry.histogram(
+    "llm_request_seconds", "GPT request latency by kind (complete/stream)")
+FIRST_TOKEN_SECONDS = registry.histogram(
+    "llm_first_token_seconds", "Time from a streamed GPT request to its first text")
+REQUESTS = registry.counter("llm_requests_total", "GPT requests by kind and outcome")
+IN_FLIGHT = registry.gauge("llm_requests_in_flight", "GPT requests submitted and not yet finished")
+
+
+def describe_api_error(error: Exception) -> str:
+    """Turn an OpenAI/HTTP exception into a short, user-facing message."""
+    if isinstance(error, DeadlineExceeded):
+        logging.warning("LLM request given up: %s", error)
+        return "The request took too long and was given up. Please try again."
+    error_msg = str(error)
+    lowered = error_msg.lower()
+    if "rate_limit" in lowered:
+        logging.error("OpenAI rate limit exceeded: %s", error)
+        return "Rate limit exceeded. Please try again in a few minutes."
+    if "authentication" in lowered or "api_key" in lowered:
+        logging.error("OpenAI authentication error: %s", error)
+        return "API authentication error. Please check your API key in the .env file."
+    if "timeout" in lowered or "timed out" in lowered:
+        logging.error("OpenAI request timed out: %s", error)
+        return "The API took too long to respond. Please try again."
+    if "api" in lowered:
+        logging.error("OpenAI API error: %s", error)
+        return "API service error. Please try again later."
+    logging.error("Error in LLM request: %s", error)
+    return f"Error: {error_msg}"
+
+
+class AsyncLLMClient:
+    """
+    Chat-completion client backed by a single asyncio loop thread.
+
+    All requests share one ``httpx.AsyncClient`` so TLS sessions and TCP
+    connections are reused, and a semaphore caps how many calls are in
+    flight at once. Work submitted through ``submit`` or ``schedule`` goes
+    through ``scheduler`` first, so an interactive request never queues
+    behind background ones. The loop thread and HTTP client are created
+    lazily on the first request, so constructing the client is free.
+
+    Attributes:
+        api_key (str): OpenAI API key.
+        base_url (Optional[str]): Override for the API endpoint (e.g. a local
+            stand-in server); ``None`` uses the OpenAI default.
+        connect_timeout (float): Seconds allowed to open a connection.
+        read_timeout (float): Seconds allowed between response bytes.
+        max_concurrency (int): Maximum simultaneous in-flight requests; also
+            the size of the keep-alive connection pool.
+        max_retries (int): Retries performed by the OpenAI SDK per request.
+        scheduler (TaskScheduler): Priority admission onto the loop, capped
+            at ``max_concurrency`` tasks.
+    """
+
+    def __init__(self,
+                 api_key: str = "",
+                 base_url: Optional[str] = None,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT,
+                 max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+                 max_retries: int = 2,
+                 system_prompt: str = DEFAULT_SYSTEM_PROMPT,
+                 class_limits: Optional[Mapping[Priority, int]] = None) -> None:
+        self.api_key = api_key
+        self.base_url = base_url
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.max_retries = max_retries
+        self.system_prompt = system_prompt
+        self.class_limits = class_limits
+        self.scheduler = TaskScheduler(self.call_soon, self.max_concurrency, class_limits)
+
+        self._lock = threading.Lock()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        # Only touched from the loop thread
+        self._client = None
+        self._http_client = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    # -------------------------------------------------------
+    # Event loop management
+    # -------------------------------------------------------
+    @property
+    def is_running(self) -> bool:
+        """Whether the background loop thread has been started."""
+        return self._loop is not None
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Start the background event loop thread on first use."""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                ready = threading.Event()
+                thread = threading.Thread(
+                    target=self._run_loop, args=(loop, ready),
+                    name="llm-event-loop", daemon=True
+                )
+                thread.start()
+                ready.wait()
+                self._loop, self._thread = loop, thread
+                logging.info("LLM event loop started.")
+            return self._loop
+
+    @staticmethod
+    def _run_loop(loop: asyncio.AbstractEventLoop, ready: threading.Event) -> None:
+        asyncio.set_event_loop(loop)
+        loop.call_soon(ready.set)
+        loop.run_forever()
+
+    def _get_client(self):
+        """Build the pooled HTTP client and SDK client (loop thread only)."""
+        if self._client is None:
+            import httpx
+            from openai import AsyncOpenAI
+
+            timeout = httpx.Timeout(self.read_timeout, connect=self.connect_timeout)
+            self._http_client = httpx.AsyncClient(
+                timeout=timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                    keepalive_expiry=DEFAULT_KEEPALIVE_EXPIRY,
+                ),
+            )
+            self._client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                timeout=timeout,
+                max_retries=self.max_retries,
+                http_client=self._http_client,
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._client
+
+    # -------------------------------------------------------
+    # Requests
+    # -------------------------------------------------------
+    def build_messages(self, prompt: str,
+                       system_prompt: Optional[str] = None) -> list:
+        """Build the chat message list for a single-turn prompt."""
+        return [
+            {"role": "system", "content": system_prompt or self.system_prompt},
+            {"role": "user", "content": prompt},
+        ]
+
+    async def complete(self,
+                       prompt: str,
+                       model: str = "gpt-4o",
+                       max_tokens: int = 600,
+                       temperature: float = 0.5,
+                       system_prompt: Optional[str] = None) -> str:
+        """
+        Run one chat completion on the loop and return the stripped text.
+
+        Must be awaited on this client's loop; use ``submit`` from any
+        other thread.
+        """
+        start = time.perf_counter()
+        outcome = "error"
+        IN_FLIGHT.inc()
+        try:
+            client = self._get_client()
+            async with self._semaphore:
+                response = await client.chat.completions.create(
+                    model=model,
+                    messages=self.build_messages(prompt, system_prompt),
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                )
+            outcome = "ok"
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            IN_FLIGHT.dec()
+            REQUEST_SECONDS.observe(time.perf_counter() - start, kind="complete")
+            REQUESTS.inc(kind="complete", outcome=outcome)
+        return (response.choices[0].message.content or "").strip()
+
+    async def stream(self,
+                     prompt: str,
+                     model: str = "gpt-4o",
+                     max_tokens: int = 600,
+                     temperature: float = 0.5,
+                     system_prompt: Optional[str] = None) -> AsyncIterator[str]:
+        """
+        Stream one chat completion, yielding text deltas as they arrive.
+
+        The concurrency slot is held until the stream is exhausted or the
+        generator is closed, so callers that stop early should ``aclose`` it.
+        """
+        start = time.perf_counter()
+        first = True
+        outcome = "error"
+        IN_FLIGHT.inc()
+        try:
+            client = self._get_client()
+            async with self._semaphore:
+                response = await client.chat.completions.create(
+                    model=model,
+                    messages=self.build_messages(prompt, system_prompt),
+                    max_tokens=max_tokens,
+                    temperature=temperature,
+                    stream=True,
+                )
+                try:
+                    async for chunk in response:
+                        if chunk.choices and chunk.choices[0].delta.content:
+                            if first:
+                                FIRST_TOKEN_SECONDS.observe(time.perf_counter() - start)
+                                first = False
+                            yield chunk.choices[0].delta.content
+                finally:
+                    await response.close()
+            outcome = "ok"
+        except (asyncio.CancelledError, GeneratorExit):
+            outcome = "cancelled"
+            raise
+        finally:
+            IN_FLIGHT.dec()
+            REQUEST_SECONDS.observe(time.perf_counter() - start, kind="stream")
+            REQUESTS.inc(kind="stream", outcome=outcome)
+
+    def run(self, coro: Awaitable[Any]) -> Future:
+        """Schedule an arbitrary coroutine on the client's loop."""
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+
+    def schedule(self,
+                 func: Callable[..., Any],
+                 *args: Any,
+                 priority: Priority = Priority.INTERACTIVE,
+                 token: Optional[CancellationToken] = None,
+                 deadline: Optional[float] = None,
+                 **kwargs: Any) -> Future:
+        """
+        Run ``func(*args, **kwargs)`` through the priority scheduler.
+
+        ``func`` is a coroutine function (run on the loop) or a plain
+        function (run in the loop's thread pool); see ``TaskScheduler.submit``
+        for ``priority``, ``token`` and ``deadline``.
+        """
+        return self.scheduler.submit(func, *args, priority=priority, token=token,
+                                     deadline=deadline, **kwargs)
+
+    def submit(self,
+               prompt: str,
+               callback: Optional[Callable[[Future], Any]] = None,
+               priority: Priority = Priority.INTERACTIVE,
+               token: Optional[CancellationToken] = None,
+               deadline: Optional[float] = None,
+               **kwargs: Any) -> Future:
+        """
+        Schedule a completion from any thread.
+
+        Args:
+            prompt: The user prompt.
+            callback: Optional done-callback, invoked with the finished (or
+                cancelled) future, usually on the loop thread.
+            priority: Scheduler priority class.
+            token: Cancellation token for the request.
+            deadline: Seconds, queueing included, before the request fails
+                with ``DeadlineExceeded``.
+            **kwargs: ``model``, ``max_tokens``, ``temperature`` or
+                ``system_prompt`` forwarded to ``complete``.
+
+        Returns:
+            A ``concurrent.futures.Future`` resolving to the response text.
+        """
+        future = self.schedule(self.complete, prompt, priority=priority, token=token,
+                               deadline=deadline, **kwargs)
+        if callback is not None:
+            future.add_done_callback(callback)
+        return future
+
+    def call_soon(self, callback: Callable[..., Any], *args: Any) -> None:
+        """Run a plain callback on the loop thread (thread-safe)."""
+        loop = self._ensure_loop()
+        loop.call_soon_threadsafe(callback, *args)
+
+    def pool_info(self) -> Dict[str, Any]:
+        """Describe the connection pool configuration."""
+        return {
+            "running": self.is_running,
+            "max_concurrency": self.max_concurrency,
+            "connect_timeout": self.connect_timeout,
+            "read_timeout": self.read_timeout,
+            "base_url": self.base_url,
+            "scheduler": self.scheduler.snapshot(),
+        }
+
+    # -------------------------------------------------------
+    # Shutdown
+    # -------------------------------------------------------
+    async def _aclose(self) -> None:
+        self.scheduler.shutdown()
+        if self._client is not None:
+            await self._client.close()
+        self._client = None
+        self._http_client = None
+
+    def close(self, timeout: float = 3.0) -> None:
+        """Close pooled connections and stop the loop thread."""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop, self._thread = None, None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._aclose(), loop).result(timeout)
+        except Exception as e:
+            logging.warning("Error closing LLM client: %s", e)
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout)
+        if not loop.is_running():
+            loop.close()
+        # A fresh scheduler in case the client is used again
+        self.scheduler = TaskScheduler(self.call_soon, self.max_concurrency, self.class_limits)
+        logging.info("LLM event loop stopped.")
@@ -0,0 +1,366 @@
+"""
+Local LLM Stand-in Server
+OpenAI-compatible HTTP server that replays recorded chat completions with
+configurable latency, jitter, error rate and streaming, so the online
+pipeline can be measured and regression-tested without the real API
+
+Usage:
+    python llm_standin_server.py --port 8000 --latency 0.4 --jitter 0.1
+    OPENAI_BASE_URL=http://127.0.0.1:8000/v1 python main.py
+"""
+
+import argparse
+import json
+import logging
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+# Recorded responses per flow; each flow cycles through its list
+DEFAULT_RECORDINGS: Dict[str, List[str]] = {
+    "generate": [
+        json.dumps([
+            {
+                "context": "Estás en un café de Bogotá con una amiga.",
+                "sentence": "Yo siempre ______ un tinto por la mañana.",
+                "answer": "tomo",
+                "choices": ["tomo", "tomas", "toma", "tomamos"],
+                "translation": "I always ______ a black coffee in the morning."
+            },
+            {
+                "context": "Tu hermano te llama desde el aeropuerto.",
+                "sentence": "Mi vuelo ______ a las ocho de la noche.",
+                "answer": "sale",
+                "choices": ["salgo", "sales", "sale", "salen"],
+                "translation": "My flight ______ at eight at night."
+            },
+            {
+                "context": "Hablas con tu vecino sobre el fin de semana.",
+                "sentence": "Nosotros ______ al mercado el sábado.",
+                "answer": "fuimos",
+                "choices": ["fui", "fuiste", "fue", "fuimos"],
+                "translation": "We ______ to the market on Saturday."
+            }
+        ], ensure_ascii=False)
+    ],
+    "explain": [
+        "La forma correcta usa la terminación de la primera persona del singular del "
+        "presente: el sujeto es \"yo\", por eso el verbo termina en -o.",
+        "Aquí se necesita el pretérito porque la acción ocurrió en un momento concreto "
+        "del pasado y ya terminó."
+    ],
+    "hint": [
+        "Piensa en quién realiza la acción y si ocurre ahora o ya pasó.",
+        "Fíjate en la palabra que indica el tiempo al inicio de la oración."
+    ],
+    "summary": [
+        "Buen trabajo en general. Dominas el presente regular; repasa el pretérito "
+        "de los verbos irregulares como ir y ser."
+    ],
+}
+
+# Ordered (flow, marker) pairs used to recognize which flow sent a prompt
+FLOW_MARKERS = [
+    ("summary", "reviewing a student's practice session"),
+    ("explain_batch", "reviewing several answers"),
+    ("hint", "hint"),
+    ("generate", "Generate "),
+    ("explain", "Learner's Answer"),
+]
+
+STREAM_CHUNK_CHARS = 16
+
+
+def classify_prompt(prompt: str) -> str:
+    """Return the flow name a prompt belongs to (``explain`` by default)."""
+    for flow, marker in FLOW_MARKERS:
+        if marker in prompt:
+            return flow
+    return "explain"
+
+
+def load_recordings(path: str) -> Dict[str, List[str]]:
+    """
+    Load recorded responses from a JSON file.
+
+    The file maps flow names to a response string or a list of them; flows
+    it does not mention keep the built-in recordings.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    recordings = {flow: list(responses) for flow, responses in DEFAULT_RECORDINGS.items()}
+    for flow, responses in data.items():
+        recordings[flow] = [responses] if isinstance(responses, str) else list(responses)
+    return recordings
+
+
+class LLMStandInServer:
+    """
+    Threaded OpenAI-compatible ``/v1/chat/completions`` replay server.
+
+    Attributes:
+        latency (float): Base delay in seconds before each response.
+        jitter (float): Uniform +/- variation added to ``latency``.
+        error_rate (float): Probability (0-1) of answering with ``error_status``.
+        error_status (int): HTTP status used for injected errors (500 or 429
+            are retried by the OpenAI SDK).
+        stream_chunk_delay (float): Delay between streamed chunks.
+        request_count (int): Requests received, including retried ones.
+        flow_counts (Dict[str, int]): Requests received per flow.
+        errors_injected (int): Responses replaced by an injected error.
+    """
+
+    def __init__(self,
+                 host: str = "127.0.0.1",
+                 port: int = 0,
+                 recordings: Optional[Dict[str, List[str]]] = None,
+                 latency: float = 0.0,
+                 jitter: float = 0.0,
+                 error_rate: float = 0.0,
+                 error_status: int = 500,
+                 stream_chunk_delay: float = 0.0,
+                 seed: Optional[int] = None) -> None:
+        self.host = host
+        self.port = port
+        self.recordings = recordings or {k: list(v) for k, v in DEFAULT_RECORDINGS.items()}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.stream_chunk_delay = stream_chunk_delay
+
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._cursors: Dict[str, int] = {}
+        self._server: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+
+        self.request_count = 0
+        self.flow_counts: Dict[str, int] = {}
+        self.errors_injected = 0
+
+    # -------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------
+    @property
+    def base_url(self) -> str:
+        """The ``/v1`` base URL clients should be pointed at."""
+        return f"http://{self.host}:{self.port}/v1"
+
+    def start(self) -> str:
+        """Start serving on a background thread and return the base URL."""
+        self._server = ThreadingHTTPServer((self.host, self.port), self._make_handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="llm-standin", daemon=True
+        )
+        self._thread.start()
+        logging.info("LLM stand-in server listening on %s", self.base_url)
+        return self.base_url
+
+    def stop(self) -> None:
+        """Stop serving and release the port."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self) -> "LLMStandInServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def reset_stats(self) -> None:
+        """Zero the request counters."""
+        with self._lock:
+            self.request_count = 0
+            self.flow_counts = {}
+            self.errors_injected = 0
+
+    # -------------------------------------------------------
+    # Response selection
+    # -------------------------------------------------------
+    def _next_recording(self, flow: str) -> str:
+        responses = self.recordings.get(flow) or self.recordings.get("explain") or [""]
+        with self._lock:
+            cursor = self._cursors.get(flow, 0)
+            self._cursors[flow] = cursor + 1
+        return responses[cursor % len(responses)]
+
+    def response_for(self, prompt: str) -> str:
+        """Pick the recorded response for a prompt."""
+        flow = classify_prompt(prompt)
+        if flow == "explain_batch":
+            ids = [int(i) for i in re.findall(r"- id (\d+):", prompt)]
+            return json.dumps(
+                [{"id": i, "explanation": self._next_recording("explain")} for i in ids],
+                ensure_ascii=False
+            )
+        return self._next_recording(flow)
+
+    def _record_request(self, prompt: str) -> bool:
+        """Count a request; return True if it should fail."""
+        flow = classify_prompt(prompt)
+        with self._lock:
+            self.request_count += 1
+            self.flow_counts[flow] = self.flow_counts.get(flow, 0) + 1
+            fail = self._random.random() < self.error_rate
+            if fail:
+                self.errors_injected += 1
+            delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+        time.sleep(delay)
+        return fail
+
+    # -------------------------------------------------------
+    # HTTP handling
+    # -------------------------------------------------------
+    def _make_handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logging.debug("stand-in: " + format, *args)
+
+            def do_POST(self) -> None:
+                length = int(self.headers.get("Content-Length", 0))
+                try:
+                    body = json.loads(self.rfile.read(length) or b"{}")
+                except json.JSONDecodeError:
+                    self._send_json(400, {"error": {"message": "Invalid JSON body", "type": "invalid_request_error"}})
+                    return
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self._send_json(404, {"error": {"message": f"Unknown path {self.path}", "type": "invalid_request_error"}})
+                    return
+
+                messages = body.get("messages") or [{}]
+                prompt = messages[-1].get("content", "")
+                if server._record_request(prompt):
+                    self._send_json(server.error_status, {
+                        "error": {"message": "Injected stand-in failure", "type": "server_error"}
+                    })
+                    return
+
+                content = server.response_for(prompt)
+                model = body.get("model", "gpt-4o")
+                if body.get("stream"):
+                    self._send_stream(content, model)
+                else:
+                    self._send_json(200, {
+                        "id": "chatcmpl-standin",
+                        "object": "chat.completion",
+                        "created": int(time.time()),
+                        "model": model,
+                        "choices": [{
+                            "index": 0,
+                            "message": {"role": "assistant", "content": content},
+                            "finish_reason": "stop",
+                        }],
+                        "usage": {
+                            "prompt_tokens": len(prompt) // 4,
+                            "completion_tokens": len(content) // 4,
+                            "total_tokens": (len(prompt) + len(content)) // 4,
+                        },
+                    })
+
+            def _send_json(self, status: int, payload: Dict[str, Any]) -> None:
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _write_chunk(self, data: bytes) -> None:
+                self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+
+            def _send_stream(self, content: str, model: str) -> None:
+                try:
+                    self._write_stream(content, model)
+                except (BrokenPipeError, ConnectionResetError):
+                    # The client stopped reading (e.g. a cancelled request);
+                    # nothing left to deliver, so end quietly
+                    self.close_connection = True
+
+            def _write_stream(self, content: str, model: str) -> None:
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+
+                pieces = [content[i:i + STREAM_CHUNK_CHARS]
+                          for i in range(0, len(content), STREAM_CHUNK_CHARS)]
+                for index, piece in enumerate(pieces):
+                    delta = {"content": piece}
+                    if index == 0:
+                        delta["role"] = "assistant"
+                    event = {
+                        "id": "chatcmpl-standin",
+                        "object": "chat.completion.chunk",
+                        "created": int(time.time()),
+                        "model": model,
+                        "choices": [{"index": 0, "delta": delta, "finish_reason": None}],
+                    }
+                    self._write_chunk(f"data: {json.dumps(event, ensure_ascii=False)}\n\n".encode("utf-8"))
+                    if server.stream_chunk_delay:
+                        time.sleep(server.stream_chunk_delay)
+                final = {
+                    "id": "chatcmpl-standin",
+                    "object": "chat.completion.chunk",
+                    "created": int(time.time()),
+                    "model": model,
+                    "choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}],
+                }
+                self._write_chunk(f"data: {json.dumps(final)}\n\n".encode("utf-8"))
+                self._write_chunk(b"data: [DONE]\n\n")
+                self._write_chunk(b"")
+
+        return Handler
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="OpenAI-compatible replay server for offline testing")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--recordings", help="JSON file mapping flow names to recorded responses")
+    parser.add_argument("--latency", type=float, default=0.0, help="Base response delay in seconds")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Uniform +/- delay variation in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Probability of an injected error")
+    parser.add_argument("--error-status", type=int, default=500)
+    parser.add_argument("--stream-chunk-delay", type=float, default=0.0)
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    server = LLMStandInServer(
+        host=args.host,
+        port=args.port,
+        recordings=load_recordings(args.recordings) if args.recordings else None,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        stream_chunk_delay=args.stream_chunk_delay,
+        seed=args.seed,
+    )
+    server.start()
+    print(f"Serving on {server.base_url} (Ctrl+C to stop)")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""
+Local Rule-Based Explanations
+Explains conjugation answers from the SpanishConjugator tables (endings,
+irregular and stem-changing verbs, person/tense mismatches) without an
+API round-trip
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+from answer_matcher import fold, person_index, tense_key
+from conjugation_engine import COMMON_VERBS, PERSON_LABELS, SpanishConjugator
+
+# Spanish tense names used in the explanation text
+TENSE_NAMES_ES = {
+    'present': 'presente',
+    'preterite': 'pretérito',
+    'imperfect': 'imperfecto',
+    'future': 'futuro',
+    'conditional': 'condicional',
+    'present_subjunctive': 'presente de subjuntivo'
+}
+
+# Categories returned by LocalExplainer.diagnose_mistake
+MISTAKE_CATEGORIES = {
+    'accent': 'missing or extra accent mark',
+    'person': 'wrong person',
+    'tense': 'wrong tense',
+    'person_tense': 'wrong person and tense',
+    'verb': 'wrong verb',
+    'regularized': 'irregular verb conjugated as regular',
+    'form': 'misspelled form'
+}
+
+# (infinitive, tense, person index)
+Analysis = Tuple[str, str, int]
+
+
+class LocalExplainer:
+    """
+    Generate grammar explanations from the local conjugation engine.
+
+    A reverse index from every conjugated form of the known verbs to its
+    ``(infinitive, tense, person)`` analyses is built once, so explaining an
+    answer is a couple of dictionary lookups. ``explain`` returns ``None``
+    when the correct answer is not a form the engine can analyze; callers
+    should fall back to GPT in that case.
+    """
+
+    def __init__(self,
+                 conjugator: Optional[SpanishConjugator] = None,
+                 verbs: Optional[List[str]] = None) -> None:
+        self.conjugator = conjugator or SpanishConjugator()
+        self.tenses = list(self.conjugator.regular_endings)
+        if verbs is None:
+            verbs = [verb for group in COMMON_VERBS['regular'].values() for verb in group]
+            verbs += COMMON_VERBS['irregular'] + COMMON_VERBS['stem_changing']
+        self._index: Dict[str, List[Analysis]] = {}
+        self._loose_index: Dict[str, List[Analysis]] = {}
+        self._indexed_verbs = set()
+        for verb in verbs:
+            self.add_verb(verb)
+
+    # -------------------------------------------------------
+    # Index
+    # -------------------------------------------------------
+    def add_verb(self, infinitive: str) -> None:
+        """Index every form of ``infinitive`` the engine can conjugate."""
+        infinitive = infinitive.strip().lower()
+        if infinitive in self._indexed_verbs:
+            return
+        self._indexed_verbs.add(infinitive)
+        for tense in self.tenses:
+            for person in range(len(PERSON_LABELS)):
+                form = self.conjugator.conjugate(infinitive, tense, person)
+                if not form:
+                    continue
+                analysis = (infinitive, tense, person)
+                self._index.setdefault(form, []).append(analysis)
+                self._loose_index.setdefault(fold(form), []).append(analysis)
+
+    def analyze(self, form: str) -> List[Analysis]:
+        """Return every ``(infinitive, tense, person)`` that produces ``form``."""
+        return list(self._index.get(form.strip().lower(), []))
+
+    def classify_verb(self, infinitive: str, tense: str) -> str:
+        """Return ``'irregular'``, ``'stem-changing'`` or ``'regular'`` for a tense."""
+        if tense in self.conjugator.irregular_verbs.get(infinitive, {}):
+            return 'irregular'
+        if infinitive in self.conjugator.stem_changes and tense == 'present':
+            return 'stem-changing'
+        return 'regular'
+
+    def regular_form(self, infinitive: str, tense: str, person: int) -> Optional[str]:
+        """The form ``infinitive`` would take if it followed the regular pattern."""
+        verb_class = infinitive[-2:]
+        endings = self.conjugator.regular_endings.get(tense, {})
+        if verb_class not in endings:
+            return None
+        if tense in ('future', 'conditional'):
+            return infinitive + endings['ar'][person]
+        return infinitive[:-2] + endings[verb_class][person]
+
+    # -------------------------------------------------------
+    # Explanations
+    # -------------------------------------------------------
+    def explain(self,
+                sentence: str,
+                correct_answer: str,
+                user_answer: str,
+                is_correct: bool,
+                verb: Optional[str] = None,
+                tense: Optional[str] = None,
+                person: Any = None) -> Optional[str]:
+        """
+        Explain an answer, or return ``None`` if the engine cannot analyze it.
+
+        Args:
+            sentence: Exercise sentence (unused by the rules, kept for parity
+                with the GPT prompt).
+            correct_answer: Expected verb form.
+            user_answer: What the learner entered.
+            is_correct: Verdict from ``check_answer``.
+            verb, tense, person: Exercise metadata when known; used to pick
+                the right analysis of ambiguous forms such as ``fui``. The
+                tense may be an engine name or a display name ('Imperfect').
+        """
+        target = self._target(correct_answer, verb, tense, person)
+        if target is None:
+            return None
+
+        correct_form = correct_answer.strip().lower()
+        lines = [self._describe_form(correct_form, target)]
+        if not is_correct:
+            lines.append(self._describe_mistake(user_answer.strip().lower(), correct_form, target))
+        return "\n".join(line for line in lines if line)
+
+    def _target(self, correct_answer: str, verb: Optional[str],
+                tense: Optional[str], person: Any) -> Optional[Analysis]:
+        if verb:
+            self.add_verb(verb)
+        # Generated exercises carry display names; an unknown name matches nothing
+        tense = tense_key(tense) or tense
+        return self._pick_analysis(self.analyze(correct_answer), verb, tense, person_index(person))
+
+    @staticmethod
+    def _pick_analysis(analyses: List[Analysis],
+                       verb: Optional[str],
+                       tense: Optional[str],
+                       person: Optional[int]) -> Optional[Analysis]:
+        def matches(analysis: Analysis) -> bool:
+            return ((not verb or analysis[0] == verb.strip().lower())
+                    and (not tense or analysis[1] == tense)
+                    and (person is None or analysis[2] == person))
+
+        # Only explain a form we can pin down: GPT exercises carry no metadata,
+        # and guessing between e.g. ser/ir for "fue" would explain the wrong verb
+        candidates = {a for a in analyses if matches(a)}
+        return candidates.pop() if len(candidates) == 1 else None
+
+    def _describe_form(self, form: str, analysis: Analysis) -> str:
+        infinitive, tense, person = analysis
+        tense_es = TENSE_NAMES_ES.get(tense, tense)
+        subject = PERSON_LABELS[person]
+        verb_type = self.classify_verb(infinitive, tense)
+
+        if verb_type == 'irregular':
+            return (f"\"{form}\" es la forma irregular de \"{infinitive}\" en {tense_es} "
+                    f"para {subject}; no sigue las terminaciones regulares y hay que memorizarla.")
+        if verb_type == 'stem-changing':
+            change = self.conjugator.stem_changes[infinitive]['type']
+            return (f"\"{form}\" es \"{infinitive}\" en {tense_es} para {subject}. "
+                    f"Es un verbo con cambio de raíz ({change}): el cambio ocurre en todas las "
+                    f"personas excepto nosotros y vosotros.")
+
+        ending = self._ending_of(infinitive, tense, person)
+        if tense in ('future', 'conditional'):
+            return (f"\"{form}\" es \"{infinitive}\" en {tense_es} para {subject}: "
+                    f"se añade -{ending} al infinitivo completo.")
+        return (f"\"{form}\" es \"{infinitive}\" en {tense_es} para {subject}: "
+                f"raíz \"{infinitive[:-2]}-\" + terminación -{ending} de los verbos "
+                f"-{infinitive[-2:]}.")
+
+    def _ending_of(self, infinitive: str, tense: str, person: int) -> str:
+        verb_class = 'ar' if tense in ('future', 'conditional') else infinitive[-2:]
+        return self.conjugator.regular_endings[tense][verb_class][person]
+
+    def diagnose_mistake(self,
+                         correct_answer: str,
+                         user_answer: str,
+                         verb: Optional[str] = None,
+                         tense: Optional[str] = None,
+                         person: Any = None) -> Optional[Dict[str, Any]]:
+        """
+        Classify a wrong answer without rendering text.
+
+        Returns:
+            ``{'verb', 'tense', 'person', 'category'}`` where category is one
+            of ``MISTAKE_CATEGORIES``, or ``None`` if the correct answer is not
+            analyzable.
+        """
+        target = self._target(correct_answer, verb, tense, person)
+        if target is None:
+            return None
+        category, _ = self._diagnose(user_answer.strip().lower(), correct_answer.strip().lower(), target)
+        return {'verb': target[0], 'tense': target[1], 'person': target[2], 'category': category}
+
+    def _diagnose(self, user_form: str, correct_form: str,
+                  target: Analysis) -> Tuple[str, Optional[Analysis]]:
+        """Return the mistake category and the user's form analysis, if any."""
+        infinitive, tense, person = target
+        if fold(user_form) == fold(correct_form):
+            return 'accent', None
+
+        user_analyses = self.analyze(user_form) or self._loose_index.get(fold(user_form), [])
+        same_verb = [a for a in user_analyses if a[0] == infinitive]
+        if same_verb:
+            # Prefer the analysis closest to the target: same tense, then same person
+            closest = min(same_verb, key=lambda a: (a[1] != tense, a[2] != person))
+            if closest[1] == tense:
+                return 'person', closest
+            if closest[2] == person:
+                return 'tense', closest
+            return 'person_tense', closest
+        if user_analyses:
+            return 'verb', user_analyses[0]
+
+        regular = self.regular_form(infinitive, tense, person)
+        if regular and user_form == regular and self.classify_verb(infinitive, tense) != 'regular':
+            return 'regularized', None
+        return 'form', None
+
+    def _describe_mistake(self, user_form: str, correct_form: str, target: Analysis) -> str:
+        infinitive, tense, person = target
+        tense_es = TENSE_NAMES_ES.get(tense, tense)
+        category, user_analysis = self._diagnose(user_form, correct_form, target)
+
+        if category == 'accent':
+            return (f"Solo falta la tilde: se escribe \"{correct_form}\". "
+                    f"El acento escrito es parte de la terminación en {tense_es}.")
+        if category == 'person':
+            return (f"\"{user_form}\" corresponde a {PERSON_LABELS[user_analysis[2]]}, pero el "
+                    f"sujeto aquí es {PERSON_LABELS[person]}. Revisa quién realiza la acción.")
+        if category == 'tense':
+            return (f"\"{user_form}\" es el {TENSE_NAMES_ES.get(user_analysis[1], user_analysis[1])}, "
+                    f"pero la oración pide el {tense_es}. Fíjate en las pistas de tiempo.")
+        if category == 'person_tense':
+            return (f"\"{user_form}\" es el {TENSE_NAMES_ES.get(user_analysis[1], user_analysis[1])} para "
+                    f"{PERSON_LABELS[user_analysis[2]]}; aquí se necesita el {tense_es} para "
+                    f"{PERSON_LABELS[person]}.")
+        if category == 'verb':
+            return (f"\"{user_form}\" es una forma de \"{user_analysis[0]}\"; "
+                    f"la oración necesita el verbo \"{infinitive}\".")
+
+        verb_type = self.classify_verb(infinitive, tense)
+        if category == 'regularized':
+            if verb_type == 'stem-changing':
+                change = self.conjugator.stem_changes[infinitive]['type']
+                return (f"\"{user_form}\" aplica la terminación regular pero olvida el cambio "
+                        f"de raíz {change} de \"{infinitive}\".")
+            return (f"\"{user_form}\" sería la forma regular, pero \"{infinitive}\" es "
+                    f"irregular en {tense_es}.")
+        if verb_type == 'regular':
+            verb_class = 'ar' if tense in ('future', 'conditional') else infinitive[-2:]
+            endings = ", ".join(self.conjugator.regular_endings[tense][verb_class])
+            return (f"Terminaciones del {tense_es} para verbos -{infinitive[-2:]}: {endings}.")
+        return f"La forma correcta es \"{correct_form}\"."
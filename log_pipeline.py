@@ -0,0 +1,197 @@
+"""
+Logging Pipeline
+Non-blocking application logging: callers only enqueue records, while a
+listener thread formats them and writes rotating, gzip-compressed log
+files. Large payloads are truncated and sampled before they are queued.
+"""
+
+import atexit
+import gzip
+import logging
+import logging.handlers
+import os
+import queue
+import shutil
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+DEFAULT_MAX_BYTES = 1_000_000
+DEFAULT_BACKUP_COUNT = 5
+DEFAULT_ROTATE_INTERVAL = 24 * 60 * 60  # seconds
+DEFAULT_MAX_MESSAGE_CHARS = 2000
+DEFAULT_SAMPLE_EVERY = 10
+
+# Third-party loggers that are chatty at INFO (one line per HTTP request)
+DEFAULT_LOGGER_LEVELS = {"httpx": "WARNING", "httpcore": "WARNING", "openai": "WARNING"}
+
+_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class CompressingRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    """
+    Rotates on size or age, whichever comes first, and gzips rotated files.
+
+    Rotated files are named ``<file>.1.gz`` (newest) to
+    ``<file>.<backup_count>.gz``. It is meant to run on the listener thread,
+    so the compression cost never lands on a caller.
+    """
+
+    def __init__(self,
+                 filename: str,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 backup_count: int = DEFAULT_BACKUP_COUNT,
+                 rotate_interval: float = DEFAULT_ROTATE_INTERVAL,
+                 compress: bool = True,
+                 encoding: str = "utf-8") -> None:
+        super().__init__(filename, mode="a", maxBytes=max_bytes, backupCount=backup_count,
+                         encoding=encoding, delay=True)
+        self.rotate_interval = rotate_interval
+        self.compress = compress
+        self.rollover_at = self._next_rollover(self._file_start_time())
+        if compress:
+            self.namer = lambda name: name + ".gz"
+            self.rotator = self._gzip_rotate
+
+    def _file_start_time(self) -> float:
+        try:
+            return os.path.getmtime(self.baseFilename) if os.path.exists(self.baseFilename) else time.time()
+        except OSError:
+            return time.time()
+
+    def _next_rollover(self, start: float) -> float:
+        return start + self.rotate_interval if self.rotate_interval > 0 else float("inf")
+
+    def shouldRollover(self, record: logging.LogRecord) -> bool:
+        if time.time() >= self.rollover_at and os.path.exists(self.baseFilename):
+            return True
+        return bool(super().shouldRollover(record))
+
+    def doRollover(self) -> None:
+        super().doRollover()
+        self.rollover_at = self._next_rollover(time.time())
+
+    @staticmethod
+    def _gzip_rotate(source: str, dest: str) -> None:
+        with open(source, "rb") as f_in, gzip.open(dest, "wb") as f_out:
+            shutil.copyfileobj(f_in, f_out)
+        os.remove(source)
+
+
+class PayloadFilter(logging.Filter):
+    """
+    Truncation and sampling policy for large log messages.
+
+    Messages longer than ``max_chars`` are cut to that length with a marker.
+    Of the oversized messages from one call site only the first and then
+    every ``sample_every``-th are kept; the rest are dropped. Records at
+    WARNING or above are truncated but never dropped.
+    """
+
+    def __init__(self,
+                 max_chars: int = DEFAULT_MAX_MESSAGE_CHARS,
+                 sample_every: int = DEFAULT_SAMPLE_EVERY) -> None:
+        super().__init__()
+        self.max_chars = max_chars
+        self.sample_every = max(1, sample_every)
+        self._oversized: Dict[Tuple[str, int], int] = {}
+        self._lock = threading.Lock()
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        message = record.getMessage()
+        if len(message) <= self.max_chars:
+            return True
+
+        if record.levelno < logging.WARNING:
+            site = (record.pathname, record.lineno)
+            with self._lock:
+                seen = self._oversized.get(site, 0)
+                self._oversized[site] = seen + 1
+            if seen % self.sample_every:
+                self.dropped += 1
+                return False
+
+        record.msg = f"{message[:self.max_chars]}... [truncated {len(message) - self.max_chars} chars]"
+        record.args = None
+        return True
+
+
+def apply_logger_levels(levels: Dict[str, str]) -> None:
+    """Set per-logger levels, e.g. ``{"httpx": "WARNING", "": "DEBUG"}``."""
+    for name, level in levels.items():
+        try:
+            logging.getLogger(name).setLevel(level.upper() if isinstance(level, str) else level)
+        except (ValueError, TypeError):
+            logging.warning("Ignoring invalid log level %r for logger %r", level, name)
+
+
+def configure_logging(log_file: str,
+                      formatter: logging.Formatter,
+                      level: int = logging.INFO,
+                      logger_levels: Optional[Dict[str, str]] = None,
+                      max_bytes: int = DEFAULT_MAX_BYTES,
+                      backup_count: int = DEFAULT_BACKUP_COUNT,
+                      rotate_interval: float = DEFAULT_ROTATE_INTERVAL,
+                      compress: bool = True,
+                      max_message_chars: int = DEFAULT_MAX_MESSAGE_CHARS,
+                      sample_every: int = DEFAULT_SAMPLE_EVERY,
+                      console: bool = True) -> logging.Logger:
+    """
+    Route the root logger through a queue to a listener thread.
+
+    The root logger gets a single ``QueueHandler``; the console and rotating
+    file handlers run on the listener thread, which is stopped (and the
+    queue drained) at interpreter exit. Calling this again replaces the
+    previous pipeline.
+
+    Returns:
+        The root logger.
+    """
+    stop_logging()
+
+    handlers = []
+    if console:
+        console_handler = logging.StreamHandler()
+        console_handler.setFormatter(formatter)
+        handlers.append(console_handler)
+
+    directory = os.path.dirname(log_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    file_handler = CompressingRotatingFileHandler(
+        log_file, max_bytes=max_bytes, backup_count=backup_count,
+        rotate_interval=rotate_interval, compress=compress
+    )
+    file_handler.setFormatter(formatter)
+    handlers.append(file_handler)
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    queue_handler.addFilter(PayloadFilter(max_message_chars, sample_every))
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+    apply_logger_levels(dict(DEFAULT_LOGGER_LEVELS, **(logger_levels or {})))
+
+    global _listener
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    return root
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread."""
+    global _listener
+    if _listener is None:
+        return
+    listener, _listener = _listener, None
+    listener.stop()
+    for handler in listener.handlers:
+        handler.close()
+
+
+atexit.register(stop_logging)
@@ -26,12 +26,10 @@ Improvements Addressed (based on 'B'):
 
 import sys
 import os
-import json
 import logging
 import random
-import time
 from typing import (
-    List, Dict, Union, Optional, Any, Tuple, Callable
+    List, Dict, Union, Optional, Any, Callable, TYPE_CHECKING
 )
 
 from dotenv import load_dotenv
@@ -40,14 +38,30 @@ load_dotenv()
 # Local modules
 from exercise_generator import ExerciseGenerator
 from progress_tracker import ProgressTracker
-from conjugation_engine import PERSON_LABELS, TENSE_NAMES, SpanishConjugator
+from response_timer import ResponseTimer
+from conjugation_engine import TENSE_NAMES, SpanishConjugator
+from practice_engine import (PERSON_OPTIONS, TENSE_OPTIONS, PracticeSession, ProgressStats,
+                             parse_custom_exercises)
 from task_scenarios import TaskScenario
 from speed_practice import SpeedPractice
 from learning_path import LearningPath
+from local_explainer import LocalExplainer
+from prompts import build_exercise_prompt, build_explanation_prompt, build_hint_prompt
+from session_summary import RollingSessionSummary
+from exercise_stream_parser import ExerciseStreamParser, parse_exercises
+from exercise_dedup import ExerciseDedupIndex
+from startup_tracer import PROFILE_FLAG, tracer
+from ui_watchdog import watchdog
+from sampling_profiler import DEFAULT_OUTPUT as PROFILE_OUTPUT, env_output, profiler
+from metrics import MetricsExporter, registry
+from task_scheduler import CancellationToken, Priority
+from log_pipeline import apply_logger_levels, configure_logging
+from session_journal import SessionJournal
+from config_store import ConfigStore, get_config_store
 
 # PyQt5 imports
 from PyQt5.QtCore import (
-    Qt, QRunnable, QObject, pyqtSignal, QThreadPool
+    Qt, QObject, pyqtSignal, QTimer
 )
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QSplitter,
@@ -56,12 +70,11 @@ from PyQt5.QtWidgets import (
     QCheckBox, QMessageBox, QToolBar, QSpinBox
 )
 
-# OpenAI imports
-import openai
-from openai import OpenAI
-
-# For newer OpenAI versions (1.x), errors are handled differently
-# We'll use generic exception handling to be compatible
+# The OpenAI SDK (and asyncio/httpx behind it) is only imported when the first
+# online request builds the LLM client; offline use never pays for it.
+if TYPE_CHECKING:
+    from llm_client import AsyncLLMClient
+    from explanation_batcher import ExplanationBatcher
 
 
 # -------------------------------------------------------
@@ -70,31 +83,17 @@ from openai import OpenAI
 def setup_logging() -> logging.Logger:
     """
     Configure application logging with both file and console handlers.
+
+    Log calls only enqueue the record; a listener thread writes the console
+    and the size/time-rotated, compressed log file (see log_pipeline).
     Returns the root logger.
     """
-    logger = logging.getLogger()
-    logger.setLevel(logging.INFO)
-
-    # Clear any existing handlers to avoid duplication
-    for handler in logger.handlers[:]:
-        logger.removeHandler(handler)
-
-    # Define formatter
     formatter = logging.Formatter("%(asctime)s - %(levelname)s - %(message)s")
-
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-
-    # File handler
-    file_handler = logging.FileHandler("logging_doc.txt", mode="a", encoding="utf-8")
-    file_handler.setLevel(logging.INFO)
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
-
-    return logger
+    return configure_logging(
+        os.environ.get("LOG_FILE_PATH", "logging_doc.txt"),
+        formatter,
+        level=logging.INFO
+    )
 
 
 logger = setup_logging()
@@ -121,6 +120,21 @@ PROGRESS_BAR_HEIGHT = "25px"
 # Number of exercises to request from GPT by default
 DEFAULT_EXERCISE_BATCH_SIZE = 5
 
+# Legacy plain-text history of generated sentences, imported once into the
+# hashed dedup index stored alongside progress data
+EXERCISE_LOG_FILE = "exercise_log.txt"
+EXERCISE_INDEX_DB = "progress.db"
+
+# Append-only NDJSON journal of answers (replay: python session_journal.py)
+SESSION_JOURNAL_FILE = "session_journal.ndjson"
+
+# A hint that takes longer than this is no longer wanted (seconds, queueing included)
+HINT_DEADLINE = 30.0
+
+# Startup phase trace (Chrome trace-event JSON) and optional cProfile output
+STARTUP_TRACE_FILE = "startup_trace.json"
+STARTUP_PROFILE_FILE = "startup.prof"
+
 
 # -------------------------------------------------------
 # CONFIGURATION MANAGEMENT
@@ -132,6 +146,10 @@ class AppConfig:
     Handles saving, loading, and accessing application configuration. 
     This stub demonstrates how you might expand or integrate user-defined
     preferences.
+
+    A thin view over the shared ConfigStore for ``config_file``: reads come
+    from memory and ``set`` schedules a debounced atomic write, so UI
+    toggles do no disk I/O.
     """
     def __init__(self, config_file: str = "app_config.json") -> None:
         self.config_file = config_file
@@ -145,6 +163,24 @@ class AppConfig:
             "max_stored_responses": 100,
             "exercise_count": DEFAULT_EXERCISE_BATCH_SIZE,
             "answer_strictness": "normal",
+            "api_connect_timeout": 5.0,
+            "api_read_timeout": 60.0,
+            "api_max_concurrency": 4,
+            "batch_explanations": False,
+            "explanation_batch_window": 1.5,
+            "explanation_batch_size": 5,
+            "local_explanations": True,
+            "summary_update_every": 10,
+            "summary_max_prompt_tokens": 600,
+            "stream_exercises": True,
+            "ui_watchdog": True,
+            "ui_stall_threshold_ms": 250,
+            "sampling_profiler": False,
+            "profile_interval_ms": 5,
+            "profile_output": PROFILE_OUTPUT,
+            "metrics_export_path": "logs/metrics.prom",
+            "metrics_export_interval": 60,
+            "log_levels": {},
             "window_geometry": {
                 "width": WINDOW_WIDTH,
                 "height": WINDOW_HEIGHT,
@@ -153,78 +189,37 @@ class AppConfig:
             },
             "splitter_sizes": SPLITTER_SIZES
         }
-        # Current configuration
-        self.config = self.load_config()
+        # Shared store: the file's contents, or the defaults if missing/corrupted
+        self.store: ConfigStore = get_config_store(self.config_file, self.default_config)
+
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Current configuration snapshot."""
+        return self.store.data
 
     def load_config(self) -> Dict[str, Any]:
-        """Load configuration from file or use defaults."""
-        try:
-            if os.path.exists(self.config_file):
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    return json.load(f)
-            else:
-                return self.default_config.copy()
-        except Exception as e:
-            logging.error(f"Error loading config: {e}")
-            return self.default_config.copy()
+        """Reload configuration from file (pending changes are kept)."""
+        self.store.reload(force=True)
+        return self.config
 
     def save_config(self) -> bool:
-        """Save current configuration to file."""
-        try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2)
-            return True
-        except Exception as e:
-            logging.error(f"Error saving config: {e}")
-            return False
+        """Write the current configuration to file now."""
+        return self.store.flush(force=True)
 
     def get(self, key: str, default=None) -> Any:
         """Get configuration value by key."""
         return self.config.get(key, self.default_config.get(key, default))
 
+    @watchdog.instrument("AppConfig.set")
     def set(self, key: str, value: Any) -> None:
-        """Set configuration value and save."""
-        self.config[key] = value
-        self.save_config()
+        """Set configuration value; it is written to file shortly after."""
+        self.store.set(key, value)
 
 
 # Global config instance (could also be passed around if needed)
 app_config = AppConfig()
-
-
-# -------------------------------------------------------
-# PROGRESS TRACKING
-# -------------------------------------------------------
-class ProgressStats:
-    """
-    Track and manage user progress statistics.
-    This class can be expanded to track performance by tense, person, etc.
-    """
-    def __init__(self) -> None:
-        self.total_attempted = 0
-        self.total_correct = 0
-        self.history: List[Dict[str, Any]] = []
-
-    def record_attempt(self, exercise: Dict[str, Any], user_answer: str, is_correct: bool) -> None:
-        """Record an exercise attempt in the statistics."""
-        self.total_attempted += 1
-        if is_correct:
-            self.total_correct += 1
-
-        from datetime import datetime
-        self.history.append({
-            "timestamp": datetime.now().isoformat(),
-            "exercise": exercise,
-            "user_answer": user_answer,
-            "correct_answer": exercise.get("answer", ""),
-            "is_correct": is_correct
-        })
-
-    def get_accuracy(self) -> float:
-        """Get overall accuracy percentage."""
-        if self.total_attempted == 0:
-            return 0.0
-        return (self.total_correct / self.total_attempted) * 100.0
+# Per-logger levels from settings, e.g. {"openai": "DEBUG"}
+apply_logger_levels(app_config.get("log_levels", {}))
 
 
 # Simple API key retrieval from environment
@@ -232,11 +227,40 @@ api_key = os.getenv("OPENAI_API_KEY", "")
 if not api_key:
     logging.error("OPENAI_API_KEY not found in environment variables. Please create a .env file.")
 
-# Set your OpenAI API key
-openai.api_key = api_key
-
-# Create the OpenAI client
-client = OpenAI(api_key=api_key)
+# Shared asyncio LLM client (one event loop thread, pooled keep-alive HTTP)
+# and the opt-in explanation batcher; both are built on first use.
+llm_client: Optional["AsyncLLMClient"] = None
+explanation_batcher: Optional["ExplanationBatcher"] = None
+
+
+def get_llm_client() -> "AsyncLLMClient":
+    """Return the shared LLM client, creating it on first use."""
+    global llm_client
+    if llm_client is None:
+        from llm_client import AsyncLLMClient
+        llm_client = AsyncLLMClient(
+            api_key=api_key,
+            base_url=os.getenv("OPENAI_BASE_URL") or None,
+            connect_timeout=app_config.get("api_connect_timeout", 5.0),
+            read_timeout=app_config.get("api_read_timeout", 60.0),
+            max_concurrency=app_config.get("api_max_concurrency", 4)
+        )
+    return llm_client
+
+
+def get_explanation_batcher() -> "ExplanationBatcher":
+    """Return the shared explanation batcher, creating it on first use."""
+    global explanation_batcher
+    if explanation_batcher is None:
+        from explanation_batcher import ExplanationBatcher
+        explanation_batcher = ExplanationBatcher(
+            get_llm_client(),
+            window_seconds=app_config.get("explanation_batch_window", 1.5),
+            max_items=app_config.get("explanation_batch_size", 5),
+            model=app_config.get("api_model", "gpt-4o"),
+            temperature=app_config.get("temperature", 0.5)
+        )
+    return explanation_batcher
 
 
 # -------------------------------------------------------
@@ -253,67 +277,164 @@ class WorkerSignals(QObject):
 # (5) OPENAI ERROR HANDLING ENHANCEMENT
 #     (6) FIX OPENAI ROLE PARAMETER
 # -------------------------------------------------------
-class GPTWorkerRunnable(QRunnable):
+class GPTRequest:
     """
-    Worker thread for calling GPT asynchronously using the updated ChatCompletion interface.
-    
+    A single GPT call dispatched on the shared asyncio LLM client.
+
+    The request is admitted by the client's priority scheduler and runs on
+    its event loop thread; its result is delivered back to the Qt main
+    thread through ``signals.result`` (a queued cross-thread signal), so no
+    pool thread is held while waiting on the network. A cancelled request
+    emits nothing.
+
     Attributes:
         prompt (str): The content of the user prompt.
         model (str): The GPT model ID.
         max_tokens (int): Maximum tokens for GPT response.
         temperature (float): Sampling temperature.
+        priority (Priority): Scheduler class; the learner waits on interactive ones.
+        token (Optional[CancellationToken]): Cancels the request.
+        deadline (Optional[float]): Seconds before the request is given up.
         signals (WorkerSignals): PyQt signals to emit the GPT result.
     """
     def __init__(self,
                  prompt: str,
                  model: str = "gpt-4o",
                  max_tokens: int = 600,
-                 temperature: float = 0.5) -> None:
-        super().__init__()
+                 temperature: float = 0.5,
+                 priority: Priority = Priority.INTERACTIVE,
+                 token: Optional[CancellationToken] = None,
+                 deadline: Optional[float] = None) -> None:
         self.prompt = prompt
         self.model = model
         self.max_tokens = max_tokens
         self.temperature = temperature
+        self.priority = priority
+        self.token = token
+        self.deadline = deadline
         self.signals = WorkerSignals()
 
-    def run(self) -> None:
+    def start(self) -> None:
+        """Submit the request to the shared LLM client."""
+        get_llm_client().submit(
+            self.prompt,
+            callback=self._on_done,
+            priority=self.priority,
+            token=self.token,
+            deadline=self.deadline,
+            model=self.model,
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+        )
+
+    def _on_done(self, future) -> None:
+        if future.cancelled():
+            return
         try:
-            response = client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "You are an expert Spanish tutor specializing in LATAM Spanish. "
-                            "Your guidance should always reflect real-life conversational tone, "
-                            "using authentic expressions and culturally relevant details."
-                        )
-                    },
-                    {"role": "user", "content": self.prompt}
-                ],
-                max_tokens=self.max_tokens,
-                temperature=self.temperature,
-            )
-            output = response.choices[0].message.content.strip()
+            output = future.result()
             logging.info("GPT response received.")
         except Exception as e:
-            error_msg = str(e)
-            if "rate_limit" in error_msg.lower():
-                output = "Rate limit exceeded. Please try again in a few minutes."
-                logging.error("OpenAI rate limit exceeded: %s", e)
-            elif "authentication" in error_msg.lower() or "api_key" in error_msg.lower():
-                output = "API authentication error. Please check your API key in the .env file."
-                logging.error("OpenAI authentication error: %s", e)
-            elif "api" in error_msg.lower():
-                output = "API service error. Please try again later."
-                logging.error("OpenAI API error: %s", e)
-            else:
-                output = f"Error: {error_msg}"
-                logging.error("Error in GPTWorkerRunnable: %s", e)
-
+            from llm_client import describe_api_error
+            output = describe_api_error(e)
         self.signals.result.emit(output)
 
 
+class BatchedExplanationRequest:
+    """
+    An answer explanation queued on the shared ExplanationBatcher.
+
+    Several of these are answered by a single GPT call; each one still
+    receives only its own explanation through ``signals.result``.
+    """
+    def __init__(self,
+                 sentence: str,
+                 correct_answer: str,
+                 user_answer: str,
+                 is_correct: bool) -> None:
+        self.sentence = sentence
+        self.correct_answer = correct_answer
+        self.user_answer = user_answer
+        self.is_correct = is_correct
+        self.signals = WorkerSignals()
+
+    def start(self) -> None:
+        """Queue the answer on the batcher."""
+        get_explanation_batcher().add(
+            self.sentence, self.correct_answer, self.user_answer,
+            self.is_correct, callback=self._on_done
+        )
+
+    def _on_done(self, explanation: str) -> None:
+        self.signals.result.emit(explanation)
+
+
+class ExerciseStreamSignals(QObject):
+    """
+    Signals for streamed exercise generation.
+    """
+    exercise = pyqtSignal(dict)
+    finished = pyqtSignal(int)
+    error = pyqtSignal(str)
+
+
+class StreamingExerciseRequest:
+    """
+    Exercise generation that streams the GPT response.
+
+    Each exercise is parsed and emitted through ``signals.exercise`` as soon
+    as its closing brace arrives, so the first one can be shown while the
+    rest are still being generated. ``signals.finished`` carries the number
+    of valid exercises; ``signals.error`` reports a failed or interrupted
+    stream (exercises already emitted remain usable). Cancelling ``token``
+    closes the stream and emits nothing further.
+    """
+    def __init__(self,
+                 prompt: str,
+                 model: str = "gpt-4o",
+                 max_tokens: int = 600,
+                 temperature: float = 0.5,
+                 token: Optional[CancellationToken] = None) -> None:
+        self.prompt = prompt
+        self.model = model
+        self.max_tokens = max_tokens
+        self.temperature = temperature
+        self.token = token
+        self.signals = ExerciseStreamSignals()
+
+    def start(self) -> None:
+        """Start streaming on the shared LLM client."""
+        future = get_llm_client().schedule(
+            self._consume, priority=Priority.INTERACTIVE, token=self.token)
+        future.add_done_callback(self._on_done)
+
+    async def _consume(self) -> int:
+        parser = ExerciseStreamParser()
+        async for delta in get_llm_client().stream(
+            self.prompt,
+            model=self.model,
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+        ):
+            for exercise in parser.feed(delta):
+                self.signals.exercise.emit(exercise)
+        parser.close()
+        if parser.truncated:
+            logging.warning("Exercise stream was truncated after %d exercises.", parser.emitted)
+        return parser.emitted
+
+    def _on_done(self, future) -> None:
+        if future.cancelled():
+            return
+        try:
+            count = future.result()
+            logging.info("Exercise stream finished with %d exercises.", count)
+        except Exception as e:
+            from llm_client import describe_api_error
+            self.signals.error.emit(describe_api_error(e))
+            return
+        self.signals.finished.emit(count)
+
+
 # -------------------------------------------------------
 # (9) JSON HANDLING IMPROVEMENT (Utility Function)
 # -------------------------------------------------------
@@ -321,84 +442,77 @@ def parse_gpt_json(text: str) -> List[Dict[str, Any]]:
     """
     Parse JSON from GPT output with robust error handling.
 
+    Markdown fences and surrounding prose are ignored, objects missing
+    required exercise keys are dropped, and a truncated response still
+    yields every exercise that was completed before the cut.
+
     Args:
         text: Raw text from GPT that should contain JSON
 
     Returns:
         Parsed list of exercise dictionaries or empty list on failure.
     """
-    # Strip markdown code fences if present
-    if text.startswith("```"):
-        try:
-            # Find the first and last code block markers
-            start_idx = text.find("\n", text.find("```")) + 1
-            end_idx = text.rfind("```")
-            if start_idx > 0 and end_idx > start_idx:
-                text = text[start_idx:end_idx].strip()
-        except Exception as e:
-            logging.error("Error cleaning code blocks: %s", e)
-
-    # Try to parse the JSON
-    try:
-        data = json.loads(text)
-        return data if isinstance(data, list) else []
-    except json.JSONDecodeError as e:
-        logging.error("JSON parse error: %s", e)
-        # Attempt a more manual recovery
-        try:
-            array_start = text.find("[")
-            array_end = text.rfind("]") + 1
-            if array_start >= 0 and array_end > array_start:
-                return json.loads(text[array_start:array_end])
-        except Exception as recovery_e:
-            logging.error("JSON recovery failed: %s", recovery_e)
-        return []
+    return parse_exercises(text)
 
 
 # -------------------------------------------------------
-# (12) ANSWER VALIDATION FLEXIBILITY
+# MULTIPLE CHOICE VIEW
 # -------------------------------------------------------
-def check_answer(user_answer: str,
-                 correct_answer: str,
-                 strictness: str = "normal") -> Tuple[bool, str]:
+class ChoicePool(QWidget):
     """
-    Check if the user's answer is correct using flexible matching.
-
-    Args:
-        user_answer: The answer provided by the user
-        correct_answer: The expected correct answer
-        strictness: Matching strictness level ("strict", "normal", or "lenient")
+    Multiple-choice answers backed by a fixed pool of radio buttons.
 
-    Returns:
-        (is_correct, feedback_message)
+    ``setChoices`` reuses the existing buttons, only touching the text and
+    visibility that changed, and suspends repaints while it does so; the
+    pool grows when an exercise has more choices than ever seen before.
+    Buttons are never deleted, so switching exercises creates no Qt objects.
     """
-    user_norm = user_answer.strip().lower()
-    correct_norm = correct_answer.strip().lower()
-
-    # Direct match check
-    if user_norm == correct_norm:
-        return True, "Correct! Great job!"
-
-    # Accent insensitive check (for "normal" and "lenient")
-    if strictness in ["normal", "lenient"]:
-        import unicodedata
-        def remove_accents(text: str) -> str:
-            return ''.join(
-                c for c in unicodedata.normalize('NFKD', text)
-                if not unicodedata.combining(c)
-            )
-        if remove_accents(user_norm) == remove_accents(correct_norm):
-            return True, "Correct! (Accent marks differ)"
-
-    # Lenient mode additional checks (typos)
-    if strictness == "lenient":
-        import difflib
-        # Check similarity
-        similarity = difflib.SequenceMatcher(None, user_norm, correct_norm).ratio()
-        if similarity > 0.85:
-            return True, f"Close enough! The exact answer is '{correct_answer}'."
-
-    return False, f"Incorrect. The correct answer is '{correct_answer}'."
+    def __init__(self, size: int = 4, parent: Optional[QWidget] = None) -> None:
+        super().__init__(parent)
+        self.group = QButtonGroup(self)
+        self.buttons: List[QRadioButton] = []
+        self._layout = QVBoxLayout(self)
+        self._layout.setContentsMargins(0, 0, 0, 0)
+        self._count = 0
+        self._grow(size)
+
+    def _grow(self, size: int) -> None:
+        while len(self.buttons) < size:
+            button = QRadioButton(self)
+            button.setVisible(False)
+            self.group.addButton(button, len(self.buttons))
+            self._layout.addWidget(button)
+            self.buttons.append(button)
+
+    def setChoices(self, choices: List[str]) -> None:
+        """Show ``choices`` and select the first one."""
+        self._grow(len(choices))
+        self.setUpdatesEnabled(False)
+        try:
+            for index, button in enumerate(self.buttons):
+                if index < len(choices):
+                    if button.text() != choices[index]:
+                        button.setText(choices[index])
+                    if button.isHidden():
+                        button.setVisible(True)
+                elif not button.isHidden():
+                    button.setVisible(False)
+            self._count = len(choices)
+            if choices:
+                self.buttons[0].setChecked(True)
+        finally:
+            self.setUpdatesEnabled(True)
+
+    def choices(self) -> List[str]:
+        """The choices currently shown, in order."""
+        return [button.text() for button in self.buttons[:self._count]]
+
+    def selectedText(self) -> str:
+        """Text of the checked choice, or "" if none is shown."""
+        index = self.group.checkedId()
+        if not 0 <= index < self._count:
+            return ""
+        return self.buttons[index].text()
 
 
 # -------------------------------------------------------
@@ -414,12 +528,12 @@ class SpanishConjugationGUI(QMainWindow):
 
     Attributes:
         responses (List[dict]): Records of user responses for session summary
+        session (PracticeSession): Exercise set, answer checking and scoring
         exercises (List[dict]): Current batch of exercises
         current_exercise (int): Index of the current exercise being displayed
         stats (ProgressStats): Tracks number of attempts and correct answers
         progress_tracker (ProgressTracker): SQLite-based progress tracking
         exercise_generator (ExerciseGenerator): Local exercise generation
-        threadpool (QThreadPool): Thread pool for asynchronous operations
         dark_mode (bool): Whether dark mode is enabled
         show_translation (bool): Whether English translations are displayed
         offline_mode (bool): Whether to use local generation instead of GPT
@@ -436,22 +550,42 @@ class SpanishConjugationGUI(QMainWindow):
         )
 
         self.responses: List[Dict[str, Any]] = []
-        self.exercises: List[Dict[str, Any]] = []
-        self.current_exercise: int = 0
-
-        self.stats = ProgressStats()
-        self.progress_tracker = ProgressTracker()
-        self.exercise_generator = ExerciseGenerator()
-        self.task_scenarios = TaskScenario()
-        self.speed_practice = SpeedPractice()
-        self.learning_path = LearningPath()
-        self.conjugator = SpanishConjugator()
-        self.session_id = self.progress_tracker.start_session()
-        self.threadpool = QThreadPool()
+
+        with tracer.span("progress_tracker"):
+            self.progress_tracker = ProgressTracker()
+        with tracer.span("engines"):
+            self.exercise_generator = ExerciseGenerator()
+            self.task_scenarios = TaskScenario()
+            self.speed_practice = SpeedPractice(self.progress_tracker)
+            self.learning_path = LearningPath()
+            self.conjugator = SpanishConjugator()
+            self.local_explainer = LocalExplainer(self.conjugator)
+            self.lexicon = None  # Built when the verb reference is first opened
+            self.session_summary = RollingSessionSummary(
+                update_every=app_config.get("summary_update_every", 10),
+                max_prompt_tokens=app_config.get("summary_max_prompt_tokens", 600),
+                explainer=self.local_explainer
+            )
+        with tracer.span("start_session"):
+            self.session_id = self.progress_tracker.start_session()
+            self.journal = SessionJournal(SESSION_JOURNAL_FILE, session_id=self.session_id)
+        # Exercise set, answer checking and scoring, shared with the HTTP service
+        self.session = PracticeSession(
+            session_id=self.session_id,
+            progress_tracker=self.progress_tracker,
+            exercise_generator=self.exercise_generator,
+            task_scenarios=self.task_scenarios,
+            speed_practice=self.speed_practice,
+            explainer=self.local_explainer
+        )
         self.offline_mode = False  # Start in online mode by default
-        self.task_mode = False  # Toggle between grammar drills and tasks
-        self.speed_mode = False  # Speed practice mode
-        self.start_time = None  # For timing responses
+        self.last_explanation_request = None  # Arguments for on-demand GPT explanations
+        self.stream_generation = 0  # Identifies the current exercise stream
+        self.stream_accepted = 0
+        self.stream_token: Optional[CancellationToken] = None  # Cancels the running stream
+        self.hint_token: Optional[CancellationToken] = None  # Cancels a hint for the shown exercise
+        with tracer.span("dedup_index"):
+            self.dedup_index = ExerciseDedupIndex(EXERCISE_INDEX_DB, legacy_log=EXERCISE_LOG_FILE)
 
         # Load initial states from config
         self.dark_mode: bool = app_config.get("dark_mode", False)
@@ -460,13 +594,49 @@ class SpanishConjugationGUI(QMainWindow):
         # Additional placeholders
         self.max_stored_responses: int = app_config.get("max_stored_responses", 100)
 
-        self.initUI()
+        with tracer.span("init_ui"):
+            self.initUI()
+
+        # Speed answers are timed from the painted exercise, not from the app's work
+        self.response_timer = ResponseTimer(self.session.clock, self)
+        self.response_timer.watchDisplay(self.sentence_label)
+        self.response_timer.watchInput(self.free_response_input)
+        self.response_timer.watchButtons(self.choice_pool.group)
+
+        # Periodic metrics file (GPT latency, DB writes, generation time...)
+        self.metrics_exporter: Optional[MetricsExporter] = None
+        interval = app_config.get("metrics_export_interval", 60)
+        if interval and interval > 0:
+            self.metrics_exporter = MetricsExporter(
+                registry, app_config.get("metrics_export_path", "logs/metrics.prom"), interval)
+            self.metrics_exporter.start()
 
         # Do not auto-generate on startup; user must click "New Exercise"
-        self.exercises = []
-        self.total_exercises: int = 0
         self.updateSessionStats()
 
+    # The exercise set lives in the practice session
+    @property
+    def exercises(self) -> List[Dict[str, Any]]:
+        return self.session.exercises
+
+    @property
+    def current_exercise(self) -> int:
+        return self.session.current
+
+    @property
+    def total_exercises(self) -> int:
+        return self.session.total
+
+    @property
+    def stats(self) -> ProgressStats:
+        return self.session.stats
+
+    def showExerciseSet(self) -> None:
+        """Display the first exercise of a newly loaded set."""
+        self.cancelHint()
+        self.progress_bar.setMaximum(self.total_exercises)
+        self.updateExercise()
+
     def initUI(self) -> None:
         """
         Initialize the GUI elements and layout.
@@ -600,9 +770,9 @@ class SpanishConjugationGUI(QMainWindow):
 
         multiple_choice_page = QWidget()
         mc_layout = QVBoxLayout(multiple_choice_page)
-        self.mc_button_group = QButtonGroup(multiple_choice_page)
-        self.mc_options_layout = QVBoxLayout()
-        mc_layout.addLayout(self.mc_options_layout)
+        self.choice_pool = ChoicePool(parent=multiple_choice_page)
+        mc_layout.addWidget(self.choice_pool)
+        mc_layout.addStretch()
         self.input_stack.addWidget(multiple_choice_page)
 
         right_layout.addWidget(self.input_stack)
@@ -612,12 +782,17 @@ class SpanishConjugationGUI(QMainWindow):
         self.prev_button = QPushButton("Previous")
         self.hint_button = QPushButton("Hint")
         self.submit_button = QPushButton("Submit")
+        self.explain_button = QPushButton("Ask GPT")
+        self.explain_button.setToolTip("Get a detailed GPT explanation for this answer")
+        self.explain_button.setEnabled(False)
         self.next_button = QPushButton("Next")
-        for btn in (self.prev_button, self.hint_button, self.submit_button, self.next_button):
+        for btn in (self.prev_button, self.hint_button, self.submit_button,
+                    self.explain_button, self.next_button):
             btn.setStyleSheet(f"font-size: {FONT_SIZE_MEDIUM}; padding: {PADDING_SMALL};")
         buttons_layout.addWidget(self.prev_button)
         buttons_layout.addWidget(self.hint_button)
         buttons_layout.addWidget(self.submit_button)
+        buttons_layout.addWidget(self.explain_button)
         buttons_layout.addWidget(self.next_button)
         right_layout.addLayout(buttons_layout)
 
@@ -640,6 +815,7 @@ class SpanishConjugationGUI(QMainWindow):
         self.next_button.clicked.connect(self.nextExercise)
         self.prev_button.clicked.connect(self.prevExercise)
         self.hint_button.clicked.connect(self.provideHint)
+        self.explain_button.clicked.connect(self.requestGPTExplanation)
 
         self.status_bar = QStatusBar()
         self.setStatusBar(self.status_bar)
@@ -727,6 +903,11 @@ class SpanishConjugationGUI(QMainWindow):
         export_action.triggered.connect(self.exportProgress)
         toolbar.addAction(export_action)
 
+        diagnostics_action = QAction("🩺 Diagnostics", self)
+        diagnostics_action.setToolTip("UI responsiveness: stalls and slow handlers")
+        diagnostics_action.triggered.connect(self.showDiagnostics)
+        toolbar.addAction(diagnostics_action)
+
     def toggleOfflineMode(self) -> None:
         """Toggle between offline and online exercise generation."""
         self.offline_mode = not self.offline_mode
@@ -735,62 +916,17 @@ class SpanishConjugationGUI(QMainWindow):
         
     def startReviewMode(self) -> None:
         """Start review mode with problematic verbs."""
-        review_items = self.progress_tracker.get_verbs_for_review(10)
-        if not review_items:
+        if not self.session.start_review(limit=10, count=5):
             self.updateStatus("No items need review yet. Keep practicing!")
             return
-            
-        # Generate exercises for review items
-        exercises = []
-        for item in review_items[:5]:
-            exercise = self.exercise_generator.generate_exercise(
-                verb=item['verb'],
-                tense=item['tense'],
-                person=item['person']
-            )
-            exercises.append(exercise)
-        
-        self.exercises = exercises
-        self.total_exercises = len(exercises)
-        self.current_exercise = 0
-        self.progress_bar.setMaximum(self.total_exercises)
-        self.updateExercise()
+        self.showExerciseSet()
         self.updateStatus("Review mode: Practicing your weak areas")
     
     def startTaskMode(self) -> None:
         """Start task-based learning mode with scenarios."""
-        self.task_mode = True
         self.updateStatus("Task Mode: Practice with real-world scenarios")
-        
-        # Get available scenarios
-        scenarios = self.task_scenarios.get_scenario_list()
-        scenario_type = random.choice(scenarios)
-        
-        # Get task sequence
-        tasks = self.task_scenarios.get_task_sequence(scenario_type, 5)
-        
-        # Convert to exercise format
-        exercises = []
-        for task in tasks:
-            exercise = {
-                'sentence': f"{task['scenario_title']}\n{task['scenario_context']}\n\n{task['goal']}:\n{task['template']}",
-                'answer': self.task_scenarios.conjugator.conjugate(task['verb'], task['tense'], task['person']),
-                'verb': task['verb'],
-                'tense': task['tense'],
-                'person': task['person'],
-                'choices': self._generate_task_choices(task),
-                'translation': task['prompt'],
-                'context': task['scenario_context'],
-                'goal': task['goal'],
-                'task_data': task
-            }
-            exercises.append(exercise)
-        
-        self.exercises = exercises
-        self.total_exercises = len(exercises)
-        self.current_exercise = 0
-        self.progress_bar.setMaximum(self.total_exercises)
-        self.updateExercise()
+        self.session.start_task(5)
+        self.showExerciseSet()
     
     def startStoryMode(self) -> None:
         """Start story mode with connected discourse."""
@@ -812,35 +948,12 @@ class SpanishConjugationGUI(QMainWindow):
                 break
         
         # Generate story sequence
-        exercises = self.exercise_generator.generate_story_sequence(story_tense, 5)
-        
-        self.exercises = exercises
-        self.total_exercises = len(exercises)
-        self.current_exercise = 0
-        self.progress_bar.setMaximum(self.total_exercises)
-        self.updateExercise()
+        exercises = self.session.start_story(story_tense, 5)
+        self.showExerciseSet()
         self.updateStatus(f"Story: {exercises[0].get('story_title', 'Connected Story')}")
     
-    def _generate_task_choices(self, task: Dict[str, Any]) -> List[str]:
-        """Generate choices for task-based exercise."""
-        correct = self.task_scenarios.conjugator.conjugate(task['verb'], task['tense'], task['person'])
-        choices = [correct]
-        
-        # Add related forms
-        for person in range(6):
-            if person != task['person']:
-                form = self.task_scenarios.conjugator.conjugate(task['verb'], task['tense'], person)
-                if form and form not in choices:
-                    choices.append(form)
-                    if len(choices) >= 4:
-                        break
-        
-        return choices[:4]
-    
     def startSpeedMode(self) -> None:
         """Start speed practice mode for conversational fluency."""
-        self.speed_mode = True
-        
         # Get user preferences
         time_limit = self.speed_timer_spin.value()
         exercise_count = self.exercise_count_spin.value()
@@ -848,31 +961,7 @@ class SpanishConjugationGUI(QMainWindow):
         
         self.updateStatus(f"⚡ Speed Mode: {time_limit} seconds per verb! Build conversational fluency.")
         
-        # Generate speed round with user settings
-        if selected_verbs:
-            # Use user's specific verbs
-            verbs = [v.strip() for v in selected_verbs.split(',')]
-            self.speed_practice.essential_verbs = verbs
-        
-        # Calculate duration based on user settings
-        duration = exercise_count * time_limit
-        exercises = self.speed_practice.generate_speed_round(duration)
-        
-        # Convert to exercise format
-        for ex in exercises:
-            ex['sentence'] = f"{ex['trigger']}\n\n{ex['scenario']}"
-            ex['translation'] = f"Time limit: {ex['time_limit']} seconds"
-        
-        self.exercises = exercises
-        self.total_exercises = len(exercises)
-        self.current_exercise = 0
-        self.progress_bar.setMaximum(self.total_exercises)
-        
-        # Start timer for first exercise
-        self.start_time = time.time()
-        self.updateExercise()
-        
-        # Show speed tips
+        # Show speed tips before the round, so reading them is not timed
         QMessageBox.information(self, "Speed Mode Tips",
             "⚡ SPEED MODE - Build Conversational Fluency\n\n"
             "• You have 3 seconds per verb\n"
@@ -880,6 +969,12 @@ class SpanishConjugationGUI(QMainWindow):
             "• This trains automatic recall\n"
             "• In real conversation, slow = awkward\n\n"
             "Ready? Go!")
+        
+        # Generate speed round with user settings; each answer is timed from
+        # when its exercise is painted
+        verbs = [v.strip() for v in selected_verbs.split(',')] if selected_verbs else None
+        self.session.start_speed(exercise_count, time_limit, verbs)
+        self.showExerciseSet()
     
     def startCustomPractice(self) -> None:
         """Let user create completely custom practice session."""
@@ -919,68 +1014,11 @@ class SpanishConjugationGUI(QMainWindow):
     
     def processCustomExercises(self, dialog):
         """Process user's custom exercises."""
-        import re
-        
-        text = self.custom_text.toPlainText()
-        lines = [line.strip() for line in text.split('\n') if line.strip() and not line.startswith('#')]
-        
-        exercises = []
-        person_map = {
-            'yo': 0, 'tú': 1, 'él': 2, 'ella': 2, 'usted': 2,
-            'nosotros': 3, 'vosotros': 4, 'ellos': 5, 'ellas': 5, 'ustedes': 5
-        }
-        
-        tense_map = {
-            'present': 'present', 'presente': 'present',
-            'preterite': 'preterite', 'pretérito': 'preterite',
-            'imperfect': 'imperfect', 'imperfecto': 'imperfect',
-            'future': 'future', 'futuro': 'future',
-            'conditional': 'conditional', 'condicional': 'conditional',
-            'subjunctive': 'present_subjunctive', 'subjuntivo': 'present_subjunctive'
-        }
-        
-        for line in lines:
-            # Parse format: sentence _____ (verb, tense, person)
-            match = re.search(r'(.*?)_+\s*\((.*?)\)', line)
-            if match:
-                sentence_part = match.group(1)
-                params = match.group(2).split(',')
-                
-                if len(params) >= 3:
-                    verb = params[0].strip()
-                    tense = tense_map.get(params[1].strip().lower(), 'present')
-                    person_str = params[2].strip().lower()
-                    person = person_map.get(person_str, 0)
-                    
-                    answer = self.conjugator.conjugate(verb, tense, person)
-                    if answer:
-                        # Generate choices
-                        choices = [answer]
-                        for p in range(6):
-                            if p != person:
-                                form = self.conjugator.conjugate(verb, tense, p)
-                                if form and form not in choices:
-                                    choices.append(form)
-                                    if len(choices) >= 4:
-                                        break
-                        
-                        exercises.append({
-                            'sentence': line.replace(match.group(0), sentence_part + "_____"),
-                            'answer': answer,
-                            'choices': choices[:4],
-                            'verb': verb,
-                            'tense': tense,
-                            'person': person,
-                            'translation': f"Custom: {verb} ({tense}, {person_str})",
-                            'context': 'User-created exercise'
-                        })
+        exercises = parse_custom_exercises(self.custom_text.toPlainText(), self.conjugator)
         
         if exercises:
-            self.exercises = exercises
-            self.total_exercises = len(exercises)
-            self.current_exercise = 0
-            self.progress_bar.setMaximum(self.total_exercises)
-            self.updateExercise()
+            self.session.load(exercises, 'custom')
+            self.showExerciseSet()
             self.updateStatus(f"Created {len(exercises)} custom exercises!")
             dialog.accept()
         else:
@@ -988,62 +1026,20 @@ class SpanishConjugationGUI(QMainWindow):
                                "Could not parse any valid exercises. Check format.")
     
     def showCheatSheet(self) -> None:
-        """Show quick conjugation reference for current verb or common verbs."""
-        # Create a simple reference table
-        from PyQt5.QtWidgets import QDialog, QVBoxLayout, QTableWidget, QTableWidgetItem, QDialogButtonBox
-        
-        dialog = QDialog(self)
-        dialog.setWindowTitle("Quick Verb Reference")
-        dialog.setGeometry(200, 200, 600, 400)
-        
-        layout = QVBoxLayout()
-        table = QTableWidget()
-        
-        # Show current verb if in exercise, otherwise show ser/estar/tener
+        """Show the conjugation reference for the whole lexicon, searched for the current verb."""
+        from lexicon_browser import Lexicon, LexiconBrowser, exercise_verbs
+
+        # Show current verb if in exercise, otherwise show ser
         if self.exercises and 0 <= self.current_exercise < len(self.exercises):
             verb = self.exercises[self.current_exercise].get('verb', 'ser')
         else:
             verb = 'ser'  # Default to most important verb
-        
-        # Get all conjugations
-        table.setRowCount(6)
-        table.setColumnCount(4)
-        table.setHorizontalHeaderLabels(['Person', 'Present', 'Preterite', 'Imperfect'])
-        
-        persons = ['yo', 'tú', 'él/ella', 'nosotros', 'vosotros', 'ellos']
-        for i, person in enumerate(persons):
-            table.setItem(i, 0, QTableWidgetItem(person))
-            
-            # Present
-            form = self.conjugator.conjugate(verb, 'present', i)
-            table.setItem(i, 1, QTableWidgetItem(form or '-'))
-            
-            # Preterite
-            form = self.conjugator.conjugate(verb, 'preterite', i)
-            table.setItem(i, 2, QTableWidgetItem(form or '-'))
-            
-            # Imperfect
-            form = self.conjugator.conjugate(verb, 'imperfect', i)
-            table.setItem(i, 3, QTableWidgetItem(form or '-'))
-        
-        table.resizeColumnsToContents()
-        layout.addWidget(QLabel(f"Conjugation for: {verb}"))
-        layout.addWidget(table)
-        
-        # Add quick tips
-        tips = QLabel(
-            "💡 Quick Tips:\n"
-            "• Regular -AR: o, as, a, amos, áis, an\n"
-            "• Regular -ER: o, es, e, emos, éis, en\n"
-            "• Regular -IR: o, es, e, imos, ís, en"
-        )
-        layout.addWidget(tips)
-        
-        buttons = QDialogButtonBox(QDialogButtonBox.Ok)
-        buttons.accepted.connect(dialog.accept)
-        layout.addWidget(buttons)
-        
-        dialog.setLayout(layout)
+
+        # Conjugated once; rebuilt only when exercises bring in an unknown verb
+        if self.lexicon is None or verb not in self.lexicon:
+            self.lexicon = Lexicon.build(self.conjugator, exercise_verbs(self.exercises))
+
+        dialog = LexiconBrowser(self.lexicon, verb, self)
         dialog.exec_()
     
     def exportProgress(self) -> None:
@@ -1058,8 +1054,9 @@ class SpanishConjugationGUI(QMainWindow):
             'statistics': self.progress_tracker.get_statistics(),
             'weak_areas': self.progress_tracker.get_weak_areas(10),
             'speed_practice': {
-                'response_times': self.speed_practice.response_times,
-                'weak_spots': self.speed_practice.get_weak_spots()
+                'verb_stats': self.speed_practice.get_verb_stats(),
+                'weak_spots': self.speed_practice.get_weak_spots(),
+                'readiness': self.speed_practice.get_readiness()
             },
             'current_exercises': self.exercises,
             'settings': {
@@ -1078,7 +1075,8 @@ class SpanishConjugationGUI(QMainWindow):
         
         if filename:
             try:
-                with open(filename, 'w', encoding='utf-8') as f:
+                # Timed apart from the file dialog, which is the user's time
+                with watchdog.timed("exportProgress.write"), open(filename, 'w', encoding='utf-8') as f:
                     json.dump(export_data, f, indent=2, ensure_ascii=False)
                 self.updateStatus(f"Progress exported to {filename}")
                 QMessageBox.information(self, "Export Successful", 
@@ -1105,6 +1103,42 @@ class SpanishConjugationGUI(QMainWindow):
         
         QMessageBox.information(self, "Learning Statistics", message)
     
+    def showDiagnostics(self) -> None:
+        """
+        Show event-loop latency, recent stalls with stacks, handler timing
+        and the runtime metrics.
+        """
+        from PyQt5.QtWidgets import QDialog, QDialogButtonBox
+        from PyQt5.QtGui import QFontDatabase
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle("🩺 Diagnostics")
+        dialog.setGeometry(200, 200, 800, 500)
+        layout = QVBoxLayout()
+
+        report = QTextEdit()
+        report.setReadOnly(True)
+        report.setLineWrapMode(QTextEdit.NoWrap)
+        report.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        report.setPlainText(self.diagnosticsReport())
+        layout.addWidget(report)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Close)
+        refresh_btn = buttons.addButton("Refresh", QDialogButtonBox.ActionRole)
+        refresh_btn.clicked.connect(lambda: report.setPlainText(self.diagnosticsReport()))
+        buttons.rejected.connect(dialog.reject)
+        layout.addWidget(buttons)
+
+        dialog.setLayout(layout)
+        dialog.exec_()
+
+    def diagnosticsReport(self) -> str:
+        """Watchdog report followed by the metrics table and, when profiling, the hot frames."""
+        report = f"{watchdog.format_report()}\n\nMetrics\n{registry.format_report()}"
+        if profiler.running:
+            report += f"\n\nProfile ({profiler.samples} samples)\n{profiler.format_summary()}"
+        return report
+
     def toggleTranslation(self) -> None:
         """
         Toggle the visibility of the English translation label.
@@ -1163,6 +1197,7 @@ class SpanishConjugationGUI(QMainWindow):
         """
         self.status_bar.showMessage(message, 5000)
 
+    @watchdog.instrument()
     def updateExercise(self) -> None:
         """
         Display the current exercise data in the UI.
@@ -1170,6 +1205,7 @@ class SpanishConjugationGUI(QMainWindow):
         if self.total_exercises == 0 or not (0 <= self.current_exercise < self.total_exercises):
             return
 
+        self.response_timer.arm()
         exercise = self.exercises[self.current_exercise]
         # Combine context and sentence if context is provided
         context_text = exercise.get("context", "")
@@ -1188,6 +1224,8 @@ class SpanishConjugationGUI(QMainWindow):
             self.translation_label.setText("")
 
         self.feedback_text.clear()
+        self.explain_button.setEnabled(False)
+        self.last_explanation_request = None
         self.progress_bar.setValue(self.current_exercise + 1)
         self.updateStatus(f"Exercise {self.current_exercise + 1} of {self.total_exercises}")
 
@@ -1204,22 +1242,9 @@ class SpanishConjugationGUI(QMainWindow):
 
     def populateMultipleChoice(self, choices: List[str]) -> None:
         """
-        Populate multiple choice options in the dedicated layout.
+        Show multiple choice options, reusing the pooled radio buttons.
         """
-        while self.mc_options_layout.count():
-            child = self.mc_options_layout.takeAt(0)
-            if child.widget():
-                child.widget().deleteLater()
-
-        self.mc_button_group = QButtonGroup()
-        for choice in choices:
-            radio = QRadioButton(choice)
-            self.mc_button_group.addButton(radio)
-            self.mc_options_layout.addWidget(radio)
-
-        # Optionally select the first radio button
-        if self.mc_button_group.buttons():
-            self.mc_button_group.buttons()[0].setChecked(True)
+        self.choice_pool.setChoices(choices)
 
     def switchMode(self) -> None:
         """
@@ -1252,15 +1277,14 @@ class SpanishConjugationGUI(QMainWindow):
         if mode == "Free Response":
             return self.free_response_input.text().strip()
         else:
-            for button in self.mc_button_group.buttons():
-                if button.isChecked():
-                    return button.text().strip()
-        return ""
+            return self.choice_pool.selectedText().strip()
 
+    @watchdog.instrument()
     def submitAnswer(self) -> None:
         """
         Validate the user's answer and request a GPT explanation.
         """
+        submitted_at = self.session.clock()
         if self.total_exercises == 0:
             self.updateStatus("No exercise available. Please generate new exercises.")
             return
@@ -1271,56 +1295,47 @@ class SpanishConjugationGUI(QMainWindow):
             self.updateStatus("Please enter an answer before submitting.")
             return
 
-        correct_answer = exercise["answer"].strip()
-        strictness = app_config.get("answer_strictness", "normal")
-        is_correct, base_feedback = check_answer(user_answer, correct_answer, strictness)
-
-        # Record attempt in stats
-        self.stats.record_attempt(exercise, user_answer, is_correct)
-        
-        # Record in progress tracker if we have verb info
-        if 'verb' in exercise and 'tense' in exercise and 'person' in exercise:
-            # Map person label to index
-            person_index = 0
-            for i, label in enumerate(PERSON_LABELS):
-                if label == exercise.get('person', ''):
-                    person_index = i
-                    break
-            
-            self.progress_tracker.record_attempt(
-                exercise['verb'],
-                exercise['tense'],
-                person_index,
-                user_answer,
-                correct_answer,
-                is_correct
-            )
+        # Local explanations are built by the session; GPT ones on demand below
+        result = self.session.submit(
+            user_answer,
+            strictness=app_config.get("answer_strictness", "normal"),
+            explain=app_config.get("local_explanations", True),
+            timing=self.response_timer.timing(submitted_at)
+        )
+        correct_answer = result["correct_answer"]
+        is_correct = result["correct"]
+        base_feedback = result["feedback"]
+
+        self.session_summary.record(exercise, user_answer, is_correct)
+        self.journal.append(
+            "answer",
+            exercise=self.current_exercise,
+            sentence=exercise.get("sentence", ""),
+            translation=exercise.get("translation", ""),
+            user_answer=user_answer,
+            correct_answer=correct_answer,
+            correct=is_correct,
+            verb=exercise.get("verb"),
+            tense=exercise.get("tense"),
+            response_time=result.get("response_time"),
+            reaction_time=result.get("reaction_time")
+        )
 
-        # Check if this is speed mode
-        if self.speed_mode and self.start_time:
-            response_time = time.time() - self.start_time
-            speed_result = self.speed_practice.evaluate_speed_response(
-                exercise['verb'], 
-                exercise.get('person', 0),
-                user_answer,
-                response_time
-            )
-            
-            feedback = speed_result['feedback']
-            feedback += f"\n\nTime: {response_time:.1f}s - {speed_result['speed_rating']}"
-            if speed_result['improvement']:
-                feedback += f"\n{speed_result['improvement']:.1f}s faster than average!"
+        if result["kind"] == "speed":
+            feedback = result['speed_feedback']
+            feedback += f"\n\nTime: {result['response_time']:.1f}s - {result['speed_rating']}"
+            if result['reaction_time'] is not None:
+                feedback += f"\nFirst keystroke after {result['reaction_time']:.2f}s"
+            if result['improvement']:
+                feedback += f"\n{result['improvement']:.1f}s faster than average!"
             
             self.feedback_text.setText(feedback)
-            self.updateStatus(speed_result['speed_rating'])
-            
-            # Reset timer for next exercise
-            self.start_time = time.time()
+            self.updateStatus(result['speed_rating'])
             
         # Check if this is a task-based exercise
-        elif 'task_data' in exercise:
+        elif result["kind"] == "task":
             # Evaluate communicative success
-            task_result = self.task_scenarios.evaluate_response(user_answer, exercise['task_data'])
+            task_result = result['task']
             
             # Enhanced feedback for task mode
             feedback = task_result['feedback']
@@ -1331,15 +1346,33 @@ class SpanishConjugationGUI(QMainWindow):
             
             self.feedback_text.setText(feedback)
             self.updateStatus("Task evaluated - focus on communication!")
-        elif self.offline_mode:
-            # Provide simple feedback in offline mode
-            self.feedback_text.setText(base_feedback)
-            self.updateStatus("Answer submitted.")
         else:
-            self.generateGPTExplanationAsync(
-                user_answer, correct_answer, is_correct,
-                exercise.get("sentence", ""), base_feedback
-            )
+            local_explanation = result["explanation"]
+            if local_explanation:
+                # Instant engine explanation; GPT stays available on demand
+                self.handleExplanationResult(local_explanation, base_feedback, user_answer)
+                self.last_explanation_request = (
+                    user_answer, correct_answer, is_correct,
+                    exercise.get("sentence", ""), base_feedback
+                )
+                self.explain_button.setEnabled(not self.offline_mode)
+            elif self.offline_mode:
+                # Provide simple feedback in offline mode
+                self.feedback_text.setText(base_feedback)
+                self.updateStatus("Answer submitted.")
+            else:
+                self.generateGPTExplanationAsync(
+                    user_answer, correct_answer, is_correct,
+                    exercise.get("sentence", ""), base_feedback
+                )
+
+    def requestGPTExplanation(self) -> None:
+        """Ask GPT for a detailed explanation of the last submitted answer."""
+        if not self.last_explanation_request or self.offline_mode:
+            return
+        self.explain_button.setEnabled(False)
+        self.updateStatus("Requesting GPT explanation...")
+        self.generateGPTExplanationAsync(*self.last_explanation_request, replace=True)
 
     def generateGPTExplanationAsync(
         self,
@@ -1347,52 +1380,97 @@ class SpanishConjugationGUI(QMainWindow):
         correct_answer: str,
         is_correct: bool,
         sentence: str,
-        base_feedback: str
+        base_feedback: str,
+        replace: bool = False
     ) -> None:
         """
         Trigger an asynchronous GPT call to provide a grammar-focused explanation.
+
+        With ``batch_explanations`` enabled the answer is queued on the shared
+        batcher and explained together with other recent answers; the local
+        verdict is shown immediately and the explanation follows. ``replace``
+        is set for on-demand requests, whose answer already has a response.
         """
-        prompt = (
-            "You are an expert Spanish tutor specializing in LATAM Spanish. "
-            f"Sentence: \"{sentence}\"\n"
-            f"Correct Answer: \"{correct_answer}\"\n"
-            f"Learner's Answer: \"{user_answer}\"\n"
-            f"Is the learner's answer correct? {'Yes' if is_correct else 'No'}\n\n"
-            "Provide a concise explanation in LATAM Spanish that focuses strictly on the grammatical structure. "
-            "Do not include extra praise or filler. "
-        )
-        worker = GPTWorkerRunnable(
+        exercise_index = self.current_exercise
+        exercise = self.exercises[exercise_index]
+
+        def on_result(result: str) -> None:
+            self.handleExplanationResult(result, base_feedback, user_answer,
+                                         exercise_index, exercise, replace)
+
+        if app_config.get("batch_explanations", False):
+            self.feedback_text.setText(base_feedback + "\n\n(Explanation pending...)")
+            request = BatchedExplanationRequest(sentence, correct_answer, user_answer, is_correct)
+            request.signals.result.connect(on_result)
+            request.start()
+            return
+
+        prompt = build_explanation_prompt(sentence, correct_answer, user_answer, is_correct)
+        request = GPTRequest(
             prompt,
             model=app_config.get("api_model", "gpt-4o"),
             max_tokens=app_config.get("max_tokens", 600),
             temperature=app_config.get("temperature", 0.5)
         )
-        worker.signals.result.connect(lambda result: self.handleExplanationResult(result, base_feedback, user_answer))
-        self.threadpool.start(worker)
+        request.signals.result.connect(on_result)
+        request.start()
 
-    def handleExplanationResult(self, result: str, base_feedback: str, user_answer: str) -> None:
+    def handleExplanationResult(
+        self,
+        result: str,
+        base_feedback: str,
+        user_answer: str,
+        exercise_index: Optional[int] = None,
+        exercise: Optional[Dict[str, Any]] = None,
+        replace: bool = False
+    ) -> None:
         """
         Combine the GPT explanation with base feedback and display it.
-        Also append to self.responses with memory management.
+        Also append to self.responses with memory management; with
+        ``replace`` the answer's existing response gets the new explanation
+        instead (the journal replays it onto the same answer too).
+
+        The explanation is attached to the exercise it was requested for; it
+        is only shown if that exercise is still on screen, since batched
+        explanations can arrive after the learner has moved on.
         """
+        if exercise is None:
+            exercise_index = self.current_exercise
+            exercise = self.exercises[exercise_index]
+
         full_feedback = base_feedback + "\n\n" + result
-        self.feedback_text.setText(full_feedback)
+        is_visible = (0 <= self.current_exercise < len(self.exercises)
+                      and self.exercises[self.current_exercise] is exercise)
+        if is_visible:
+            self.feedback_text.setText(full_feedback)
 
         entry = {
-            "exercise": self.current_exercise,
-            "sentence": self.exercises[self.current_exercise].get("sentence", ""),
-            "translation": self.exercises[self.current_exercise].get("translation", ""),
+            "exercise": exercise_index,
+            "sentence": exercise.get("sentence", ""),
+            "translation": exercise.get("translation", ""),
             "user_answer": user_answer,
             "correct": full_feedback.startswith("Correct"),
             "explanation": result
         }
-        self.responses.append(entry)
+        previous = None
+        if replace:
+            previous = next((response for response in reversed(self.responses)
+                             if response["exercise"] == exercise_index
+                             and response["user_answer"] == user_answer), None)
+        if previous is not None:
+            previous.update(entry)
+        else:
+            self.responses.append(entry)
+        self.journal.append("explanation", exercise=exercise_index, explanation=result)
 
         # (7) Trim stored responses if exceeding max
         if len(self.responses) > self.max_stored_responses:
             self.responses = self.responses[-self.max_stored_responses:]
 
-        self.updateStatus("Answer submitted.")
+        if is_visible:
+            self.updateStatus("Answer submitted.")
+        else:
+            self.updateStatus(f"Explanation ready for exercise {exercise_index + 1}.")
         self.updateSessionStats()
 
     def provideHint(self) -> None:
@@ -1404,23 +1482,27 @@ class SpanishConjugationGUI(QMainWindow):
             return
 
         exercise = self.exercises[self.current_exercise]
-        prompt = (
-            f"You are an expert Spanish tutor specializing in LATAM Spanish. "
-            f"Given the following realistic scenario where a verb is missing:\n"
-            f"Sentence: \"{exercise.get('sentence', '')}\"\n"
-            f"Correct Conjugation: \"{exercise['answer']}\"\n\n"
-            "Please provide a subtle, context-based hint in LATAM Spanish "
-            "that gently guides the learner toward the correct verb form, "
-            "without revealing the answer directly."
-        )
-        worker = GPTWorkerRunnable(
+        prompt = build_hint_prompt(exercise.get('sentence', ''), exercise['answer'])
+        self.cancelHint()
+        self.hint_token = CancellationToken()
+        request = GPTRequest(
             prompt,
             model=app_config.get("api_model", "gpt-4o"),
             max_tokens=100,
-            temperature=app_config.get("temperature", 0.5)
+            temperature=app_config.get("temperature", 0.5),
+            token=self.hint_token,
+            deadline=HINT_DEADLINE
         )
-        worker.signals.result.connect(self.handleHintResult)
-        self.threadpool.start(worker)
+        request.signals.result.connect(self.handleHintResult)
+        request.start()
+
+    def cancelHint(self) -> None:
+        """
+        Drop a pending hint; it would be for an exercise no longer on screen.
+        """
+        if self.hint_token is not None:
+            self.hint_token.cancel()
+            self.hint_token = None
 
     def handleHintResult(self, result: str) -> None:
         """
@@ -1429,6 +1511,7 @@ class SpanishConjugationGUI(QMainWindow):
         self.feedback_text.setText("Hint: " + result)
         self.updateStatus("Hint provided.")
 
+    @watchdog.instrument()
     def nextExercise(self) -> None:
         """
         Move to the next exercise if available.
@@ -1437,13 +1520,14 @@ class SpanishConjugationGUI(QMainWindow):
             self.updateStatus("No exercise available. Please generate new exercises.")
             return
 
-        if self.current_exercise < self.total_exercises - 1:
-            self.current_exercise += 1
+        if self.session.next():
+            self.cancelHint()
             self.updateExercise()
         else:
             self.updateStatus("You have completed all exercises!")
         self.updateSessionStats()
 
+    @watchdog.instrument()
     def prevExercise(self) -> None:
         """
         Move to the previous exercise if available.
@@ -1452,8 +1536,8 @@ class SpanishConjugationGUI(QMainWindow):
             self.updateStatus("No exercise available. Please generate new exercises.")
             return
 
-        if self.current_exercise > 0:
-            self.current_exercise -= 1
+        if self.session.prev():
+            self.cancelHint()
             self.updateExercise()
         self.updateSessionStats()
 
@@ -1461,14 +1545,15 @@ class SpanishConjugationGUI(QMainWindow):
         """
         Reset the current exercise index, correct count, and responses.
         """
-        self.current_exercise = 0
-        self.stats.total_correct = 0
-        self.stats.total_attempted = 0
+        self.session.reset()
         self.responses.clear()
+        self.session_summary.reset()
+        self.journal.append("reset")
         self.updateExercise()
         self.updateStatus("Progress has been reset.")
         self.updateSessionStats()
 
+    @watchdog.instrument()
     def generateNewExercise(self) -> None:
         """
         Generate new exercises either locally or from GPT API based on mode.
@@ -1483,43 +1568,18 @@ class SpanishConjugationGUI(QMainWindow):
             # Generate exercises locally
             self.updateStatus("Generating exercises locally...")
             
-            # Map GUI tense names to internal tense names
-            tense_map = {
-                'Present': 'present',
-                'Preterite': 'preterite',
-                'Imperfect': 'imperfect',
-                'Future': 'future',
-                'Conditional': 'conditional',
-                'Subjunctive': 'present_subjunctive'
-            }
-            
-            # Map person labels to indices
-            person_map = {
-                '1st person singular': 0,
-                '2nd person singular': 1,
-                '3rd person singular': 2,
-                '1st person plural': 3,
-                '2nd person plural': 4,
-                '3rd person plural': 5
-            }
-            
-            tenses = [tense_map[t] for t in selected_tenses if t in tense_map] or None
-            persons = [person_map[p] for p in selected_persons if p in person_map] or None
+            tenses = [TENSE_OPTIONS[t] for t in selected_tenses if t in TENSE_OPTIONS]
+            persons = [PERSON_OPTIONS[p] for p in selected_persons if p in PERSON_OPTIONS]
             verbs = [v.strip() for v in specific_verbs.split(',')] if specific_verbs else None
             
-            exercises = self.exercise_generator.generate_batch(
+            exercises = self.session.generate(
                 count=count,
                 verbs=verbs,
                 tenses=tenses,
                 persons=persons,
                 difficulty=difficulty
             )
-            
-            self.exercises = exercises
-            self.total_exercises = len(exercises)
-            self.progress_bar.setMaximum(self.total_exercises)
-            self.current_exercise = 0
-            self.updateExercise()
+            self.showExerciseSet()
             self.updateStatus(f"Generated {len(exercises)} exercises locally!")
             return
         
@@ -1528,42 +1588,105 @@ class SpanishConjugationGUI(QMainWindow):
         person_text = ", ".join(selected_persons) if selected_persons else "any form"
         theme_context = self.theme_input.text().strip()
 
-        prompt = (
-            f"Generate {count} unique Spanish exercises at {difficulty} level that reflect authentic, everyday "
-            f"interactions in LATAM contexts. Each exercise should include:\n\n"
-            "1. \"context\": Two or three sentences of natural text.\n"
-            "2. \"sentence\": A passage with a blank for a missing verb.\n"
-            "3. \"answer\": The correct verb form.\n"
-            "4. \"choices\": An array of four options (including the correct one).\n"
-            "5. \"translation\": English translation with the blank.\n\n"
-            "Context Instructions:\n"
-            f"- Use ONLY these verb tenses/aspects: {tense_text}.\n"
-            f"- Use ONLY these grammatical persons: {person_text}.\n"
-        )
-        if specific_verbs:
-            prompt += f"- Use only these verbs for the blank: {specific_verbs}.\n"
-        if theme_context:
-            prompt += f"- Theme/Context: {theme_context}.\n"
-
-        prompt += (
-            "\nEnsure the examples reflect natural LATAM Spanish. Return a strictly valid JSON array "
-            "of objects with no extra formatting."
+        prompt = build_exercise_prompt(
+            count, difficulty, tense_text, person_text, specific_verbs, theme_context
         )
 
-        worker = GPTWorkerRunnable(
+        if app_config.get("stream_exercises", True):
+            self.startExerciseStream(prompt)
+            return
+
+        request = GPTRequest(
             prompt,
             model=app_config.get("api_model", "gpt-4o"),
             max_tokens=app_config.get("max_tokens", 600),
             temperature=app_config.get("temperature", 0.5)
         )
-        worker.signals.result.connect(self.handleNewExerciseResult)
-        self.threadpool.start(worker)
+        request.signals.result.connect(self.handleNewExerciseResult)
+        request.start()
+
+    def startExerciseStream(self, prompt: str) -> None:
+        """
+        Stream exercise generation, showing the first exercise on arrival.
+
+        Every call starts a new generation and cancels the older stream;
+        exercises it already delivered to the event queue are ignored.
+        """
+        self.stream_generation += 1
+        generation = self.stream_generation
+        self.stream_accepted = 0
+        if self.stream_token is not None:
+            self.stream_token.cancel()
+        self.stream_token = CancellationToken()
+
+        request = StreamingExerciseRequest(
+            prompt,
+            model=app_config.get("api_model", "gpt-4o"),
+            max_tokens=app_config.get("max_tokens", 600),
+            temperature=app_config.get("temperature", 0.5),
+            token=self.stream_token
+        )
+        request.signals.exercise.connect(
+            lambda exercise: self.handleStreamedExercise(exercise, generation))
+        request.signals.finished.connect(
+            lambda count: self.handleExerciseStreamFinished(count, generation))
+        request.signals.error.connect(
+            lambda message: self.handleExerciseStreamError(message, generation))
+        request.start()
+        self.updateStatus("Generating exercises...")
+
+    @watchdog.instrument()
+    def handleStreamedExercise(self, exercise: Dict[str, Any], generation: int) -> None:
+        """
+        Add one streamed exercise, replacing the old set on the first arrival.
+        """
+        if generation != self.stream_generation:
+            return
+        sentence_text = exercise.get("sentence", exercise.get("exercise"))
+        if not self.dedup_index.add(sentence_text):
+            logging.info("Duplicate exercise detected: %s", sentence_text)
+            return
+
+        if self.stream_accepted == 0:
+            self.session.load([exercise])
+            self.showExerciseSet()
+        else:
+            self.session.append(exercise)
+            self.progress_bar.setMaximum(self.total_exercises)
+            self.updateSessionStats()
+        self.stream_accepted += 1
+        self.updateStatus(f"Received {self.stream_accepted} exercise(s)...")
+
+    def handleExerciseStreamFinished(self, count: int, generation: int) -> None:
+        """
+        Finish a streamed generation, regenerating if nothing new arrived.
+        """
+        if generation != self.stream_generation:
+            return
+        if self.stream_accepted == 0:
+            logging.info("No new unique exercises generated (%d parsed), trying again.", count)
+            self.updateStatus("No new exercises received. Regenerating...")
+            self.generateNewExercise()
+            return
+        self.updateStatus("New exercises generated!")
 
+    def handleExerciseStreamError(self, message: str, generation: int) -> None:
+        """
+        Report a failed stream, keeping any exercises that already arrived.
+        """
+        if generation != self.stream_generation:
+            return
+        if self.stream_accepted:
+            self.updateStatus(f"Generation interrupted; kept {self.stream_accepted} exercise(s).")
+        else:
+            self.updateStatus(message)
+
+    @watchdog.instrument()
     def handleNewExerciseResult(self, result: str) -> None:
         """
         Process the exercise generation result from the GPT API.
         """
-        logging.info("Raw GPT response for new exercise:\n%s", result)
+        logging.debug("Raw GPT response for new exercise:\n%s", result)
         exercises_batch = parse_gpt_json(result)
 
         if not exercises_batch:
@@ -1572,39 +1695,22 @@ class SpanishConjugationGUI(QMainWindow):
             self.generateNewExercise()
             return
 
-        # Filter out duplicates based on sentence text
+        # Filter out duplicates based on sentence text; new ones are indexed
         new_exercises = []
-        exercise_log_file = "exercise_log.txt"
-        logged_sentences: List[str] = []
-        if os.path.exists(exercise_log_file):
-            with open(exercise_log_file, "r", encoding="utf-8") as f:
-                logged_sentences = [line.strip() for line in f if line.strip()]
-
         for ex in exercises_batch:
-            # Must have required keys
-            if ("sentence" in ex or "exercise" in ex) and \
-               "answer" in ex and "choices" in ex and "translation" in ex:
-                sentence_text = ex.get("sentence", ex.get("exercise"))
-                if sentence_text not in logged_sentences:
-                    new_exercises.append(ex)
-                else:
-                    logging.info("Duplicate exercise detected: %s", sentence_text)
+            sentence_text = ex.get("sentence", ex.get("exercise"))
+            if self.dedup_index.add(sentence_text):
+                new_exercises.append(ex)
+            else:
+                logging.info("Duplicate exercise detected: %s", sentence_text)
 
         if not new_exercises:
             logging.info("No new unique exercises generated, trying again.")
             self.generateNewExercise()
             return
 
-        self.exercises = new_exercises
-        with open(exercise_log_file, "a", encoding="utf-8") as f:
-            for ex in new_exercises:
-                sentence_text = ex.get("sentence", ex.get("exercise"))
-                f.write(sentence_text + "\n")
-
-        self.total_exercises = len(self.exercises)
-        self.progress_bar.setMaximum(self.total_exercises)
-        self.current_exercise = 0
-        self.updateExercise()
+        self.session.load(new_exercises)
+        self.showExerciseSet()
         self.updateStatus("New exercises generated!")
         logging.info("New exercises generated: %s", ", ".join(
             [ex.get("sentence", ex.get("exercise", "")) for ex in new_exercises]
@@ -1613,22 +1719,14 @@ class SpanishConjugationGUI(QMainWindow):
     def generateSessionSummary(self) -> None:
         """
         Summarize the user's performance using GPT.
+
+        The prompt is built from the rolling session digest rather than every
+        stored response, so its size is capped regardless of session length.
         """
-        session_data = "\n".join(
-            f"Exercise {entry['exercise']+1}: Sentence: {entry['sentence']} | "
-            f"Your answer: {entry['user_answer']} | Correct: {entry['correct']} | "
-            f"Explanation: {entry['explanation']}"
-            for entry in self.responses
-        )
-        prompt = (
-            "You are an expert Spanish tutor reviewing a student's practice session:\n"
-            f"{session_data}\n\n"
-            "Provide a concise summary highlighting correct/incorrect items. "
-            "Use clear, encouraging language, but be concise."
-        )
-        worker = GPTWorkerRunnable(prompt, max_tokens=200)
-        worker.signals.result.connect(self.handleSummaryResult)
-        self.threadpool.start(worker)
+        prompt = self.session_summary.build_prompt()
+        request = GPTRequest(prompt, max_tokens=200, priority=Priority.VISIBLE)
+        request.signals.result.connect(self.handleSummaryResult)
+        request.start()
 
     def handleSummaryResult(self, result: str) -> None:
         """
@@ -1644,9 +1742,9 @@ class SpanishConjugationGUI(QMainWindow):
         """
         Handle application close event with proper cleanup.
         """
-        # Wait for all threads to complete (with a timeout).
-        if not self.threadpool.waitForDone(3000):
-            logging.warning("Some background threads did not complete in time.")
+        # Close pooled API connections and stop the LLM event loop.
+        if llm_client is not None:
+            llm_client.close(timeout=3.0)
         
         # Update session in database
         if hasattr(self, 'progress_tracker'):
@@ -1658,24 +1756,16 @@ class SpanishConjugationGUI(QMainWindow):
                 verbs_practiced
             )
             self.progress_tracker.close()
+        self.dedup_index.close()
 
-        # Save session log
-        try:
-            with open("session_log.txt", "a", encoding="utf-8") as log_file:
-                log_file.write("=== Session Log ===\n")
-                for entry in self.responses:
-                    log_file.write(
-                        f"Exercise {entry['exercise']+1}:\n"
-                        f"  Sentence: {entry['sentence']}\n"
-                        f"  Translation: {entry.get('translation', '')}\n"
-                        f"  Your answer: {entry['user_answer']}\n"
-                        f"  Correct: {entry['correct']}\n"
-                        f"  Explanation: {entry['explanation']}\n\n"
-                    )
-                log_file.write("=== End Session ===\n\n")
-            logging.info("Session log written successfully.")
-        except Exception as e:
-            logging.error("Error writing session log file: %s", e)
+        # Answers were journaled as they happened; only the end marker is left
+        self.journal.close()
+        # Write any debounced settings changes
+        app_config.store.flush()
+        watchdog.stop()
+        profiler.finish()
+        if self.metrics_exporter is not None:
+            self.metrics_exporter.stop()
 
         event.accept()
 
@@ -1685,7 +1775,25 @@ class SpanishConjugationGUI(QMainWindow):
 # (10) UNIT TESTS can be in a separate file `test_spanish_app.py`
 # -------------------------------------------------------
 if __name__ == '__main__':
-    app = QApplication(sys.argv)
-    window = SpanishConjugationGUI()
-    window.show()
+    if PROFILE_FLAG in sys.argv:
+        sys.argv.remove(PROFILE_FLAG)
+        tracer.start_profile()
+    with tracer.span("qapplication"):
+        app = QApplication(sys.argv)
+    with tracer.span("main_window"):
+        window = SpanishConjugationGUI()
+    with tracer.span("show"):
+        window.show()
+    if app_config.get("ui_watchdog", True):
+        watchdog.threshold = app_config.get("ui_stall_threshold_ms", 250) / 1000
+        watchdog.start()
+    # SAMPLING_PROFILE=1 (or =<output path>) profiles a single run without touching the settings
+    profile_output = env_output() or (
+        app_config.get("profile_output", PROFILE_OUTPUT) if app_config.get("sampling_profiler", False) else None)
+    if profile_output:
+        profiler.interval = app_config.get("profile_interval_ms", 5) / 1000
+        profiler.output = profile_output
+        profiler.start()
+    # Runs once the event loop has started, i.e. after the first paint
+    QTimer.singleShot(0, lambda: tracer.finish(STARTUP_TRACE_FILE, STARTUP_PROFILE_FILE))
     sys.exit(app.exec_())
@@ -22,7 +22,7 @@ import json
 import logging
 import random
 import time
-from typing import List, Dict, Union, Optional, Any, Tuple, Callable
+from typing import List, Dict, Union, Optional, Any, Tuple, Callable, TYPE_CHECKING
 
 # Add src directory to path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
@@ -31,7 +31,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 # PyQt5 imports
-from PyQt5.QtCore import Qt, QRunnable, QObject, pyqtSignal, QThreadPool, QTimer
+from PyQt5.QtCore import Qt, QObject, pyqtSignal, QTimer
 from PyQt5.QtWidgets import (
     QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QSplitter,
     QLabel, QLineEdit, QPushButton, QProgressBar, QTextEdit, QComboBox,
@@ -40,11 +40,7 @@ from PyQt5.QtWidgets import (
 )
 from PyQt5.QtGui import QFont, QPixmap, QIcon
 
-# Import professional components
-from dialogs.setup_wizard import SetupWizard
-from dialogs.settings_dialog import SettingsDialog
-from dialogs.about_dialog import AboutDialog
-from dialogs.error_dialog import ErrorDialog, APIErrorHandler
+# Import professional components (dialogs are imported where they are opened)
 from gui.system_tray import SystemTrayManager, TrayNotificationManager
 from gui.professional_styling import ProfessionalStyling, professional_styling
 from utils.first_run_manager import FirstRunManager
@@ -53,43 +49,83 @@ from utils.first_run_manager import FirstRunManager
 from exercise_generator import ExerciseGenerator
 from progress_tracker import ProgressTracker
 from conjugation_engine import PERSON_LABELS, TENSE_NAMES, SpanishConjugator
+from local_explainer import LocalExplainer
+from exercise_stream_parser import parse_exercises
 from task_scenarios import TaskScenario
 from speed_practice import SpeedPractice
 from learning_path import LearningPath
+from prompts import build_quick_exercise_prompt
+from startup_tracer import PROFILE_FLAG, tracer
+from log_pipeline import apply_logger_levels, configure_logging
+from metrics import MetricsExporter, registry
+from task_scheduler import Priority
+from sampling_profiler import DEFAULT_OUTPUT as PROFILE_OUTPUT, env_output, profiler
+from ui_watchdog import watchdog
 
-# OpenAI imports
-import openai
-from openai import OpenAI
+if TYPE_CHECKING:
+    from llm_client import AsyncLLMClient
 
 # Configuration Management
 class EnhancedAppConfig:
-    """Enhanced configuration manager with first-run detection"""
+    """Enhanced configuration manager with first-run detection
+    
+    A thin view over the user config store shared with FirstRunManager:
+    reads are served from memory and set/update are written behind.
+    """
     
     def __init__(self):
         self.first_run_manager = FirstRunManager()
-        self.config = self.first_run_manager.load_configuration()
-        
-        # Set OpenAI API key if available
-        api_key = self.config.get("api_key") or os.getenv("OPENAI_API_KEY", "")
-        if api_key:
-            openai.api_key = api_key
-            self.openai_client = OpenAI(api_key=api_key)
-        else:
-            self.openai_client = None
+        self.store = self.first_run_manager.store
+        self._base = self.first_run_manager.base_configuration()
+        if self.first_run_manager.is_setup_completed():
+            self.first_run_manager.record_run()
+        
+        # OpenAI API key if available; the client is built on first use
+        self.api_key = self.config.get("api_key") or os.getenv("OPENAI_API_KEY", "")
+        self._llm_client: Optional["AsyncLLMClient"] = None
+    
+    @property
+    def llm_client(self) -> Optional["AsyncLLMClient"]:
+        """Shared asyncio LLM client, created on first access (None without a key)"""
+        if self._llm_client is None and self.api_key:
+            from llm_client import AsyncLLMClient
+            self._llm_client = AsyncLLMClient(
+                api_key=self.api_key,
+                base_url=os.getenv("OPENAI_BASE_URL") or None,
+                connect_timeout=self.config.get("api_connect_timeout", 5.0),
+                read_timeout=self.config.get("api_read_timeout", 60.0),
+                max_concurrency=self.config.get("api_max_concurrency", 4)
+            )
+        return self._llm_client
+    
+    def set_api_key(self, api_key: str):
+        """Switch API key; the client is rebuilt on next use"""
+        self.close_llm_client()
+        self.api_key = api_key
+    
+    def close_llm_client(self, timeout: float = 3.0):
+        """Close the LLM client if one was ever created"""
+        if self._llm_client is not None:
+            self._llm_client.close(timeout=timeout)
+            self._llm_client = None
     
     def is_first_run(self) -> bool:
         return self.first_run_manager.is_first_run()
     
+    @property
+    def config(self) -> Dict[str, Any]:
+        """Merged configuration: defaults, project config, then user settings"""
+        return {**self._base, **self.store.data}
+    
     def get(self, key: str, default=None):
-        return self.config.get(key, default)
+        data = self.store.data
+        return data[key] if key in data else self._base.get(key, default)
     
     def set(self, key: str, value: Any):
-        self.config[key] = value
-        self.save_config()
+        self.store.set(key, value)
     
     def update(self, new_config: Dict[str, Any]):
-        self.config.update(new_config)
-        self.save_config()
+        self.store.update(new_config)
     
     def save_config(self):
         return self.first_run_manager.save_configuration(self.config)
@@ -100,75 +136,59 @@ class EnhancedAppConfig:
 # Enhanced logging setup
 def setup_enhanced_logging() -> logging.Logger:
     """Configure enhanced logging with professional formatting"""
-    logger = logging.getLogger()
-    logger.setLevel(logging.INFO)
-    
-    # Clear existing handlers
-    for handler in logger.handlers[:]:
-        logger.removeHandler(handler)
-    
     # Enhanced formatter
     formatter = logging.Formatter(
         "%(asctime)s - %(name)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s"
     )
     
-    # Console handler
-    console_handler = logging.StreamHandler()
-    console_handler.setLevel(logging.INFO)
-    console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
-    
-    # File handler
-    os.makedirs("logs", exist_ok=True)
-    file_handler = logging.FileHandler("logs/app.log", mode="a", encoding="utf-8")
-    file_handler.setLevel(logging.INFO)
-    file_handler.setFormatter(formatter)
-    logger.addHandler(file_handler)
-    
-    return logger
+    # Queue-based: console and rotating logs/app.log are written off the UI thread
+    return configure_logging("logs/app.log", formatter, level=logging.INFO)
 
 logger = setup_enhanced_logging()
 
-# Enhanced Worker Thread with Error Handling
-class EnhancedGPTWorker(QRunnable):
-    """Enhanced GPT worker with professional error handling"""
+ERRORS = registry.counter("app_errors_total", "Errors shown to the user or uncaught, by source")
+
+# Enhanced GPT request with Error Handling
+class EnhancedGPTRequest:
+    """Enhanced GPT request admitted by the shared LLM client's priority scheduler"""
     
-    def __init__(self, prompt: str, config: EnhancedAppConfig):
-        super().__init__()
+    def __init__(self, prompt: str, config: EnhancedAppConfig,
+                 priority: Priority = Priority.INTERACTIVE):
         self.prompt = prompt
         self.config = config
+        self.priority = priority
         self.signals = WorkerSignals()
     
-    def run(self):
+    def start(self):
+        """Submit the request; the result arrives via signals.result"""
+        if not self.config.llm_client:
+            self._emit_error(Exception("OpenAI client not initialized. Please check your API key."))
+            return
+        
+        self.config.llm_client.submit(
+            self.prompt,
+            callback=self._on_done,
+            priority=self.priority,
+            model=self.config.get("api_model", "gpt-4o"),
+            max_tokens=self.config.get("max_tokens", 600),
+            temperature=self.config.get("temperature", 0.5),
+        )
+    
+    def _on_done(self, future):
+        if future.cancelled():
+            return
         try:
-            if not self.config.openai_client:
-                raise Exception("OpenAI client not initialized. Please check your API key.")
-            
-            response = self.config.openai_client.chat.completions.create(
-                model=self.config.get("api_model", "gpt-4o"),
-                messages=[
-                    {
-                        "role": "system",
-                        "content": (
-                            "You are an expert Spanish tutor specializing in LATAM Spanish. "
-                            "Your guidance should always reflect real-life conversational tone, "
-                            "using authentic expressions and culturally relevant details."
-                        )
-                    },
-                    {"role": "user", "content": self.prompt}
-                ],
-                max_tokens=self.config.get("max_tokens", 600),
-                temperature=self.config.get("temperature", 0.5),
-            )
-            output = response.choices[0].message.content.strip()
+            output = future.result()
             logger.info("GPT response received successfully")
-            
         except Exception as e:
-            logger.error(f"GPT API error: {str(e)}")
-            # Let the error dialog handle the user-friendly message
-            output = f"API_ERROR: {str(e)}"
-        
+            self._emit_error(e)
+            return
         self.signals.result.emit(output)
+    
+    def _emit_error(self, error: Exception):
+        logger.error(f"GPT API error: {str(error)}")
+        # Let the error dialog handle the user-friendly message
+        self.signals.result.emit(f"API_ERROR: {str(error)}")
 
 class WorkerSignals(QObject):
     """Signals for worker threads"""
@@ -182,7 +202,9 @@ class ProfessionalSpanishApp(QMainWindow):
         super().__init__()
         
         # Initialize configuration
-        self.config = EnhancedAppConfig()
+        with tracer.span("config"):
+            self.config = EnhancedAppConfig()
+        apply_logger_levels(self.config.get("log_levels", {}))
         
         # Initialize core components
         self.responses: List[Dict[str, Any]] = []
@@ -191,14 +213,18 @@ class ProfessionalSpanishApp(QMainWindow):
         self.total_exercises: int = 0
         
         # Initialize learning components
-        self.progress_tracker = ProgressTracker()
-        self.exercise_generator = ExerciseGenerator()
-        self.task_scenarios = TaskScenario()
-        self.speed_practice = SpeedPractice()
-        self.learning_path = LearningPath()
-        self.conjugator = SpanishConjugator()
-        self.session_id = self.progress_tracker.start_session()
-        self.threadpool = QThreadPool()
+        with tracer.span("progress_tracker"):
+            self.progress_tracker = ProgressTracker()
+        with tracer.span("engines"):
+            self.exercise_generator = ExerciseGenerator()
+            self.task_scenarios = TaskScenario()
+            self.speed_practice = SpeedPractice(self.progress_tracker)
+            self.learning_path = LearningPath()
+            self.conjugator = SpanishConjugator()
+            self.local_explainer = LocalExplainer(self.conjugator)
+            self.lexicon = None  # Built when the verb reference is first opened
+        with tracer.span("start_session"):
+            self.session_id = self.progress_tracker.start_session()
         
         # UI state
         self.start_time = None
@@ -208,6 +234,7 @@ class ProfessionalSpanishApp(QMainWindow):
         # Professional features
         self.system_tray = None
         self.notification_manager = None
+        self.metrics_exporter: Optional[MetricsExporter] = None
         
         # Check for first run
         if self.config.is_first_run():
@@ -220,6 +247,7 @@ class ProfessionalSpanishApp(QMainWindow):
         logger.info("First run detected, showing setup wizard")
         
         # Show setup wizard
+        from dialogs.setup_wizard import SetupWizard
         wizard = SetupWizard()
         wizard.configuration_complete.connect(self.on_setup_complete)
         
@@ -243,8 +271,7 @@ class ProfessionalSpanishApp(QMainWindow):
         # Initialize OpenAI client if API key was provided
         if setup_config.get("api_key"):
             try:
-                openai.api_key = setup_config["api_key"]
-                self.config.openai_client = OpenAI(api_key=setup_config["api_key"])
+                self.config.set_api_key(setup_config["api_key"])
                 logger.info("OpenAI client initialized")
             except Exception as e:
                 logger.error(f"Failed to initialize OpenAI client: {e}")
@@ -258,7 +285,8 @@ class ProfessionalSpanishApp(QMainWindow):
         self.setWindowIcon(self.load_app_icon())
         
         # Apply professional styling
-        self.apply_professional_styling()
+        with tracer.span("styling"):
+            self.apply_professional_styling()
         
         # Set window geometry
         geometry = self.config.get("window_geometry", {})
@@ -270,10 +298,27 @@ class ProfessionalSpanishApp(QMainWindow):
         )
         
         # Initialize UI
-        self.initUI()
+        with tracer.span("init_ui"):
+            self.initUI()
         
         # Initialize system tray
-        self.initialize_system_tray()
+        with tracer.span("system_tray"):
+            self.initialize_system_tray()
+        
+        # Periodic metrics file for watching performance in the field
+        interval = self.config.get("metrics_export_interval", 60)
+        if interval and interval > 0:
+            self.metrics_exporter = MetricsExporter(
+                registry, self.config.get("metrics_export_path", "logs/metrics.prom"), interval)
+            self.metrics_exporter.start()
+        
+        # Opt-in stack sampling of background work (SAMPLING_PROFILE=1 for one run)
+        profile_output = env_output() or (
+            self.config.get("profile_output", PROFILE_OUTPUT) if self.config.get("sampling_profiler", False) else None)
+        if profile_output:
+            profiler.interval = self.config.get("profile_interval_ms", 5) / 1000
+            profiler.output = profile_output
+            profiler.start()
         
         # Show welcome message for new users
         if self.config.get("run_count", 0) < 3:
@@ -398,6 +443,10 @@ class ProfessionalSpanishApp(QMainWindow):
         reference_action.triggered.connect(self.showCheatSheet)
         tools_menu.addAction(reference_action)
         
+        diagnostics_action = QAction('&Diagnostics', self)
+        diagnostics_action.triggered.connect(self.show_diagnostics)
+        tools_menu.addAction(diagnostics_action)
+        
         tools_menu.addSeparator()
         
         settings_action = QAction('&Settings', self)
@@ -552,11 +601,20 @@ class ProfessionalSpanishApp(QMainWindow):
     
     def setup_error_handling(self):
         """Setup enhanced error handling"""
-        # This would connect to various error sources in the original app
-        pass
+        # Count and log uncaught exceptions (e.g. raised in slots), then defer
+        # to the previous hook
+        previous_hook = sys.excepthook
+        
+        def count_uncaught(exc_type, exc_value, exc_traceback):
+            ERRORS.inc(source="uncaught")
+            logger.error("Uncaught exception", exc_info=(exc_type, exc_value, exc_traceback))
+            previous_hook(exc_type, exc_value, exc_traceback)
+        
+        sys.excepthook = count_uncaught
     
     def show_settings(self):
         """Show settings dialog"""
+        from dialogs.settings_dialog import SettingsDialog
         success, new_config = SettingsDialog.openSettings(self.config.config, self)
         if success:
             # Update configuration
@@ -573,8 +631,14 @@ class ProfessionalSpanishApp(QMainWindow):
             self.updateStatus("Settings updated successfully")
             logger.info("Settings updated by user")
     
+    def show_diagnostics(self):
+        """Show runtime metrics (GPT latency, DB writes, generation, errors)"""
+        from dialogs.diagnostics_dialog import DiagnosticsDialog
+        DiagnosticsDialog.showDiagnostics(registry, self.metrics_exporter, self)
+    
     def show_about(self):
         """Show about dialog"""
+        from dialogs.about_dialog import AboutDialog
         AboutDialog.showAbout(self)
     
     def toggleTheme(self):
@@ -600,8 +664,10 @@ class ProfessionalSpanishApp(QMainWindow):
     def handle_api_error(self, error_message: str):
         """Handle API errors with professional error dialog"""
         logger.error(f"API Error: {error_message}")
+        ERRORS.inc(source="api")
         
         # Show professional error dialog
+        from dialogs.error_dialog import ErrorDialog
         ErrorDialog.show_api_error(error_message, error_message, self)
         
         # Optionally switch to offline mode
@@ -615,6 +681,7 @@ class ProfessionalSpanishApp(QMainWindow):
                 self.config.set("offline_mode", True)
                 self.updateStatus("Switched to offline mode due to API error")
     
+    @watchdog.instrument()
     def generateNewExercise(self):
         """Generate new exercises with enhanced error handling"""
         if self.config.get("offline_mode", False):
@@ -637,6 +704,8 @@ class ProfessionalSpanishApp(QMainWindow):
             
         except Exception as e:
             logger.error(f"Offline exercise generation error: {e}")
+            ERRORS.inc(source="generation")
+            from dialogs.error_dialog import ErrorDialog
             ErrorDialog.show_generic_error(
                 "Exercise Generation Error",
                 "Could not generate exercises locally. Please try again.",
@@ -645,7 +714,7 @@ class ProfessionalSpanishApp(QMainWindow):
     
     def generate_online_exercises(self):
         """Generate exercises using AI"""
-        if not self.config.openai_client:
+        if not self.config.llm_client:
             self.handle_api_error("OpenAI client not initialized. Please configure your API key.")
             return
         
@@ -653,18 +722,18 @@ class ProfessionalSpanishApp(QMainWindow):
             count = self.quick_count_spin.value()
             tense = self.quick_tense_combo.currentText()
             
-            prompt = f"""Generate {count} Spanish conjugation exercises for {tense} tense.
-            Return as JSON array with format: [{{"sentence": "...", "answer": "...", "choices": [...], "translation": "..."}}]"""
+            prompt = build_quick_exercise_prompt(count, tense)
             
-            worker = EnhancedGPTWorker(prompt, self.config)
-            worker.signals.result.connect(self.handleExerciseResult)
-            self.threadpool.start(worker)
+            request = EnhancedGPTRequest(prompt, self.config)
+            request.signals.result.connect(self.handleExerciseResult)
+            request.start()
             
             self.updateStatus("Generating AI-powered exercises...")
             
         except Exception as e:
             self.handle_api_error(str(e))
     
+    @watchdog.instrument()
     def handleExerciseResult(self, result: str):
         """Handle exercise generation result"""
         if result.startswith("API_ERROR:"):
@@ -673,9 +742,8 @@ class ProfessionalSpanishApp(QMainWindow):
             return
         
         try:
-            import json
-            exercises = json.loads(result.strip())
-            if not isinstance(exercises, list):
+            exercises = parse_exercises(result, required_keys=("answer", "choices"))
+            if not exercises:
                 raise ValueError("Invalid response format")
             
             self.exercises = exercises
@@ -687,6 +755,8 @@ class ProfessionalSpanishApp(QMainWindow):
             
         except Exception as e:
             logger.error(f"Exercise parsing error: {e}")
+            ERRORS.inc(source="parsing")
+            from dialogs.error_dialog import ErrorDialog
             ErrorDialog.show_generic_error(
                 "Response Parsing Error",
                 "Could not parse the AI response. Switching to offline mode.",
@@ -695,6 +765,7 @@ class ProfessionalSpanishApp(QMainWindow):
             self.config.set("offline_mode", True)
             self.generate_offline_exercises()
     
+    @watchdog.instrument()
     def updateExercise(self):
         """Update exercise display"""
         if not self.exercises or self.current_exercise >= len(self.exercises):
@@ -721,6 +792,7 @@ class ProfessionalSpanishApp(QMainWindow):
         else:
             self.stats_label.setText("Ready to practice!")
     
+    @watchdog.instrument()
     def submitAnswer(self):
         """Submit user answer"""
         if not self.exercises:
@@ -743,6 +815,12 @@ class ProfessionalSpanishApp(QMainWindow):
             self.feedback_text.setStyleSheet("color: #27ae60;")
         else:
             feedback = f"❌ Incorrect. The correct answer is: {correct_answer}"
+            explanation = self.local_explainer.explain(
+                exercise.get("sentence", ""), correct_answer, user_answer, False,
+                verb=exercise.get("verb"), tense=exercise.get("tense"), person=exercise.get("person")
+            )
+            if explanation:
+                feedback += f"\n\n{explanation}"
             self.feedback_text.setStyleSheet("color: #e74c3c;")
         
         self.feedback_text.setText(feedback)
@@ -752,6 +830,7 @@ class ProfessionalSpanishApp(QMainWindow):
         if is_correct:
             QTimer.singleShot(1500, self.nextExercise)
     
+    @watchdog.instrument()
     def nextExercise(self):
         """Move to next exercise"""
         if self.current_exercise < self.total_exercises - 1:
@@ -789,13 +868,23 @@ class ProfessionalSpanishApp(QMainWindow):
         """Update status bar message"""
         self.status_bar.showMessage(message, 5000)
     
+    def showCheatSheet(self):
+        """Show the conjugation reference for the whole lexicon, searched for the current verb."""
+        from lexicon_browser import Lexicon, LexiconBrowser, exercise_verbs
+        if self.exercises and 0 <= self.current_exercise < len(self.exercises):
+            verb = self.exercises[self.current_exercise].get('verb', 'ser')
+        else:
+            verb = 'ser'
+        if self.lexicon is None or verb not in self.lexicon:
+            self.lexicon = Lexicon.build(self.conjugator, exercise_verbs(self.exercises))
+        LexiconBrowser(self.lexicon, verb, self).exec_()
+    
     # Placeholder methods for features not fully implemented
     def generateSessionSummary(self): pass
     def startSpeedMode(self): self.updateStatus("Speed Mode - Feature coming soon!")
     def startTaskMode(self): self.updateStatus("Task Mode - Feature coming soon!")
     def startStoryMode(self): self.updateStatus("Story Mode - Feature coming soon!")
     def showStatistics(self): self.updateStatus("Statistics - Feature coming soon!")
-    def showCheatSheet(self): self.updateStatus("Verb Reference - Feature coming soon!")
     def exportProgress(self): self.updateStatus("Export Progress - Feature coming soon!")
     
     def closeEvent(self, event):
@@ -825,9 +914,18 @@ class ProfessionalSpanishApp(QMainWindow):
         if self.system_tray:
             self.system_tray.cleanup()
         
-        # Wait for threads
-        if not self.threadpool.waitForDone(3000):
-            logger.warning("Some threads did not complete in time")
+        # Close pooled API connections and stop the LLM event loop
+        self.config.close_llm_client(timeout=3.0)
+        
+        # Write any debounced settings changes
+        self.config.store.flush()
+        
+        # Write the collected profile, if profiling
+        profiler.finish()
+        
+        # Final metrics snapshot
+        if self.metrics_exporter:
+            self.metrics_exporter.stop()
         
         event.accept()
 
@@ -843,29 +941,36 @@ def show_splash_screen(app):
         # Process events to show splash
         app.processEvents()
         
-        # Simulate loading time
-        import time
-        time.sleep(1)
-        
-        splash.close()
+        # Stays up until the main window is shown (see main())
         return splash
     
     return None
 
 def main():
     """Main entry point for professional Spanish conjugation app"""
-    app = QApplication(sys.argv)
-    app.setApplicationName("Spanish Conjugation Trainer")
-    app.setApplicationVersion("2.0.0")
-    app.setOrganizationName("Professional Language Tools")
+    # --profile-startup: also capture a cProfile of the startup path
+    if PROFILE_FLAG in sys.argv:
+        sys.argv.remove(PROFILE_FLAG)
+        tracer.start_profile()
+    
+    with tracer.span("qapplication"):
+        app = QApplication(sys.argv)
+        app.setApplicationName("Spanish Conjugation Trainer")
+        app.setApplicationVersion("2.0.0")
+        app.setOrganizationName("Professional Language Tools")
     
     # Show splash screen
-    splash = show_splash_screen(app)
+    with tracer.span("splash"):
+        splash = show_splash_screen(app)
     
     try:
         # Create and show main window
-        window = ProfessionalSpanishApp()
-        window.show()
+        with tracer.span("main_window"):
+            window = ProfessionalSpanishApp()
+        with tracer.span("show"):
+            window.show()
+            if splash:
+                splash.finish(window)
         
         # Bring window to front
         window.raise_()
@@ -873,6 +978,9 @@ def main():
         
         logger.info("Professional Spanish Conjugation Trainer started successfully")
         
+        # Write the startup trace once the event loop has started (after first paint)
+        QTimer.singleShot(0, lambda: tracer.finish("logs/startup_trace.json", "logs/startup.prof"))
+        
         # Run application
         sys.exit(app.exec_())
         
@@ -0,0 +1,360 @@
+"""
+Runtime Metrics
+A small in-process metrics registry (counters, gauges and fixed-bucket
+histograms, optionally labelled) that instrumented code updates from any
+thread, rendered as Prometheus text or JSON and written periodically to a
+file by a background exporter
+"""
+
+import json
+import logging
+import math
+import os
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Seconds; covers a fast SQLite commit through a slow GPT call
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5,
+                   1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+DEFAULT_EXPORT_INTERVAL = 60.0  # seconds between metric file writes
+
+LabelKey = Tuple[Tuple[str, str], ...]
+
+
+def _label_key(labels: Dict[str, Any]) -> LabelKey:
+    return tuple(sorted((name, str(value)) for name, value in labels.items()))
+
+
+def _format_labels(key: LabelKey) -> str:
+    if not key:
+        return ""
+    escaped = ((name, value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'))
+               for name, value in key)
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+def _format_duration(seconds: Optional[float]) -> str:
+    if seconds is None:
+        return "-"
+    if math.isinf(seconds):
+        return "+Inf"
+    return f"{seconds * 1000:.1f} ms" if seconds < 1 else f"{seconds:.2f} s"
+
+
+class Metric:
+    """A named metric with one value (or bucket set) per label combination."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str = "") -> None:
+        self.name = name
+        self.help = help
+        self._lock = threading.Lock()
+        self._values: Dict[LabelKey, Any] = {}
+
+    def samples(self) -> List[Tuple[str, LabelKey, float]]:
+        """``(sample name, labels, value)`` for every label combination."""
+        with self._lock:
+            return [(self.name, key, value) for key, value in sorted(self._values.items())]
+
+    def value(self, **labels: Any) -> float:
+        """Current value for ``labels`` (0 if never set)."""
+        with self._lock:
+            return self._values.get(_label_key(labels), 0.0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            values = [{"labels": dict(key), "value": value} for key, value in sorted(self._values.items())]
+        return {"type": self.kind, "help": self.help, "values": values}
+
+
+class Counter(Metric):
+    """A value that only goes up: requests, cache hits, errors."""
+
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        if amount < 0:
+            raise ValueError("Counters can only increase")
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(Metric):
+    """A value that goes up and down: requests in flight, queue depth, cache size."""
+
+    kind = "gauge"
+
+    def set(self, value: float, **labels: Any) -> None:
+        with self._lock:
+            self._values[_label_key(labels)] = float(value)
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+
+class HistogramValue:
+    """Per-bucket counts (non-cumulative), sample count and sum."""
+
+    __slots__ = ('counts', 'count', 'total')
+
+    def __init__(self, buckets: int) -> None:
+        self.counts = [0] * (buckets + 1)  # the last one is +Inf
+        self.count = 0
+        self.total = 0.0
+
+
+class Histogram(Metric):
+    """Distribution over fixed upper bounds, e.g. latencies in seconds."""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str = "", buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, help)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = _label_key(labels)
+        index = bisect_left(self.buckets, value)  # first bound >= value, or +Inf
+        with self._lock:
+            hist = self._values.get(key)
+            if hist is None:
+                hist = self._values[key] = HistogramValue(len(self.buckets))
+            hist.counts[index] += 1
+            hist.count += 1
+            hist.total += value
+
+    @contextmanager
+    def time(self, **labels: Any) -> Iterator[None]:
+        """Observe the enclosed block's duration in seconds (also when it raises)."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def value(self, **labels: Any) -> float:
+        """Number of observations for ``labels``."""
+        with self._lock:
+            hist = self._values.get(_label_key(labels))
+            return hist.count if hist else 0
+
+    def mean(self, **labels: Any) -> Optional[float]:
+        with self._lock:
+            hist = self._values.get(_label_key(labels))
+            return hist.total / hist.count if hist and hist.count else None
+
+    def quantile(self, q: float, **labels: Any) -> Optional[float]:
+        """Upper bound of the bucket holding the ``q`` quantile (None if empty)."""
+        with self._lock:
+            hist = self._values.get(_label_key(labels))
+            if not hist or not hist.count:
+                return None
+            counts = list(hist.counts)
+            rank = q * hist.count
+        seen = 0
+        for bound, count in zip(self.buckets + (math.inf,), counts):
+            seen += count
+            if seen >= rank:
+                return bound
+        return math.inf
+
+    def samples(self) -> List[Tuple[str, LabelKey, float]]:
+        result = []
+        with self._lock:
+            for key, hist in sorted(self._values.items()):
+                cumulative = 0
+                for bound, count in zip(self.buckets + (math.inf,), hist.counts):
+                    cumulative += count
+                    result.append((f"{self.name}_bucket", key + (("le", _format_value(bound)),), cumulative))
+                result.append((f"{self.name}_sum", key, hist.total))
+                result.append((f"{self.name}_count", key, hist.count))
+        return result
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            values = [{"labels": dict(key), "count": hist.count, "sum": hist.total,
+                       "buckets": dict(zip([_format_value(b) for b in self.buckets] + ["+Inf"], hist.counts))}
+                      for key, hist in sorted(self._values.items())]
+        return {"type": self.kind, "help": self.help, "values": values}
+
+
+class MetricsRegistry:
+    """
+    Get-or-create store of named metrics.
+
+    Instrumented modules ask for their metrics by name at import time, so
+    every module sees the same objects. Collectors are callbacks run just
+    before a snapshot, for values that are cheaper to read on demand than
+    to update on every event (e.g. ``lru_cache`` statistics).
+    """
+
+    def __init__(self) -> None:
+        self._metrics: Dict[str, Metric] = {}
+        self._collectors: List[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    def _get(self, cls, name: str, help: str, **kwargs: Any) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric '{name}' is already registered as a {metric.kind}")
+            return metric
+
+    def counter(self, name: str, help: str = "") -> Counter:
+        return self._get(Counter, name, help)
+
+    def gauge(self, name: str, help: str = "") -> Gauge:
+        return self._get(Gauge, name, help)
+
+    def histogram(self, name: str, help: str = "",
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help, buckets=buckets)
+
+    def add_collector(self, collector: Callable[[], None]) -> None:
+        """Run ``collector`` before every snapshot (it usually sets gauges)."""
+        self._collectors.append(collector)
+
+    def get(self, name: str) -> Optional[Metric]:
+        return self._metrics.get(name)
+
+    def collect(self) -> List[Metric]:
+        """Run the collectors and return the metrics sorted by name."""
+        for collector in list(self._collectors):
+            try:
+                collector()
+            except Exception as e:
+                logging.warning("Metrics collector failed: %s", e)
+        with self._lock:
+            return [self._metrics[name] for name in sorted(self._metrics)]
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format (version 0.0.4)."""
+        lines = []
+        for metric in self.collect():
+            if metric.help:
+                lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            for sample, key, value in metric.samples():
+                lines.append(f"{sample}{_format_labels(key)} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-ready snapshot with a timestamp."""
+        return {"timestamp": time.time(),
+                "metrics": {metric.name: metric.to_dict() for metric in self.collect()}}
+
+    def write(self, path: str) -> None:
+        """
+        Write a snapshot to ``path`` atomically: JSON for ``.json`` files,
+        Prometheus text otherwise.
+        """
+        if path.endswith(".json"):
+            content = json.dumps(self.to_dict(), indent=2)
+        else:
+            content = self.to_prometheus()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            f.write(content)
+        os.replace(temp_path, path)
+
+    def summary(self) -> List[Tuple[str, str, str]]:
+        """
+        ``(metric, labels, value)`` display rows; histograms show their
+        count, mean and the bucket bound holding the 90th percentile.
+        """
+        rows = []
+        for metric in self.collect():
+            with metric._lock:
+                keys = sorted(metric._values)
+            for key in keys:
+                labels = ", ".join(f"{name}={value}" for name, value in key)
+                if isinstance(metric, Histogram):
+                    values = dict(key)
+                    count, mean, p90 = metric.value(**values), metric.mean(**values), metric.quantile(0.9, **values)
+                    value = f"n={count}, mean {_format_duration(mean)}, p90 <= {_format_duration(p90)}"
+                else:
+                    value = _format_value(metric.value(**dict(key)))
+                rows.append((metric.name, labels, value))
+        return rows
+
+    def format_report(self) -> str:
+        """The summary rows as an aligned text table."""
+        rows = self.summary()
+        if not rows:
+            return "No metrics recorded yet"
+        name_width = max(len(row[0]) for row in rows) + 2
+        label_width = max(len(row[1]) for row in rows) + 2
+        return "\n".join(f"{name:<{name_width}}{labels:<{label_width}}{value}" for name, labels, value in rows)
+
+    def reset(self) -> None:
+        """Forget every metric value (the metric objects stay registered)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        for metric in metrics:
+            with metric._lock:
+                metric._values.clear()
+
+
+class MetricsExporter:
+    """Background thread writing the registry to a file every ``interval`` seconds."""
+
+    def __init__(self, registry: "MetricsRegistry", path: str,
+                 interval: float = DEFAULT_EXPORT_INTERVAL) -> None:
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="metrics-exporter", daemon=True)
+            self._thread.start()
+
+    def export(self) -> bool:
+        """Write a snapshot now; returns False (and logs) on failure."""
+        try:
+            self.registry.write(self.path)
+            return True
+        except OSError as e:
+            logging.error("Could not write metrics to %s: %s", self.path, e)
+            return False
+
+    def stop(self, final_export: bool = True) -> None:
+        """Stop the thread, writing one last snapshot by default."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout=2.0)
+            self._thread = None
+        if final_export:
+            self.export()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.export()
+
+
+# Process-wide registry shared by all instrumented modules
+registry = MetricsRegistry()
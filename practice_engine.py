@@ -0,0 +1,528 @@
+"""
+Practice Engine
+UI-free practice session: exercise sets for every mode, navigation, answer
+checking, progress recording and speed timing, shared by the Qt window and
+the HTTP practice service
+"""
+
+import logging
+import random
+import re
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from answer_matcher import get_matcher, person_index
+from conjugation_engine import SpanishConjugator
+
+# GUI option labels -> engine tense names and person indices
+TENSE_OPTIONS = {
+    'Present': 'present',
+    'Preterite': 'preterite',
+    'Imperfect': 'imperfect',
+    'Future': 'future',
+    'Conditional': 'conditional',
+    'Subjunctive': 'present_subjunctive'
+}
+PERSON_OPTIONS = {
+    '1st person singular': 0,
+    '2nd person singular': 1,
+    '3rd person singular': 2,
+    '1st person plural': 3,
+    '2nd person plural': 4,
+    '3rd person plural': 5
+}
+
+# Keywords accepted in custom exercise lines
+CUSTOM_PERSONS = {
+    'yo': 0, 'tú': 1, 'él': 2, 'ella': 2, 'usted': 2,
+    'nosotros': 3, 'vosotros': 4, 'ellos': 5, 'ellas': 5, 'ustedes': 5
+}
+CUSTOM_TENSES = {
+    'present': 'present', 'presente': 'present',
+    'preterite': 'preterite', 'pretérito': 'preterite',
+    'imperfect': 'imperfect', 'imperfecto': 'imperfect',
+    'future': 'future', 'futuro': 'future',
+    'conditional': 'conditional', 'condicional': 'conditional',
+    'subjunctive': 'present_subjunctive', 'subjuntivo': 'present_subjunctive'
+}
+
+MODES = ('practice', 'review', 'task', 'story', 'speed', 'custom')
+
+
+# -------------------------------------------------------
+# ANSWER VALIDATION
+# -------------------------------------------------------
+def check_answer(user_answer: str,
+                 correct_answer: str,
+                 strictness: str = "normal") -> Tuple[bool, str]:
+    """
+    Check if the user's answer is correct using flexible matching.
+
+    Args:
+        user_answer: The answer provided by the user
+        correct_answer: The expected correct answer
+        strictness: Matching strictness level ("strict", "normal", or "lenient")
+
+    Returns:
+        (is_correct, feedback_message)
+    """
+    result = get_matcher().match(user_answer, correct_answer, strictness)
+    return result.correct, result.feedback
+
+
+# -------------------------------------------------------
+# PROGRESS TRACKING
+# -------------------------------------------------------
+class ResponseTiming(NamedTuple):
+    """
+    Monotonic timestamps of one answer, captured by the UI that showed it
+    (same clock as the session's ``clock``).
+    """
+    shown_at: float                         # Exercise painted on screen
+    submitted_at: float                     # Submit key or click received
+    first_input_at: Optional[float] = None  # First keystroke or choice press
+    render_time: Optional[float] = None     # Display request to paint, excluded
+
+    @property
+    def response_time(self) -> float:
+        return max(0.0, self.submitted_at - self.shown_at)
+
+    @property
+    def reaction_time(self) -> Optional[float]:
+        if self.first_input_at is None:
+            return None
+        return max(0.0, self.first_input_at - self.shown_at)
+
+
+class ProgressStats:
+    """
+    Track and manage user progress statistics.
+    This class can be expanded to track performance by tense, person, etc.
+    """
+    def __init__(self) -> None:
+        self.total_attempted = 0
+        self.total_correct = 0
+        self.history: List[Dict[str, Any]] = []
+
+    def record_attempt(self, exercise: Dict[str, Any], user_answer: str, is_correct: bool) -> None:
+        """Record an exercise attempt in the statistics."""
+        self.total_attempted += 1
+        if is_correct:
+            self.total_correct += 1
+
+        self.history.append({
+            "timestamp": datetime.now().isoformat(),
+            "exercise": exercise,
+            "user_answer": user_answer,
+            "correct_answer": exercise.get("answer", ""),
+            "is_correct": is_correct
+        })
+
+    def get_accuracy(self) -> float:
+        """Get overall accuracy percentage."""
+        if self.total_attempted == 0:
+            return 0.0
+        return (self.total_correct / self.total_attempted) * 100.0
+
+
+# -------------------------------------------------------
+# EXERCISE HELPERS
+# -------------------------------------------------------
+def conjugation_choices(conjugator: SpanishConjugator,
+                        verb: str,
+                        tense: str,
+                        person: int,
+                        limit: int = 4) -> List[str]:
+    """The correct form first, then other persons of the same tense as distractors."""
+    correct = conjugator.conjugate(verb, tense, person)
+    choices = [correct]
+    for other in range(6):
+        if other != person:
+            form = conjugator.conjugate(verb, tense, other)
+            if form and form not in choices:
+                choices.append(form)
+                if len(choices) >= limit:
+                    break
+    return choices[:limit]
+
+
+def parse_custom_exercises(text: str, conjugator: SpanishConjugator) -> List[Dict[str, Any]]:
+    """
+    Build exercises from lines like ``Yo _____ (hablar, present, yo)``.
+
+    Blank lines, ``#`` comments and lines the engine cannot conjugate are
+    skipped.
+    """
+    lines = [line.strip() for line in text.split('\n') if line.strip() and not line.startswith('#')]
+    exercises = []
+    for line in lines:
+        # Parse format: sentence _____ (verb, tense, person)
+        match = re.search(r'(.*?)_+\s*\((.*?)\)', line)
+        if not match:
+            continue
+        sentence_part = match.group(1)
+        params = match.group(2).split(',')
+        if len(params) < 3:
+            continue
+
+        verb = params[0].strip()
+        tense = CUSTOM_TENSES.get(params[1].strip().lower(), 'present')
+        person_str = params[2].strip().lower()
+        person = CUSTOM_PERSONS.get(person_str, 0)
+
+        answer = conjugator.conjugate(verb, tense, person)
+        if answer:
+            exercises.append({
+                'sentence': line.replace(match.group(0), sentence_part + "_____"),
+                'answer': answer,
+                'choices': conjugation_choices(conjugator, verb, tense, person),
+                'verb': verb,
+                'tense': tense,
+                'person': person,
+                'translation': f"Custom: {verb} ({tense}, {person_str})",
+                'context': 'User-created exercise'
+            })
+    return exercises
+
+
+# Exercise fields a client may see before answering
+PUBLIC_FIELDS = ('sentence', 'context', 'translation', 'verb', 'tense', 'person',
+                 'time_limit', 'goal', 'story_title')
+
+
+def _speed_prompt(exercise: Dict[str, Any]) -> Dict[str, Any]:
+    """Fill in the display fields of a SpeedPractice exercise."""
+    exercise['sentence'] = f"{exercise['trigger']}\n\n{exercise['scenario']}"
+    exercise['translation'] = f"Time limit: {exercise['time_limit']} seconds"
+    return exercise
+
+
+def public_exercise(exercise: Optional[Dict[str, Any]],
+                    rng: Optional[random.Random] = None) -> Optional[Dict[str, Any]]:
+    """The exercise without its answer, with the choices shuffled."""
+    if exercise is None:
+        return None
+    public = {key: exercise[key] for key in PUBLIC_FIELDS if key in exercise}
+    choices = [c for c in exercise.get('choices') or [] if c]
+    if choices:
+        public['choices'] = (rng or random).sample(choices, len(choices))
+    return public
+
+
+# -------------------------------------------------------
+# PRACTICE SESSION
+# -------------------------------------------------------
+class PracticeSession:
+    """
+    One learner's practice session, independent of any UI.
+
+    Holds the current exercise set and position, checks and records
+    answers, and times responses in speed mode. Engines are injected so the
+    window can share its own and a server can share stateless ones between
+    sessions; the speed practice engine keeps per-learner timings, so a
+    session creates its own unless one is given.
+
+    Attributes:
+        exercises (List[dict]): Current exercise set
+        current (int): Index of the exercise being practiced
+        mode (str): How the current set was built, one of MODES
+        stats (ProgressStats): Attempts and correct answers this session
+    """
+
+    def __init__(self,
+                 session_id: Any = None,
+                 progress_tracker: Any = None,
+                 exercise_generator: Any = None,
+                 task_scenarios: Any = None,
+                 speed_practice: Any = None,
+                 explainer: Any = None,
+                 strictness: str = "normal",
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.session_id = session_id
+        self.progress_tracker = progress_tracker
+        self.strictness = strictness
+        self.explainer = explainer
+        self.clock = clock
+        self._exercise_generator = exercise_generator
+        self._task_scenarios = task_scenarios
+        self._speed_practice = speed_practice
+
+        self.exercises: List[Dict[str, Any]] = []
+        self.current = 0
+        self.mode = 'practice'
+        self.stats = ProgressStats()
+        self.shown_at: Optional[float] = None  # When the current exercise was shown
+        self._furthest = 0  # Highest exercise index shown so far
+
+    # -------------------------------------------------------
+    # Engines (built on first use)
+    # -------------------------------------------------------
+    @property
+    def exercise_generator(self):
+        if self._exercise_generator is None:
+            from exercise_generator import ExerciseGenerator
+            self._exercise_generator = ExerciseGenerator()
+        return self._exercise_generator
+
+    @property
+    def task_scenarios(self):
+        if self._task_scenarios is None:
+            from task_scenarios import TaskScenario
+            self._task_scenarios = TaskScenario()
+        return self._task_scenarios
+
+    @property
+    def speed_practice(self):
+        if self._speed_practice is None:
+            from speed_practice import SpeedPractice
+            self._speed_practice = SpeedPractice(self.progress_tracker)
+        return self._speed_practice
+
+    # -------------------------------------------------------
+    # Exercise sets
+    # -------------------------------------------------------
+    @property
+    def total(self) -> int:
+        return len(self.exercises)
+
+    @property
+    def exercise(self) -> Optional[Dict[str, Any]]:
+        """The current exercise, or None when there is none."""
+        if 0 <= self.current < len(self.exercises):
+            return self.exercises[self.current]
+        return None
+
+    @property
+    def finished(self) -> bool:
+        """Whether the current exercise is the last one."""
+        return self.current >= len(self.exercises) - 1
+
+    def load(self, exercises: List[Dict[str, Any]], mode: str = 'practice') -> List[Dict[str, Any]]:
+        """Replace the exercise set and start at its first exercise."""
+        self.exercises = list(exercises)
+        self.current = 0
+        self._furthest = 0
+        self.mode = mode
+        self.shown_at = self.clock()
+        return self.exercises
+
+    def append(self, exercise: Dict[str, Any]) -> None:
+        """Add an exercise to the end of the set (e.g. while streaming)."""
+        self.exercises.append(exercise)
+
+    def generate(self,
+                 count: int = 5,
+                 tenses: Optional[List[str]] = None,
+                 persons: Optional[List[int]] = None,
+                 verbs: Optional[List[str]] = None,
+                 difficulty: str = 'intermediate') -> List[Dict[str, Any]]:
+        """Generate a set locally; tenses and persons use engine names and indices."""
+        exercises = self.exercise_generator.generate_batch(
+            count=count,
+            verbs=verbs or None,
+            tenses=tenses or None,
+            persons=persons or None,
+            difficulty=difficulty
+        )
+        return self.load(exercises, 'practice')
+
+    def start_review(self, limit: int = 10, count: int = 5) -> List[Dict[str, Any]]:
+        """Exercises for the verbs due for review (empty without a tracker or reviews)."""
+        if self.progress_tracker is None:
+            return []
+        review_items = self.progress_tracker.get_verbs_for_review(limit)
+        if not review_items:
+            return []
+        exercises = [
+            self.exercise_generator.generate_exercise(
+                verb=item['verb'], tense=item['tense'], person=item['person'])
+            for item in review_items[:count]
+        ]
+        return self.load(exercises, 'review')
+
+    def start_task(self, count: int = 5, scenario_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Exercises from one real-world scenario (random unless ``scenario_type``).
+
+        Tasks whose verb the engine cannot conjugate (e.g. reflexive verbs)
+        are skipped, since they could not be checked.
+        """
+        scenarios = self.task_scenarios
+        scenario_type = scenario_type or random.choice(scenarios.get_scenario_list())
+        exercises = []
+        for task in scenarios.get_task_sequence(scenario_type, count):
+            answer = scenarios.conjugator.conjugate(task['verb'], task['tense'], task['person'])
+            if not answer:
+                continue
+            exercises.append({
+                'sentence': f"{task['scenario_title']}\n{task['scenario_context']}\n\n{task['goal']}:\n{task['template']}",
+                'answer': answer,
+                'verb': task['verb'],
+                'tense': task['tense'],
+                'person': task['person'],
+                'choices': conjugation_choices(scenarios.conjugator, task['verb'], task['tense'], task['person']),
+                'translation': task['prompt'],
+                'context': task['scenario_context'],
+                'goal': task['goal'],
+                'task_data': task
+            })
+        return self.load(exercises, 'task')
+
+    def start_story(self, tense: str = 'preterite', count: int = 5) -> List[Dict[str, Any]]:
+        """A connected story in one tense."""
+        exercises = self.exercise_generator.generate_story_sequence(tense, count)
+        return self.load(exercises, 'story')
+
+    def start_speed(self,
+                    count: int = 5,
+                    time_limit: float = 3,
+                    verbs: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """A timed round of about ``count`` prompts; the timer starts now."""
+        if verbs:
+            self.speed_practice.essential_verbs = verbs
+        exercises = [_speed_prompt(ex)
+                     for ex in self.speed_practice.generate_speed_round(int(count * time_limit))]
+        return self.load(exercises, 'speed')
+
+    # -------------------------------------------------------
+    # Navigation
+    # -------------------------------------------------------
+    def next(self) -> bool:
+        """Advance to the next exercise; False if already at the last one."""
+        if self.current < len(self.exercises) - 1:
+            self.current += 1
+            self._furthest = max(self._furthest, self.current)
+            self._shown()
+            return True
+        return False
+
+    def prev(self) -> bool:
+        """Go back one exercise; False if already at the first one."""
+        if self.current > 0:
+            self.current -= 1
+            self._shown()
+            return True
+        return False
+
+    def _shown(self) -> None:
+        # Speed rounds run on without a pause, so there the next answer is
+        # timed from the previous submission instead
+        if self.mode != 'speed':
+            self.shown_at = self.clock()
+
+    def reset(self) -> None:
+        """Start the set over and clear the session's scores."""
+        self.current = 0
+        self.stats.total_correct = 0
+        self.stats.total_attempted = 0
+
+    # -------------------------------------------------------
+    # Answers
+    # -------------------------------------------------------
+    def submit(self,
+               user_answer: str,
+               strictness: Optional[str] = None,
+               explain: bool = True,
+               timing: Optional[ResponseTiming] = None) -> Dict[str, Any]:
+        """
+        Check and record an answer to the current exercise.
+
+        Every attempt is timed, from ``timing`` when the UI measured it,
+        otherwise by the session clock since the exercise was shown (in
+        speed mode, since the previous answer). Only speed answers are
+        rated and feed the speed profile.
+
+        Returns:
+            ``exercise`` (index), ``user_answer``, ``correct_answer``,
+            ``correct``, ``feedback``, ``match`` (the answer_matcher kind,
+            e.g. "accent" or "wrong_person") and ``kind``: "speed" adds
+            ``response_time``, ``reaction_time``, ``render_time``,
+            ``speed_rating``, ``improvement`` and ``speed_feedback``; "task" adds ``task`` (the scenario
+            evaluation); "standard" adds ``explanation`` from the local
+            explainer (None when unavailable or ``explain`` is False).
+
+        Raises:
+            ValueError: If there is no current exercise or the answer is empty.
+        """
+        exercise = self.exercise
+        if exercise is None:
+            raise ValueError("No exercise available")
+        user_answer = (user_answer or "").strip()
+        if not user_answer:
+            raise ValueError("Empty answer")
+
+        correct_answer = (exercise.get("answer") or "").strip()
+        match = get_matcher().match(user_answer, correct_answer, strictness or self.strictness,
+                                    verb=exercise.get('verb'), tense=exercise.get('tense'),
+                                    person=exercise.get('person'))
+        is_correct, feedback = match.correct, match.feedback
+        response_time = reaction_time = render_time = speed = None
+        if timing is not None:
+            response_time = timing.response_time
+            reaction_time, render_time = timing.reaction_time, timing.render_time
+        elif self.shown_at is not None:
+            response_time = self.clock() - self.shown_at
+        if self.mode == 'speed' and 'verb' in exercise and response_time is not None:
+            # Evaluated before the attempt is stored, so the verb's saved
+            # history that SpeedPractice loads does not include it yet
+            speed = self.speed_practice.evaluate_speed_response(
+                exercise['verb'], person_index(exercise.get('person')) or 0, user_answer, response_time)
+        self.stats.record_attempt(exercise, user_answer, is_correct)
+        if self.progress_tracker is not None and all(k in exercise for k in ('verb', 'tense', 'person')):
+            self.progress_tracker.record_attempt(
+                exercise['verb'], exercise['tense'], person_index(exercise['person']) or 0,
+                user_answer, correct_answer, is_correct, response_time, reaction_time, render_time,
+                self.mode == 'speed'
+            )
+
+        result: Dict[str, Any] = {
+            "exercise": self.current,
+            "user_answer": user_answer,
+            "correct_answer": correct_answer,
+            "correct": is_correct,
+            "feedback": feedback,
+            "match": match.kind,
+        }
+        if speed is not None:
+            result.update(kind="speed", response_time=response_time,
+                          reaction_time=reaction_time, render_time=render_time,
+                          speed_rating=speed['speed_rating'], improvement=speed['improvement'],
+                          speed_feedback=speed['feedback'])
+            # Re-plan the upcoming prompt now that this answer has updated
+            # the scheduler, never with the item just answered; prompts
+            # already seen are kept
+            if self._furthest <= self.current < len(self.exercises) - 1:
+                answered = (exercise['verb'], person_index(exercise.get('person')) or 0)
+                self.exercises[self.current + 1] = _speed_prompt(
+                    self.speed_practice.next_speed_exercise(avoid=answered))
+            # The next answer is timed from now
+            self.shown_at = self.clock()
+        elif 'task_data' in exercise:
+            result.update(kind="task",
+                          task=self.task_scenarios.evaluate_response(user_answer, exercise['task_data']))
+        else:
+            explanation = None
+            if explain and self.explainer is not None:
+                start = time.perf_counter()
+                explanation = self.explainer.explain(
+                    exercise.get("sentence", ""), correct_answer, user_answer, is_correct,
+                    verb=exercise.get("verb"), tense=exercise.get("tense"), person=exercise.get("person")
+                )
+                logging.debug("Local explanation %s in %.2f ms",
+                              "built" if explanation else "unavailable",
+                              (time.perf_counter() - start) * 1000)
+            result.update(kind="standard", explanation=explanation)
+        return result
+
+    def summary(self) -> Dict[str, Any]:
+        """Session scores and position as plain JSON-ready data."""
+        return {
+            "session": self.session_id,
+            "mode": self.mode,
+            "exercise": self.current,
+            "total": self.total,
+            "attempted": self.stats.total_attempted,
+            "correct": self.stats.total_correct,
+            "accuracy": round(self.stats.get_accuracy(), 1),
+        }
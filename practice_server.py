@@ -0,0 +1,471 @@
+"""
+Practice Server
+Local HTTP/JSON service running headless practice sessions on one asyncio
+event loop, so many learners (a classroom LAN, a web front end) can share
+one process
+
+Usage:
+    python practice_server.py --port 8765
+    curl -X POST localhost:8765/sessions -d '{"count": 5, "tenses": ["present"]}'
+    curl -X POST localhost:8765/sessions/<id>/answer -d '{"answer": "hablo"}'
+
+Endpoints:
+    POST   /sessions                 create a session (mode, count, tenses, persons, verbs, difficulty, strictness)
+    GET    /sessions/<id>            current exercise and scores
+    POST   /sessions/<id>/next       advance to the next exercise
+    POST   /sessions/<id>/answer     check {"answer": ...} against the current exercise
+    GET    /sessions/<id>/stats      scores
+    DELETE /sessions/<id>            end the session
+    GET    /stats                    server throughput and latency
+    GET    /health                   liveness
+"""
+
+import argparse
+import asyncio
+import collections
+import json
+import logging
+import math
+import random
+import secrets
+import threading
+import time
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from practice_engine import MODES, PracticeSession, public_exercise
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+DEFAULT_MAX_SESSIONS = 1000
+DEFAULT_SESSION_TTL = 3600.0  # seconds idle before a session is dropped
+MAX_HEADER_BYTES = 8192
+MAX_BODY_BYTES = 64 * 1024
+KEEP_ALIVE_TIMEOUT = 15.0
+LATENCY_WINDOW = 4096  # recent request latencies kept for percentiles
+
+REASONS = {200: "OK", 201: "Created", 400: "Bad Request", 404: "Not Found",
+           405: "Method Not Allowed", 413: "Payload Too Large", 500: "Internal Server Error",
+           503: "Service Unavailable"}
+
+
+class HTTPError(Exception):
+    """An error response with a JSON ``{"error": message}`` body."""
+
+    def __init__(self, status: int, message: str) -> None:
+        super().__init__(message)
+        self.status = status
+        self.message = message
+
+
+class PracticeServer:
+    """
+    Asyncio HTTP/1.1 server over headless practice sessions.
+
+    Every request is handled on one event loop thread: sessions are plain
+    objects in a dict and need no locking, and answer checking is
+    microseconds of CPU, so a single process serves many concurrent
+    keep-alive connections. Engines without per-learner state (exercise
+    generator, task scenarios, local explainer) are shared by all sessions.
+    Progress is only written to SQLite when ``progress_db`` is given; those
+    writes run on the loop thread, which suits a classroom-sized server.
+
+    ``start`` runs the loop in a background thread (for tests and
+    benchmarks); ``serve`` runs it in the calling thread.
+    """
+
+    def __init__(self,
+                 host: str = DEFAULT_HOST,
+                 port: int = DEFAULT_PORT,
+                 max_sessions: int = DEFAULT_MAX_SESSIONS,
+                 session_ttl: float = DEFAULT_SESSION_TTL,
+                 progress_db: Optional[str] = None,
+                 seed: Optional[int] = None) -> None:
+        self.host = host
+        self.port = port
+        self.max_sessions = max_sessions
+        self.session_ttl = session_ttl
+        self.progress_db = progress_db
+        self.rng = random.Random(seed)
+
+        self.sessions: Dict[str, PracticeSession] = {}
+        self._last_seen: Dict[str, float] = {}
+        self._engines: Optional[Dict[str, Any]] = None
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._ready = threading.Event()
+        self.reset_stats()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    # -------------------------------------------------------
+    # Lifecycle
+    # -------------------------------------------------------
+    async def open(self) -> None:
+        """Bind the listening socket (port 0 picks a free port)."""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logging.info("Practice server listening on %s", self.base_url)
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._engines and self._engines.get("progress_tracker") is not None:
+            self._engines["progress_tracker"].close()
+        self._engines = None
+
+    async def serve(self) -> None:
+        """Serve until cancelled."""
+        await self.open()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.close()
+
+    def start(self) -> str:
+        """Serve from a background thread; returns the base URL."""
+        self._thread = threading.Thread(target=self._run_thread, name="practice-server", daemon=True)
+        self._thread.start()
+        self._ready.wait(10)
+        return self.base_url
+
+    def stop(self) -> None:
+        if self._loop is not None and self._thread is not None:
+            asyncio.run_coroutine_threadsafe(self.close(), self._loop).result(10)
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(10)
+            self._loop = self._thread = None
+
+    def __enter__(self) -> "PracticeServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+
+    def _run_thread(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_until_complete(self.open())
+        self._ready.set()
+        self._loop.run_forever()
+        self._loop.close()
+
+    # -------------------------------------------------------
+    # Stats
+    # -------------------------------------------------------
+    def reset_stats(self) -> None:
+        self.started = time.monotonic()
+        self.requests = 0
+        self.errors = 0
+        self.connections = 0
+        self.routes: Dict[str, int] = collections.Counter()
+        self._latencies: Deque[float] = collections.deque(maxlen=LATENCY_WINDOW)
+
+    def stats(self) -> Dict[str, Any]:
+        """Request counts, throughput and recent handler latency."""
+        elapsed = max(time.monotonic() - self.started, 1e-9)
+        latencies = sorted(self._latencies)
+
+        def pct(p: float) -> float:
+            # Nearest rank, in milliseconds
+            if not latencies:
+                return 0.0
+            rank = max(1, math.ceil(p / 100 * len(latencies)))
+            return round(latencies[rank - 1] * 1000, 3)
+
+        return {
+            "uptime_s": round(elapsed, 3),
+            "sessions": len(self.sessions),
+            "connections": self.connections,
+            "requests": self.requests,
+            "errors": self.errors,
+            "requests_per_s": round(self.requests / elapsed, 1),
+            "latency_ms": {"p50": pct(50), "p95": pct(95), "p99": pct(99), "max": pct(100)},
+            "routes": dict(self.routes),
+        }
+
+    # -------------------------------------------------------
+    # HTTP
+    # -------------------------------------------------------
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), KEEP_ALIVE_TIMEOUT)
+                except HTTPError as e:
+                    self.errors += 1
+                    await self._write_response(writer, e.status, {"error": e.message}, keep_alive=False)
+                    return
+                if request is None:
+                    return
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+
+                start = time.perf_counter()
+                try:
+                    status, payload = self.dispatch(method, path, body)
+                except HTTPError as e:
+                    status, payload = e.status, {"error": e.message}
+                except Exception:
+                    logging.exception("Practice server error handling %s %s", method, path)
+                    status, payload = 500, {"error": "Internal server error"}
+                self._latencies.append(time.perf_counter() - start)
+                self.requests += 1
+                if status >= 400:
+                    self.errors += 1
+
+                await self._write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    return
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict[str, str], bytes]]:
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return None  # Client closed the connection between requests
+        except asyncio.LimitOverrunError:
+            raise HTTPError(413, "Headers too large")
+        if len(head) > MAX_HEADER_BYTES:
+            raise HTTPError(413, "Headers too large")
+
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ", 2)
+        except ValueError:
+            raise HTTPError(400, "Malformed request line")
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        if version == "HTTP/1.0" and headers.get("connection", "").lower() != "keep-alive":
+            headers["connection"] = "close"
+
+        try:
+            length = int(headers.get("content-length", "0"))
+        except ValueError:
+            raise HTTPError(400, "Invalid Content-Length")
+        if length > MAX_BODY_BYTES:
+            raise HTTPError(413, "Body too large")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target.split("?", 1)[0], headers, body
+
+    async def _write_response(self, writer: asyncio.StreamWriter, status: int,
+                              payload: Any, keep_alive: bool) -> None:
+        body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        head = (f"HTTP/1.1 {status} {REASONS.get(status, 'Error')}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n"
+                f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    # -------------------------------------------------------
+    # Routes
+    # -------------------------------------------------------
+    def dispatch(self, method: str, path: str, body: bytes = b"") -> Tuple[int, Any]:
+        """Route one request; returns (status, JSON payload)."""
+        parts = [p for p in path.split("/") if p]
+        if parts == ["health"]:
+            route = "health"
+            self._require(method, "GET")
+            result: Tuple[int, Any] = (200, {"status": "ok"})
+        elif parts == ["stats"]:
+            route = "stats"
+            self._require(method, "GET")
+            result = (200, self.stats())
+        elif parts == ["sessions"]:
+            route = "create"
+            self._require(method, "POST")
+            result = (201, self.create_session(self._json(body)))
+        elif len(parts) >= 2 and parts[0] == "sessions":
+            session_id = parts[1]
+            action = parts[2] if len(parts) == 3 else None
+            route = action or method.lower()
+            if len(parts) > 3:
+                raise HTTPError(404, "Not found")
+            session = self._session(session_id)
+            if action is None and method == "GET":
+                result = (200, self._view(session))
+            elif action is None and method == "DELETE":
+                result = (200, self.end_session(session_id))
+            elif action == "next":
+                self._require(method, "POST")
+                advanced = session.next()
+                result = (200, dict(self._view(session), done=not advanced))
+            elif action == "answer":
+                self._require(method, "POST")
+                result = (200, self.answer(session, self._json(body)))
+            elif action == "stats":
+                self._require(method, "GET")
+                result = (200, session.summary())
+            elif action is None:
+                raise HTTPError(405, "Method not allowed")
+            else:
+                raise HTTPError(404, "Not found")
+        else:
+            raise HTTPError(404, "Not found")
+        self.routes[route] += 1
+        return result
+
+    def create_session(self, options: Dict[str, Any]) -> Dict[str, Any]:
+        self._expire_sessions()
+        if len(self.sessions) >= self.max_sessions:
+            raise HTTPError(503, "Too many active sessions")
+        mode = options.get("mode", "practice")
+        if mode not in MODES or mode == "custom":
+            raise HTTPError(400, f"Unknown mode: {mode}")
+        if mode == "review" and not self.progress_db:
+            raise HTTPError(400, "review mode needs the server to have a progress database")
+        count = options.get("count", 5)
+        if not isinstance(count, int) or not 1 <= count <= 50:
+            raise HTTPError(400, "count must be an integer from 1 to 50")
+        time_limit = options.get("time_limit", 3)
+        if (isinstance(time_limit, bool) or not isinstance(time_limit, (int, float))
+                or not 1 <= time_limit <= 10):
+            raise HTTPError(400, "time_limit must be a number of seconds from 1 to 10")
+        strictness = options.get("strictness", "normal")
+        if strictness not in ("strict", "normal", "lenient"):
+            raise HTTPError(400, f"Unknown strictness: {strictness}")
+
+        engines = self._shared_engines()
+        session_id = secrets.token_urlsafe(12)
+        session = PracticeSession(session_id=session_id, strictness=strictness, **engines)
+        if mode == "practice":
+            session.generate(count=count,
+                             tenses=self._list(options, "tenses"),
+                             persons=self._list(options, "persons"),
+                             verbs=self._list(options, "verbs"),
+                             difficulty=options.get("difficulty", "intermediate"))
+        elif mode == "review":
+            session.start_review(count=count)
+        elif mode == "task":
+            session.start_task(count)
+        elif mode == "story":
+            session.start_story(options.get("tense", "preterite"), count)
+        elif mode == "speed":
+            session.start_speed(count, time_limit, self._list(options, "verbs"))
+        if not session.total:
+            # e.g. nothing due for review, or a speed round under one 3 s prompt
+            raise HTTPError(409, "No exercises available for these options")
+
+        self.sessions[session_id] = session
+        self._last_seen[session_id] = time.monotonic()
+        return self._view(session)
+
+    def answer(self, session: PracticeSession, body: Dict[str, Any]) -> Dict[str, Any]:
+        answer = body.get("answer")
+        if not isinstance(answer, str):
+            raise HTTPError(400, "answer must be a string")
+        try:
+            result = session.submit(answer, explain=body.get("explain", True))
+        except ValueError as e:
+            raise HTTPError(400, str(e))
+        result["stats"] = session.summary()
+        return result
+
+    def end_session(self, session_id: str) -> Dict[str, Any]:
+        session = self.sessions.pop(session_id)
+        self._last_seen.pop(session_id, None)
+        return dict(session.summary(), closed=True)
+
+    # -------------------------------------------------------
+    # Helpers
+    # -------------------------------------------------------
+    def _shared_engines(self) -> Dict[str, Any]:
+        if self._engines is None:
+            from exercise_generator import ExerciseGenerator
+            from local_explainer import LocalExplainer
+            from task_scenarios import TaskScenario
+            progress_tracker = None
+            if self.progress_db:
+                from progress_tracker import ProgressTracker
+                progress_tracker = ProgressTracker(self.progress_db)
+            self._engines = {
+                "exercise_generator": ExerciseGenerator(),
+                "task_scenarios": TaskScenario(),
+                "explainer": LocalExplainer(),
+                "progress_tracker": progress_tracker,
+            }
+        return self._engines
+
+    def _session(self, session_id: str) -> PracticeSession:
+        session = self.sessions.get(session_id)
+        if session is None:
+            raise HTTPError(404, "Unknown session")
+        self._last_seen[session_id] = time.monotonic()
+        return session
+
+    def _expire_sessions(self) -> None:
+        cutoff = time.monotonic() - self.session_ttl
+        for session_id in [s for s, seen in self._last_seen.items() if seen < cutoff]:
+            logging.info("Practice session %s expired", session_id)
+            self.sessions.pop(session_id, None)
+            self._last_seen.pop(session_id, None)
+
+    def _view(self, session: PracticeSession) -> Dict[str, Any]:
+        return {
+            "session": session.session_id,
+            "mode": session.mode,
+            "index": session.current,
+            "total": session.total,
+            "exercise": public_exercise(session.exercise, self.rng),
+        }
+
+    @staticmethod
+    def _require(method: str, expected: str) -> None:
+        if method != expected:
+            raise HTTPError(405, "Method not allowed")
+
+    @staticmethod
+    def _json(body: bytes) -> Dict[str, Any]:
+        if not body:
+            return {}
+        try:
+            data = json.loads(body)
+        except ValueError:
+            raise HTTPError(400, "Body is not valid JSON")
+        if not isinstance(data, dict):
+            raise HTTPError(400, "Body must be a JSON object")
+        return data
+
+    @staticmethod
+    def _list(options: Dict[str, Any], key: str) -> Optional[List[Any]]:
+        value = options.get(key)
+        if value is None:
+            return None
+        if not isinstance(value, list):
+            raise HTTPError(400, f"{key} must be a list")
+        return value
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve headless practice sessions over HTTP/JSON")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--max-sessions", type=int, default=DEFAULT_MAX_SESSIONS)
+    parser.add_argument("--session-ttl", type=float, default=DEFAULT_SESSION_TTL,
+                        help="Seconds a session may stay idle")
+    parser.add_argument("--progress-db", help="Record attempts in this progress database")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    server = PracticeServer(args.host, args.port, args.max_sessions, args.session_ttl, args.progress_db)
+    try:
+        asyncio.run(server.serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
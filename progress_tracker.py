@@ -5,9 +5,16 @@ Simple implementation without external dependencies
 
 import sqlite3
 import json
+import time
 from datetime import datetime, timedelta
 from typing import List, Dict, Any, Optional
 
+from metrics import registry
+from streaming_stats import LogHistogram, log_bucket
+
+DB_WRITE_SECONDS = registry.histogram(
+    "db_write_seconds", "Progress database write time (statements and commit) by operation")
+
 class ProgressTracker:
     """Track user progress and implement spaced repetition."""
     
@@ -53,6 +60,29 @@ class ProgressTracker:
             )
         ''')
         
+        # Speed profiles: response-time totals and log-scale histogram
+        # buckets (see streaming_stats), updated with every timed attempt
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS speed_profiles (
+                verb TEXT NOT NULL,
+                tense TEXT NOT NULL,
+                person INTEGER NOT NULL,
+                samples INTEGER DEFAULT 0,
+                total_time REAL DEFAULT 0,
+                PRIMARY KEY (verb, tense, person)
+            )
+        ''')
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS latency_histograms (
+                verb TEXT NOT NULL,
+                tense TEXT NOT NULL,
+                person INTEGER NOT NULL,
+                bucket INTEGER NOT NULL,
+                count INTEGER DEFAULT 0,
+                PRIMARY KEY (verb, tense, person, bucket)
+            )
+        ''')
+        
         # Session summary table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS sessions (
@@ -65,18 +95,41 @@ class ProgressTracker:
             )
         ''')
         
+        # Databases created before timed attempts were recorded: response,
+        # first-keystroke (reaction) and excluded UI render times, in seconds
+        columns = {row['name'] for row in cursor.execute('PRAGMA table_info(attempts)')}
+        for column in ('response_time', 'reaction_time', 'render_time'):
+            if column not in columns:
+                cursor.execute(f'ALTER TABLE attempts ADD COLUMN {column} REAL')
+        
         self.conn.commit()
     
     def record_attempt(self, verb: str, tense: str, person: int, 
-                      user_answer: str, correct_answer: str, is_correct: bool):
-        """Record a single attempt."""
+                      user_answer: str, correct_answer: str, is_correct: bool,
+                      response_time: Optional[float] = None,
+                      reaction_time: Optional[float] = None,
+                      render_time: Optional[float] = None,
+                      speed_profile: bool = True):
+        """
+        Record a single attempt. Timed attempts also pass, in seconds, the
+        response time (shown to submitted), the reaction time (shown to first
+        keystroke) and the UI render time left out of both. The response
+        time only feeds the speed profile when ``speed_profile`` is set, so
+        untimed-mode answers do not skew speed-drill latencies.
+        """
+        start = time.perf_counter()
         cursor = self.conn.cursor()
         
         # Insert attempt
         cursor.execute('''
-            INSERT INTO attempts (verb, tense, person, user_answer, correct_answer, is_correct)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (verb, tense, person, user_answer, correct_answer, is_correct))
+            INSERT INTO attempts (verb, tense, person, user_answer, correct_answer, is_correct,
+                                  response_time, reaction_time, render_time)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', (verb, tense, person, user_answer, correct_answer, is_correct,
+              response_time, reaction_time, render_time))
+        
+        if response_time is not None and speed_profile:
+            self._record_latency(cursor, verb, tense, person, response_time)
         
         # Update verb performance
         cursor.execute('''
@@ -101,6 +154,54 @@ class ProgressTracker:
               is_correct))
         
         self.conn.commit()
+        DB_WRITE_SECONDS.observe(time.perf_counter() - start, op="record_attempt")
+    
+    def _record_latency(self, cursor: sqlite3.Cursor, verb: str, tense: str, person: int,
+                        response_time: float):
+        """Add one sample to the (verb, tense, person) speed profile."""
+        cursor.execute('''
+            INSERT INTO speed_profiles (verb, tense, person, samples, total_time)
+            VALUES (?, ?, ?, 1, ?)
+            ON CONFLICT(verb, tense, person) DO UPDATE SET
+                samples = samples + 1,
+                total_time = total_time + excluded.total_time
+        ''', (verb, tense, person, response_time))
+        cursor.execute('''
+            INSERT INTO latency_histograms (verb, tense, person, bucket, count)
+            VALUES (?, ?, ?, ?, 1)
+            ON CONFLICT(verb, tense, person, bucket) DO UPDATE SET
+                count = count + 1
+        ''', (verb, tense, person, log_bucket(response_time)))
+    
+    def get_latency_histogram(self, verb: str, tense: Optional[str] = None,
+                              person: Optional[int] = None) -> LogHistogram:
+        """Response-time histogram of a verb, optionally narrowed to a tense and person."""
+        where = 'verb = ?'
+        params: List[Any] = [verb]
+        if tense is not None:
+            where += ' AND tense = ?'
+            params.append(tense)
+        if person is not None:
+            where += ' AND person = ?'
+            params.append(person)
+        
+        histogram = LogHistogram()
+        cursor = self.conn.cursor()
+        cursor.execute(f'''
+            SELECT COALESCE(SUM(samples), 0) AS samples, COALESCE(SUM(total_time), 0) AS total_time
+            FROM speed_profiles WHERE {where}
+        ''', params)
+        row = cursor.fetchone()
+        histogram.count, histogram.total = row['samples'], row['total_time']
+        cursor.execute(f'''
+            SELECT bucket, SUM(count) AS count
+            FROM latency_histograms WHERE {where}
+            GROUP BY bucket
+        ''', params)
+        for row in cursor.fetchall():
+            if 0 <= row['bucket'] < len(histogram.counts):
+                histogram.counts[row['bucket']] = row['count']
+        return histogram
     
     def calculate_next_review(self, is_correct: bool, current_interval: int = 1) -> str:
         """Calculate next review date based on performance."""
@@ -208,16 +309,19 @@ class ProgressTracker:
     
     def start_session(self) -> int:
         """Start a new practice session."""
+        start = time.perf_counter()
         cursor = self.conn.cursor()
         cursor.execute('''
             INSERT INTO sessions (start_time, total_attempts, correct_attempts)
             VALUES (CURRENT_TIMESTAMP, 0, 0)
         ''')
         self.conn.commit()
+        DB_WRITE_SECONDS.observe(time.perf_counter() - start, op="start_session")
         return cursor.lastrowid
     
     def update_session(self, session_id: int, total: int, correct: int, verbs: List[str]):
         """Update session statistics."""
+        start = time.perf_counter()
         cursor = self.conn.cursor()
         cursor.execute('''
             UPDATE sessions
@@ -228,6 +332,7 @@ class ProgressTracker:
             WHERE id = ?
         ''', (total, correct, json.dumps(verbs), session_id))
         self.conn.commit()
+        DB_WRITE_SECONDS.observe(time.perf_counter() - start, op="update_session")
     
     def get_learning_curve(self, days: int = 30) -> List[Dict[str, Any]]:
         """Get accuracy over time for learning curve visualization."""
@@ -0,0 +1,114 @@
+"""
+GPT Prompt Builders
+Every prompt the online mode sends, in one place so the GUIs, the batcher
+and the offline benchmark all use exactly the same text
+"""
+
+from typing import Any, Dict, List
+
+
+def build_exercise_prompt(count: int,
+                          difficulty: str,
+                          tense_text: str,
+                          person_text: str,
+                          specific_verbs: str = "",
+                          theme_context: str = "") -> str:
+    """Prompt asking GPT for a JSON array of fill-in-the-blank exercises."""
+    prompt = (
+        f"Generate {count} unique Spanish exercises at {difficulty} level that reflect authentic, everyday "
+        f"interactions in LATAM contexts. Each exercise should include:\n\n"
+        "1. \"context\": Two or three sentences of natural text.\n"
+        "2. \"sentence\": A passage with a blank for a missing verb.\n"
+        "3. \"answer\": The correct verb form.\n"
+        "4. \"choices\": An array of four options (including the correct one).\n"
+        "5. \"translation\": English translation with the blank.\n\n"
+        "Context Instructions:\n"
+        f"- Use ONLY these verb tenses/aspects: {tense_text}.\n"
+        f"- Use ONLY these grammatical persons: {person_text}.\n"
+    )
+    if specific_verbs:
+        prompt += f"- Use only these verbs for the blank: {specific_verbs}.\n"
+    if theme_context:
+        prompt += f"- Theme/Context: {theme_context}.\n"
+
+    prompt += (
+        "\nEnsure the examples reflect natural LATAM Spanish. Return a strictly valid JSON array "
+        "of objects with no extra formatting."
+    )
+    return prompt
+
+
+def build_quick_exercise_prompt(count: int, tense: str) -> str:
+    """Shorter exercise prompt used by the professional edition."""
+    return f"""Generate {count} Spanish conjugation exercises for {tense} tense.
+            Return as JSON array with format: [{{"sentence": "...", "answer": "...", "choices": [...], "translation": "..."}}]"""
+
+
+def build_explanation_prompt(sentence: str,
+                             correct_answer: str,
+                             user_answer: str,
+                             is_correct: bool) -> str:
+    """Prompt asking for a grammar-focused explanation of one answer."""
+    return (
+        "You are an expert Spanish tutor specializing in LATAM Spanish. "
+        f"Sentence: \"{sentence}\"\n"
+        f"Correct Answer: \"{correct_answer}\"\n"
+        f"Learner's Answer: \"{user_answer}\"\n"
+        f"Is the learner's answer correct? {'Yes' if is_correct else 'No'}\n\n"
+        "Provide a concise explanation in LATAM Spanish that focuses strictly on the grammatical structure. "
+        "Do not include extra praise or filler. "
+    )
+
+
+def build_batch_explanation_prompt(items: List[Dict[str, Any]]) -> str:
+    """Prompt asking for one JSON explanation object per numbered answer."""
+    lines = []
+    for item in items:
+        lines.append(
+            f"- id {item['id']}: Sentence: \"{item['sentence']}\" | "
+            f"Correct Answer: \"{item['correct_answer']}\" | "
+            f"Learner's Answer: \"{item['user_answer']}\" | "
+            f"Correct? {'Yes' if item['is_correct'] else 'No'}"
+        )
+    return (
+        "You are reviewing several answers from the same learner.\n"
+        + "\n".join(lines) + "\n\n"
+        "For each item, provide a concise explanation in LATAM Spanish that focuses strictly on the "
+        "grammatical structure. Do not include extra praise or filler.\n"
+        "Return a strictly valid JSON array with exactly one object per item, in the form "
+        "{\"id\": <item id>, \"explanation\": \"<text>\"}, with no extra formatting."
+    )
+
+
+def build_hint_prompt(sentence: str, answer: str) -> str:
+    """Prompt asking for a subtle hint that does not reveal the answer."""
+    return (
+        f"You are an expert Spanish tutor specializing in LATAM Spanish. "
+        f"Given the following realistic scenario where a verb is missing:\n"
+        f"Sentence: \"{sentence}\"\n"
+        f"Correct Conjugation: \"{answer}\"\n\n"
+        "Please provide a subtle, context-based hint in LATAM Spanish "
+        "that gently guides the learner toward the correct verb form, "
+        "without revealing the answer directly."
+    )
+
+
+def build_summary_prompt(digest: str, recent: List[str]) -> str:
+    """
+    Prompt asking GPT to summarize a practice session.
+
+    Args:
+        digest: Compact stats for the session so far (see ``session_summary``).
+        recent: One line per answer submitted after the digest was built.
+    """
+    sections = []
+    if digest:
+        sections.append(f"Session stats:\n{digest}")
+    if recent:
+        sections.append("Latest answers:\n" + "\n".join(f"- {line}" for line in recent))
+    return (
+        "You are an expert Spanish tutor reviewing a student's practice session:\n"
+        + ("\n\n".join(sections) or "No answers yet.") + "\n\n"
+        "Provide a concise summary highlighting strengths and the error patterns to practice next. "
+        "Use clear, encouraging language, but be concise."
+    )
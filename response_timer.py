@@ -0,0 +1,101 @@
+"""
+Response Timer
+Measures how long the learner, not the app, takes to answer: the clock
+starts when the exercise is actually painted (not when it was requested,
+and not while a modal dialog covers it), the first keystroke or choice
+press is noted, and the render time in between is reported separately
+"""
+
+import time
+from typing import Callable, List, Optional
+
+from PyQt5.QtCore import QEvent, QObject
+from PyQt5.QtWidgets import QAbstractButton, QApplication, QButtonGroup, QWidget
+
+from practice_engine import ResponseTiming
+
+INPUT_EVENTS = (QEvent.KeyPress, QEvent.MouseButtonPress)
+
+
+class ResponseTimer(QObject):
+    """
+    Event-filter stopwatch for one exercise at a time.
+
+    ``arm()`` when a new exercise is put on screen; the next paint of a
+    watched display widget with no modal dialog open marks it shown. Key
+    or mouse presses on watched inputs (and presses in watched button
+    groups) mark the first input, and ``timing()`` at submit returns the
+    whole breakdown.
+    """
+
+    def __init__(self,
+                 clock: Callable[[], float] = time.monotonic,
+                 parent: Optional[QObject] = None) -> None:
+        super().__init__(parent)
+        self.clock = clock
+        self.requested_at: Optional[float] = None
+        self.shown_at: Optional[float] = None
+        self.first_input_at: Optional[float] = None
+        self._displays: List[QWidget] = []
+        self._inputs: List[QWidget] = []
+
+    def watchDisplay(self, widget: QWidget) -> None:
+        """Treat the first paint of ``widget`` after ``arm()`` as the exercise being shown."""
+        self._displays.append(widget)
+        widget.installEventFilter(self)
+        # Closing a modal dialog reactivates the window, which may not repaint
+        if widget.window() != widget:
+            widget.window().installEventFilter(self)
+
+    def watchInput(self, widget: QWidget) -> None:
+        """Treat key and mouse presses on ``widget`` as answer input."""
+        self._inputs.append(widget)
+        widget.installEventFilter(self)
+
+    def watchButtons(self, group: QButtonGroup) -> None:
+        """Treat presses of any button in ``group`` (present or added later) as answer input."""
+        group.buttonPressed.connect(self._buttonPressed)
+
+    def arm(self) -> None:
+        """A new exercise is about to be displayed; restart the stopwatch."""
+        self.requested_at = self.clock()
+        self.shown_at = None
+        self.first_input_at = None
+        # An unchanged text would not repaint on its own
+        for widget in self._displays:
+            widget.update()
+
+    def markInput(self) -> None:
+        if self.shown_at is not None and self.first_input_at is None:
+            self.first_input_at = self.clock()
+
+    def timing(self, submitted_at: Optional[float] = None) -> Optional[ResponseTiming]:
+        """
+        Breakdown for an answer submitted at ``submitted_at`` (default: now),
+        or None if nothing was armed. Without an observed paint (e.g. a
+        hidden window) the clock runs from the display request and the
+        render time is unknown.
+        """
+        if self.requested_at is None:
+            return None
+        submitted_at = self.clock() if submitted_at is None else submitted_at
+        if self.shown_at is None:
+            return ResponseTiming(self.requested_at, submitted_at, self.first_input_at, None)
+        return ResponseTiming(self.shown_at, submitted_at, self.first_input_at,
+                              self.shown_at - self.requested_at)
+
+    def eventFilter(self, obj: QObject, event: QEvent) -> bool:
+        kind = event.type()
+        if kind == QEvent.Paint:
+            if (self.requested_at is not None and self.shown_at is None
+                    and obj in self._displays and QApplication.activeModalWidget() is None):
+                self.shown_at = self.clock()
+        elif kind in INPUT_EVENTS and obj in self._inputs:
+            self.markInput()
+        elif kind == QEvent.WindowActivate and self.requested_at is not None and self.shown_at is None:
+            for widget in self._displays:
+                widget.update()
+        return False
+
+    def _buttonPressed(self, button: QAbstractButton) -> None:
+        self.markInput()
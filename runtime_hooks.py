@@ -79,14 +79,11 @@ def main():
         setup_qt_plugins()
         setup_logging()
         
-        # Import main modules to trigger any initialization
+        # Import main modules to trigger any initialization; ssl and the
+        # OpenAI stack are left to load on the first online request
         import PyQt5.QtCore
         import PyQt5.QtWidgets
         
-        # Verify SSL setup
-        import ssl
-        import certifi
-        
         print("✅ Runtime hooks executed successfully")
         
     except Exception as e:
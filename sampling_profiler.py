@@ -0,0 +1,222 @@
+"""
+Sampling Profiler
+Opt-in wall-clock stack sampling of instrumented sections (slot handlers
+and background work bodies): a sampler thread reads every thread's stack
+with sys._current_frames, keeps only threads inside a section, and
+aggregates collapsed stacks per section for flamegraph tools
+"""
+
+import functools
+import logging
+import os
+import sys
+import threading
+from collections import Counter
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+PROFILE_ENV = "SAMPLING_PROFILE"  # "1" enables; any other value is also the output path
+DEFAULT_INTERVAL = 0.005          # seconds between samples
+DEFAULT_OUTPUT = os.path.join("logs", "profile.collapsed")
+MAX_DEPTH = 64                    # frames kept per sample, innermost first
+
+logger = logging.getLogger("sampling_profiler")
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """
+    Samples the stacks of threads that are inside a profiled section.
+
+    ``section(name)`` (or the ``profiled`` decorator) marks a unit of work;
+    when the profiler is not running it only checks a flag. While running,
+    a daemon thread wakes every ``interval`` seconds and, for each thread in
+    a section, adds one count to the collapsed stack from the outermost
+    section's entry frame down to the frame executing now. Sampling wall
+    clock time from a thread, rather than a SIGPROF handler, also catches
+    time blocked in I/O and works on Windows.
+
+    Attributes:
+        stacks (Dict[str, Counter]): Samples per collapsed stack, per section.
+        samples (int): Sampler ticks taken.
+        output (str): Where ``finish`` writes the collapsed stacks.
+    """
+
+    def __init__(self, interval: float = DEFAULT_INTERVAL, max_depth: int = MAX_DEPTH) -> None:
+        self.interval = interval
+        self.max_depth = max_depth
+        self.stacks: Dict[str, Counter] = {}
+        self.samples = 0
+        self.running = False
+        self.output = DEFAULT_OUTPUT
+        # Thread ident -> open sections as (name, entry frame), outermost first
+        self._sections: Dict[int, List[Tuple[str, Any]]] = {}
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self.running = True
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self.running = False
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout=1.0)
+            self._thread = None
+        self._sections.clear()
+
+    # -------------------------------------------------------
+    # Sections
+    # -------------------------------------------------------
+    def enter(self, name: str, frame) -> None:
+        """Open section ``name``; samples are cut at ``frame``, the code that opened it."""
+        if self.running:
+            self._sections.setdefault(threading.get_ident(), []).append((name, frame))
+
+    def leave(self) -> None:
+        if self.running:
+            sections = self._sections.get(threading.get_ident())
+            if sections:
+                sections.pop()
+
+    @contextmanager
+    def section(self, name: str) -> Iterator[None]:
+        """Profile the enclosed block as ``name``."""
+        if not self.running:
+            yield
+            return
+        self.enter(name, sys._getframe(2))
+        try:
+            yield
+        finally:
+            self.leave()
+
+    def profiled(self, name: Optional[str] = None) -> Callable[[Callable], Callable]:
+        """Decorator profiling every call of a work function as one section."""
+        def decorate(func: Callable) -> Callable:
+            label = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.running:
+                    return func(*args, **kwargs)
+                self.enter(label, sys._getframe(0))
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.leave()
+            return wrapper
+        return decorate
+
+    # -------------------------------------------------------
+    # Sampling
+    # -------------------------------------------------------
+    def sample(self) -> int:
+        """Take one sample of every thread in a section; returns how many were sampled."""
+        frames = sys._current_frames()
+        taken = 0
+        for ident, sections in list(self._sections.items()):
+            sections = list(sections)
+            frame = frames.get(ident)
+            if not sections or frame is None:
+                continue
+            name, entry = sections[0]
+            labels = []
+            while frame is not None and len(labels) < self.max_depth:
+                labels.append(_frame_label(frame))
+                if frame is entry:
+                    break
+                frame = frame.f_back
+            stack = ";".join([name] + labels[::-1])
+            with self._lock:
+                self.stacks.setdefault(name, Counter())[stack] += 1
+            taken += 1
+        self.samples += 1
+        return taken
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.sample()
+            except Exception:  # never let profiling take the app down
+                logger.exception("Profiler sample failed")
+
+    # -------------------------------------------------------
+    # Reporting
+    # -------------------------------------------------------
+    def collapsed(self) -> List[str]:
+        """``section;frame;...;frame count`` lines (flamegraph.pl, speedscope, inferno)."""
+        with self._lock:
+            return [f"{stack} {count}" for counter in self.stacks.values()
+                    for stack, count in sorted(counter.items())]
+
+    def summary(self, top: int = 3) -> List[Dict[str, Any]]:
+        """Per section: samples, approximate time and the hottest innermost frames."""
+        with self._lock:
+            counters = {name: Counter(counter) for name, counter in self.stacks.items()}
+        result = []
+        for name, counter in counters.items():
+            leaves: Counter = Counter()
+            for stack, count in counter.items():
+                leaves[stack.rsplit(";", 1)[-1]] += count
+            total = sum(counter.values())
+            result.append({
+                "section": name,
+                "samples": total,
+                "seconds": round(total * self.interval, 3),
+                "hottest": leaves.most_common(top),
+            })
+        return sorted(result, key=lambda item: item["samples"], reverse=True)
+
+    def format_summary(self) -> str:
+        rows = self.summary()
+        if not rows:
+            return "No samples recorded"
+        lines = []
+        for row in rows:
+            lines.append(f"{row['section']}: {row['samples']} samples (~{row['seconds']:.2f} s)")
+            lines.extend(f"    {count:>5}  {frame}" for frame, count in row["hottest"])
+        return "\n".join(lines)
+
+    def write(self, path: str) -> None:
+        """Write the collapsed stacks to ``path``."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.writelines(line + "\n" for line in self.collapsed())
+
+    def finish(self, path: Optional[str] = None) -> None:
+        """Stop sampling, write the collapsed stacks and log the per-section summary."""
+        if not self.running and not self.stacks:
+            return
+        self.stop()
+        path = path or self.output
+        try:
+            self.write(path)
+            logger.info("Profile (%d samples) written to %s:\n%s",
+                        self.samples, path, self.format_summary())
+        except OSError as e:
+            logger.error("Could not write profile: %s", e)
+
+
+def env_output() -> Optional[str]:
+    """Output path requested through the SAMPLING_PROFILE variable, if any."""
+    value = os.environ.get(PROFILE_ENV, "").strip()
+    if not value or value.lower() in ("0", "false", "no", "off"):
+        return None
+    return DEFAULT_OUTPUT if value.lower() in ("1", "true", "yes", "on") else value
+
+
+# Process-wide profiler used by the instrumented handlers and workers
+profiler = SamplingProfiler()
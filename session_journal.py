@@ -0,0 +1,242 @@
+"""
+Session Journal
+Append-only NDJSON journal of practice sessions, written incrementally by
+a background thread and rotated by size, with a replay tool that turns
+it back into a readable session log
+"""
+
+import argparse
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+from sampling_profiler import profiler
+
+DEFAULT_JOURNAL_PATH = "session_journal.ndjson"
+DEFAULT_MAX_BYTES = 1_000_000
+DEFAULT_BACKUP_COUNT = 5
+
+_STOP = object()
+
+
+class SessionJournal:
+    """
+    Crash-safe journal of one practice session.
+
+    ``append`` only enqueues; a writer thread serializes each record as one
+    JSON line and flushes after every batch it drains, so a crash loses at
+    most the records still queued. Every record carries ``type``, ``ts``
+    (epoch seconds) and ``session``. The file rotates to ``<path>.1`` ...
+    ``<path>.<backup_count>`` when it would exceed ``max_bytes``.
+
+    Attributes:
+        written (int): Records written so far.
+    """
+
+    def __init__(self,
+                 path: str = DEFAULT_JOURNAL_PATH,
+                 session_id: Optional[Any] = None,
+                 max_bytes: int = DEFAULT_MAX_BYTES,
+                 backup_count: int = DEFAULT_BACKUP_COUNT) -> None:
+        self.path = path
+        self.session_id = session_id
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.written = 0
+
+        self._queue: "queue.SimpleQueue[Any]" = queue.SimpleQueue()
+        self._file = None
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="session-journal", daemon=True)
+        self._thread.start()
+        self.append("session_start")
+
+    def append(self, record_type: str, **fields: Any) -> None:
+        """Queue one record; never blocks on disk I/O."""
+        if self._closed:
+            return
+        record = {"type": record_type, "ts": round(time.time(), 3), "session": self.session_id}
+        record.update(fields)
+        self._queue.put(record)
+
+    def close(self, timeout: float = 2.0) -> None:
+        """Write a ``session_end`` record, drain the queue and stop the writer."""
+        if self._closed:
+            return
+        self.append("session_end")
+        self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+
+    # -------------------------------------------------------
+    # Writer thread
+    # -------------------------------------------------------
+    def _run(self) -> None:
+        while True:
+            batch = [self._queue.get()]
+            while True:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = False
+            with profiler.section("session_journal.write"):
+                for record in batch:
+                    if record is _STOP:
+                        stop = True
+                        continue
+                    self._write(record)
+                if self._file is not None:
+                    self._file.flush()
+            if stop:
+                if self._file is not None:
+                    self._file.close()
+                    self._file = None
+                return
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        try:
+            line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+            if self._should_rotate(len(line)):
+                self._rotate()
+            if self._file is None:
+                self._file = open(self.path, "ab")
+            self._file.write(line)
+            self.written += 1
+        except (OSError, TypeError, ValueError) as e:
+            logging.error("Error writing session journal record: %s", e)
+
+    def _should_rotate(self, pending: int) -> bool:
+        if self.max_bytes <= 0:
+            return False
+        size = self._file.tell() if self._file is not None else (
+            os.path.getsize(self.path) if os.path.exists(self.path) else 0)
+        return size > 0 and size + pending > self.max_bytes
+
+    def _rotate(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+        if self.backup_count <= 0:
+            os.remove(self.path)
+            return
+        for i in range(self.backup_count - 1, 0, -1):
+            source = f"{self.path}.{i}"
+            if os.path.exists(source):
+                os.replace(source, f"{self.path}.{i + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+
+# -------------------------------------------------------
+# Replay
+# -------------------------------------------------------
+def journal_files(path: str = DEFAULT_JOURNAL_PATH) -> List[str]:
+    """The journal and its rotated backups, oldest first."""
+    directory = os.path.dirname(path) or "."
+    prefix = os.path.basename(path) + "."
+    backups = []
+    for name in os.listdir(directory) if os.path.isdir(directory) else ():
+        suffix = name[len(prefix):]
+        if name.startswith(prefix) and suffix.isdigit():
+            backups.append((int(suffix), os.path.join(directory, name)))
+    files = [p for _, p in sorted(backups, reverse=True)]
+    if os.path.exists(path):
+        files.append(path)
+    return files
+
+
+def iter_records(path: str = DEFAULT_JOURNAL_PATH) -> Iterator[Dict[str, Any]]:
+    """
+    Yield journal records oldest first, across rotated files.
+
+    A torn final line (crash mid-write) or any other undecodable line is
+    skipped.
+    """
+    for file_path in journal_files(path):
+        with open(file_path, "rb") as f:
+            for line_number, line in enumerate(f, 1):
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    logging.warning("Skipping unreadable journal line %s:%d", file_path, line_number)
+                    continue
+                if isinstance(record, dict):
+                    yield record
+
+
+def replay_sessions(records: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Rebuild sessions from journal records.
+
+    Returns:
+        One dict per session in order of first appearance, with ``session``,
+        ``started``, ``ended`` (None if the app never closed cleanly) and
+        ``answers``; explanations are attached to the latest answer for the
+        same exercise.
+    """
+    ordered: List[Dict[str, Any]] = []
+    current: Dict[Any, Dict[str, Any]] = {}
+    for record in records:
+        key = record.get("session")
+        session = current.get(key)
+        if session is None or (record.get("type") == "session_start" and session["ended"]):
+            session = {"session": key, "started": record.get("ts"), "ended": None, "answers": []}
+            current[key] = session
+            ordered.append(session)
+        record_type = record.get("type")
+        if record_type == "answer":
+            session["answers"].append(dict(record))
+        elif record_type == "explanation":
+            for answer in reversed(session["answers"]):
+                if answer.get("exercise") == record.get("exercise"):
+                    answer["explanation"] = record.get("explanation", "")
+                    break
+        elif record_type == "reset":
+            session["answers"].append({"type": "reset", "ts": record.get("ts")})
+        elif record_type == "session_end":
+            session["ended"] = record.get("ts")
+    return ordered
+
+
+def format_session(session: Dict[str, Any]) -> str:
+    """Render one replayed session in the old session_log.txt layout."""
+    lines = [f"=== Session {session['session']} ==="]
+    for answer in session["answers"]:
+        if answer.get("type") == "reset":
+            lines.append("--- Progress reset ---")
+            continue
+        lines.append(
+            f"Exercise {answer.get('exercise', 0) + 1}:\n"
+            f"  Sentence: {answer.get('sentence', '')}\n"
+            f"  Translation: {answer.get('translation', '')}\n"
+            f"  Your answer: {answer.get('user_answer', '')}\n"
+            f"  Correct: {answer.get('correct')}\n"
+            f"  Explanation: {answer.get('explanation', '')}\n"
+        )
+    lines.append("=== End Session ===" if session["ended"] else "=== Session not closed ===")
+    return "\n".join(lines) + "\n"
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Replay the session journal")
+    parser.add_argument("journal", nargs="?", default=DEFAULT_JOURNAL_PATH)
+    parser.add_argument("--session", help="Only show this session id")
+    parser.add_argument("--json", action="store_true", help="Print replayed sessions as JSON")
+    args = parser.parse_args(argv)
+
+    sessions = replay_sessions(iter_records(args.journal))
+    if args.session is not None:
+        sessions = [s for s in sessions if str(s["session"]) == args.session]
+    if args.json:
+        print(json.dumps(sessions, ensure_ascii=False, indent=2))
+    else:
+        for session in sessions:
+            print(format_session(session))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+Rolling Session Summary
+Keeps a compact, incrementally updated digest of the practice session from
+structured answer stats so the end-of-session GPT call stays small no
+matter how long the session was
+"""
+
+import math
+import re
+from collections import Counter, deque
+from typing import Any, Deque, Dict, List, Optional
+
+from local_explainer import MISTAKE_CATEGORIES, LocalExplainer
+from prompts import build_summary_prompt
+
+DEFAULT_UPDATE_EVERY = 10
+DEFAULT_MAX_PROMPT_TOKENS = 600
+TOP_ITEMS = 3
+MAX_ANSWER_CHARS = 40
+
+_TOKEN_PATTERN = re.compile(r"\w+|[^\w\s]", re.UNICODE)
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Cheap local estimate of how many BPE tokens ``text`` costs.
+
+    Counts words and punctuation, charging long words extra since they
+    split into several sub-word tokens; deliberately errs on the high side.
+    """
+    total = 0
+    for piece in _TOKEN_PATTERN.findall(text):
+        total += max(1, math.ceil(len(piece) / 4))
+    return total
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut ``text`` so ``estimate_tokens`` of the result is at most ``max_tokens``."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(text[:middle]) + 1 <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low].rstrip() + "…"
+
+
+class RollingSessionSummary:
+    """
+    Incremental session digest with a capped summary prompt.
+
+    Every answer updates O(1) counters (totals, error categories, missed
+    verbs and tenses) and a short window of recent answers. Every
+    ``update_every`` answers the counters are folded into a compact text
+    digest. ``build_prompt`` combines the digest with the answers since the
+    last fold and trims the result to ``max_prompt_tokens``.
+    """
+
+    def __init__(self,
+                 update_every: int = DEFAULT_UPDATE_EVERY,
+                 max_prompt_tokens: int = DEFAULT_MAX_PROMPT_TOKENS,
+                 explainer: Optional[LocalExplainer] = None) -> None:
+        self.update_every = max(1, int(update_every))
+        self.max_prompt_tokens = max_prompt_tokens
+        self.explainer = explainer or LocalExplainer()
+        self.reset()
+
+    def reset(self) -> None:
+        """Forget the session."""
+        self.total = 0
+        self.correct = 0
+        self.error_categories: Counter = Counter()
+        self.missed_verbs: Counter = Counter()
+        self.missed_tenses: Counter = Counter()
+        self.practiced_tenses: Counter = Counter()
+        self.recent: Deque[str] = deque(maxlen=self.update_every)
+        self.digest = ""
+
+    # -------------------------------------------------------
+    # Recording
+    # -------------------------------------------------------
+    def record(self,
+               exercise: Dict[str, Any],
+               user_answer: str,
+               is_correct: bool) -> None:
+        """Add one submitted answer to the running stats."""
+        correct_answer = exercise.get("answer", "")
+        verb, tense = exercise.get("verb"), exercise.get("tense")
+        category = None
+        if not is_correct:
+            diagnosis = self.explainer.diagnose_mistake(
+                correct_answer, user_answer, verb=verb, tense=tense, person=exercise.get("person")
+            )
+            if diagnosis:
+                verb, tense, category = diagnosis["verb"], diagnosis["tense"], diagnosis["category"]
+            self.error_categories[category or "unclassified"] += 1
+            if verb:
+                self.missed_verbs[verb] += 1
+            if tense:
+                self.missed_tenses[tense] += 1
+
+        self.total += 1
+        self.correct += int(is_correct)
+        if tense:
+            self.practiced_tenses[tense] += 1
+
+        line = (f"{'OK' if is_correct else 'X'} \"{user_answer[:MAX_ANSWER_CHARS]}\" "
+                f"(expected \"{correct_answer}\"")
+        if category:
+            line += f", {MISTAKE_CATEGORIES[category]}"
+        self.recent.append(line + ")")
+
+        if self.total % self.update_every == 0:
+            self._fold()
+
+    def _fold(self) -> None:
+        """Rebuild the digest from the counters and clear the recent window."""
+        self.digest = self._render_stats()
+        self.recent.clear()
+
+    def _render_stats(self) -> str:
+        accuracy = (self.correct / self.total * 100) if self.total else 0.0
+        lines = [f"Answers: {self.total}, correct: {self.correct} ({accuracy:.0f}%)."]
+        if self.error_categories:
+            lines.append("Error types: " + ", ".join(
+                f"{MISTAKE_CATEGORIES.get(name, name)} x{count}"
+                for name, count in self.error_categories.most_common(TOP_ITEMS)
+            ) + ".")
+        if self.missed_verbs:
+            lines.append("Most missed verbs: " + ", ".join(
+                f"{verb} x{count}" for verb, count in self.missed_verbs.most_common(TOP_ITEMS)
+            ) + ".")
+        if self.missed_tenses:
+            lines.append("Most missed tenses: " + ", ".join(
+                f"{tense} x{count}" for tense, count in self.missed_tenses.most_common(TOP_ITEMS)
+            ) + ".")
+        if self.practiced_tenses:
+            lines.append("Tenses practiced: " + ", ".join(sorted(self.practiced_tenses)) + ".")
+        return "\n".join(lines)
+
+    # -------------------------------------------------------
+    # Prompt
+    # -------------------------------------------------------
+    def build_prompt(self) -> str:
+        """
+        Build the end-of-session summary prompt within the token budget.
+
+        The prompt is the digest from the last fold plus the answers since
+        then; the oldest of those are dropped first if it is over budget.
+        """
+        recent: List[str] = list(self.recent)
+        prompt = build_summary_prompt(self.digest, recent)
+        while recent and estimate_tokens(prompt) > self.max_prompt_tokens:
+            recent.pop(0)
+            prompt = build_summary_prompt(self.digest, recent)
+        if estimate_tokens(prompt) > self.max_prompt_tokens:
+            overhead = estimate_tokens(build_summary_prompt("", []))
+            digest = truncate_to_tokens(self.digest, max(1, self.max_prompt_tokens - overhead))
+            prompt = build_summary_prompt(digest, [])
+        return prompt
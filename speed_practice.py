@@ -3,9 +3,16 @@ Speed Practice Mode - The Missing Piece
 Builds conversational fluency through timed production
 """
 
+import random
 import time
 from typing import Dict, List, Tuple, Optional
+from answer_matcher import get_matcher
 from conjugation_engine import SpanishConjugator
+from speed_scheduler import CONVERSATIONAL_SECONDS, SpeedScheduler
+from streaming_stats import LatencyStats, LogHistogram, log_bucket
+
+# Saved answers per verb counted as scheduler evidence (recent sessions dominate)
+PRIOR_WEIGHT = 6
 
 class SpeedPractice:
     """
@@ -13,8 +20,15 @@ class SpeedPractice:
     Simple but addresses the core problem.
     """
     
-    def __init__(self):
+    def __init__(self, progress_tracker=None, policy='ucb', rng: Optional[random.Random] = None):
         self.conjugator = SpanishConjugator()
+        # Optional ProgressTracker holding speed profiles from earlier sessions
+        self.progress_tracker = progress_tracker
+        # Item selection: a speed_scheduler policy name or SelectionPolicy
+        self.policy = policy
+        self.rng = rng or random.Random()
+        self._scheduler: Optional[SpeedScheduler] = None
+        self._scheduler_verbs: Tuple[str, ...] = ()
         
         # Only the most essential verbs for conversation
         # These 20 verbs cover 50% of Spanish conversation
@@ -47,43 +61,70 @@ class SpeedPractice:
             ]
         }
         
-        # Track response times for each verb
-        self.response_times = {}
+        # Streaming response-time statistics for each verb
+        self.verb_stats: Dict[str, LatencyStats] = {}
+        # All-time present-tense histograms, loaded from the tracker on first use
+        self.verb_history: Dict[str, LogHistogram] = {}
         self.accuracy_under_pressure = {}
     
+    @property
+    def scheduler(self) -> SpeedScheduler:
+        """
+        Adaptive item scheduler over essential verbs x yo/tú/él, built on
+        first use (and again if ``essential_verbs`` changes) with each
+        verb's saved response times as prior evidence.
+        """
+        items = [(verb, person) for verb in self.essential_verbs for person in range(3)]
+        if self._scheduler is None or self._scheduler_verbs != tuple(self.essential_verbs):
+            self._scheduler = SpeedScheduler((), self.policy, self.rng)
+            self._scheduler_verbs = tuple(self.essential_verbs)
+            for verb, person in items:
+                fast, slow = self._prior(verb)
+                self._scheduler.add((verb, person), fast, slow)
+        return self._scheduler
+    
+    def _prior(self, verb: str) -> Tuple[float, float]:
+        """Saved answers of ``verb`` as (fast, slow) evidence, capped at PRIOR_WEIGHT."""
+        history = self.history(verb)
+        if not history.count:
+            return 0.0, 0.0
+        fast = sum(history.counts[:log_bucket(CONVERSATIONAL_SECONDS)])
+        weight = min(PRIOR_WEIGHT, history.count) / history.count
+        return fast * weight, (history.count - fast) * weight
+    
+    def next_speed_exercise(self, avoid: Optional[Tuple[str, int]] = None) -> Dict:
+        """
+        The next exercise, for the item the scheduler rates least automatic
+        other than ``avoid`` (a ``(verb, person)`` item, e.g. the one just answered).
+        """
+        verb, person = self.scheduler.next_item(avoid)
+        
+        # Always present tense for speed practice
+        # (Master present before adding complexity)
+        answer = self.conjugator.conjugate(verb, 'present', person)
+        
+        # Create pressure scenario
+        person_labels = ['yo', 'tú', 'él/ella']
+        trigger = self.rng.choice(self.conversation_triggers[person_labels[person]])
+        
+        return {
+            'trigger': trigger,
+            'verb': verb,
+            'verb_english': self.get_verb_meaning(verb),
+            'person': person,
+            'tense': 'present',
+            'answer': answer,
+            'time_limit': 3.0,  # 3 seconds to answer
+            'scenario': f"Quick! Use '{verb}' ({self.get_verb_meaning(verb)})"
+        }
+    
     def generate_speed_round(self, duration_seconds: int = 60) -> List[Dict]:
         """
         Generate rapid-fire exercises for X seconds.
-        Focus: produce correct form FAST.
+        Focus: produce correct form FAST, on the verbs recalled slowest.
         """
-        exercises = []
         prompts_per_round = duration_seconds // 3  # 3 seconds per verb
-        
-        import random
-        for _ in range(prompts_per_round):
-            verb = random.choice(self.essential_verbs)
-            person = random.randint(0, 2)  # Focus on yo/tú/él (most used)
-            
-            # Always present tense for speed practice
-            # (Master present before adding complexity)
-            answer = self.conjugator.conjugate(verb, 'present', person)
-            
-            # Create pressure scenario
-            person_labels = ['yo', 'tú', 'él/ella']
-            trigger = random.choice(self.conversation_triggers[person_labels[person]])
-            
-            exercise = {
-                'trigger': trigger,
-                'verb': verb,
-                'verb_english': self.get_verb_meaning(verb),
-                'person': person,
-                'answer': answer,
-                'time_limit': 3.0,  # 3 seconds to answer
-                'scenario': f"Quick! Use '{verb}' ({self.get_verb_meaning(verb)})"
-            }
-            exercises.append(exercise)
-        
-        return exercises
+        return [self.next_speed_exercise() for _ in range(prompts_per_round)]
     
     def evaluate_speed_response(self, verb: str, person: int, 
                                user_answer: str, response_time: float) -> Dict:
@@ -92,7 +133,8 @@ class SpeedPractice:
         In conversation, slow correct answers = communication breakdown.
         """
         correct_answer = self.conjugator.conjugate(verb, 'present', person)
-        is_correct = user_answer.strip().lower() == correct_answer.lower()
+        # Exact spelling, accents included: speed drills build automaticity
+        is_correct = get_matcher().match(user_answer, correct_answer or '', 'strict').correct
         
         # Speed categories (based on conversation flow)
         if response_time < 1.5:
@@ -104,16 +146,15 @@ class SpeedPractice:
         else:
             speed_rating = "❌ Not conversational"
         
-        # Track performance
-        if verb not in self.response_times:
-            self.response_times[verb] = []
-        self.response_times[verb].append(response_time)
-        
-        # Calculate improvement
-        improvement = None
-        if len(self.response_times[verb]) > 1:
-            prev_avg = sum(self.response_times[verb][:-1]) / len(self.response_times[verb][:-1])
-            improvement = prev_avg - response_time
+        # Track performance; improvement is against the average before this answer
+        stats = self.verb_stats.get(verb)
+        if stats is None:
+            stats = self.verb_stats[verb] = LatencyStats()
+        improvement = stats.mean - response_time if stats.count else None
+        stats.add(response_time)
+        self.history(verb).add(response_time)
+        if self._scheduler is not None:
+            self._scheduler.record((verb, person), is_correct, response_time)
         
         return {
             'correct': is_correct,
@@ -167,16 +208,54 @@ class SpeedPractice:
     def get_weak_spots(self) -> List[Tuple[str, float]]:
         """Identify verbs that are too slow for conversation."""
         slow_verbs = []
-        for verb, times in self.response_times.items():
-            avg_time = sum(times) / len(times)
-            if avg_time > 3.0:  # Not conversational
-                slow_verbs.append((verb, avg_time))
+        for verb, stats in self.verb_stats.items():
+            if stats.mean > 3.0:  # Not conversational
+                slow_verbs.append((verb, stats.mean))
         
         return sorted(slow_verbs, key=lambda x: x[1], reverse=True)
     
+    def get_verb_stats(self) -> Dict[str, Dict]:
+        """Per-verb count, mean, stdev, EWMA, min/max, p50 and p90 in seconds."""
+        return {verb: stats.to_dict() for verb, stats in self.verb_stats.items()}
+    
+    def history(self, verb: str) -> LogHistogram:
+        """
+        All-time present-tense response times for ``verb``: the tracker's
+        saved profile (read once) plus this session's answers.
+        """
+        histogram = self.verb_history.get(verb)
+        if histogram is None:
+            if self.progress_tracker is not None:
+                histogram = self.progress_tracker.get_latency_histogram(verb, 'present')
+            else:
+                histogram = LogHistogram()
+            self.verb_history[verb] = histogram
+        return histogram
+    
+    def get_readiness(self) -> Dict:
+        """
+        Conversational readiness across all sessions: the share of the
+        essential verbs whose all-time average response is under 3 seconds.
+        """
+        profiles = {verb: self.history(verb) for verb in self.essential_verbs}
+        conversational_verbs = [verb for verb, h in profiles.items() if h.count and h.mean < 3.0]
+        need_work = sorted(((verb, h.mean) for verb, h in profiles.items() if h.count and h.mean >= 3.0),
+                           key=lambda item: item[1], reverse=True)
+        readiness_percent = (len(conversational_verbs) / len(self.essential_verbs)) * 100
+        
+        return {
+            'ready': readiness_percent > 70,
+            'readiness_percent': readiness_percent,
+            'conversational_verbs': conversational_verbs,
+            'need_work': need_work[:5],
+            'unpracticed': [verb for verb, h in profiles.items() if not h.count],
+            'profiles': {verb: h.to_dict() for verb, h in profiles.items() if h.count},
+            'message': self.get_readiness_message(readiness_percent)
+        }
+    
     def get_session_summary(self) -> Dict:
         """Focus on what matters: can you speak fluently?"""
-        total_attempts = sum(len(times) for times in self.response_times.values())
+        total_attempts = sum(stats.count for stats in self.verb_stats.values())
         if total_attempts == 0:
             return {'ready': False, 'message': 'No practice data yet'}
         
@@ -184,12 +263,11 @@ class SpeedPractice:
         conversational_verbs = []
         struggling_verbs = []
         
-        for verb, times in self.response_times.items():
-            avg_time = sum(times) / len(times)
-            if avg_time < 3.0:
+        for verb, stats in self.verb_stats.items():
+            if stats.mean < 3.0:
                 conversational_verbs.append(verb)
             else:
-                struggling_verbs.append((verb, avg_time))
+                struggling_verbs.append((verb, stats.mean))
         
         readiness_percent = (len(conversational_verbs) / len(self.essential_verbs)) * 100
         
@@ -198,6 +276,7 @@ class SpeedPractice:
             'readiness_percent': readiness_percent,
             'conversational_verbs': conversational_verbs,
             'need_work': struggling_verbs[:5],  # Top 5 to focus on
+            'verb_stats': self.get_verb_stats(),
             'message': self.get_readiness_message(readiness_percent)
         }
     
@@ -0,0 +1,208 @@
+"""
+Speed Scheduler
+Adaptive choice of the next speed-drill item. Each (verb, person) item
+keeps a Beta posterior over "not yet automatic" (wrong or slow answers);
+a pluggable policy scores items from it and a heap hands out the highest
+score, so a pick or an update costs O(log n)
+"""
+
+import heapq
+import itertools
+import math
+import random
+from typing import Dict, Hashable, Iterable, List, Optional
+
+# Answers at or under INSTANT_SECONDS count as fully automatic, answers at
+# or over CONVERSATIONAL_SECONDS (or wrong) as not automatic; in between is
+# a linear mix (thresholds as in SpeedPractice.evaluate_speed_response)
+INSTANT_SECONDS = 1.5
+CONVERSATIONAL_SECONDS = 3.0
+
+DEFAULT_SPACING = 0.5  # score multiplier after a pick, so rounds interleave items
+# Evidence multiplier per answer: recall speeds up with practice, so older
+# answers should weigh less than recent ones
+DEFAULT_DECAY = 0.7
+
+
+def slowness(correct: bool, response_time: float) -> float:
+    """How far from automatic one answer was, from 0.0 (instant) to 1.0."""
+    if not correct:
+        return 1.0
+    span = CONVERSATIONAL_SECONDS - INSTANT_SECONDS
+    return min(1.0, max(0.0, (response_time - INSTANT_SECONDS) / span))
+
+
+class ItemStats:
+    """Evidence for one item: automatic vs. not-automatic mass and attempts."""
+
+    __slots__ = ('fast', 'slow', 'attempts')
+
+    def __init__(self, fast: float = 0.0, slow: float = 0.0) -> None:
+        self.fast = fast
+        self.slow = slow
+        self.attempts = 0
+
+    @property
+    def evidence(self) -> float:
+        return self.fast + self.slow
+
+    @property
+    def slow_rate(self) -> float:
+        """Posterior mean of "not yet automatic" under a Beta(1, 1) prior."""
+        return (1.0 + self.slow) / (2.0 + self.evidence)
+
+
+class SelectionPolicy:
+    """Scores an item; the scheduler practises the highest score next."""
+
+    name = 'base'
+
+    def score(self, stats: ItemStats, picks: int, rng: random.Random) -> float:
+        raise NotImplementedError
+
+
+class UniformPolicy(SelectionPolicy):
+    """Random order regardless of performance (the original speed rounds)."""
+
+    name = 'uniform'
+
+    def score(self, stats: ItemStats, picks: int, rng: random.Random) -> float:
+        return rng.random()
+
+
+class UCBPolicy(SelectionPolicy):
+    """UCB1: posterior slow rate plus an exploration bonus for rarely seen items."""
+
+    name = 'ucb'
+
+    def __init__(self, exploration: float = 0.2) -> None:
+        self.exploration = exploration
+
+    def score(self, stats: ItemStats, picks: int, rng: random.Random) -> float:
+        bonus = math.sqrt(math.log(picks + 2) / (stats.evidence + 1))
+        return stats.slow_rate + self.exploration * bonus
+
+
+class ThompsonPolicy(SelectionPolicy):
+    """Thompson sampling: a draw from the item's Beta posterior."""
+
+    name = 'thompson'
+
+    def score(self, stats: ItemStats, picks: int, rng: random.Random) -> float:
+        return rng.betavariate(1.0 + stats.slow, 1.0 + stats.fast)
+
+
+POLICIES = {policy.name: policy for policy in (UniformPolicy, UCBPolicy, ThompsonPolicy)}
+
+
+def make_policy(policy) -> SelectionPolicy:
+    """A SelectionPolicy from an instance or one of the POLICIES names."""
+    if isinstance(policy, SelectionPolicy):
+        return policy
+    try:
+        return POLICIES[policy]()
+    except KeyError:
+        raise ValueError(f"Unknown policy '{policy}' (choose from {', '.join(POLICIES)})") from None
+
+
+class SpeedScheduler:
+    """
+    Hand out items one at a time, slowest-to-recall first.
+
+    Scores live in a max-heap with lazy invalidation: a rescored item gets
+    a new entry and its old one is skipped when popped. An item is scored
+    when it is added, picked or answered, so Thompson draws and UCB bonuses
+    are refreshed per item rather than across the whole pool.
+    """
+
+    def __init__(self,
+                 items: Iterable[Hashable],
+                 policy='ucb',
+                 rng: Optional[random.Random] = None,
+                 spacing: float = DEFAULT_SPACING,
+                 decay: float = DEFAULT_DECAY) -> None:
+        self.policy = make_policy(policy)
+        self.rng = rng or random.Random()
+        self.spacing = spacing
+        self.decay = decay
+        self.stats: Dict[Hashable, ItemStats] = {}
+        self.picks = 0
+        self._heap: List[list] = []
+        self._entries: Dict[Hashable, list] = {}
+        self._counter = itertools.count()
+        for item in items:
+            self.add(item)
+
+    def __len__(self) -> int:
+        return len(self.stats)
+
+    def __contains__(self, item: Hashable) -> bool:
+        return item in self.stats
+
+    def add(self, item: Hashable, fast: float = 0.0, slow: float = 0.0) -> None:
+        """Add ``item`` (or reset its evidence) with optional prior evidence."""
+        self.stats[item] = ItemStats(fast, slow)
+        self._push(item, self._score(item))
+
+    def next_item(self, avoid: Optional[Hashable] = None) -> Hashable:
+        """
+        Pop the highest-scoring item and push it back with its score
+        scaled by ``spacing``, so it is not drilled twice in a row.
+
+        ``avoid`` (usually the item just answered) is skipped unless it is
+        the only item.
+
+        Raises:
+            IndexError: If the scheduler has no items.
+        """
+        held = None
+        while self._heap:
+            entry = heapq.heappop(self._heap)
+            neg_score, _, item = entry
+            if item is None:
+                continue
+            if item == avoid and held is None and len(self._entries) > 1:
+                held = entry  # still valid; goes back once another item is picked
+                continue
+            del self._entries[item]
+            self.picks += 1
+            self._push(item, -neg_score * self.spacing)
+            if held is not None:
+                heapq.heappush(self._heap, held)
+            return item
+        raise IndexError("next_item() on an empty scheduler")
+
+    def record(self, item: Hashable, correct: bool, response_time: float) -> None:
+        """
+        Update ``item`` with an answer and rescore it; unknown items are ignored.
+
+        The new score keeps the ``spacing`` penalty: the item was just
+        practised, while the other items still carry their penalties from
+        earlier picks.
+        """
+        stats = self.stats.get(item)
+        if stats is None:
+            return
+        miss = slowness(correct, response_time)
+        stats.slow = stats.slow * self.decay + miss
+        stats.fast = stats.fast * self.decay + 1.0 - miss
+        stats.attempts += 1
+        self._push(item, self._score(item) * self.spacing)
+
+    def slow_rate(self, item: Hashable) -> float:
+        return self.stats[item].slow_rate
+
+    def _score(self, item: Hashable) -> float:
+        return self.policy.score(self.stats[item], self.picks, self.rng)
+
+    def _push(self, item: Hashable, score: float) -> None:
+        old = self._entries.get(item)
+        if old is not None:
+            old[2] = None
+        entry = [-score, next(self._counter), item]
+        self._entries[item] = entry
+        heapq.heappush(self._heap, entry)
+        # Drop invalidated entries once they dominate the heap
+        if len(self._heap) > 4 * len(self._entries) + 64:
+            self._heap = [e for e in self._heap if e[2] is not None]
+            heapq.heapify(self._heap)
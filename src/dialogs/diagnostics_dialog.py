@@ -0,0 +1,94 @@
+"""
+Diagnostics Dialog with Runtime Metrics
+"""
+
+from typing import Optional
+
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem,
+    QTextEdit, QTabWidget, QDialogButtonBox, QHeaderView, QMessageBox
+)
+from PyQt5.QtGui import QFontDatabase
+
+from metrics import MetricsExporter, MetricsRegistry
+
+
+class DiagnosticsDialog(QDialog):
+    """Live view of the metrics registry: a summary table and the raw export"""
+
+    def __init__(self, registry: MetricsRegistry,
+                 exporter: Optional[MetricsExporter] = None, parent=None):
+        super().__init__(parent)
+        self.registry = registry
+        self.exporter = exporter
+        self.setWindowTitle("Diagnostics")
+        self.setMinimumSize(760, 480)
+        self.initUI()
+        self.refresh()
+
+    def initUI(self):
+        layout = QVBoxLayout(self)
+
+        self.export_label = QLabel()
+        layout.addWidget(self.export_label)
+
+        self.tabs = QTabWidget()
+
+        # Summary table: one row per metric and label set
+        self.table = QTableWidget(0, 3)
+        self.table.setHorizontalHeaderLabels(["Metric", "Labels", "Value"])
+        self.table.verticalHeader().setVisible(False)
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeToContents)
+        self.table.horizontalHeader().setStretchLastSection(True)
+        self.tabs.addTab(self.table, "Summary")
+
+        # Raw Prometheus text, as written to the export file
+        self.raw_text = QTextEdit()
+        self.raw_text.setReadOnly(True)
+        self.raw_text.setLineWrapMode(QTextEdit.NoWrap)
+        self.raw_text.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        self.tabs.addTab(self.raw_text, "Prometheus")
+
+        layout.addWidget(self.tabs)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Close)
+        refresh_button = buttons.addButton("Refresh", QDialogButtonBox.ActionRole)
+        refresh_button.clicked.connect(self.refresh)
+        self.export_button = buttons.addButton("Export Now", QDialogButtonBox.ActionRole)
+        self.export_button.clicked.connect(self.exportNow)
+        self.export_button.setEnabled(self.exporter is not None)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+
+    def refresh(self):
+        """Reload the table and raw text from the registry"""
+        rows = self.registry.summary()
+        self.table.setRowCount(len(rows))
+        for row, values in enumerate(rows):
+            for column, value in enumerate(values):
+                self.table.setItem(row, column, QTableWidgetItem(value))
+        self.raw_text.setPlainText(self.registry.to_prometheus())
+
+        if self.exporter is not None:
+            self.export_label.setText(
+                f"Exported every {self.exporter.interval:g} s to {self.exporter.path}")
+        else:
+            self.export_label.setText("Periodic export is off")
+
+    def exportNow(self):
+        """Write the export file immediately"""
+        if self.exporter.export():
+            self.refresh()
+            self.export_label.setText(f"Exported to {self.exporter.path}")
+        else:
+            QMessageBox.warning(self, "Export Failed",
+                                f"Could not write metrics to {self.exporter.path}")
+
+    @staticmethod
+    def showDiagnostics(registry: MetricsRegistry,
+                        exporter: Optional[MetricsExporter] = None, parent=None):
+        """Static method to show the diagnostics dialog"""
+        dialog = DiagnosticsDialog(registry, exporter, parent)
+        return dialog.exec_()
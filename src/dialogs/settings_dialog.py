@@ -379,6 +379,19 @@ class AdvancedSettingsTab(QWidget):
         
         layout.addWidget(backup_group)
         
+        # Diagnostics
+        diagnostics_group = QGroupBox("Diagnostics")
+        diagnostics_layout = QVBoxLayout(diagnostics_group)
+        
+        self.sampling_profiler_checkbox = QCheckBox("Profile slow handlers (takes effect on restart)")
+        self.sampling_profiler_checkbox.setChecked(self.config.get("sampling_profiler", False))
+        self.sampling_profiler_checkbox.setToolTip(
+            f"Samples stacks while handlers and background work run; written to "
+            f"{self.config.get('profile_output', 'logs/profile.collapsed')} on exit")
+        diagnostics_layout.addWidget(self.sampling_profiler_checkbox)
+        
+        layout.addWidget(diagnostics_group)
+        
         # Reset Settings
         reset_group = QGroupBox("Reset Options")
         reset_layout = QVBoxLayout(reset_group)
@@ -472,7 +485,8 @@ class AdvancedSettingsTab(QWidget):
         return {
             "max_stored_responses": self.max_stored_responses_spin.value(),
             "database_path": self.db_path_input.text(),
-            "auto_backup": self.auto_backup_checkbox.isChecked()
+            "auto_backup": self.auto_backup_checkbox.isChecked(),
+            "sampling_profiler": self.sampling_profiler_checkbox.isChecked()
         }
 
 class SettingsDialog(QDialog):
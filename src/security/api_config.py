@@ -19,6 +19,7 @@ Version: 1.0.0
 """
 
 import os
+import copy
 import json
 import configparser
 import logging
@@ -26,6 +27,7 @@ from typing import Dict, Optional, Any, List, Union
 from pathlib import Path
 from datetime import datetime
 
+from config_store import ConfigStore, get_config_store
 from .credentials_manager import CredentialsManager, CredentialsError
 
 
@@ -207,8 +209,8 @@ class APIConfig:
         suffix = config_path.suffix.lower()
         
         if suffix == '.json':
-            with open(config_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            # Served from the shared config store; copied so edits stay local
+            return copy.deepcopy(get_config_store(config_path).data)
         
         elif suffix in ['.ini', '.cfg']:
             parser = configparser.ConfigParser()
@@ -381,7 +383,8 @@ class APIConfig:
             config[parts[-1]] = value
             
             if save:
-                return self.save_config()
+                # Written behind by the config store
+                self._stage_json()
             
             return True
         except Exception as e:
@@ -525,14 +528,12 @@ class APIConfig:
             True if successful
         """
         try:
-            # Update metadata
-            self.config['metadata']['last_updated'] = datetime.now().isoformat()
-            
             if format.lower() == 'json':
-                with open(self.json_config_file, 'w', encoding='utf-8') as f:
-                    json.dump(self.config, f, indent=2, ensure_ascii=False)
+                if not self._stage_json().flush():
+                    return False
                     
             elif format.lower() == 'ini':
+                self.config['metadata']['last_updated'] = datetime.now().isoformat()
                 parser = configparser.ConfigParser()
                 
                 # Convert nested dict to INI format
@@ -560,6 +561,13 @@ class APIConfig:
             self.logger.error(f"Error saving configuration: {e}")
             return False
     
+    def _stage_json(self) -> ConfigStore:
+        """Hand the configuration to the JSON file's config store."""
+        self.config.setdefault('metadata', {})['last_updated'] = datetime.now().isoformat()
+        store = get_config_store(self.json_config_file)
+        store.replace(self.config)
+        return store
+    
     def create_config_template(self, template_path: Optional[Path] = None) -> bool:
         """
         Create a configuration template file.
@@ -25,6 +25,8 @@ import logging
 import hashlib
 import zipfile
 import tempfile
+import time
+import functools
 from typing import Dict, Optional, Any, List, Callable
 from pathlib import Path
 from datetime import datetime, timedelta
@@ -38,6 +40,33 @@ except ImportError:
     CRYPTO_AVAILABLE = False
 
 from .credentials_manager import CredentialsManager
+from metrics import registry
+from sampling_profiler import profiler
+
+BACKUP_SECONDS = registry.histogram(
+    "backup_seconds", "Backup creation and restore time by operation and type")
+BACKUP_OPERATIONS = registry.counter(
+    "backup_operations_total", "Backup creations and restores by type and outcome")
+
+
+def _timed_operation(operation: str, type_arg: str, type_index: int) -> Callable:
+    """
+    Record duration and outcome of a backup method returning a result dict,
+    labelled with its backup type argument (``type_arg``, positional index
+    ``type_index`` after self, default 'full')
+    """
+    def decorate(method: Callable) -> Callable:
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            kind = kwargs.get(type_arg, args[type_index] if len(args) > type_index else 'full')
+            start = time.perf_counter()
+            result = method(self, *args, **kwargs)
+            BACKUP_SECONDS.observe(time.perf_counter() - start, op=operation, type=kind)
+            outcome = 'ok' if result.get('success') else 'error'
+            BACKUP_OPERATIONS.inc(op=operation, type=kind, outcome=outcome)
+            return result
+        return wrapper
+    return decorate
 
 
 class BackupError(Exception):
@@ -100,6 +129,7 @@ class BackupManager:
         
         self.logger.info("Backup manager initialized")
     
+    @_timed_operation('create', 'backup_type', 0)
     def create_backup(self, 
                      backup_type: str = 'full',
                      encrypt: bool = True,
@@ -445,6 +475,7 @@ class BackupManager:
         
         return backups
     
+    @_timed_operation('restore', 'restore_type', 1)
     def restore_backup(self, 
                       backup_name: str,
                       restore_type: str = 'full',
@@ -735,6 +766,7 @@ class BackupManager:
             self.logger.error(f"Failed to schedule backups: {e}")
             return False
     
+    @profiler.profiled("backup.scheduled")
     def _scheduled_backup(self, backup_type: str) -> None:
         """Perform scheduled backup."""
         try:
@@ -8,8 +8,14 @@ import sys
 from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
 
+from config_store import ConfigStore, get_config_store
+
 class FirstRunManager:
-    """Manages first-run detection and configuration flow"""
+    """Manages first-run detection and configuration flow
+    
+    User and project config files are read and written through the shared
+    ConfigStore, so other config classes see the same cached values.
+    """
     
     def __init__(self, config_file: str = "app_config.json"):
         self.config_file = config_file
@@ -57,6 +63,12 @@ class FirstRunManager:
             # Advanced Settings
             "max_stored_responses": 100,
             "auto_backup": False,
+            "log_levels": {},
+            "metrics_export_path": "logs/metrics.prom",
+            "metrics_export_interval": 60,
+            "sampling_profiler": False,
+            "profile_interval_ms": 5,
+            "profile_output": "logs/profile.collapsed",
             "notification_settings": {
                 "session_complete": True,
                 "achievements": True,
@@ -64,63 +76,51 @@ class FirstRunManager:
                 "errors": True
             }
         }
+        
+        self.store: ConfigStore = get_config_store(self.user_config_file)
+        self.project_store: ConfigStore = get_config_store(self.config_file)
     
     def is_first_run(self) -> bool:
         """Check if this is the first run of the application"""
         # Check multiple indicators
         markers = [
             not self.setup_complete_marker.exists(),
-            not self.user_config_file.exists(),
+            not self.store.exists,
             not self.is_setup_completed()
         ]
         return any(markers)
     
     def is_setup_completed(self) -> bool:
         """Check if setup wizard has been completed"""
-        try:
-            if self.user_config_file.exists():
-                with open(self.user_config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                    return config.get("setup_complete", False)
-        except Exception:
-            pass
-        return False
+        return bool(self.store.get("setup_complete", False))
     
     def get_run_count(self) -> int:
         """Get the number of times the application has been run"""
-        try:
-            if self.user_config_file.exists():
-                with open(self.user_config_file, 'r', encoding='utf-8') as f:
-                    config = json.load(f)
-                    return config.get("run_count", 0)
-        except Exception:
-            pass
-        return 0
+        return self.store.get("run_count", 0)
+    
+    def base_configuration(self) -> Dict[str, Any]:
+        """Defaults merged with the project config file (no user settings)"""
+        config = self.default_config.copy()
+        if self.project_store.exists:
+            config.update(self.project_store.data)
+        return config
     
     def load_configuration(self) -> Dict[str, Any]:
         """Load configuration, merging defaults with user settings"""
-        config = self.default_config.copy()
-        
-        # Load from project config file (if exists)
-        if os.path.exists(self.config_file):
-            try:
-                with open(self.config_file, 'r', encoding='utf-8') as f:
-                    project_config = json.load(f)
-                    config.update(project_config)
-            except Exception as e:
-                print(f"Warning: Could not load project config: {e}")
-        
-        # Load from user config file (takes precedence)
-        if self.user_config_file.exists():
-            try:
-                with open(self.user_config_file, 'r', encoding='utf-8') as f:
-                    user_config = json.load(f)
-                    config.update(user_config)
-            except Exception as e:
-                print(f"Warning: Could not load user config: {e}")
+        config = self.base_configuration()
         
+        # User config takes precedence
+        config.update(self.store.data)
         return config
     
+    def record_run(self) -> None:
+        """Count this launch (written behind, not on the startup path)"""
+        from datetime import datetime
+        self.store.update({
+            "run_count": self.get_run_count() + 1,
+            "last_run_date": datetime.now().isoformat()
+        })
+    
     def save_configuration(self, config: Dict[str, Any]) -> bool:
         """Save configuration to user config file"""
         try:
@@ -135,17 +135,15 @@ class FirstRunManager:
             config["run_count"] = config.get("run_count", 0) + 1
             config["version"] = "2.0.0"
             
-            # Save to user config
-            with open(self.user_config_file, 'w', encoding='utf-8') as f:
-                json.dump(config, f, indent=2)
+            # Save to user config (atomic write, now)
+            self.store.replace(config)
+            if not self.store.flush():
+                return False
             
             # Also update project config for compatibility
-            if os.path.exists(self.config_file):
-                try:
-                    with open(self.config_file, 'w', encoding='utf-8') as f:
-                        json.dump(config, f, indent=2)
-                except Exception:
-                    pass  # Don't fail if we can't write to project config
+            if self.project_store.exists:
+                self.project_store.replace(config)
+                self.project_store.flush()  # Don't fail if we can't write to project config
             
             return True
         except Exception as e:
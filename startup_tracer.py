@@ -0,0 +1,165 @@
+"""
+Startup Phase Tracer
+Lightweight nested phase timing for the startup path, exported as a Chrome
+trace-event JSON file and a one-line log summary, with optional cProfile
+capture
+"""
+
+import cProfile
+import io
+import json
+import logging
+import os
+import pstats
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+PROFILE_FLAG = "--profile-startup"
+
+
+class StartupTracer:
+    """
+    Records nested, monotonic timing spans.
+
+    Spans are opened with ``with tracer.span("name"):`` and may nest; each
+    one becomes a complete ("X") event in the Chrome trace-event format,
+    viewable in chrome://tracing or Perfetto. Timing uses
+    ``time.perf_counter_ns`` relative to tracer creation.
+
+    Attributes:
+        enabled (bool): When False, ``span`` is a no-op.
+        events (List[Dict[str, Any]]): Finished trace events.
+    """
+
+    def __init__(self, enabled: bool = True) -> None:
+        self.enabled = enabled
+        self.events: List[Dict[str, Any]] = []
+        self._origin_ns = time.perf_counter_ns()
+        self._depth = 0
+        self._profiler: Optional[cProfile.Profile] = None
+
+    def _now_us(self) -> float:
+        return (time.perf_counter_ns() - self._origin_ns) / 1000.0
+
+    @contextmanager
+    def span(self, name: str, **args: Any) -> Iterator[None]:
+        """Time the enclosed block as one phase."""
+        if not self.enabled:
+            yield
+            return
+        start = self._now_us()
+        depth = self._depth
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            event = {
+                "name": name,
+                "cat": "startup",
+                "ph": "X",
+                "ts": round(start, 1),
+                "dur": round(self._now_us() - start, 1),
+                "pid": os.getpid(),
+                "tid": threading.get_ident(),
+                "args": dict(args, depth=depth),
+            }
+            self.events.append(event)
+
+    def mark(self, name: str) -> None:
+        """Record an instant event (e.g. "window shown")."""
+        if self.enabled:
+            self.events.append({
+                "name": name, "cat": "startup", "ph": "i", "s": "p",
+                "ts": round(self._now_us(), 1), "pid": os.getpid(),
+                "tid": threading.get_ident(),
+            })
+
+    # -------------------------------------------------------
+    # Reporting
+    # -------------------------------------------------------
+    def top_level(self) -> List[Dict[str, Any]]:
+        """Finished depth-0 spans in start order."""
+        spans = [e for e in self.events if e["ph"] == "X" and e["args"]["depth"] == 0]
+        return sorted(spans, key=lambda e: e["ts"])
+
+    def summary(self) -> str:
+        """One-line summary: total time and each top-level phase in ms."""
+        spans = self.top_level()
+        if not spans:
+            return "Startup: no phases recorded"
+        total = max(e["ts"] + e["dur"] for e in spans) - min(e["ts"] for e in spans)
+        phases = ", ".join(f"{e['name']} {e['dur'] / 1000:.1f}" for e in spans)
+        return f"Startup {total / 1000:.1f} ms: {phases}"
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """The trace as a Chrome trace-event JSON object."""
+        return {"traceEvents": sorted(self.events, key=lambda e: e["ts"]),
+                "displayTimeUnit": "ms"}
+
+    def write(self, path: str) -> None:
+        """Write the Chrome trace JSON to ``path``."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_chrome_trace(), f)
+
+    def finish(self, trace_path: Optional[str] = None,
+               profile_path: Optional[str] = None) -> str:
+        """
+        Log the summary, write the trace and stop profiling if active.
+
+        Returns:
+            The summary line.
+        """
+        summary = self.summary()
+        logging.info(summary)
+        if trace_path:
+            try:
+                self.write(trace_path)
+            except OSError as e:
+                logging.error("Could not write startup trace: %s", e)
+        if self._profiler is not None:
+            self.stop_profile(profile_path)
+        return summary
+
+    # -------------------------------------------------------
+    # cProfile
+    # -------------------------------------------------------
+    def start_profile(self) -> None:
+        """Start capturing a cProfile of the startup path."""
+        if self._profiler is None:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+
+    def stop_profile(self, path: Optional[str] = None, top: int = 25) -> None:
+        """
+        Stop profiling.
+
+        With ``path`` the raw stats go to ``path`` and the top entries by
+        cumulative time to ``path + ".txt"``; otherwise the top entries are
+        logged.
+        """
+        if self._profiler is None:
+            return
+        self._profiler.disable()
+        stream = io.StringIO()
+        pstats.Stats(self._profiler, stream=stream).sort_stats("cumulative").print_stats(top)
+        if path:
+            directory = os.path.dirname(path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            self._profiler.dump_stats(path)
+            with open(path + ".txt", "w", encoding="utf-8") as f:
+                f.write(stream.getvalue())
+            logging.info("Startup profile written to %s (top %d in %s.txt)", path, top, path)
+        else:
+            logging.info("Startup profile (top %d by cumulative time):\n%s", top, stream.getvalue())
+        self._profiler = None
+
+
+# Process-wide tracer used by the startup path
+tracer = StartupTracer()
@@ -0,0 +1,259 @@
+"""
+Streaming Statistics
+Constant-memory, O(1)-per-sample estimators for response-time series:
+Welford mean/variance, an exponentially weighted moving average and P²
+quantile markers, bundled per series by LatencyStats, plus a fixed
+log-scale histogram that can be merged and persisted bucket by bucket
+"""
+
+import math
+from bisect import insort
+from typing import Dict, List, Optional, Sequence
+
+DEFAULT_QUANTILES = (0.5, 0.9)
+DEFAULT_EWMA_ALPHA = 0.3  # weight of the newest sample
+
+# Log-scale latency buckets (seconds): bucket 0 is <= 0.1 s, each bucket
+# ends sqrt(2) times higher than the previous, the last is open-ended
+# (above 51.2 s)
+BUCKET_BASE = 0.1
+BUCKET_GROWTH = math.sqrt(2)
+BUCKET_COUNT = 20
+
+
+def log_bucket(value: float) -> int:
+    """Index of the log-scale bucket holding ``value`` seconds."""
+    if value <= BUCKET_BASE:
+        return 0
+    index = math.ceil(math.log(value / BUCKET_BASE, BUCKET_GROWTH) - 1e-9)
+    return min(index, BUCKET_COUNT - 1)
+
+
+def bucket_upper_bound(index: int) -> float:
+    """Upper edge of bucket ``index`` (infinite for the last bucket)."""
+    return math.inf if index >= BUCKET_COUNT - 1 else BUCKET_BASE * BUCKET_GROWTH ** index
+
+
+class Welford:
+    """Running count, mean and variance (Welford's online algorithm)."""
+
+    __slots__ = ('count', 'mean', '_m2')
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.mean = 0.0
+        self._m2 = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        """Sample variance (0.0 with fewer than two samples)."""
+        return self._m2 / (self.count - 1) if self.count > 1 else 0.0
+
+    @property
+    def stdev(self) -> float:
+        return math.sqrt(self.variance)
+
+
+class EWMA:
+    """Exponentially weighted moving average; the first sample seeds it."""
+
+    __slots__ = ('alpha', 'value')
+
+    def __init__(self, alpha: float = DEFAULT_EWMA_ALPHA) -> None:
+        if not 0.0 < alpha <= 1.0:
+            raise ValueError(f"alpha must be in (0, 1], got {alpha}")
+        self.alpha = alpha
+        self.value: Optional[float] = None
+
+    def add(self, value: float) -> None:
+        self.value = value if self.value is None else self.value + self.alpha * (value - self.value)
+
+
+class P2Quantile:
+    """
+    Estimate one quantile with the P² algorithm (Jain & Chlamtac, 1985).
+
+    Five markers track the minimum, the p/2, p and (1+p)/2 quantiles and
+    the maximum; each sample moves them by a piecewise-parabolic step, so
+    memory and update cost are constant. Exact (nearest rank) up to the
+    fifth sample.
+    """
+
+    __slots__ = ('p', '_heights', '_positions', '_desired', '_increments')
+
+    def __init__(self, p: float) -> None:
+        if not 0.0 < p < 1.0:
+            raise ValueError(f"quantile must be in (0, 1), got {p}")
+        self.p = p
+        self._heights: List[float] = []
+        self._positions = [0, 1, 2, 3, 4]
+        self._desired = [0.0, 2 * p, 4 * p, 2 + 2 * p, 4.0]
+        self._increments = [0.0, p / 2, p, (1 + p) / 2, 1.0]
+
+    def add(self, value: float) -> None:
+        heights = self._heights
+        if len(heights) < 5:
+            insort(heights, value)
+            return
+
+        if value < heights[0]:
+            heights[0] = value
+            cell = 0
+        elif value >= heights[4]:
+            heights[4] = value
+            cell = 3
+        else:
+            cell = 0
+            while value >= heights[cell + 1]:
+                cell += 1
+
+        positions = self._positions
+        for i in range(cell + 1, 5):
+            positions[i] += 1
+        for i in range(5):
+            self._desired[i] += self._increments[i]
+
+        for i in (1, 2, 3):
+            offset = self._desired[i] - positions[i]
+            if ((offset >= 1 and positions[i + 1] - positions[i] > 1)
+                    or (offset <= -1 and positions[i - 1] - positions[i] < -1)):
+                step = 1 if offset > 0 else -1
+                height = self._parabolic(i, step)
+                if not heights[i - 1] < height < heights[i + 1]:
+                    height = heights[i] + step * (heights[i + step] - heights[i]) / (
+                        positions[i + step] - positions[i])
+                heights[i] = height
+                positions[i] += step
+
+    def _parabolic(self, i: int, step: int) -> float:
+        q, n = self._heights, self._positions
+        return q[i] + step / (n[i + 1] - n[i - 1]) * (
+            (n[i] - n[i - 1] + step) * (q[i + 1] - q[i]) / (n[i + 1] - n[i])
+            + (n[i + 1] - n[i] - step) * (q[i] - q[i - 1]) / (n[i] - n[i - 1]))
+
+    @property
+    def value(self) -> Optional[float]:
+        """Current estimate, or None before any sample."""
+        heights = self._heights
+        if not heights:
+            return None
+        if len(heights) < 5 or self._positions[4] == 4:
+            return heights[max(0, math.ceil(self.p * len(heights)) - 1)]
+        return heights[2]
+
+
+class LatencyStats:
+    """Mean, spread, trend and quantiles of one series, in constant memory."""
+
+    __slots__ = ('moments', 'ewma', 'minimum', 'maximum', 'quantiles')
+
+    def __init__(self,
+                 quantiles: Sequence[float] = DEFAULT_QUANTILES,
+                 alpha: float = DEFAULT_EWMA_ALPHA) -> None:
+        self.moments = Welford()
+        self.ewma = EWMA(alpha)
+        self.minimum = math.inf
+        self.maximum = -math.inf
+        self.quantiles = {q: P2Quantile(q) for q in quantiles}
+
+    def add(self, value: float) -> None:
+        self.moments.add(value)
+        self.ewma.add(value)
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+        for estimator in self.quantiles.values():
+            estimator.add(value)
+
+    @property
+    def count(self) -> int:
+        return self.moments.count
+
+    @property
+    def mean(self) -> float:
+        return self.moments.mean
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Estimate for one of the tracked quantiles."""
+        return self.quantiles[q].value
+
+    def to_dict(self) -> Dict[str, Optional[float]]:
+        """Plain JSON-ready summary (p50, p90, ... keyed by percent)."""
+        summary: Dict[str, Optional[float]] = {
+            'count': self.count,
+            'mean': self.mean if self.count else None,
+            'stdev': self.moments.stdev,
+            'ewma': self.ewma.value,
+            'min': self.minimum if self.count else None,
+            'max': self.maximum if self.count else None,
+        }
+        for q, estimator in self.quantiles.items():
+            summary[f"p{q * 100:g}"] = estimator.value
+        return summary
+
+
+class LogHistogram:
+    """
+    Sample count, sum and fixed log-scale bucket counts of one series.
+
+    Buckets are the same for every histogram, so histograms merge by
+    adding counts and persist as ``(bucket, count)`` rows.
+    """
+
+    __slots__ = ('counts', 'count', 'total')
+
+    def __init__(self) -> None:
+        self.counts = [0] * BUCKET_COUNT
+        self.count = 0
+        self.total = 0.0
+
+    def add(self, value: float) -> None:
+        self.counts[log_bucket(value)] += 1
+        self.count += 1
+        self.total += value
+
+    def merge(self, other: "LogHistogram") -> None:
+        for index, count in enumerate(other.counts):
+            self.counts[index] += count
+        self.count += other.count
+        self.total += other.total
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.total / self.count if self.count else None
+
+    def quantile(self, q: float) -> Optional[float]:
+        """
+        Estimate the ``q`` quantile, interpolating geometrically inside the
+        bucket that holds it (the last bucket reports its lower edge).
+        """
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            if count and seen + count >= rank:
+                upper = bucket_upper_bound(index)
+                lower = bucket_upper_bound(index - 1) if index else BUCKET_BASE / BUCKET_GROWTH
+                if math.isinf(upper):
+                    return lower
+                fraction = (rank - seen) / count
+                return lower * (upper / lower) ** fraction
+            seen += count
+        return bucket_upper_bound(BUCKET_COUNT - 2)
+
+    def to_dict(self) -> Dict[str, Optional[float]]:
+        """Count, mean, p50 and p90 as plain JSON-ready data."""
+        return {
+            'count': self.count,
+            'mean': self.mean,
+            'p50': self.quantile(0.5),
+            'p90': self.quantile(0.9),
+        }
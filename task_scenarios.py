@@ -5,6 +5,7 @@ Minimal TBLT implementation without overengineering
 
 import random
 from typing import Dict, List, Any, Optional
+from answer_matcher import bounded_edit_distance, get_matcher, normalize
 from conjugation_engine import SpanishConjugator, PERSON_LABELS
 
 class TaskScenario:
@@ -217,7 +218,7 @@ class TaskScenario:
         correct_form = self.conjugator.conjugate(verb, tense, person)
         
         # Check grammatical accuracy
-        grammatical_accuracy = user_answer.strip().lower() == correct_form.lower()
+        grammatical_accuracy = get_matcher().match(user_answer, correct_form, 'strict').correct
         
         # Check communicative success (simplified - in reality would need NLP)
         # For now, we check if the answer is close enough to convey meaning
@@ -241,8 +242,8 @@ class TaskScenario:
         Simple heuristic for communicative success.
         In a real app, this would use NLP to check if meaning is conveyed.
         """
-        user_clean = user_answer.strip().lower()
-        correct_clean = correct_form.lower()
+        user_clean = normalize(user_answer)
+        correct_clean = normalize(correct_form)
         
         # If completely correct, it's communicatively successful
         if user_clean == correct_clean:
@@ -254,30 +255,11 @@ class TaskScenario:
                 return True
         
         # Check Levenshtein distance (allows minor spelling errors)
-        if self._levenshtein_distance(user_clean, correct_clean) <= 2:
+        if bounded_edit_distance(user_clean, correct_clean, 2) <= 2:
             return True
         
         return False
     
-    def _levenshtein_distance(self, s1: str, s2: str) -> int:
-        """Simple edit distance calculation."""
-        if len(s1) < len(s2):
-            return self._levenshtein_distance(s2, s1)
-        if len(s2) == 0:
-            return len(s1)
-        
-        previous_row = range(len(s2) + 1)
-        for i, c1 in enumerate(s1):
-            current_row = [i + 1]
-            for j, c2 in enumerate(s2):
-                insertions = previous_row[j + 1] + 1
-                deletions = current_row[j] + 1
-                substitutions = previous_row[j] + (c1 != c2)
-                current_row.append(min(insertions, deletions, substitutions))
-            previous_row = current_row
-        
-        return previous_row[-1]
-    
     def _generate_feedback(self, grammatical: bool, communicative: bool, goal: str) -> str:
         """Generate appropriate feedback based on performance."""
         if grammatical and communicative:
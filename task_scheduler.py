@@ -0,0 +1,319 @@
+"""
+Task Scheduler
+Priority-aware admission of work onto an asyncio loop: three priority
+classes with per-class concurrency limits under one overall cap,
+cancellation tokens and deadlines, with queue depth, queue wait and
+outcomes exported as metrics
+
+asyncio is only imported on the loop thread, so the GUI can import
+Priority and CancellationToken without paying for it at startup.
+"""
+
+import functools
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from enum import IntEnum
+from typing import TYPE_CHECKING, Any, Callable, Deque, Dict, List, Mapping, Optional
+
+from metrics import registry
+
+if TYPE_CHECKING:
+    import asyncio
+
+logger = logging.getLogger("task_scheduler")
+
+
+class Priority(IntEnum):
+    """Priority classes, most urgent first."""
+
+    INTERACTIVE = 0  # the learner is waiting on it: hints, explanations, new exercises
+    VISIBLE = 1      # shown when ready, nobody blocked on it: session summaries
+    BACKGROUND = 2   # nobody is looking: prefetches, exports, analytics
+
+
+QUEUE_DEPTH = registry.gauge("scheduler_queue_depth", "Tasks waiting for a slot, by priority")
+RUNNING = registry.gauge("scheduler_running", "Tasks holding a slot, by priority")
+WAIT_SECONDS = registry.histogram(
+    "scheduler_wait_seconds", "Time from submission to start, by priority")
+TASKS = registry.counter("scheduler_tasks_total", "Finished tasks by priority and outcome")
+
+
+def default_limits(max_running: int) -> Dict[Priority, int]:
+    """
+    Per-class limits for an overall cap of ``max_running``: interactive work
+    may use every slot, while visible and background work together leave at
+    least one free for it (once there are more than two slots).
+    """
+    return {
+        Priority.INTERACTIVE: max_running,
+        Priority.VISIBLE: max(1, max_running // 2),
+        Priority.BACKGROUND: 1,
+    }
+
+
+class DeadlineExceeded(TimeoutError):
+    """A task did not finish before its deadline."""
+
+
+class CancellationToken:
+    """
+    Cancels every task it was passed to, whether queued or running.
+
+    Thread-safe, and cancelling twice is harmless. A running coroutine is
+    cancelled at its next await; a plain function running in a thread cannot
+    be interrupted, so long ones should check ``cancelled`` themselves.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._callbacks: List[Callable[[], None]] = []
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._cancelled:
+                return
+            self._cancelled = True
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                logger.exception("Cancellation callback failed")
+
+    def add_callback(self, callback: Callable[[], None]) -> None:
+        """Run ``callback`` on cancellation (right away if already cancelled)."""
+        with self._lock:
+            if not self._cancelled:
+                self._callbacks.append(callback)
+                return
+        callback()
+
+
+class _Task:
+    __slots__ = ('func', 'args', 'kwargs', 'priority', 'deadline', 'submitted',
+                 'future', 'state', 'handle', 'expiry')
+
+    def __init__(self, func: Callable, args: tuple, kwargs: Dict[str, Any],
+                 priority: Priority, deadline: Optional[float], submitted: float) -> None:
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.deadline = deadline  # absolute, on the scheduler's clock
+        self.submitted = submitted
+        self.future: Future = Future()
+        self.state = "new"  # new -> queued -> running -> done
+        self.handle: Optional["asyncio.Task"] = None
+        self.expiry: Optional["asyncio.TimerHandle"] = None
+
+
+def _resolve(future: Future, result: Any = None, error: Optional[BaseException] = None) -> None:
+    if future.done():
+        return
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+class TaskScheduler:
+    """
+    Runs submitted work on an asyncio loop in priority order.
+
+    At most ``max_running`` tasks hold a slot at once, and each priority
+    class at most its own limit. When a slot frees up, the oldest queued
+    task of the most urgent class that is under its limit starts, so a
+    burst of background work can delay, but never starve, a hint.
+
+    ``submit`` accepts coroutine functions, which run on the loop, and
+    plain functions, which run in the loop's default thread pool. Either
+    way the work is only created once it is admitted. Everything but
+    ``submit`` runs on the loop thread, reached through ``call_soon`` (a
+    thread-safe ``loop.call_soon_threadsafe``-style callable).
+
+    Attributes:
+        max_running (int): Overall cap on running tasks.
+        limits (Dict[Priority, int]): Cap on running tasks per class.
+    """
+
+    def __init__(self,
+                 call_soon: Callable[..., None],
+                 max_running: int = 4,
+                 limits: Optional[Mapping[Priority, int]] = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.call_soon = call_soon
+        self.max_running = max(1, int(max_running))
+        self.limits = default_limits(self.max_running)
+        self.limits.update({Priority(p): max(1, int(n)) for p, n in (limits or {}).items()})
+        self.clock = clock
+        # Loop-thread state
+        self._queues: Dict[Priority, Deque[_Task]] = {p: deque() for p in Priority}
+        self._running: Dict[Priority, int] = {p: 0 for p in Priority}
+        self._active: List[_Task] = []
+        self._closed = False
+
+    def submit(self,
+               func: Callable[..., Any],
+               *args: Any,
+               priority: Priority = Priority.BACKGROUND,
+               token: Optional[CancellationToken] = None,
+               deadline: Optional[float] = None,
+               **kwargs: Any) -> Future:
+        """
+        Queue ``func(*args, **kwargs)`` from any thread.
+
+        Args:
+            func: Coroutine function or plain function.
+            priority: Priority class.
+            token: Cancels the task when cancelled; one token may be shared
+                by several tasks.
+            deadline: Seconds from now, queueing included, after which the
+                task fails with ``DeadlineExceeded``.
+
+        Returns:
+            A ``concurrent.futures.Future`` for the result. It is cancelled
+            when the task is; cancelling it cancels the task.
+        """
+        now = self.clock()
+        task = _Task(func, args, kwargs, Priority(priority),
+                     None if deadline is None else now + deadline, now)
+        task.future.add_done_callback(
+            lambda future: self._request_cancel(task) if future.cancelled() else None)
+        if token is not None:
+            token.add_callback(lambda: self._request_cancel(task))
+        self.call_soon(self._enqueue, task)
+        return task.future
+
+    def _request_cancel(self, task: _Task) -> None:
+        # Nothing to do once the task has finished (or the scheduler has shut
+        # down); skipping the hop also keeps a closed loop from being revived
+        if task.state != "done" and not self._closed:
+            self.call_soon(self._cancel, task)
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        """Queued and running tasks and the limit, per class name."""
+        return {p.name.lower(): {"queued": len(self._queues[p]), "running": self._running[p],
+                                 "limit": self.limits[p]} for p in Priority}
+
+    def shutdown(self) -> None:
+        """Cancel every queued and running task (loop thread only)."""
+        self._closed = True
+        for priority in Priority:
+            for task in list(self._queues[priority]):
+                self._cancel(task)
+        for task in list(self._active):
+            self._cancel(task)
+            task.future.cancel()  # the loop may stop before the task unwinds
+
+    # -------------------------------------------------------
+    # Loop-thread internals
+    # -------------------------------------------------------
+    def _enqueue(self, task: _Task) -> None:
+        import asyncio
+        if task.state != "new":
+            return  # cancelled before it reached the loop
+        if self._closed:
+            self._cancel(task)
+            return
+        task.state = "queued"
+        self._queues[task.priority].append(task)
+        QUEUE_DEPTH.inc(priority=task.priority.name.lower())
+        if task.deadline is not None:
+            task.expiry = asyncio.get_running_loop().call_later(
+                max(0.0, task.deadline - self.clock()), self._expire, task)
+        self._dispatch()
+
+    def _dequeue(self, task: _Task) -> None:
+        self._queues[task.priority].remove(task)
+        QUEUE_DEPTH.dec(priority=task.priority.name.lower())
+        if task.expiry is not None:
+            task.expiry.cancel()
+            task.expiry = None
+
+    def _dispatch(self) -> None:
+        for priority in Priority:
+            queue = self._queues[priority]
+            while (queue and len(self._active) < self.max_running
+                   and self._running[priority] < self.limits[priority]):
+                self._start(queue[0])
+
+    def _start(self, task: _Task) -> None:
+        import asyncio
+        name = task.priority.name.lower()
+        self._dequeue(task)
+        task.state = "running"
+        self._running[task.priority] += 1
+        self._active.append(task)
+        RUNNING.inc(priority=name)
+        WAIT_SECONDS.observe(self.clock() - task.submitted, priority=name)
+        task.handle = asyncio.get_running_loop().create_task(self._execute(task))
+        task.handle.add_done_callback(lambda handle: self._finished(task, handle))
+
+    async def _execute(self, task: _Task) -> str:
+        """Run the task and resolve its future; returns the outcome label."""
+        import asyncio
+        try:
+            if asyncio.iscoroutinefunction(task.func):
+                work = task.func(*task.args, **task.kwargs)
+            else:
+                work = asyncio.get_running_loop().run_in_executor(
+                    None, functools.partial(task.func, *task.args, **task.kwargs))
+            if task.deadline is not None:
+                result = await asyncio.wait_for(work, max(0.0, task.deadline - self.clock()))
+            else:
+                result = await work
+        except asyncio.TimeoutError as e:  # not yet the builtin TimeoutError before 3.11
+            if task.deadline is None or self.clock() < task.deadline:
+                _resolve(task.future, error=e)
+                return "error"
+            _resolve(task.future, error=DeadlineExceeded(
+                f"Task did not finish within its deadline ({task.priority.name.lower()})"))
+            return "expired"
+        except Exception as e:
+            _resolve(task.future, error=e)
+            return "error"
+        _resolve(task.future, result)
+        return "ok"
+
+    def _finished(self, task: _Task, handle: "asyncio.Task") -> None:
+        # A done callback rather than a finally: a task cancelled before its
+        # first step never runs its body at all
+        task.state = "done"
+        if handle.cancelled():
+            outcome = "cancelled"
+            task.future.cancel()
+        else:
+            outcome = handle.result()
+        self._running[task.priority] -= 1
+        self._active.remove(task)
+        RUNNING.dec(priority=task.priority.name.lower())
+        TASKS.inc(priority=task.priority.name.lower(), outcome=outcome)
+        self._dispatch()
+
+    def _finish_queued(self, task: _Task, outcome: str) -> None:
+        if task.state == "queued":
+            self._dequeue(task)
+        task.state = "done"
+        TASKS.inc(priority=task.priority.name.lower(), outcome=outcome)
+
+    def _expire(self, task: _Task) -> None:
+        if task.state == "queued":
+            task.expiry = None
+            self._finish_queued(task, "expired")
+            _resolve(task.future, error=DeadlineExceeded(
+                f"Task waited past its deadline ({task.priority.name.lower()})"))
+
+    def _cancel(self, task: _Task) -> None:
+        if task.state == "running":
+            task.handle.cancel()
+        elif task.state in ("new", "queued"):
+            self._finish_queued(task, "cancelled")
+            task.future.cancel()
@@ -0,0 +1,135 @@
+"""
+Unit tests for the shared answer matcher.
+
+Tests cover:
+- Normalization and accent folding
+- Banded edit distance against a full edit-distance table with transpositions
+- Classification: exact, accent-only, typo, wrong person, wrong tense
+- Strictness levels and feedback text
+- Batch grading with match_many
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from answer_matcher import (ACCENT, EXACT, TYPO, WRONG, WRONG_PERSON, WRONG_TENSE,
+                            AnswerMatcher, bounded_edit_distance, fold, normalize,
+                            person_index, tense_key, typo_budget)
+from conjugation_engine import SpanishConjugator
+
+
+def _osa_distance(a, b):
+    """Full-table Levenshtein distance with adjacent transpositions."""
+    table = [[i + j if not i or not j else 0 for j in range(len(b) + 1)] for i in range(len(a) + 1)]
+    for i in range(1, len(a) + 1):
+        for j in range(1, len(b) + 1):
+            table[i][j] = min(table[i - 1][j] + 1, table[i][j - 1] + 1,
+                              table[i - 1][j - 1] + (a[i - 1] != b[j - 1]))
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                table[i][j] = min(table[i][j], table[i - 2][j - 2] + 1)
+    return table[-1][-1]
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    return AnswerMatcher(SpanishConjugator())
+
+
+class TestNormalization:
+    def test_normalize_casefolds_and_collapses_whitespace(self):
+        assert normalize("  Me   Levanto ") == "me levanto"
+
+    def test_fold_strips_accents(self):
+        assert fold("Habláis") == "hablais"
+
+    def test_metadata_helpers(self):
+        assert tense_key("Present") == "present"
+        assert tense_key("preterite") == "preterite"
+        assert tense_key("Pluperfect") is None
+        assert person_index("nosotros") == 3
+        assert person_index("él/ella/usted") == 2
+        assert person_index(7) is None
+
+    def test_typo_budget(self):
+        assert typo_budget("hablo") == 0
+        assert typo_budget("hablamos") == 1
+
+
+class TestBoundedEditDistance:
+    def test_matches_full_table_within_limit(self):
+        rng = random.Random(7)
+        for _ in range(2000):
+            a = ''.join(rng.choice('abc') for _ in range(rng.randint(0, 8)))
+            b = ''.join(rng.choice('abc') for _ in range(rng.randint(0, 8)))
+            limit = rng.randint(0, 4)
+            distance = _osa_distance(a, b)
+            assert bounded_edit_distance(a, b, limit) == (distance if distance <= limit else limit + 1)
+
+    def test_gives_up_beyond_limit(self):
+        assert bounded_edit_distance("hablamos", "comieron", 2) == 3
+        assert bounded_edit_distance("a", "abcdef", 1) == 2
+
+    def test_adjacent_swap_is_one_edit(self):
+        assert bounded_edit_distance("habalmos", "hablamos", 1) == 1
+        assert bounded_edit_distance("ab", "ba", 0) == 1
+        assert bounded_edit_distance("abc", "ca", 3) == 3  # no edits inside a swapped pair
+
+
+class TestMatch:
+    def test_exact(self, matcher):
+        result = matcher.match(" Hablo ", "hablo")
+        assert (result.kind, result.correct, result.feedback) == (EXACT, True, "Correct! Great job!")
+
+    def test_accent_only_depends_on_strictness(self, matcher):
+        assert matcher.match("hablais", "habláis").kind == ACCENT
+        assert matcher.match("hablais", "habláis", "normal").correct
+        assert not matcher.match("hablais", "habláis", "strict").correct
+
+    def test_typo_accepted_only_when_lenient(self, matcher):
+        lenient = matcher.match("hablamoss", "hablamos", "lenient")
+        assert (lenient.kind, lenient.correct, lenient.distance) == (TYPO, True, 1)
+        assert lenient.feedback == "Close enough! The exact answer is 'hablamos'."
+        assert not matcher.match("hablamoss", "hablamos", "normal").correct
+        swapped = matcher.match("habalmos", "hablamos", "lenient")
+        assert (swapped.kind, swapped.correct, swapped.distance) == (TYPO, True, 1)
+
+    def test_short_words_get_no_typo_allowance(self, matcher):
+        result = matcher.match("hable", "hablo", "lenient")
+        assert (result.kind, result.correct) == (WRONG, False)
+        assert result.feedback == "Incorrect. The correct answer is 'hablo'."
+
+    def test_wrong_person(self, matcher):
+        result = matcher.match("hablas", "hablo", verb="hablar", tense="present", person=0)
+        assert (result.kind, result.form_of) == (WRONG_PERSON, ("present", 1))
+        assert result.feedback.endswith("That is the tú form.")
+
+    def test_other_person_is_never_a_typo(self, matcher):
+        result = matcher.match("comieron", "comimos", "lenient", verb="comer", tense="preterite", person=3)
+        assert (result.kind, result.correct) == (WRONG_PERSON, False)
+
+    def test_wrong_tense_with_display_names(self, matcher):
+        result = matcher.match("hablé", "hablo", verb="hablar", tense="Present", person="yo")
+        assert (result.kind, result.form_of) == (WRONG_TENSE, ("preterite", 0))
+
+    def test_without_conjugator_falls_back_to_wrong(self):
+        result = AnswerMatcher().match("hablas", "hablo", verb="hablar", tense="present", person=0)
+        assert result.kind == WRONG
+
+
+class TestMatchMany:
+    def test_grades_batch_in_order(self, matcher):
+        results = matcher.match_many([
+            ("hablo", "hablo"),
+            ("hablas", "hablo", "hablar", "present", 0),
+            ("hablamoss", "hablamos"),
+        ], strictness="lenient")
+        assert [r.kind for r in results] == [EXACT, WRONG_PERSON, TYPO]
+
+    def test_duplicate_submissions_share_a_result(self, matcher):
+        results = matcher.match_many([("comes", "como")] * 3)
+        assert results[0] is results[1] is results[2]
@@ -0,0 +1,116 @@
+"""
+Unit tests for the bulk submission grader.
+
+Tests cover:
+- CSV parsing and required-column validation
+- Grading with expected forms conjugated or supplied
+- Identical results in-process and across a process pool
+- Per-student summary totals and the command-line entry point
+"""
+
+import csv
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from bulk_grader import (INVALID, grade_csv, grade_submissions, main,
+                         read_submissions)
+
+ROWS = [
+    ['student', 'sentence', 'verb', 'tense', 'person', 'answer'],
+    ['ana', 'Yo ___ español.', 'hablar', 'present', 'yo', 'hablo'],
+    ['ana', 'Tú ___ mucho.', 'comer', 'Present', '1', 'comes'],
+    ['ana', 'Nosotros ___ ayer.', 'hablar', 'preterite', 'nosotros', 'hablaron'],
+    ['ben', 'Ellos ___ aquí.', 'vivir', 'present', 'ellos', 'vivem'],
+    ['ben', 'Yo ___ en casa.', 'estar', 'present', '0', 'estoy'],
+    ['ben', '???', 'hablar', 'pluperfect', 'yo', 'hablo'],
+]
+
+
+@pytest.fixture
+def submissions_csv(tmp_path):
+    path = tmp_path / "submissions.csv"
+    with open(path, 'w', newline='', encoding='utf-8') as f:
+        csv.writer(f).writerows(ROWS)
+    return path
+
+
+def _read(path):
+    with open(path, newline='', encoding='utf-8') as f:
+        return list(csv.DictReader(f))
+
+
+class TestReadSubmissions:
+    def test_parses_rows_lazily(self):
+        rows = read_submissions(iter(["student,sentence,verb,tense,person,answer\n",
+                                      "ana,s,hablar,present,yo, hablo \n"]))
+        assert next(rows) == ('ana', 's', 'hablar', 'present', 'yo', 'hablo', '')
+
+    def test_missing_column_raises(self):
+        with pytest.raises(ValueError, match="answer"):
+            list(read_submissions(iter(["student,sentence,verb,tense,person\n"])))
+
+
+class TestGradeSubmissions:
+    def test_grades_in_order(self, submissions_csv):
+        with open(submissions_csv, newline='', encoding='utf-8') as f:
+            graded = list(grade_submissions(read_submissions(f), workers=0))
+        assert [row.kind for row in graded] == ['exact', 'exact', 'wrong_person', 'wrong', 'exact', INVALID]
+        assert graded[2].expected == 'hablamos'
+        assert [row.correct for row in graded] == [True, True, False, False, True, False]
+
+    def test_expected_column_overrides_conjugation(self):
+        submission = ('ana', 's', 'hablar', 'present', 'yo', 'hablamos', 'hablamos')
+        graded = list(grade_submissions([submission], workers=0))
+        assert graded[0].correct
+
+    def test_lenient_accepts_typos(self):
+        submission = ('ana', 's', 'hablar', 'present', 'nosotros', 'hablamoss', '')
+        assert not next(grade_submissions([submission], workers=0)).correct
+        assert next(grade_submissions([submission], 'lenient', workers=0)).kind == 'typo'
+
+    def test_unknown_strictness_raises(self):
+        with pytest.raises(ValueError):
+            list(grade_submissions([], 'picky', workers=0))
+
+    def test_process_pool_matches_in_process(self, submissions_csv):
+        with open(submissions_csv, newline='', encoding='utf-8') as f:
+            rows = list(read_submissions(f)) * 50
+        in_process = list(grade_submissions(rows, workers=0))
+        pooled = list(grade_submissions(rows, workers=2, chunk_size=7))
+        assert pooled == in_process
+
+
+class TestGradeCsv:
+    def test_writes_graded_rows_and_summary(self, submissions_csv, tmp_path):
+        report = grade_csv(str(submissions_csv), str(tmp_path / "graded.csv"),
+                           str(tmp_path / "students.csv"), workers=0)
+        assert (report.rows, report.correct, report.invalid, report.students) == (6, 3, 1, 2)
+
+        graded = _read(tmp_path / "graded.csv")
+        assert graded[3]['kind'] == 'wrong' and graded[3]['expected'] == 'viven'
+
+        students = {row['student']: row for row in _read(tmp_path / "students.csv")}
+        assert students['ana']['attempted'] == '3'
+        assert students['ana']['correct'] == '2'
+        assert students['ana']['wrong_person'] == '1'
+        assert students['ben']['invalid'] == '1'
+        # The ungradable row is not held against ben's accuracy
+        assert (students['ben']['attempted'], students['ben']['accuracy']) == ('2', '50.0')
+
+    def test_cli(self, submissions_csv, tmp_path, capsys):
+        output = tmp_path / "out.csv"
+        assert main([str(submissions_csv), "-o", str(output), "--workers", "0"]) == 0
+        out = capsys.readouterr().out
+        assert "6 rows from 2 students" in out
+        assert "60.0% correct, 1 ungradable" in out
+        assert len(_read(output)) == 6
+
+    def test_cli_reports_bad_input(self, tmp_path, capsys):
+        bad = tmp_path / "bad.csv"
+        bad.write_text("name,answer\nana,hablo\n", encoding='utf-8')
+        assert main([str(bad), "--workers", "0"]) == 1
+        assert "Missing CSV column" in capsys.readouterr().err
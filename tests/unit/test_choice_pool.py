@@ -0,0 +1,72 @@
+"""
+Unit tests for the pooled multiple-choice view.
+
+Tests cover:
+- Buttons reused across exercises instead of recreated
+- Growing the pool and hiding unused buttons
+- Selected answer text
+- The exercise-switching benchmark
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+class TestChoicePool:
+    """Test reuse of the radio button pool."""
+
+    def test_buttons_reused(self, app):
+        from main import ChoicePool
+        pool = ChoicePool(size=4)
+        buttons = list(pool.buttons)
+        pool.setChoices(["hablo", "hablas", "habla"])
+        pool.setChoices(["como", "comes", "come", "comemos"])
+        assert pool.buttons == buttons
+        assert pool.choices() == ["como", "comes", "come", "comemos"]
+
+    def test_grows_and_hides(self, app):
+        from main import ChoicePool
+        pool = ChoicePool(size=2)
+        pool.setChoices(["a", "b", "c", "d", "e"])
+        assert len(pool.buttons) == 5
+        pool.setChoices(["x", "y"])
+        assert len(pool.buttons) == 5
+        assert [b.isHidden() for b in pool.buttons] == [False, False, True, True, True]
+        assert pool.choices() == ["x", "y"]
+
+    def test_selected_text(self, app):
+        from main import ChoicePool
+        pool = ChoicePool()
+        assert pool.selectedText() == ""
+        pool.setChoices(["vivo", "vives", "vive"])
+        assert pool.selectedText() == "vivo"
+        pool.buttons[2].setChecked(True)
+        assert pool.selectedText() == "vive"
+        # A new exercise resets the selection to the first choice
+        pool.setChoices(["soy", "eres"])
+        assert pool.selectedText() == "soy"
+
+
+class TestExerciseViewBenchmark:
+    """Test the headless benchmark harness."""
+
+    def test_pool_creates_no_widgets(self, app, tmp_path, monkeypatch):
+        monkeypatch.chdir(tmp_path)
+        from benchmark_exercise_view import format_report, run_benchmark
+        short = run_benchmark(switches=5, strategy="pool", warmup=2)
+        long = run_benchmark(switches=40, strategy="pool", warmup=2)
+        assert long["widgets_after"] == short["widgets_after"]
+        assert short["p50_ms"] <= short["p99_ms"]
+        assert "pool" in format_report([short])
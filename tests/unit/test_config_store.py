@@ -0,0 +1,151 @@
+"""
+Unit tests for the shared write-behind config store.
+
+Tests cover:
+- Cached reads and one shared store per file
+- Debounced, coalesced writes off the calling thread
+- Atomic temp-file-plus-rename persistence
+- Change notifications
+- mtime-based reload of outside edits
+- Config classes as views over the store
+"""
+
+import json
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+
+from config_store import ConfigStore, get_config_store
+
+
+def _read(path):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _wait_for(condition, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.01)
+    return True
+
+
+class TestConfigStore:
+    """Test caching, write-behind and atomic persistence."""
+
+    def test_initial_used_when_file_missing(self, tmp_path):
+        store = ConfigStore(str(tmp_path / "config.json"), {"dark_mode": False})
+        assert store.get("dark_mode") is False
+        assert not store.exists
+        assert not (tmp_path / "config.json").exists()
+
+    def test_burst_of_sets_is_one_write(self, tmp_path):
+        path = tmp_path / "config.json"
+        store = ConfigStore(str(path), write_delay=0.05)
+        for i in range(50):
+            store.set("dark_mode", i % 2 == 0)
+            store.set("counter", i)
+        # Nothing has touched the disk yet
+        assert store.writes == 0 and not path.exists()
+
+        assert _wait_for(lambda: not store.dirty)
+        assert store.writes == 1
+        assert _read(path) == {"dark_mode": False, "counter": 49}
+
+    def test_unchanged_value_schedules_nothing(self, tmp_path):
+        store = ConfigStore(str(tmp_path / "config.json"), {"dark_mode": True})
+        store.set("dark_mode", True)
+        assert not store.dirty
+
+    def test_flush_writes_atomically(self, tmp_path):
+        path = tmp_path / "config.json"
+        path.write_text('{"old": true}', encoding="utf-8")
+        store = ConfigStore(str(path), write_delay=60)
+        store.set("idioma", "español")
+        assert store.flush()
+        assert _read(path) == {"old": True, "idioma": "español"}
+        # No temporary files left behind
+        assert os.listdir(tmp_path) == ["config.json"]
+
+    def test_failed_write_keeps_original_file(self, tmp_path):
+        path = tmp_path / "config.json"
+        path.write_text('{"old": true}', encoding="utf-8")
+        store = ConfigStore(str(path), write_delay=60)
+        store.set("bad", object())
+        assert not store.flush()
+        assert _read(path) == {"old": True}
+        assert store.dirty
+
+    def test_change_notifications(self, tmp_path):
+        store = ConfigStore(str(tmp_path / "config.json"), {"dark_mode": False}, write_delay=60)
+        seen = []
+        store.subscribe(seen.append)
+        store.set("dark_mode", True)
+        store.update({"dark_mode": True, "exercise_count": 7})
+        store.unsubscribe(seen.append)
+        store.set("dark_mode", False)
+        assert seen == [{"dark_mode": True}, {"exercise_count": 7}]
+
+    def test_reload_outside_edit(self, tmp_path):
+        path = tmp_path / "config.json"
+        path.write_text('{"dark_mode": false}', encoding="utf-8")
+        store = ConfigStore(str(path), reload_interval=0)
+        seen = []
+        store.subscribe(seen.append)
+
+        path.write_text('{"dark_mode": true, "extra": 1}', encoding="utf-8")
+        os.utime(path, ns=(time.time_ns(), time.time_ns() + 10**9))
+        assert store.get("dark_mode") is True
+        assert seen == [{"dark_mode": True, "extra": 1}]
+
+    def test_pending_changes_win_over_reload(self, tmp_path):
+        path = tmp_path / "config.json"
+        path.write_text('{"dark_mode": false}', encoding="utf-8")
+        store = ConfigStore(str(path), write_delay=60, reload_interval=0)
+        store.set("dark_mode", True)
+        path.write_text('{"dark_mode": false, "other": 2}', encoding="utf-8")
+        assert store.get("dark_mode") is True
+        store.flush()
+        assert _read(path) == {"dark_mode": True}
+
+    def test_shared_store_per_path(self, tmp_path):
+        path = tmp_path / "shared.json"
+        first = get_config_store(path, {"a": 1})
+        assert get_config_store(str(path)) is first
+        assert get_config_store(str(tmp_path / "other.json")) is not first
+
+
+class TestConfigViews:
+    """Test that the config classes share one store."""
+
+    def test_app_config_set_does_no_io(self, tmp_path):
+        from main import AppConfig
+        path = str(tmp_path / "app_config.json")
+        config = AppConfig(path)
+        config.set("dark_mode", True)
+        assert not os.path.exists(path)
+        assert config.save_config()
+        assert _read(path)["dark_mode"] is True
+
+    def test_first_run_manager_and_enhanced_config_share_user_store(self, tmp_path, monkeypatch):
+        pytest.importorskip("PyQt5")
+        monkeypatch.setattr("pathlib.Path.home", lambda: tmp_path)
+        monkeypatch.chdir(tmp_path)
+        from utils.first_run_manager import FirstRunManager
+        from main_professional import EnhancedAppConfig
+
+        config = EnhancedAppConfig()
+        manager = FirstRunManager()
+        assert manager.store is config.store
+
+        config.set("dark_mode", True)
+        assert manager.load_configuration()["dark_mode"] is True
+        assert config.get("speed_timer") == 3  # Default from the base layer
+        assert manager.get_run_count() == 0  # set() no longer bumps the run count
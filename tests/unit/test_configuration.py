@@ -127,6 +127,9 @@ class TestConfigurationSaving:
         app_config.set("dark_mode", True)
         app_config.set("exercise_count", 12)
         
+        # Writes are debounced; flush before reading the file
+        app_config.store.flush()
+        
         # Verify file was created and contains correct data
         assert os.path.exists(config_path)
         
@@ -149,6 +152,7 @@ class TestConfigurationSaving:
         app_config = AppConfig(config_path)
         app_config.set("dark_mode", True)
         app_config.set("exercise_count", 20)
+        app_config.store.flush()
         
         # Verify changes were saved
         with open(config_path, 'r') as f:
@@ -163,6 +167,7 @@ class TestConfigurationSaving:
         
         app_config = AppConfig(config_path)
         app_config.set("theme_context", "español, français, 中文")
+        app_config.store.flush()
         
         # Verify Unicode is properly saved
         with open(config_path, 'r', encoding='utf-8') as f:
@@ -332,17 +337,20 @@ class TestConfigurationConcurrency:
         config1 = AppConfig(config_path)
         config1.set("dark_mode", True)
         
-        # Create second instance - should load updated value
+        # Create second instance - shares the in-process store
         config2 = AppConfig(config_path)
         assert config2.get("dark_mode") == True
         
         # Modify with second instance
         config2.set("exercise_count", 25)
         
-        # First instance should still have old values until reloaded
-        assert config1.get("exercise_count") != 25
+        # First instance sees the change immediately
+        assert config1.get("exercise_count") == 25
         
-        # But file should contain new values
+        # And the file contains the new values once written
+        config2.store.flush()
+        with open(config_path, 'r') as f:
+            assert json.load(f)["exercise_count"] == 25
         config3 = AppConfig(config_path)
         assert config3.get("exercise_count") == 25
         assert config3.get("dark_mode") == True
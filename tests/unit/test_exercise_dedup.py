@@ -0,0 +1,96 @@
+"""
+Unit tests for the hashed exercise dedup index.
+
+Tests cover:
+- Sentence normalization
+- Persistence across reopen
+- One-time import of the legacy exercise log
+- Bloom filter membership
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from exercise_dedup import BloomFilter, ExerciseDedupIndex, normalize_sentence, sentence_hash
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / "index.db")
+
+
+class TestNormalization:
+    """Test what counts as the same sentence."""
+
+    def test_case_accents_blanks_and_spacing(self):
+        assert normalize_sentence("  Él  ______ al PARQUE. ") == normalize_sentence("el __ al parque.")
+
+    def test_different_sentences_differ(self):
+        assert sentence_hash("Yo ____ pan.") != sentence_hash("Tú ____ pan.")
+        assert len(sentence_hash("Yo ____ pan.")) == 8
+
+
+class TestExerciseDedupIndex:
+    """Test the persistent index."""
+
+    @pytest.mark.parametrize("use_bloom", [True, False])
+    def test_add_and_contains(self, db_path, use_bloom):
+        index = ExerciseDedupIndex(db_path, use_bloom=use_bloom)
+        assert "Yo ____ pan." not in index
+        assert index.add("Yo ____ pan.")
+        assert not index.add("yo ______ pan.")
+        assert "Yo ____ pan." in index
+        assert index.add_many(["A ____.", "B ____.", "a ____."]) == ["A ____.", "B ____."]
+        assert len(index) == 3
+        index.close()
+
+    def test_persists_across_reopen(self, db_path):
+        index = ExerciseDedupIndex(db_path)
+        index.add("Nosotros ____ juntos.")
+        index.close()
+
+        reopened = ExerciseDedupIndex(db_path)
+        assert "Nosotros ____ juntos." in reopened
+        reopened.close()
+
+    def test_legacy_log_imported_once(self, db_path, tmp_path):
+        log = tmp_path / "exercise_log.txt"
+        log.write_text("Uno ____.\nDos ____.\n\nUno ____.\n", encoding="utf-8")
+
+        index = ExerciseDedupIndex(db_path, legacy_log=str(log))
+        assert len(index) == 2
+        assert "Dos ____." in index
+        index.close()
+
+        log.write_text("Tres ____.\n", encoding="utf-8")
+        reopened = ExerciseDedupIndex(db_path, legacy_log=str(log))
+        assert "Tres ____." not in reopened
+        assert reopened.import_log(str(log), force=True) == 1
+        reopened.close()
+
+    def test_missing_log_is_ignored(self, db_path, tmp_path):
+        index = ExerciseDedupIndex(db_path, legacy_log=str(tmp_path / "missing.txt"))
+        assert len(index) == 0
+        index.close()
+
+
+class TestBloomFilter:
+    """Test the Bloom filter front."""
+
+    def test_no_false_negatives(self):
+        bloom = BloomFilter(capacity=1000)
+        keys = [sentence_hash(f"Frase {i}") for i in range(1000)]
+        for key in keys:
+            bloom.add(key)
+        assert all(key in bloom for key in keys)
+
+    def test_false_positive_rate(self):
+        bloom = BloomFilter(capacity=1000, error_rate=0.01)
+        for i in range(1000):
+            bloom.add(sentence_hash(f"Frase {i}"))
+        false_positives = sum(sentence_hash(f"Otra {i}") in bloom for i in range(5000))
+        assert false_positives / 5000 < 0.03
@@ -0,0 +1,96 @@
+"""
+Unit tests for the incremental exercise stream parser.
+
+Tests cover:
+- Emitting each exercise as soon as its closing brace arrives
+- Chunk boundaries anywhere, including inside strings and escapes
+- Markdown fences, surrounding prose and wrapper objects
+- Required-key validation
+- Truncated responses keeping their complete exercises
+"""
+
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from exercise_stream_parser import (ExerciseStreamParser, iter_exercises,
+                                    parse_exercises, validate_exercise)
+
+
+def _exercise(n):
+    return {
+        "sentence": f"Frase {n} con {{llaves}} y [corchetes] y \"comillas\" ______.",
+        "answer": "hablo",
+        "choices": ["hablo", "hablas", "habla", "hablamos"],
+        "translation": f"Sentence {n}",
+    }
+
+
+EXERCISES = [_exercise(n) for n in range(3)]
+RESPONSE = json.dumps(EXERCISES, ensure_ascii=False, indent=2)
+
+
+class TestExerciseStreamParser:
+    """Test incremental parsing of exercise arrays."""
+
+    def test_single_characters(self):
+        parser = ExerciseStreamParser()
+        emitted_at = []
+        for index, char in enumerate(RESPONSE):
+            for exercise in parser.feed(char):
+                emitted_at.append(index)
+                assert exercise == EXERCISES[len(emitted_at) - 1]
+        assert len(emitted_at) == 3
+        # The first exercise is available long before the response ends
+        assert emitted_at[0] < len(RESPONSE) / 2
+
+    @pytest.mark.parametrize("size", [1, 7, 64, 10000])
+    def test_chunk_sizes(self, size):
+        chunks = [RESPONSE[i:i + size] for i in range(0, len(RESPONSE), size)]
+        assert list(iter_exercises(chunks)) == EXERCISES
+
+    def test_fences_and_prose(self):
+        text = "Here are [3] exercises:\n```json\n" + RESPONSE + "\n```\nEnjoy [them]!"
+        assert parse_exercises(text) == EXERCISES
+
+    def test_wrapper_object(self):
+        text = json.dumps({"exercises": EXERCISES}, ensure_ascii=False)
+        assert parse_exercises(text) == EXERCISES
+
+    def test_invalid_items_are_skipped(self):
+        items = [EXERCISES[0], {"sentence": "Sin respuesta"}, "texto", EXERCISES[1]]
+        parser = ExerciseStreamParser()
+        assert parser.feed(json.dumps(items, ensure_ascii=False)) == [EXERCISES[0], EXERCISES[1]]
+        assert parser.rejected == 1
+
+    def test_truncated_response_keeps_complete_items(self):
+        cut = RESPONSE[:RESPONSE.index('"Sentence 2"')]
+        parser = ExerciseStreamParser()
+        assert parser.feed(cut) == EXERCISES[:2]
+        assert parser.truncated
+        assert parser.close() == []
+
+    def test_custom_required_keys(self):
+        item = {"sentence": "Yo ____.", "answer": "como", "choices": ["como"]}
+        assert parse_exercises(json.dumps([item])) == []
+        assert parse_exercises(json.dumps([item]), required_keys=("answer", "choices")) == [item]
+
+    def test_no_json(self):
+        assert parse_exercises("Lo siento, no puedo generar ejercicios.") == []
+
+
+class TestValidateExercise:
+    """Test required-key validation."""
+
+    def test_exercise_key_accepted_as_sentence(self):
+        item = dict(EXERCISES[0])
+        item["exercise"] = item.pop("sentence")
+        assert validate_exercise(item)
+
+    def test_choices_must_be_list(self):
+        item = dict(EXERCISES[0], choices="hablo, hablas")
+        assert not validate_exercise(item)
@@ -0,0 +1,135 @@
+"""
+Unit tests for batched GPT explanations.
+
+Tests cover:
+- Flushing when the batch is full and when the window expires
+- Fan-out of per-item explanations to the matching callbacks
+- Individual fallback for items missing from the batch response
+- Batch response parsing
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from llm_client import AsyncLLMClient
+from explanation_batcher import ExplanationBatcher, parse_batch_response
+
+
+class _Collector:
+    """Thread-safe callback sink that signals once N results arrived."""
+
+    def __init__(self, expected: int):
+        self.expected = expected
+        self.results = {}
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+
+    def callback_for(self, key):
+        def callback(text):
+            with self.lock:
+                self.results[key] = text
+                if len(self.results) >= self.expected:
+                    self.done.set()
+        return callback
+
+
+@pytest.fixture
+def fake_client():
+    """An AsyncLLMClient whose completions are answered locally."""
+    client = AsyncLLMClient(api_key="sk-test")
+    client.prompts = []
+
+    async def complete(prompt, **kwargs):
+        client.prompts.append(prompt)
+        ids = [int(i) for i in re.findall(r"- id (\d+):", prompt)]
+        if not ids:
+            return "single explanation"
+        answered = ids if not getattr(client, "drop_last", False) else ids[:-1]
+        return json.dumps([{"id": i, "explanation": f"explanation {i}"} for i in answered])
+
+    client.complete = complete
+    yield client
+    client.close()
+
+
+def _add(batcher, collector, key, answer="como"):
+    batcher.add("Yo ____ pan.", "como", answer, answer == "como",
+                callback=collector.callback_for(key))
+
+
+class TestExplanationBatcher:
+    """Test coalescing of explanation requests."""
+
+    def test_full_batch_uses_one_call(self, fake_client):
+        batcher = ExplanationBatcher(fake_client, window_seconds=10, max_items=3)
+        collector = _Collector(3)
+        for key in ("a", "b", "c"):
+            _add(batcher, collector, key)
+
+        assert collector.done.wait(5)
+        assert len(fake_client.prompts) == 1
+        assert batcher.batches_sent == 1
+        assert sorted(collector.results.values()) == [
+            "explanation 1", "explanation 2", "explanation 3"
+        ]
+
+    def test_window_flushes_partial_batch(self, fake_client):
+        batcher = ExplanationBatcher(fake_client, window_seconds=0.05, max_items=10)
+        collector = _Collector(2)
+        _add(batcher, collector, "a")
+        _add(batcher, collector, "b", answer="comes")
+
+        assert collector.done.wait(5)
+        assert len(fake_client.prompts) == 1
+        assert collector.results == {"a": "explanation 1", "b": "explanation 2"}
+
+    def test_single_item_uses_plain_prompt(self, fake_client):
+        batcher = ExplanationBatcher(fake_client, window_seconds=0.01, max_items=10)
+        collector = _Collector(1)
+        _add(batcher, collector, "only")
+
+        assert collector.done.wait(5)
+        assert batcher.batches_sent == 0
+        assert collector.results == {"only": "single explanation"}
+
+    def test_missing_items_fall_back_to_single_requests(self, fake_client):
+        fake_client.drop_last = True
+        batcher = ExplanationBatcher(fake_client, window_seconds=10, max_items=2)
+        collector = _Collector(2)
+        _add(batcher, collector, "a")
+        _add(batcher, collector, "b")
+
+        assert collector.done.wait(5)
+        assert collector.results == {"a": "explanation 1", "b": "single explanation"}
+        assert len(fake_client.prompts) == 2
+
+    def test_explicit_flush(self, fake_client):
+        batcher = ExplanationBatcher(fake_client, window_seconds=60, max_items=10)
+        collector = _Collector(2)
+        _add(batcher, collector, "a")
+        _add(batcher, collector, "b")
+        batcher.flush()
+
+        assert collector.done.wait(5)
+
+
+class TestParseBatchResponse:
+    """Test parsing of batch explanation responses."""
+
+    def test_fenced_json(self):
+        text = '```json\n[{"id": 1, "explanation": " Uno "}, {"id": "2", "explanation": "Dos"}]\n```'
+        assert parse_batch_response(text) == {1: "Uno", 2: "Dos"}
+
+    def test_invalid_entries_are_skipped(self):
+        text = '[{"id": "x", "explanation": "bad"}, {"id": 3}, "junk", {"id": 4, "explanation": "ok"}]'
+        assert parse_batch_response(text) == {4: "ok"}
+
+    def test_no_array(self):
+        assert parse_batch_response("Lo siento, no puedo.") == {}
@@ -0,0 +1,67 @@
+"""
+Import-time budget tests.
+
+Runs ``python -X importtime`` in a fresh interpreter and fails if importing
+the application entry modules pulls in the OpenAI stack, the professional
+dialogs, or exceeds the cold-start budget.
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '../..'))
+
+# Cumulative import time budget per entry module, in microseconds. Generous
+# enough for slow CI machines; importing openai alone costs several times this.
+IMPORT_BUDGET_US = {
+    "main": 250_000,
+    "main_professional": 250_000,
+}
+
+# Modules that must only load on first use
+DEFERRED_MODULES = ("openai", "httpx", "asyncio", "llm_client", "explanation_batcher",
+                    "dialogs.setup_wizard", "dialogs.settings_dialog")
+
+
+def _import_times(module):
+    """Return ``{module: cumulative_us}`` for a cold import of ``module``."""
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen", PYTHONDONTWRITEBYTECODE="1")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=PROJECT_ROOT, env=env, capture_output=True, text=True, timeout=120
+    )
+    if result.returncode != 0:
+        pytest.skip(f"{module} cannot be imported here: {result.stderr.strip().splitlines()[-1:]}")
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if line.startswith("import time:") and "cumulative" not in line:
+            name, cumulative = _parse_line(line)
+            times[name] = cumulative
+    return times
+
+
+def _parse_line(line):
+    """Split an ``-X importtime`` line into (module, cumulative_us)."""
+    _, cumulative, name = line.split("|")
+    return name.strip(), int(cumulative)
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGET_US))
+class TestImportTime:
+    """Cold-start import checks for the application entry points."""
+
+    def test_heavy_modules_are_deferred(self, module):
+        times = _import_times(module)
+        loaded = [name for name in DEFERRED_MODULES if name in times]
+        assert not loaded, f"importing {module} eagerly loads {loaded}"
+
+    def test_within_budget(self, module):
+        times = _import_times(module)
+        assert times[module] <= IMPORT_BUDGET_US[module], (
+            f"importing {module} took {times[module] / 1000:.0f} ms "
+            f"(budget {IMPORT_BUDGET_US[module] / 1000:.0f} ms)"
+        )
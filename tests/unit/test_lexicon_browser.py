@@ -0,0 +1,120 @@
+"""
+Unit tests for the full-lexicon verb reference.
+
+Tests cover:
+- Every verb conjugated in every tense up front
+- Accent-insensitive prefix search over verbs, forms and tenses
+- Lazy row fetching in the table model
+- Incremental narrowing of the search range
+- The browser dialog opened on the current verb
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+
+from conjugation_engine import TENSE_NAMES
+from lexicon_browser import HEADERS, Lexicon, LexiconBrowser, LexiconTableModel, exercise_verbs
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+@pytest.fixture(scope="module")
+def lexicon():
+    return Lexicon.build()
+
+
+@pytest.fixture(scope="module")
+def big_lexicon():
+    return Lexicon.build(extra_verbs=[f"verbo{i:04d}ar" for i in range(1500)])
+
+
+def _verbs_and_tenses(model):
+    return [(model.entry(row).verb, model.entry(row).tense) for row in range(model.matchCount)]
+
+
+class TestLexicon:
+    """Test the precomputed lexicon and its index."""
+
+    def test_every_tense_precomputed(self, lexicon):
+        tenses = {entry.tense for entry in lexicon.entries if entry.verb == 'hablar'}
+        assert tenses == set(TENSE_NAMES)
+        ser = next(e for e in lexicon.entries if e.verb == 'ser' and e.tense == 'present')
+        assert ser.forms == ('soy', 'eres', 'es', 'somos', 'sois', 'son')
+        assert 'tener' in lexicon and 'volar' not in lexicon
+
+    def test_extra_verbs_from_exercises(self):
+        verbs = exercise_verbs([{'verb': 'Cocinar '}, {'sentence': 'no verb'}, {'verb': None}])
+        assert verbs == ['Cocinar ']
+        assert 'cocinar' in Lexicon.build(extra_verbs=verbs)
+
+
+class TestLexiconTableModel:
+    """Test lazy fetching and filtering."""
+
+    def test_rows_fetched_in_batches(self, app, big_lexicon):
+        model = LexiconTableModel(big_lexicon, batch=100)
+        assert model.columnCount() == len(HEADERS)
+        assert model.rowCount() == 100
+        assert model.matchCount == len(big_lexicon) > 9000
+        while model.canFetchMore():
+            model.fetchMore()
+        assert model.rowCount() == len(big_lexicon)
+
+    def test_data_without_items(self, app, lexicon):
+        model = LexiconTableModel(lexicon)
+        model.setFilter("ser present")
+        assert model.rowCount() == 2  # Present and Present Subjunctive
+        row = [model.data(model.index(0, column)) for column in range(len(HEADERS))]
+        assert row == ['ser', 'Present', 'soy', 'eres', 'es', 'somos', 'sois', 'son']
+        assert model.headerData(2, 1) == 'yo'
+
+    def test_search_by_form_is_accent_insensitive(self, app, lexicon):
+        model = LexiconTableModel(lexicon)
+        model.setFilter("tengo")
+        assert _verbs_and_tenses(model) == [('tener', 'present')]
+        model.setFilter("HABLAIS")
+        assert _verbs_and_tenses(model) == [('hablar', 'present')]
+        model.setFilter("hableis")
+        assert _verbs_and_tenses(model) == [('hablar', 'present_subjunctive')]
+        model.setFilter("zzz")
+        assert model.rowCount() == 0 and not model.canFetchMore()
+        model.setFilter("")
+        assert model.matchCount == len(lexicon)
+
+    def test_narrowing_searches_inside_previous_range(self, app, big_lexicon):
+        model = LexiconTableModel(big_lexicon)
+        model.setFilter("verbo1")
+        wide = model._spans[0]
+        model.setFilter("verbo12")
+        narrow = model._spans[0]
+        assert wide[0] <= narrow[0] <= narrow[1] <= wide[1]
+        assert model.matchCount == 100 * len(TENSE_NAMES)
+        # Same result as a fresh search
+        fresh = LexiconTableModel(big_lexicon)
+        fresh.setFilter("verbo12")
+        assert _verbs_and_tenses(fresh) == _verbs_and_tenses(model)
+        # Deleting a character widens again
+        model.setFilter("verbo1")
+        assert model._spans[0] == wide
+
+
+class TestLexiconBrowser:
+    """Test the reference dialog."""
+
+    def test_opens_on_query(self, app, lexicon):
+        dialog = LexiconBrowser(lexicon, 'tener')
+        assert dialog.model.matchCount == len(TENSE_NAMES)
+        assert "of" in dialog.count_label.text()
+        dialog.search.setText("")
+        assert dialog.model.matchCount == len(lexicon)
+        dialog.deleteLater()
@@ -0,0 +1,205 @@
+"""
+Unit tests for the asyncio LLM client.
+
+Tests cover:
+- Completions against a local stand-in HTTP server
+- Keep-alive connection reuse across requests
+- Concurrency cap on in-flight requests
+- Error message mapping and shutdown
+- Request latency and outcome metrics
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+pytest.importorskip("openai")
+pytest.importorskip("httpx")
+
+from llm_client import AsyncLLMClient, describe_api_error
+
+
+class _StandInState:
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.connections = set()
+        self.requests = []
+
+
+def _make_handler(state: _StandInState):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            length = int(self.headers.get("Content-Length", 0))
+            body = json.loads(self.rfile.read(length) or b"{}")
+            with state.lock:
+                state.in_flight += 1
+                state.max_in_flight = max(state.max_in_flight, state.in_flight)
+                state.connections.add(self.client_address)
+                state.requests.append(body)
+            time.sleep(state.delay)
+            prompt = body["messages"][-1]["content"]
+            payload = json.dumps({
+                "id": "chatcmpl-test",
+                "object": "chat.completion",
+                "created": 0,
+                "model": body.get("model", "gpt-4o"),
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": f"  echo: {prompt}  "},
+                    "finish_reason": "stop",
+                }],
+            }).encode("utf-8")
+            with state.lock:
+                state.in_flight -= 1
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+    return Handler
+
+
+@pytest.fixture
+def stand_in_server():
+    """Start a local OpenAI-compatible stand-in server."""
+    servers = []
+
+    def start(delay: float = 0.0):
+        state = _StandInState(delay)
+        server = ThreadingHTTPServer(("127.0.0.1", 0), _make_handler(state))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}/v1", state
+
+    yield start
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+class TestAsyncLLMClient:
+    """Test the shared asyncio LLM client."""
+
+    def test_client_is_lazy(self):
+        """Constructing a client must not start a thread or connect."""
+        client = AsyncLLMClient(api_key="sk-test")
+        assert not client.is_running
+        client.close()
+
+    def test_complete_returns_stripped_text(self, stand_in_server):
+        base_url, state = stand_in_server()
+        client = AsyncLLMClient(api_key="sk-test", base_url=base_url)
+        try:
+            result = client.submit("hola", model="gpt-4o", max_tokens=50).result(timeout=10)
+        finally:
+            client.close()
+
+        assert result == "echo: hola"
+        request = state.requests[0]
+        assert request["max_tokens"] == 50
+        assert request["messages"][0]["role"] == "system"
+
+    def test_connections_are_reused(self, stand_in_server):
+        base_url, state = stand_in_server()
+        client = AsyncLLMClient(api_key="sk-test", base_url=base_url, max_concurrency=2)
+        try:
+            for i in range(6):
+                client.submit(f"prompt {i}").result(timeout=10)
+        finally:
+            client.close()
+
+        assert len(state.requests) == 6
+        assert len(state.connections) == 1
+
+    def test_concurrency_is_capped(self, stand_in_server):
+        base_url, state = stand_in_server(delay=0.05)
+        client = AsyncLLMClient(api_key="sk-test", base_url=base_url, max_concurrency=2)
+        try:
+            futures = [client.submit(f"prompt {i}") for i in range(8)]
+            results = [f.result(timeout=10) for f in futures]
+        finally:
+            client.close()
+
+        assert len(results) == 8
+        assert state.max_in_flight <= 2
+
+    def test_callback_receives_future(self, stand_in_server):
+        base_url, _ = stand_in_server()
+        client = AsyncLLMClient(api_key="sk-test", base_url=base_url)
+        done = threading.Event()
+        received = []
+
+        def on_done(future):
+            received.append(future.result())
+            done.set()
+
+        try:
+            client.submit("callback", callback=on_done)
+            assert done.wait(10)
+        finally:
+            client.close()
+
+        assert received == ["echo: callback"]
+
+    def test_connect_failure_is_reported(self):
+        client = AsyncLLMClient(api_key="sk-test", base_url="http://127.0.0.1:9/v1",
+                                connect_timeout=0.5, read_timeout=0.5, max_retries=0)
+        try:
+            with pytest.raises(Exception):
+                client.submit("unreachable").result(timeout=10)
+        finally:
+            client.close()
+        assert not client.is_running
+
+    def test_requests_are_measured(self, stand_in_server):
+        from llm_client import IN_FLIGHT, REQUEST_SECONDS, REQUESTS
+        ok_before = REQUESTS.value(kind="complete", outcome="ok")
+        error_before = REQUESTS.value(kind="complete", outcome="error")
+        timed_before = REQUEST_SECONDS.value(kind="complete")
+
+        base_url, _ = stand_in_server()
+        client = AsyncLLMClient(api_key="sk-test", base_url=base_url)
+        failing = AsyncLLMClient(api_key="sk-test", base_url="http://127.0.0.1:9/v1",
+                                 connect_timeout=0.5, read_timeout=0.5, max_retries=0)
+        try:
+            client.submit("hola").result(timeout=10)
+            client.submit("adios").result(timeout=10)
+            with pytest.raises(Exception):
+                failing.submit("unreachable").result(timeout=10)
+        finally:
+            client.close()
+            failing.close()
+
+        assert REQUESTS.value(kind="complete", outcome="ok") == ok_before + 2
+        assert REQUESTS.value(kind="complete", outcome="error") == error_before + 1
+        assert REQUEST_SECONDS.value(kind="complete") == timed_before + 3
+        assert IN_FLIGHT.value() == 0
+
+
+class TestDescribeApiError:
+    """Test mapping of API exceptions to user-facing messages."""
+
+    def test_rate_limit(self):
+        assert "Rate limit" in describe_api_error(Exception("rate_limit reached"))
+
+    def test_authentication(self):
+        assert "authentication" in describe_api_error(Exception("Invalid api_key"))
+
+    def test_generic(self):
+        assert describe_api_error(Exception("boom")) == "Error: boom"
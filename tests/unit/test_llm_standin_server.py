@@ -0,0 +1,137 @@
+"""
+Unit tests for the local LLM stand-in server and online benchmark.
+
+Tests cover:
+- Prompt classification and per-flow replay
+- Synthesized batch explanation responses
+- Injected errors being retried by the client
+- Streaming responses, including clients that hang up mid-stream
+- Loading recordings from a file
+- Benchmark report contents
+"""
+
+import json
+import os
+import socket
+import struct
+import sys
+import time
+from urllib.parse import urlparse
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from llm_client import AsyncLLMClient
+from llm_standin_server import LLMStandInServer, classify_prompt, load_recordings
+from explanation_batcher import parse_batch_response
+from benchmark_online import percentile, run_benchmark
+from prompts import (build_batch_explanation_prompt, build_exercise_prompt,
+                     build_explanation_prompt, build_hint_prompt, build_summary_prompt)
+
+
+@pytest.fixture
+def server():
+    """A running stand-in server with no artificial latency."""
+    with LLMStandInServer(seed=7) as srv:
+        yield srv
+
+
+@pytest.fixture
+def client(server):
+    """A client pointed at the stand-in server."""
+    llm = AsyncLLMClient(api_key="sk-test", base_url=server.base_url, max_retries=3)
+    yield llm
+    llm.close()
+
+
+class TestClassifyPrompt:
+    """Test flow detection from prompt text."""
+
+    def test_all_flows(self):
+        assert classify_prompt(build_exercise_prompt(3, "Beginner", "present", "yo")) == "generate"
+        assert classify_prompt(build_explanation_prompt("Yo ___", "como", "comes", False)) == "explain"
+        assert classify_prompt(build_hint_prompt("Yo ___", "como")) == "hint"
+        assert classify_prompt(build_summary_prompt("Answers: 3, correct: 2 (67%).", [])) == "summary"
+        items = [{"id": 1, "sentence": "s", "correct_answer": "a",
+                  "user_answer": "b", "is_correct": False}]
+        assert classify_prompt(build_batch_explanation_prompt(items)) == "explain_batch"
+
+
+class TestStandInServer:
+    """Test replay behaviour over real HTTP."""
+
+    def test_generate_returns_exercise_json(self, server, client):
+        text = client.submit(build_exercise_prompt(3, "Beginner", "present", "yo")).result(5)
+        exercises = json.loads(text)
+        assert {"sentence", "answer", "choices"} <= set(exercises[0])
+        assert server.flow_counts == {"generate": 1}
+
+    def test_batch_response_covers_every_id(self, client):
+        items = [{"id": i, "sentence": "s", "correct_answer": "a",
+                  "user_answer": "b", "is_correct": False} for i in (4, 5, 6)]
+        text = client.submit(build_batch_explanation_prompt(items)).result(5)
+        assert sorted(parse_batch_response(text)) == [4, 5, 6]
+
+    def test_injected_errors_are_retried(self, server, client):
+        server.error_rate = 0.3
+        for _ in range(6):
+            assert client.submit(build_hint_prompt("Yo ___", "como")).result(30)
+        assert server.errors_injected > 0
+        assert server.request_count == 6 + server.errors_injected
+
+    def test_streaming(self, client):
+        async def collect():
+            return [piece async for piece in client.stream(build_summary_prompt("Answers: 3, correct: 2 (67%).", []))]
+
+        pieces = client.run(collect()).result(5)
+        assert len(pieces) > 1
+        assert "".join(pieces).startswith("Buen trabajo")
+
+    def test_client_hanging_up_mid_stream(self, server, client, capsys):
+        server.stream_chunk_delay = 0.01
+        body = json.dumps({"stream": True, "messages": [
+            {"content": build_summary_prompt("Answers: 3, correct: 2 (67%).", [])}]}).encode()
+        url = urlparse(server.base_url)
+        with socket.create_connection((url.hostname, url.port)) as sock:
+            sock.sendall(b"POST /v1/chat/completions HTTP/1.1\r\nHost: x\r\n"
+                         b"Content-Length: %d\r\n\r\n" % len(body) + body)
+            assert sock.recv(64).startswith(b"HTTP/1.")
+            # Close with a reset, as a cancelled request's connection does
+            sock.setsockopt(socket.SOL_SOCKET, socket.SO_LINGER, struct.pack("ii", 1, 0))
+        time.sleep(0.3)
+        assert "Traceback" not in capsys.readouterr().err
+        server.stream_chunk_delay = 0.0
+        assert client.submit(build_hint_prompt("Yo ___", "como")).result(5)
+
+    def test_recordings_file(self, tmp_path):
+        path = tmp_path / "recordings.json"
+        path.write_text(json.dumps({"hint": ["uno", "dos"]}), encoding="utf-8")
+        recordings = load_recordings(str(path))
+        assert recordings["hint"] == ["uno", "dos"]
+        assert recordings["generate"]
+
+        srv = LLMStandInServer(recordings=recordings)
+        prompt = build_hint_prompt("Yo ___", "como")
+        assert [srv.response_for(prompt) for _ in range(3)] == ["uno", "dos", "uno"]
+
+
+class TestBenchmark:
+    """Test the benchmark report."""
+
+    def test_percentile(self):
+        values = [float(v) for v in range(1, 101)]
+        assert percentile(values, 50) == 50.0
+        assert percentile(values, 99) == 99.0
+        assert percentile([], 95) == 0.0
+
+    def test_report_has_every_flow(self, server):
+        report = run_benchmark(server.base_url, requests=4, concurrency=2,
+                               stream=True, server=server)
+        assert set(report["flows"]) == {"generate", "explain", "hint", "summary"}
+        for stats in report["flows"].values():
+            assert stats["requests"] == 4
+            assert stats["errors"] == 0
+            assert stats["retries"] == 0
+            assert stats["p50_ms"] <= stats["p95_ms"] <= stats["p99_ms"]
+            assert "ttft_p50_ms" in stats
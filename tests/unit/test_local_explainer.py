@@ -0,0 +1,133 @@
+"""
+Unit tests for local rule-based explanations.
+
+Tests cover:
+- Reverse lookup of conjugated forms
+- Regular, irregular and stem-changing classification
+- Person, tense, accent and wrong-verb mistake detection
+- Over-regularization of irregular and stem-changing verbs
+- Display-name tenses from generated exercises
+- Fallback (None) for forms the engine cannot analyze
+- Explanation latency
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from local_explainer import LocalExplainer
+
+
+@pytest.fixture(scope="module")
+def explainer():
+    return LocalExplainer()
+
+
+class TestAnalysis:
+    """Test form lookup and verb classification."""
+
+    def test_analyze_ambiguous_form(self, explainer):
+        analyses = explainer.analyze("fui")
+        assert ("ser", "preterite", 0) in analyses
+        assert ("ir", "preterite", 0) in analyses
+
+    def test_analyze_unknown_form(self, explainer):
+        assert explainer.analyze("xyz") == []
+
+    def test_classify_verb(self, explainer):
+        assert explainer.classify_verb("tener", "present") == "irregular"
+        assert explainer.classify_verb("tener", "future") == "regular"
+        assert explainer.classify_verb("pensar", "present") == "stem-changing"
+        assert explainer.classify_verb("hablar", "preterite") == "regular"
+
+    def test_add_verb(self):
+        local = LocalExplainer(verbs=[])
+        assert local.analyze("cocino") == []
+        local.add_verb("cocinar")
+        assert ("cocinar", "present", 0) in local.analyze("cocino")
+
+
+class TestExplain:
+    """Test explanation text for common answer patterns."""
+
+    def test_correct_regular(self, explainer):
+        text = explainer.explain("Yo ____ español.", "hablo", "hablo", True)
+        assert "hablar" in text and "-o" in text
+
+    def test_wrong_person(self, explainer):
+        text = explainer.explain("Nosotros ____ pan.", "comemos", "comes", False)
+        assert "tú" in text and "nosotros" in text
+
+    def test_wrong_tense(self, explainer):
+        text = explainer.explain("Ayer ____ mucho.", "trabajé", "trabajo", False)
+        assert "presente" in text and "pretérito" in text
+
+    def test_accent_only(self, explainer):
+        text = explainer.explain("Ayer ____ mucho.", "trabajé", "trabaje", False)
+        assert "tilde" in text
+
+    def test_wrong_verb(self, explainer):
+        text = explainer.explain("Yo ____ agua.", "bebo", "como", False)
+        assert "comer" in text and "beber" in text
+
+    def test_overregularized_irregular(self, explainer):
+        text = explainer.explain("Yo ____ hambre.", "tengo", "teno", False)
+        assert "irregular" in text
+
+    def test_missing_stem_change(self, explainer):
+        text = explainer.explain("Ella ____ mucho.", "piensa", "pensa", False)
+        assert "e->ie" in text
+
+    def test_metadata_disambiguates(self, explainer):
+        text = explainer.explain("Ayer ____ al cine.", "fui", "fui", True,
+                                 verb="ir", tense="preterite", person="yo")
+        assert "\"ir\"" in text
+
+    def test_ambiguous_verb_without_metadata_returns_none(self, explainer):
+        # "fue" is both ser and ir; GPT exercises carry no metadata to tell them apart
+        assert explainer.explain("Ella ____ al parque ayer.", "fue", "va", False) is None
+        text = explainer.explain("Ella ____ al parque ayer.", "fue", "va", False,
+                                 verb="ir", tense="preterite", person="él")
+        assert "\"ir\"" in text and "\"ser\"" not in text
+
+    def test_ambiguous_person_without_metadata_returns_none(self, explainer):
+        # "hablaba" is both yo and él/ella
+        assert explainer.explain("Ella ____ mucho.", "hablaba", "hablo", False) is None
+        assert explainer.explain("Ella ____ mucho.", "hablaba", "hablo", False,
+                                 verb="hablar", tense="imperfect") is None
+        text = explainer.explain("Ella ____ mucho.", "hablaba", "hablo", False,
+                                 verb="hablar", tense="imperfect", person="ella")
+        assert text.splitlines()[0].endswith("para él/ella/usted: raíz \"habl-\" + terminación -aba de los verbos -ar.")
+
+    def test_display_name_tense(self, explainer):
+        text = explainer.explain("", "compartía", "compartia", False,
+                                 verb="compartir", tense="Imperfect", person="él/ella/usted")
+        assert "imperfecto" in text
+        assert explainer.diagnose_mistake("hablo", "hablas", verb="hablar", tense="Present",
+                                          person="yo")["category"] == "person"
+
+    def test_generated_exercises_are_explained(self, explainer):
+        from exercise_generator import ExerciseGenerator
+        generator = ExerciseGenerator()
+        for _ in range(20):
+            exercise = generator.generate_exercise()
+            text = explainer.explain(exercise['sentence'], exercise['answer'], "", False,
+                                     verb=exercise['verb'], tense=exercise['tense'],
+                                     person=exercise['person'])
+            assert text, exercise
+
+    def test_unknown_answer_returns_none(self, explainer):
+        assert explainer.explain("Ella ____ la puerta.", "cerró", "cierra", False) is None
+
+    def test_metadata_mismatch_returns_none(self, explainer):
+        assert explainer.explain("Yo ____.", "hablo", "hablo", True, verb="comer") is None
+
+    def test_under_ten_milliseconds(self, explainer):
+        start = time.perf_counter()
+        for _ in range(100):
+            explainer.explain("Nosotros ____ pan.", "comemos", "comes", False)
+        assert (time.perf_counter() - start) / 100 < 0.01
@@ -0,0 +1,152 @@
+"""
+Unit tests for the queue-based logging pipeline.
+
+Tests cover:
+- Records written by the listener thread, not the caller
+- Size- and time-based rotation with gzip-compressed backups
+- Truncation and per-call-site sampling of large payloads
+- Per-logger levels from settings
+"""
+
+import gzip
+import logging
+import logging.handlers
+import os
+import sys
+import threading
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+import log_pipeline
+from log_pipeline import (CompressingRotatingFileHandler, PayloadFilter,
+                          apply_logger_levels, configure_logging, stop_logging)
+
+
+def _record(message, level=logging.INFO, lineno=10, args=None):
+    return logging.LogRecord("test", level, "/app/main.py", lineno, message, args, None)
+
+
+@pytest.fixture
+def restore_root_logger():
+    root = logging.getLogger()
+    handlers, level = root.handlers[:], root.level
+    yield
+    stop_logging()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    for handler in handlers:
+        root.addHandler(handler)
+    root.setLevel(level)
+
+
+class TestConfigureLogging:
+    """Test the queue handler and listener thread."""
+
+    def test_records_written_by_listener_thread(self, tmp_path, restore_root_logger):
+        log_file = tmp_path / "logs" / "app.log"
+        threads = []
+
+        class ThreadRecorder(logging.Handler):
+            def emit(self, record):
+                threads.append(threading.get_ident())
+
+        configure_logging(str(log_file), logging.Formatter("%(levelname)s %(message)s"),
+                          console=False)
+        root = logging.getLogger()
+        assert len(root.handlers) == 1
+        assert isinstance(root.handlers[0], logging.handlers.QueueHandler)
+        log_pipeline._listener.handlers += (ThreadRecorder(),)
+
+        logging.info("hola %s", "mundo")
+        stop_logging()
+
+        assert log_file.read_text(encoding="utf-8") == "INFO hola mundo\n"
+        assert threads and threading.get_ident() not in threads
+
+    def test_default_and_custom_logger_levels(self, tmp_path, restore_root_logger):
+        configure_logging(str(tmp_path / "app.log"), logging.Formatter("%(message)s"),
+                          logger_levels={"openai": "DEBUG"}, console=False)
+        assert logging.getLogger("httpx").level == logging.WARNING
+        assert logging.getLogger("openai").level == logging.DEBUG
+
+
+class TestRotation:
+    """Test size/time rotation and compression."""
+
+    def test_size_rotation_compresses_backups(self, tmp_path):
+        path = tmp_path / "app.log"
+        handler = CompressingRotatingFileHandler(str(path), max_bytes=200, backup_count=2)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        for i in range(30):
+            handler.emit(_record(f"line {i:03d} " + "x" * 40))
+        handler.close()
+
+        assert sorted(os.listdir(tmp_path)) == ["app.log", "app.log.1.gz", "app.log.2.gz"]
+        with gzip.open(tmp_path / "app.log.1.gz", "rt", encoding="utf-8") as f:
+            assert f.read().startswith("line ")
+
+    def test_time_rotation(self, tmp_path):
+        path = tmp_path / "app.log"
+        handler = CompressingRotatingFileHandler(str(path), max_bytes=0, rotate_interval=3600)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        handler.emit(_record("old"))
+        handler.rollover_at = time.time() - 1
+        handler.emit(_record("new"))
+        handler.close()
+
+        assert path.read_text(encoding="utf-8") == "new\n"
+        with gzip.open(tmp_path / "app.log.1.gz", "rt", encoding="utf-8") as f:
+            assert f.read() == "old\n"
+
+    def test_uncompressed_backups(self, tmp_path):
+        path = tmp_path / "app.log"
+        handler = CompressingRotatingFileHandler(str(path), max_bytes=10, compress=False)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        handler.emit(_record("first message"))
+        handler.emit(_record("second message"))
+        handler.close()
+        assert (tmp_path / "app.log.1").read_text(encoding="utf-8") == "first message\n"
+
+
+class TestPayloadFilter:
+    """Test truncation and sampling of large payloads."""
+
+    def test_small_messages_untouched(self):
+        record = _record("Raw %s", args=("ok",))
+        assert PayloadFilter(max_chars=100).filter(record)
+        assert record.getMessage() == "Raw ok"
+
+    def test_large_message_truncated(self):
+        record = _record("Raw GPT response:\n%s", args=("y" * 5000,))
+        assert PayloadFilter(max_chars=100).filter(record)
+        message = record.getMessage()
+        assert message.startswith("Raw GPT response:\nyyy")
+        assert message.endswith("[truncated 4918 chars]")
+
+    def test_large_messages_sampled_per_call_site(self):
+        payload_filter = PayloadFilter(max_chars=10, sample_every=5)
+        kept = [payload_filter.filter(_record("z" * 50)) for _ in range(12)]
+        assert kept == [True] + [False] * 4 + [True] + [False] * 4 + [True, False]
+        assert payload_filter.dropped == 9
+        # Another call site has its own counter
+        assert payload_filter.filter(_record("z" * 50, lineno=99))
+
+    def test_warnings_never_dropped(self):
+        payload_filter = PayloadFilter(max_chars=10, sample_every=100)
+        assert all(payload_filter.filter(_record("e" * 50, level=logging.ERROR)) for _ in range(5))
+
+
+class TestLoggerLevels:
+    """Test per-logger levels from settings."""
+
+    def test_apply_levels(self):
+        apply_logger_levels({"conjugation_gui.security": "debug"})
+        assert logging.getLogger("conjugation_gui.security").level == logging.DEBUG
+        logging.getLogger("conjugation_gui.security").setLevel(logging.NOTSET)
+
+    def test_invalid_level_ignored(self):
+        apply_logger_levels({"conjugation_gui.backup": "LOUD"})
+        assert logging.getLogger("conjugation_gui.backup").level == logging.NOTSET
@@ -0,0 +1,199 @@
+"""
+Unit tests for the runtime metrics registry.
+
+Tests cover:
+- Counters, gauges and fixed-bucket histograms with labels
+- Prometheus text and JSON rendering, atomic file writes
+- Collectors and the periodic exporter
+- Instrumented progress database writes, exercise generation and answer caches
+- The diagnostics dialog summary table
+"""
+
+import json
+import math
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from metrics import Counter, Gauge, Histogram, MetricsExporter, MetricsRegistry, registry
+
+
+class TestMetricTypes:
+    def test_counter_by_labels(self):
+        counter = Counter("requests_total")
+        counter.inc()
+        counter.inc(2, outcome="ok")
+        counter.inc(outcome="ok")
+        assert counter.value() == 1
+        assert counter.value(outcome="ok") == 3
+        with pytest.raises(ValueError):
+            counter.inc(-1)
+
+    def test_gauge_up_and_down(self):
+        gauge = Gauge("in_flight")
+        gauge.inc()
+        gauge.inc()
+        gauge.dec()
+        assert gauge.value() == 1
+        gauge.set(7, cache="fold")
+        assert gauge.value(cache="fold") == 7
+
+    def test_histogram_buckets_and_quantile(self):
+        histogram = Histogram("latency_seconds", buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 5.0):
+            histogram.observe(value)
+        assert histogram.value() == 4
+        assert histogram.mean() == pytest.approx(1.4125)
+        assert histogram.quantile(0.5) == 0.1
+        assert histogram.quantile(0.75) == 1.0
+        assert math.isinf(histogram.quantile(1.0))
+        assert histogram.quantile(0.5, op="missing") is None
+
+    def test_histogram_time_records_on_exception(self):
+        histogram = Histogram("op_seconds")
+        with pytest.raises(RuntimeError):
+            with histogram.time(op="write"):
+                raise RuntimeError("disk full")
+        assert histogram.value(op="write") == 1
+
+
+class TestRegistry:
+    def test_get_or_create(self):
+        reg = MetricsRegistry()
+        assert reg.counter("a_total") is reg.counter("a_total")
+        with pytest.raises(ValueError, match="already registered"):
+            reg.gauge("a_total")
+
+    def test_prometheus_text(self):
+        reg = MetricsRegistry()
+        reg.counter("gpt_total", "GPT requests").inc(outcome='bad "quote"')
+        reg.histogram("db_seconds", buckets=(0.01, 0.1)).observe(0.05, op="commit")
+        text = reg.to_prometheus()
+        assert "# HELP gpt_total GPT requests\n# TYPE gpt_total counter\n" in text
+        assert 'gpt_total{outcome="bad \\"quote\\""} 1' in text
+        assert 'db_seconds_bucket{op="commit",le="0.01"} 0' in text
+        assert 'db_seconds_bucket{op="commit",le="0.1"} 1' in text
+        assert 'db_seconds_bucket{op="commit",le="+Inf"} 1' in text
+        assert 'db_seconds_count{op="commit"} 1' in text
+        assert text.endswith("\n")
+
+    def test_json_snapshot(self):
+        reg = MetricsRegistry()
+        reg.histogram("gen_seconds", buckets=(1.0,)).observe(0.5, kind="batch")
+        data = json.loads(json.dumps(reg.to_dict()))
+        value = data["metrics"]["gen_seconds"]["values"][0]
+        assert value["labels"] == {"kind": "batch"}
+        assert value["count"] == 1 and value["buckets"] == {"1": 1, "+Inf": 0}
+
+    def test_collectors_run_before_snapshot(self):
+        reg = MetricsRegistry()
+        gauge = reg.gauge("cache_size")
+        reg.add_collector(lambda: gauge.set(42))
+        reg.add_collector(lambda: 1 / 0)  # a broken collector is logged, not raised
+        assert "cache_size 42" in reg.to_prometheus()
+
+    def test_write_by_extension(self, tmp_path):
+        reg = MetricsRegistry()
+        reg.counter("x_total").inc()
+        prom, js = tmp_path / "out" / "metrics.prom", tmp_path / "metrics.json"
+        reg.write(str(prom))
+        reg.write(str(js))
+        assert "x_total 1" in prom.read_text(encoding="utf-8")
+        assert json.loads(js.read_text(encoding="utf-8"))["metrics"]["x_total"]["values"][0]["value"] == 1
+        assert not (tmp_path / "metrics.json.tmp").exists()
+
+    def test_summary_and_report(self):
+        reg = MetricsRegistry()
+        reg.counter("errors_total").inc(source="api")
+        reg.histogram("db_write_seconds").observe(0.004, op="record_attempt")
+        rows = dict(((name, labels), value) for name, labels, value in reg.summary())
+        assert rows[("errors_total", "source=api")] == "1"
+        assert rows[("db_write_seconds", "op=record_attempt")] == "n=1, mean 4.0 ms, p90 <= 5.0 ms"
+        assert "db_write_seconds" in reg.format_report()
+        assert MetricsRegistry().format_report() == "No metrics recorded yet"
+
+
+class TestExporter:
+    def test_periodic_and_final_export(self, tmp_path):
+        reg = MetricsRegistry()
+        counter = reg.counter("ticks_total")
+        path = tmp_path / "metrics.prom"
+        exporter = MetricsExporter(reg, str(path), interval=0.02)
+        exporter.start()
+        deadline = time.monotonic() + 5
+        while not path.exists() and time.monotonic() < deadline:
+            time.sleep(0.01)
+        assert path.exists()
+        counter.inc(5)
+        exporter.stop()
+        assert "ticks_total 5" in path.read_text(encoding="utf-8")
+
+    def test_export_failure_is_reported(self, tmp_path):
+        blocker = tmp_path / "file"
+        blocker.write_text("x")
+        exporter = MetricsExporter(MetricsRegistry(), str(blocker / "metrics.prom"))
+        assert exporter.export() is False
+
+
+class TestInstrumentation:
+    def test_progress_tracker_writes(self, tmp_path):
+        from progress_tracker import DB_WRITE_SECONDS, ProgressTracker
+        before = DB_WRITE_SECONDS.value(op="record_attempt")
+        tracker = ProgressTracker(str(tmp_path / "progress.db"))
+        session = tracker.start_session()
+        tracker.record_attempt("hablar", "present", 0, "hablo", "hablo", True)
+        tracker.update_session(session, 1, 1, ["hablar"])
+        tracker.close()
+        assert DB_WRITE_SECONDS.value(op="record_attempt") == before + 1
+        assert DB_WRITE_SECONDS.value(op="start_session") >= 1
+        assert DB_WRITE_SECONDS.value(op="update_session") >= 1
+
+    def test_exercise_generation(self):
+        from exercise_generator import EXERCISES_GENERATED, GENERATION_SECONDS, ExerciseGenerator
+        before = EXERCISES_GENERATED.value(kind="batch")
+        ExerciseGenerator().generate_batch(count=3)
+        assert EXERCISES_GENERATED.value(kind="batch") == before + 3
+        assert GENERATION_SECONDS.value(kind="batch") >= 1
+
+    def test_answer_cache_collector(self):
+        from answer_matcher import fold
+        fold("Habláis")
+        fold("Habláis")
+        registry.collect()
+        assert registry.get("answer_cache_hits").value(cache="fold") >= 1
+        assert registry.get("answer_cache_misses").value(cache="fold") >= 1
+
+    def test_backup_operations(self, tmp_path):
+        pytest.importorskip("schedule")
+        from security.backup_manager import BACKUP_OPERATIONS, BackupManager
+        manager = BackupManager(backup_dir=tmp_path)
+        before = BACKUP_OPERATIONS.value(op="restore", type="config", outcome="error")
+        result = manager.restore_backup("missing", "config")
+        assert result["success"] is False
+        assert BACKUP_OPERATIONS.value(op="restore", type="config", outcome="error") == before + 1
+
+
+class TestDiagnosticsDialog:
+    def test_table_lists_metrics(self):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+        sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../../src'))
+        from dialogs.diagnostics_dialog import DiagnosticsDialog
+        app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+        reg = MetricsRegistry()
+        reg.counter("app_errors_total").inc(source="parsing")
+        dialog = DiagnosticsDialog(reg)
+        assert dialog.table.rowCount() == 1
+        assert dialog.table.item(0, 0).text() == "app_errors_total"
+        assert "app_errors_total" in dialog.raw_text.toPlainText()
+        assert not dialog.export_button.isEnabled()
+
+        reg.counter("app_errors_total").inc(source="api")
+        dialog.refresh()
+        assert dialog.table.rowCount() == 2
+        assert app is not None
@@ -0,0 +1,165 @@
+"""
+Unit tests for the headless practice engine.
+
+Tests cover:
+- Answer checking at each strictness level
+- Loading sets and navigating exercises
+- Submitting answers, scoring and progress recording
+- Speed timing, task evaluation and local explanations
+- Custom exercise parsing and answer-free client views
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from conjugation_engine import SpanishConjugator
+from practice_engine import PracticeSession, check_answer, parse_custom_exercises, public_exercise
+
+
+def _exercise(answer="hablo", **extra):
+    exercise = {"sentence": "Yo ______ español.", "answer": answer,
+                "choices": [answer, "hablas", "habla", "hablan"]}
+    exercise.update(extra)
+    return exercise
+
+
+class FakeTracker:
+    def __init__(self):
+        self.attempts = []
+
+    def record_attempt(self, *args):
+        self.attempts.append(args)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestCheckAnswer:
+    """Test strictness levels."""
+
+    def test_levels(self):
+        assert check_answer(" Hablo ", "hablo")[0]
+        assert check_answer("hablais", "habláis")[0]
+        assert not check_answer("hablais", "habláis", "strict")[0]
+        assert check_answer("hablamoss", "hablamos", "lenient")[0]
+        assert check_answer("como", "hablo") == (False, "Incorrect. The correct answer is 'hablo'.")
+
+
+class TestPracticeSession:
+    """Test navigation, scoring and per-mode evaluation."""
+
+    def test_navigation(self):
+        session = PracticeSession()
+        assert session.exercise is None and session.total == 0
+        session.load([_exercise(), _exercise("como")])
+        assert session.exercise["answer"] == "hablo"
+        assert session.next() and session.exercise["answer"] == "como"
+        assert not session.next() and session.finished
+        assert session.prev() and not session.prev()
+
+    def test_submit_scores_and_records(self):
+        tracker = FakeTracker()
+        clock = FakeClock()
+        session = PracticeSession(progress_tracker=tracker, clock=clock)
+        session.load([_exercise(verb="hablar", tense="Present", person="yo")])
+        clock.now += 2.5
+        result = session.submit("hablo", explain=False)
+        assert result["correct"] and result["kind"] == "standard"
+        assert result["explanation"] is None
+        session.submit("hablas")
+        assert session.summary()["attempted"] == 2
+        assert session.summary()["accuracy"] == 50.0
+        # Timed like every attempt, but kept out of the speed profile
+        assert tracker.attempts[0] == ("hablar", "Present", 0, "hablo", "hablo", True, 2.5, None, None, False)
+
+        session.reset()
+        assert session.stats.total_attempted == 0 and session.current == 0
+
+    def test_recorded_person_index(self):
+        tracker = FakeTracker()
+        session = PracticeSession(progress_tracker=tracker)
+        session.load([_exercise("habla", verb="hablar", tense="Present", person="él"),
+                      _exercise("hablan", verb="hablar", tense="Present", person="ellos/ellas/ustedes"),
+                      _exercise(verb="hablar", tense="Present", person="unknown")])
+        for answer in ("habla", "hablan", "hablo"):
+            session.submit(answer, explain=False)
+            session.next()
+        assert [attempt[2] for attempt in tracker.attempts] == [2, 5, 0]
+
+    def test_submit_requires_exercise_and_answer(self):
+        session = PracticeSession()
+        with pytest.raises(ValueError):
+            session.submit("hablo")
+        session.load([_exercise()])
+        with pytest.raises(ValueError):
+            session.submit("   ")
+
+    def test_local_explanation(self):
+        from local_explainer import LocalExplainer
+        session = PracticeSession(explainer=LocalExplainer())
+        session.load([_exercise(verb="hablar", tense="present", person=0)])
+        assert session.submit("hablas")["explanation"]
+
+    def test_speed_timing(self):
+        clock = FakeClock()
+        session = PracticeSession(clock=clock)
+        exercises = session.start_speed(count=3, time_limit=3, verbs=["hablar"])
+        assert session.mode == "speed" and len(exercises) == 3
+        clock.now += 1.25
+        result = session.submit(exercises[0]["answer"])
+        assert result["kind"] == "speed"
+        assert result["response_time"] == pytest.approx(1.25)
+        assert "Instant" in result["speed_rating"]
+        # The next answer is timed from the previous submission
+        session.next()
+        clock.now += 4
+        assert session.submit("x")["response_time"] == pytest.approx(4)
+
+    def test_speed_timing_ends_with_speed_set(self):
+        session = PracticeSession()
+        session.start_speed(count=1, verbs=["hablar"])
+        session.load([_exercise(verb="hablar", person=0)])
+        assert session.submit("hablo")["kind"] == "standard"
+
+    def test_task_mode(self):
+        session = PracticeSession()
+        exercises = session.start_task(2)
+        assert session.mode == "task" and exercises
+        result = session.submit(exercises[0]["answer"])
+        assert result["kind"] == "task"
+        assert result["task"]["grammatically_correct"]
+
+    def test_task_mode_skips_unconjugatable_tasks(self):
+        session = PracticeSession()
+        # This scenario includes a reflexive verb the engine cannot conjugate
+        exercises = session.start_task(10, "daily_routine")
+        assert exercises and all(exercise["answer"] for exercise in exercises)
+
+    def test_review_without_tracker(self):
+        assert PracticeSession().start_review() == []
+
+
+class TestHelpers:
+    """Test exercise helpers."""
+
+    def test_parse_custom_exercises(self):
+        exercises = parse_custom_exercises(
+            "# comment\nMañana _____ (hablar, futuro, nosotros)\nno blank here\n", SpanishConjugator())
+        assert len(exercises) == 1
+        assert exercises[0]["answer"] == "hablaremos"
+        assert exercises[0]["choices"][0] == "hablaremos" and len(exercises[0]["choices"]) == 4
+
+    def test_public_exercise_hides_answer(self):
+        public = public_exercise(_exercise(task_data={"verb": "hablar"}))
+        assert "answer" not in public and "task_data" not in public
+        assert sorted(public["choices"]) == sorted(_exercise()["choices"])
+        assert public_exercise(None) is None
@@ -0,0 +1,130 @@
+"""
+Unit tests for the practice HTTP/JSON service.
+
+Tests cover:
+- Session lifecycle through the route dispatcher
+- Request validation and error statuses
+- Keep-alive HTTP round trips against a running server
+- Server throughput statistics
+- The load benchmark
+"""
+
+import http.client
+import json
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from practice_server import HTTPError, PracticeServer
+
+
+def _post(server, path, payload=None):
+    return server.dispatch("POST", path, json.dumps(payload).encode() if payload is not None else b"")
+
+
+class TestDispatch:
+    """Test routes without a socket."""
+
+    def test_session_lifecycle(self):
+        server = PracticeServer(seed=1)
+        status, view = _post(server, "/sessions", {"count": 3, "tenses": ["present"]})
+        assert status == 201 and view["total"] == 3 and view["index"] == 0
+        assert "answer" not in view["exercise"]
+        session_id = view["session"]
+        answer = server.sessions[session_id].exercise["answer"]
+
+        status, result = _post(server, f"/sessions/{session_id}/answer", {"answer": answer})
+        assert status == 200 and result["correct"]
+        assert result["stats"]["correct"] == 1
+
+        for expected_done in (False, False, True):
+            _, view = _post(server, f"/sessions/{session_id}/next")
+            assert view["done"] is expected_done
+        assert server.dispatch("GET", f"/sessions/{session_id}/stats")[1]["attempted"] == 1
+        assert server.dispatch("DELETE", f"/sessions/{session_id}")[1]["closed"]
+        assert session_id not in server.sessions
+
+    @pytest.mark.parametrize("method,path,payload,status", [
+        ("GET", "/nowhere", None, 404),
+        ("GET", "/sessions/unknown", None, 404),
+        ("GET", "/sessions", None, 405),
+        ("POST", "/sessions", {"mode": "karaoke"}, 400),
+        ("POST", "/sessions", {"count": 0}, 400),
+        ("POST", "/sessions", {"mode": "speed", "time_limit": "3"}, 400),
+        ("POST", "/sessions", {"mode": "speed", "time_limit": 1000}, 400),
+        ("POST", "/sessions", {"mode": "speed", "time_limit": -1}, 400),
+        ("POST", "/sessions", {"mode": "speed", "time_limit": "abc"}, 400),
+        ("POST", "/sessions", {"mode": "speed", "time_limit": True}, 400),
+        ("POST", "/sessions", {"tenses": "present"}, 400),
+        ("POST", "/sessions", {"mode": "review"}, 400),
+        ("POST", "/sessions", {"mode": "speed", "count": 2, "time_limit": 1}, 409),
+    ])
+    def test_errors(self, method, path, payload, status):
+        server = PracticeServer()
+        with pytest.raises(HTTPError) as excinfo:
+            server.dispatch(method, path, json.dumps(payload).encode() if payload else b"")
+        assert excinfo.value.status == status
+
+    def test_empty_review_is_rejected(self, tmp_path):
+        server = PracticeServer(progress_db=str(tmp_path / "progress.db"))
+        with pytest.raises(HTTPError) as excinfo:
+            _post(server, "/sessions", {"mode": "review"})
+        assert excinfo.value.status == 409
+        assert not server.sessions
+
+    def test_invalid_answers(self):
+        server = PracticeServer()
+        _, view = _post(server, "/sessions", {"count": 1})
+        for body in (b"not json", b"[1]", b'{"answer": 5}', b'{"answer": " "}'):
+            with pytest.raises(HTTPError) as excinfo:
+                server.dispatch("POST", f"/sessions/{view['session']}/answer", body)
+            assert excinfo.value.status == 400
+
+    def test_session_limit_and_expiry(self):
+        server = PracticeServer(max_sessions=1, session_ttl=0)
+        _post(server, "/sessions", {"count": 1})
+        # The idle session has expired, so a new one fits
+        _post(server, "/sessions", {"count": 1})
+        server.session_ttl = 3600
+        with pytest.raises(HTTPError) as excinfo:
+            _post(server, "/sessions", {"count": 1})
+        assert excinfo.value.status == 503
+
+
+class TestHTTP:
+    """Test the server over real connections."""
+
+    def test_keep_alive_round_trips(self):
+        with PracticeServer(port=0, seed=1) as server:
+            conn = http.client.HTTPConnection(server.host, server.port, timeout=5)
+            conn.request("POST", "/sessions", body=json.dumps({"count": 2, "mode": "story"}))
+            response = conn.getresponse()
+            view = json.loads(response.read())
+            assert response.status == 201 and view["mode"] == "story"
+
+            conn.request("POST", f"/sessions/{view['session']}/answer", body='{"answer": "fuimos"}')
+            response = conn.getresponse()
+            assert response.status == 200 and "correct" in json.loads(response.read())
+
+            conn.request("GET", "/nowhere")
+            response = conn.getresponse()
+            assert response.status == 404 and json.loads(response.read())["error"]
+
+            conn.request("GET", "/stats")
+            stats = json.loads(conn.getresponse().read())
+            conn.close()
+        assert stats["connections"] == 1
+        assert stats["requests"] == 3 and stats["errors"] == 1
+        assert stats["routes"]["create"] == 1
+
+    def test_load_benchmark(self):
+        import asyncio
+        from benchmark_practice_server import run_load
+        with PracticeServer(port=0, seed=1) as server:
+            report = asyncio.run(run_load(server.base_url, learners=5, exercises=3))
+        assert report["errors"] == 0
+        assert report["requests"] == 5 * (1 + 3 * 2 + 2)
+        assert report["server"]["sessions"] == 0
@@ -0,0 +1,158 @@
+"""
+Unit tests for answer response timing.
+
+Tests cover:
+- ResponseTiming response and reaction times
+- The Qt stopwatch: shown on paint, first input, render time, fallbacks
+- Practice sessions preferring UI-measured timing and storing the breakdown
+- Untimed modes recording latency without speed ratings or profiles
+"""
+
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+from PyQt5.QtCore import QEvent, Qt
+from PyQt5.QtGui import QKeyEvent
+
+from practice_engine import PracticeSession, ResponseTiming
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class RecordingTracker:
+    def __init__(self):
+        self.attempts = []
+
+    def record_attempt(self, *args):
+        self.attempts.append(args)
+
+    def get_latency_histogram(self, verb, tense=None, person=None):
+        from streaming_stats import LogHistogram
+        return LogHistogram()
+
+
+@pytest.fixture(scope="module")
+def app():
+    return QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+
+class TestResponseTiming:
+    def test_times_from_shown(self):
+        timing = ResponseTiming(shown_at=10.0, submitted_at=12.5, first_input_at=11.0, render_time=0.02)
+        assert timing.response_time == 2.5
+        assert timing.reaction_time == 1.0
+
+    def test_without_input(self):
+        assert ResponseTiming(10.0, 11.0).reaction_time is None
+
+
+class TestResponseTimer:
+    def _timer(self, clock):
+        from response_timer import ResponseTimer
+        window = QtWidgets.QWidget()
+        layout = QtWidgets.QVBoxLayout(window)
+        label = QtWidgets.QLabel("Yo ______ español.")
+        line = QtWidgets.QLineEdit()
+        layout.addWidget(label)
+        layout.addWidget(line)
+        timer = ResponseTimer(clock, window)
+        timer.watchDisplay(label)
+        timer.watchInput(line)
+        return window, label, line, timer
+
+    def test_not_armed(self, app):
+        from response_timer import ResponseTimer
+        assert ResponseTimer().timing() is None
+
+    def test_shown_on_paint_and_first_input(self, app):
+        clock = FakeClock()
+        window, label, line, timer = self._timer(clock)
+        window.show()
+        app.processEvents()
+
+        timer.arm()
+        clock.now += 0.05
+        label.repaint()
+        assert timer.shown_at == pytest.approx(100.05)
+
+        clock.now += 0.7
+        app.sendEvent(line, QKeyEvent(QEvent.KeyPress, Qt.Key_H, Qt.NoModifier, "h"))
+        clock.now += 0.3
+        app.sendEvent(line, QKeyEvent(QEvent.KeyPress, Qt.Key_A, Qt.NoModifier, "a"))
+        clock.now += 0.5
+
+        timing = timer.timing()
+        assert timing.render_time == pytest.approx(0.05)
+        assert timing.reaction_time == pytest.approx(0.7)
+        assert timing.response_time == pytest.approx(1.5)
+        window.close()
+
+    def test_button_group_press_counts_as_input(self, app):
+        from response_timer import ResponseTimer
+        clock = FakeClock()
+        timer = ResponseTimer(clock)
+        group = QtWidgets.QButtonGroup()
+        button = QtWidgets.QRadioButton("hablo")
+        group.addButton(button)
+        timer.watchButtons(group)
+        timer.arm()
+        timer.shown_at = clock.now
+        clock.now += 0.4
+        button.pressed.emit()
+        group.buttonPressed.emit(button)
+        assert timer.first_input_at == pytest.approx(100.4)
+
+    def test_unpainted_falls_back_to_request_time(self, app):
+        clock = FakeClock()
+        _window, _label, _line, timer = self._timer(clock)
+        timer.arm()
+        clock.now += 2.0
+        timing = timer.timing()
+        assert timing.response_time == 2.0
+        assert timing.render_time is None
+
+
+class TestSessionTiming:
+    def test_ui_timing_preferred_and_recorded(self):
+        clock = FakeClock()
+        tracker = RecordingTracker()
+        session = PracticeSession(progress_tracker=tracker, clock=clock)
+        session.start_speed(count=3, time_limit=3, verbs=["hablar"])
+        clock.now += 30  # e.g. a dialog left open; not the learner's time
+
+        timing = ResponseTiming(shown_at=clock.now - 1.2, submitted_at=clock.now,
+                                first_input_at=clock.now - 0.4, render_time=0.03)
+        result = session.submit(session.exercise["answer"], timing=timing)
+
+        assert result["response_time"] == pytest.approx(1.2)
+        assert result["reaction_time"] == pytest.approx(0.8)
+        assert result["render_time"] == 0.03
+        assert tracker.attempts[0][6:] == (pytest.approx(1.2), pytest.approx(0.8), 0.03, True)
+
+    def test_latency_recorded_outside_speed_mode(self):
+        clock = FakeClock()
+        tracker = RecordingTracker()
+        session = PracticeSession(progress_tracker=tracker, clock=clock)
+        session.load([{"sentence": "Yo ______.", "answer": "hablo", "verb": "hablar",
+                       "tense": "present", "person": 0}] * 2)
+        result = session.submit("hablo", timing=ResponseTiming(0.0, 1.0))
+        assert result["kind"] == "standard" and "speed_rating" not in result
+        clock.now += 5  # reading the feedback
+        session.next()
+        clock.now += 2
+        session.submit("hablo")
+        # Timed from when each exercise was shown, kept out of the speed profile
+        assert [attempt[6:] for attempt in tracker.attempts] == [
+            (1.0, None, None, False), (pytest.approx(2.0), None, None, False)]
@@ -0,0 +1,173 @@
+"""
+Unit tests for the opt-in sampling profiler.
+
+Tests cover:
+- Sections are free when the profiler is off
+- Samples attributed to the outermost section, cut at its entry frame
+- Collapsed-stack output and the per-section summary
+- The background sampler thread and the SAMPLING_PROFILE switch
+- Watchdog-instrumented handlers (in both GUIs) and profiled worker functions
+"""
+
+import os
+import sys
+import threading
+import time
+from collections import Counter
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from sampling_profiler import DEFAULT_OUTPUT, PROFILE_ENV, SamplingProfiler, env_output, profiler
+from ui_watchdog import UIWatchdog
+
+
+def busy_wait(event: threading.Event) -> None:
+    while not event.is_set():
+        time.sleep(0.001)
+
+
+class TestSections:
+    def test_off_records_nothing(self):
+        sampler = SamplingProfiler()
+        with sampler.section("handler"):
+            assert sampler._sections == {}
+        sampler.enter("handler", sys._getframe())
+        sampler.leave()
+        assert sampler.sample() == 0
+        assert sampler.stacks == {}
+
+    def test_sample_cut_at_entry_frame(self):
+        sampler = SamplingProfiler()
+        sampler.running = True  # sample by hand instead of from the thread
+
+        def leaf():
+            return sampler.sample()
+
+        with sampler.section("outer"):
+            with sampler.section("inner"):
+                assert leaf() == 1
+        assert sampler._sections[threading.get_ident()] == []
+
+        (stack, count), = sampler.stacks["outer"].items()
+        frames = stack.split(";")
+        assert count == 1
+        assert frames[0] == "outer"
+        assert frames[1].startswith("test_sample_cut_at_entry_frame (test_sampling_profiler.py:")
+        assert frames[-2].startswith("leaf (")  # sampled from this thread, so sample() is the leaf
+        assert "inner" not in sampler.stacks
+
+    def test_profiled_decorator(self):
+        sampler = SamplingProfiler()
+
+        @sampler.profiled("worker.flush")
+        def flush(value):
+            return sampler.sample(), value
+
+        assert flush(1) == (0, 1)
+        sampler.running = True
+        assert flush(2) == (1, 2)
+        stack, = sampler.stacks["worker.flush"]
+        assert stack.split(";")[1].startswith("wrapper (sampling_profiler.py:")
+        assert stack.split(";")[-2].startswith("flush (")
+
+
+class TestReporting:
+    def make_profiler(self):
+        sampler = SamplingProfiler(interval=0.01)
+        sampler.stacks = {
+            "submitAnswer": Counter({
+                "submitAnswer;wrapper (a.py:1);check (b.py:5)": 3,
+                "submitAnswer;wrapper (a.py:1);commit (c.py:9)": 1,
+            }),
+            "config_store.flush": Counter({
+                "config_store.flush;wrapper (a.py:1);dump (d.py:2)": 1,
+            }),
+        }
+        return sampler
+
+    def test_collapsed_lines(self):
+        lines = self.make_profiler().collapsed()
+        assert "submitAnswer;wrapper (a.py:1);check (b.py:5) 3" in lines
+        assert len(lines) == 3
+
+    def test_summary(self):
+        rows = self.make_profiler().summary()
+        assert rows[0]["section"] == "submitAnswer"
+        assert rows[0]["samples"] == 4
+        assert rows[0]["seconds"] == pytest.approx(0.04)
+        assert rows[0]["hottest"][0] == ("check (b.py:5)", 3)
+        assert "config_store.flush: 1 samples" in self.make_profiler().format_summary()
+        assert SamplingProfiler().format_summary() == "No samples recorded"
+
+    def test_finish_writes_output(self, tmp_path):
+        sampler = self.make_profiler()
+        sampler.output = str(tmp_path / "logs" / "profile.collapsed")
+        sampler.finish()
+        content = (tmp_path / "logs" / "profile.collapsed").read_text(encoding="utf-8")
+        assert content.endswith("dump (d.py:2) 1\n")
+        assert len(content.splitlines()) == 3
+
+
+class TestSamplerThread:
+    def test_samples_worker_thread(self):
+        sampler = SamplingProfiler(interval=0.002)
+        sampler.start()
+        done = threading.Event()
+
+        @sampler.profiled("worker")
+        def work():
+            busy_wait(done)
+
+        worker = threading.Thread(target=work)
+        worker.start()
+        deadline = time.monotonic() + 5
+        while "worker" not in sampler.stacks and time.monotonic() < deadline:
+            time.sleep(0.005)
+        done.set()
+        worker.join()
+        sampler.stop()
+        assert not sampler.running
+        assert any("busy_wait (" in stack for stack in sampler.stacks["worker"])
+
+    def test_env_switch(self, monkeypatch):
+        monkeypatch.delenv(PROFILE_ENV, raising=False)
+        assert env_output() is None
+        monkeypatch.setenv(PROFILE_ENV, "0")
+        assert env_output() is None
+        monkeypatch.setenv(PROFILE_ENV, "1")
+        assert env_output() == DEFAULT_OUTPUT
+        monkeypatch.setenv(PROFILE_ENV, "run.collapsed")
+        assert env_output() == "run.collapsed"
+
+
+class TestHooks:
+    def test_watchdog_handlers_are_sections(self):
+        watchdog = UIWatchdog()
+        seen = []
+
+        @watchdog.instrument()
+        def submitAnswer():
+            seen.append(profiler.sample())
+
+        profiler.running = True
+        try:
+            submitAnswer()
+        finally:
+            profiler.stop()
+            stacks = profiler.stacks.pop("submitAnswer", {})
+        assert seen == [1]
+        stack, = stacks
+        assert stack.split(";")[-2].startswith("submitAnswer (")
+        assert watchdog.handlers["submitAnswer"].durations.count == 1
+
+    def test_config_store_flush_is_profiled(self):
+        from config_store import ConfigStore
+        assert ConfigStore._timer_flush.__wrapped__.__name__ == "_timer_flush"
+
+    def test_professional_app_handlers_are_sections(self):
+        from main_professional import ProfessionalSpanishApp
+        for name in ("generateNewExercise", "handleExerciseResult", "updateExercise",
+                     "submitAnswer", "nextExercise"):
+            assert getattr(ProfessionalSpanishApp, name).__wrapped__.__name__ == name
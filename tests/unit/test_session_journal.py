@@ -0,0 +1,121 @@
+"""
+Unit tests for the append-only session journal.
+
+Tests cover:
+- NDJSON records written by the background writer
+- Size-based rotation and reading across rotated files
+- Replay surviving a crash (no session_end, torn final line)
+- Explanations attached to their answers on replay
+- The replay command line
+"""
+
+import json
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from session_journal import (SessionJournal, format_session, iter_records,
+                             journal_files, main, replay_sessions)
+
+
+def _answer(journal, exercise, user_answer="como", correct=True):
+    journal.append("answer", exercise=exercise, sentence="Yo ____ pan.",
+                   translation="I eat bread.", user_answer=user_answer,
+                   correct_answer="como", correct=correct)
+
+
+class TestSessionJournal:
+    """Test journal writing and rotation."""
+
+    def test_records_written_as_ndjson(self, tmp_path):
+        path = str(tmp_path / "journal.ndjson")
+        journal = SessionJournal(path, session_id=7)
+        _answer(journal, 0)
+        journal.append("explanation", exercise=0, explanation="¡Bien!")
+        journal.close()
+
+        with open(path, encoding="utf-8") as f:
+            records = [json.loads(line) for line in f]
+        assert [r["type"] for r in records] == ["session_start", "answer", "explanation", "session_end"]
+        assert all(r["session"] == 7 for r in records)
+        assert records[2]["explanation"] == "¡Bien!"
+        assert journal.written == 4
+
+    def test_append_after_close_is_ignored(self, tmp_path):
+        journal = SessionJournal(str(tmp_path / "journal.ndjson"))
+        journal.close()
+        journal.append("answer", exercise=0)
+        journal.close()
+        assert journal.written == 2
+
+    def test_rotation_by_size(self, tmp_path):
+        path = str(tmp_path / "journal.ndjson")
+        journal = SessionJournal(path, session_id=1, max_bytes=400, backup_count=2)
+        for i in range(20):
+            _answer(journal, i)
+        journal.close()
+
+        files = journal_files(path)
+        assert files == [path + ".2", path + ".1", path]
+        assert all(os.path.getsize(p) <= 400 for p in files)
+        # Oldest records were dropped with the oldest backup; the rest stay in order
+        exercises = [r["exercise"] for r in iter_records(path) if r["type"] == "answer"]
+        assert exercises == sorted(exercises) and exercises[-1] == 19
+
+
+class TestReplay:
+    """Test rebuilding sessions from the journal."""
+
+    def test_crashed_session_survives(self, tmp_path):
+        path = str(tmp_path / "journal.ndjson")
+        journal = SessionJournal(path, session_id=1)
+        _answer(journal, 0)
+        journal.close()
+
+        crashed = SessionJournal(path, session_id=2)
+        _answer(crashed, 0, "comes", False)
+        crashed.close()
+        # Simulate a crash: drop the end marker and leave a torn line
+        with open(path, "rb") as f:
+            lines = f.readlines()
+        with open(path, "wb") as f:
+            f.writelines(lines[:-1])
+            f.write(b'{"type": "answer", "sess')
+
+        sessions = replay_sessions(iter_records(path))
+        assert [s["session"] for s in sessions] == [1, 2]
+        assert sessions[0]["ended"] is not None
+        assert sessions[1]["ended"] is None
+        assert sessions[1]["answers"][0]["user_answer"] == "comes"
+        assert "Session not closed" in format_session(sessions[1])
+
+    def test_explanation_attached_to_answer(self):
+        records = [
+            {"type": "session_start", "session": 3, "ts": 1.0},
+            {"type": "answer", "session": 3, "exercise": 0, "user_answer": "como", "correct": True},
+            {"type": "answer", "session": 3, "exercise": 1, "user_answer": "bebo", "correct": True},
+            {"type": "explanation", "session": 3, "exercise": 0, "explanation": "Presente."},
+            {"type": "reset", "session": 3, "ts": 2.0},
+            {"type": "session_end", "session": 3, "ts": 3.0},
+        ]
+        session = replay_sessions(records)[0]
+        assert session["answers"][0]["explanation"] == "Presente."
+        assert "explanation" not in session["answers"][1]
+        text = format_session(session)
+        assert "Exercise 1:" in text and "Explanation: Presente." in text
+        assert "--- Progress reset ---" in text
+
+    def test_cli(self, tmp_path, capsys):
+        path = str(tmp_path / "journal.ndjson")
+        for session_id in (1, 2):
+            journal = SessionJournal(path, session_id=session_id)
+            _answer(journal, 0)
+            journal.close()
+
+        main([path, "--session", "2", "--json"])
+        sessions = json.loads(capsys.readouterr().out)
+        assert [s["session"] for s in sessions] == [2]
+
+        main([path])
+        assert capsys.readouterr().out.count("=== End Session ===") == 2
@@ -0,0 +1,91 @@
+"""
+Unit tests for the rolling session summary.
+
+Tests cover:
+- Token estimation and truncation
+- Structured error categories, verbs and tenses
+- Folding the digest every K answers
+- Prompt size staying bounded for long sessions
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from session_summary import RollingSessionSummary, estimate_tokens, truncate_to_tokens
+
+
+def _exercise(answer="comemos", verb="comer", tense="present", person=3):
+    return {"answer": answer, "verb": verb, "tense": tense, "person": person,
+            "sentence": "Nosotros ____ pan."}
+
+
+class TestTokenEstimate:
+    """Test the local token estimator."""
+
+    def test_counts_words_and_punctuation(self):
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("Hola, sol.") == 4
+
+    def test_long_words_cost_more(self):
+        assert estimate_tokens("internacionalización") > estimate_tokens("sol")
+
+    def test_truncate(self):
+        text = "palabra " * 200
+        cut = truncate_to_tokens(text, 50)
+        assert estimate_tokens(cut) <= 50
+        assert truncate_to_tokens("corto", 50) == "corto"
+
+
+class TestRollingSessionSummary:
+    """Test incremental session stats and prompt building."""
+
+    def test_records_error_categories(self):
+        summary = RollingSessionSummary(update_every=3)
+        summary.record(_exercise(), "comemos", True)
+        summary.record(_exercise(), "comes", False)
+        summary.record(_exercise(answer="trabajé", verb="trabajar", tense="preterite", person=0),
+                       "trabajo", False)
+
+        assert summary.total == 3 and summary.correct == 1
+        assert summary.error_categories == {"person": 1, "tense": 1}
+        assert summary.missed_verbs == {"comer": 1, "trabajar": 1}
+        assert "wrong person x1" in summary.digest
+
+    def test_digest_folds_every_k_answers(self):
+        summary = RollingSessionSummary(update_every=5)
+        for _ in range(4):
+            summary.record(_exercise(), "comemos", True)
+        assert summary.digest == ""
+        assert len(summary.recent) == 4
+
+        summary.record(_exercise(), "comemos", True)
+        assert "Answers: 5" in summary.digest
+        assert len(summary.recent) == 0
+
+    def test_prompt_includes_answers_since_last_fold(self):
+        summary = RollingSessionSummary(update_every=5)
+        for _ in range(6):
+            summary.record(_exercise(), "comes", False)
+        prompt = summary.build_prompt()
+        assert "Answers: 5" in prompt
+        assert prompt.count('"comes"') == 1
+
+    def test_prompt_is_bounded_for_long_sessions(self):
+        summary = RollingSessionSummary(update_every=50, max_prompt_tokens=120)
+        for i in range(1000):
+            summary.record(_exercise(), "x" * 200 if i % 2 else "comemos", i % 2 == 0)
+        assert estimate_tokens(summary.build_prompt()) <= 120
+
+    def test_unanalyzable_answer_is_unclassified(self):
+        summary = RollingSessionSummary(update_every=1)
+        summary.record({"answer": "cerró"}, "cierra", False)
+        assert summary.error_categories == {"unclassified": 1}
+
+    def test_reset(self):
+        summary = RollingSessionSummary(update_every=1)
+        summary.record(_exercise(), "comes", False)
+        summary.reset()
+        assert summary.total == 0 and summary.digest == ""
+        assert "No answers yet." in summary.build_prompt()
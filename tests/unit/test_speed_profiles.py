@@ -0,0 +1,144 @@
+"""
+Unit tests for persistent speed profiles.
+
+Tests cover:
+- Log-scale bucketing and histogram quantiles
+- Response times stored with attempts and aggregated per verb in SQLite
+- Upgrading a progress database created before response times existed
+- SpeedPractice loading saved history lazily and cross-session readiness
+- Timed practice sessions recording each answer exactly once
+"""
+
+import os
+import sqlite3
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from practice_engine import PracticeSession
+from progress_tracker import ProgressTracker
+from speed_practice import SpeedPractice
+from streaming_stats import BUCKET_COUNT, LogHistogram, bucket_upper_bound, log_bucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    tracker = ProgressTracker(str(tmp_path / "progress.db"))
+    yield tracker
+    tracker.close()
+
+
+class TestLogHistogram:
+    def test_buckets_are_log_scale(self):
+        assert log_bucket(0.05) == 0
+        assert log_bucket(0.1) == 0
+        assert log_bucket(0.2) == 2
+        assert log_bucket(3.0) == 10
+        assert log_bucket(10_000) == BUCKET_COUNT - 1
+        assert bucket_upper_bound(2) == pytest.approx(0.2)
+
+    def test_mean_and_quantiles(self):
+        histogram = LogHistogram()
+        assert histogram.quantile(0.5) is None
+        for seconds in (1.0, 1.0, 1.0, 5.0):
+            histogram.add(seconds)
+        assert histogram.mean == 2.0
+        assert 0.8 < histogram.quantile(0.5) <= 1.131
+        assert histogram.quantile(0.9) > 4.5
+
+    def test_merge(self):
+        first, second = LogHistogram(), LogHistogram()
+        first.add(1.0)
+        second.add(2.0)
+        first.merge(second)
+        assert (first.count, first.total) == (2, 3.0)
+        assert sum(first.counts) == 2
+
+
+class TestTrackerLatency:
+    def test_timed_attempts_build_histograms(self, tracker):
+        tracker.record_attempt('hablar', 'present', 0, 'hablo', 'hablo', True, 1.0)
+        tracker.record_attempt('hablar', 'present', 1, 'hablas', 'hablas', True, 2.0)
+        tracker.record_attempt('hablar', 'present', 1, 'hablas', 'hablas', True, 6.0)
+        tracker.record_attempt('hablar', 'present', 2, 'habla', 'habla', True)
+
+        all_persons = tracker.get_latency_histogram('hablar', 'present')
+        assert (all_persons.count, all_persons.total) == (3, 9.0)
+        tu = tracker.get_latency_histogram('hablar', 'present', 1)
+        assert tu.count == 2 and tu.counts[log_bucket(6.0)] == 1
+        assert tracker.get_latency_histogram('comer').count == 0
+
+        times = [row[0] for row in tracker.conn.execute('SELECT response_time FROM attempts ORDER BY id')]
+        assert times == [1.0, 2.0, 6.0, None]
+
+    def test_untimed_mode_latency_skips_profile(self, tracker):
+        tracker.record_attempt('hablar', 'present', 0, 'hablo', 'hablo', True, 9.0, speed_profile=False)
+        assert tracker.get_latency_histogram('hablar').count == 0
+        assert tracker.conn.execute('SELECT response_time FROM attempts').fetchone()[0] == 9.0
+
+    def test_upgrades_old_database(self, tmp_path):
+        path = str(tmp_path / "old.db")
+        conn = sqlite3.connect(path)
+        conn.execute('''
+            CREATE TABLE attempts (
+                id INTEGER PRIMARY KEY AUTOINCREMENT, verb TEXT NOT NULL, tense TEXT NOT NULL,
+                person INTEGER NOT NULL, user_answer TEXT NOT NULL, correct_answer TEXT NOT NULL,
+                is_correct BOOLEAN NOT NULL, is_communicative BOOLEAN DEFAULT 0,
+                task_type TEXT DEFAULT 'grammar', scenario TEXT,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP)''')
+        conn.commit()
+        conn.close()
+
+        tracker = ProgressTracker(path)
+        tracker.record_attempt('ser', 'present', 0, 'soy', 'soy', True, 0.8)
+        assert tracker.get_latency_histogram('ser').count == 1
+        tracker.close()
+
+
+class TestSpeedPracticeHistory:
+    def test_readiness_spans_sessions(self, tracker):
+        tracker.record_attempt('hablar', 'present', 0, 'hablo', 'hablo', True, 1.0)
+        tracker.record_attempt('tener', 'present', 0, 'tengo', 'tengo', True, 5.0)
+
+        practice = SpeedPractice(tracker)
+        assert practice.verb_history == {}
+        readiness = practice.get_readiness()
+        assert readiness['conversational_verbs'] == ['hablar']
+        assert readiness['need_work'] == [('tener', 5.0)]
+        assert readiness['profiles']['hablar']['count'] == 1
+        assert 'ser' in readiness['unpracticed']
+
+    def test_session_answers_add_to_loaded_history(self, tracker):
+        tracker.record_attempt('tener', 'present', 0, 'tengo', 'tengo', True, 5.0)
+        practice = SpeedPractice(tracker)
+        practice.evaluate_speed_response('tener', 0, 'tengo', 1.0)
+        assert practice.history('tener').count == 2
+        assert practice.history('tener').mean == 3.0
+
+    def test_without_tracker(self):
+        practice = SpeedPractice()
+        practice.evaluate_speed_response('hablar', 0, 'hablo', 1.0)
+        assert practice.get_readiness()['conversational_verbs'] == ['hablar']
+
+
+class TestTimedSession:
+    def test_speed_answers_recorded_once(self, tracker):
+        clock = FakeClock()
+        session = PracticeSession(progress_tracker=tracker, clock=clock)
+        session.start_speed(count=3, time_limit=3, verbs=['hablar'])
+        clock.now += 1.5
+        session.submit(session.exercise['answer'])
+
+        assert tracker.get_latency_histogram('hablar', 'present').count == 1
+        assert session.speed_practice.history('hablar').count == 1
+        assert session.speed_practice.history('hablar').total == pytest.approx(1.5)
@@ -0,0 +1,172 @@
+"""
+Unit tests for the adaptive speed-round scheduler.
+
+Tests cover:
+- Slowness of an answer from correctness and response time
+- Policy lookup and the uniform, UCB and Thompson scores
+- Heap selection, spacing, rescoring and evidence decay
+- SpeedPractice rounds focusing on slow verbs and using saved history
+- Practice sessions re-planning the upcoming speed prompt after an answer,
+  without drilling the same item twice in a row
+"""
+
+import os
+import random
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from practice_engine import PracticeSession, ResponseTiming
+from speed_practice import SpeedPractice
+from speed_scheduler import (ItemStats, SpeedScheduler, ThompsonPolicy, UCBPolicy,
+                             make_policy, slowness)
+
+
+class TestSlowness:
+    def test_wrong_answers_are_fully_slow(self):
+        assert slowness(False, 0.5) == 1.0
+
+    def test_scales_between_instant_and_conversational(self):
+        assert slowness(True, 1.0) == 0.0
+        assert slowness(True, 2.25) == pytest.approx(0.5)
+        assert slowness(True, 9.0) == 1.0
+
+
+class TestPolicies:
+    def test_make_policy(self):
+        assert make_policy('thompson').name == 'thompson'
+        policy = UCBPolicy(exploration=1.0)
+        assert make_policy(policy) is policy
+        with pytest.raises(ValueError, match="Unknown policy"):
+            make_policy('greedy')
+
+    def test_ucb_prefers_slow_and_unexplored_items(self):
+        policy = UCBPolicy()
+        rng = random.Random(1)
+        slow, fast, fresh = ItemStats(fast=1, slow=9), ItemStats(fast=9, slow=1), ItemStats()
+        assert policy.score(slow, 20, rng) > policy.score(fast, 20, rng)
+        assert policy.score(fresh, 20, rng) > policy.score(ItemStats(fast=5, slow=5), 20, rng)
+
+    def test_thompson_draws_from_posterior(self):
+        rng = random.Random(1)
+        draws = [ThompsonPolicy().score(ItemStats(fast=1, slow=30), 0, rng) for _ in range(50)]
+        assert all(0.0 <= d <= 1.0 for d in draws)
+        assert sum(draws) / len(draws) > 0.8
+
+
+class TestSpeedScheduler:
+    def test_picks_slowest_item_first(self):
+        scheduler = SpeedScheduler([], 'ucb', random.Random(1))
+        scheduler.add('fast', fast=6)
+        scheduler.add('slow', slow=6)
+        assert scheduler.next_item() == 'slow'
+
+    def test_spacing_avoids_immediate_repeats(self):
+        scheduler = SpeedScheduler(['a', 'b'], 'ucb', random.Random(1), spacing=0.1)
+        first = scheduler.next_item()
+        assert scheduler.next_item() != first
+
+    def test_record_rescores_item(self):
+        scheduler = SpeedScheduler(['a', 'b'], 'ucb', random.Random(1))
+        for _ in range(3):
+            scheduler.record('a', True, 0.8)
+            scheduler.record('b', False, 5.0)
+        assert scheduler.next_item() == 'b'
+        assert scheduler.slow_rate('b') > scheduler.slow_rate('a')
+        assert scheduler.stats['a'].attempts == 3
+
+    def test_decay_lets_improvement_show(self):
+        scheduler = SpeedScheduler(['a'], 'ucb', decay=0.5)
+        scheduler.add('a', slow=10)
+        for _ in range(4):
+            scheduler.record('a', True, 1.0)
+        assert scheduler.slow_rate('a') < 0.5
+
+    def test_unknown_items_are_ignored(self):
+        scheduler = SpeedScheduler(['a'])
+        scheduler.record('zzz', True, 1.0)
+        assert 'zzz' not in scheduler and len(scheduler) == 1
+
+    def test_empty_scheduler_raises(self):
+        with pytest.raises(IndexError):
+            SpeedScheduler([]).next_item()
+
+    def test_heap_stays_bounded(self):
+        scheduler = SpeedScheduler(range(10), 'thompson', random.Random(2))
+        for i in range(2000):
+            scheduler.record(scheduler.next_item(), i % 3 == 0, 2.0)
+        assert len(scheduler._heap) <= 4 * len(scheduler) + 65
+
+
+class TestSpeedPracticeRounds:
+    def test_round_focuses_on_slow_verbs(self):
+        practice = SpeedPractice(rng=random.Random(3))
+        practice.essential_verbs = ['hablar', 'tener', 'ser']
+        practice.generate_speed_round(9)
+        for person in range(3):
+            for _ in range(3):
+                practice.evaluate_speed_response('hablar', person, 'wrong', 6.0)
+                practice.evaluate_speed_response('tener', person, practice.conjugator.conjugate('tener', 'present', person), 0.8)
+                practice.evaluate_speed_response('ser', person, practice.conjugator.conjugate('ser', 'present', person), 0.8)
+        verbs = [exercise['verb'] for exercise in practice.generate_speed_round(18)]
+        assert verbs.count('hablar') > verbs.count('tener')
+        assert all(exercise['tense'] == 'present' for exercise in practice.generate_speed_round(3))
+
+    def test_scheduler_rebuilt_when_verbs_change(self):
+        practice = SpeedPractice()
+        assert len(practice.scheduler) == 60
+        practice.essential_verbs = ['hablar']
+        assert len(practice.scheduler) == 3
+
+    def test_saved_history_is_prior_evidence(self):
+        class Tracker:
+            def get_latency_histogram(self, verb, tense=None, person=None):
+                from streaming_stats import LogHistogram
+                histogram = LogHistogram()
+                for _ in range(10):
+                    histogram.add(6.0 if verb == 'tener' else 0.5)
+                return histogram
+
+        practice = SpeedPractice(Tracker())
+        practice.essential_verbs = ['hablar', 'tener']
+        assert practice.scheduler.slow_rate(('tener', 0)) > 0.8
+        assert practice.scheduler.slow_rate(('hablar', 0)) < 0.2
+        assert practice.scheduler.next_item()[0] == 'tener'
+
+
+class TestOnlineSession:
+    def test_upcoming_prompt_replanned_after_answer(self):
+        session = PracticeSession()
+        session.start_speed(count=3, time_limit=3, verbs=['hablar', 'tener'])
+        second = session.exercises[1]
+        session.submit(session.exercise['answer'])
+        assert session.exercises[1] is not second
+        assert session.exercises[1]['sentence'].startswith(session.exercises[1]['trigger'])
+
+    def test_round_interleaves_items(self):
+        # Mixed 1-5 s answers at about 70% accuracy, as in a real round
+        rng = random.Random(7)
+        session = PracticeSession(speed_practice=SpeedPractice(rng=random.Random(7)))
+        session.start_speed(count=30, time_limit=3)
+        items = []
+        for _ in range(30):
+            exercise = session.exercise
+            items.append((exercise['verb'], exercise['person']))
+            answer = exercise['answer'] if rng.random() < 0.7 else 'wrong'
+            session.submit(answer, timing=ResponseTiming(0.0, rng.uniform(1.0, 5.0)))
+            if not session.next():
+                break
+        assert len(items) == 30
+        assert all(a != b for a, b in zip(items, items[1:]))
+        assert len(set(items)) > 10
+
+    def test_seen_prompts_are_kept(self):
+        session = PracticeSession()
+        session.start_speed(count=3, time_limit=3, verbs=['hablar'])
+        session.next()
+        session.prev()
+        second = session.exercises[1]
+        session.submit(session.exercise['answer'])
+        assert session.exercises[1] is second
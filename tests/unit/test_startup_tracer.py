@@ -0,0 +1,107 @@
+"""
+Unit tests for the startup phase tracer.
+
+Tests cover:
+- Nested spans with monotonic, non-overlapping timing
+- Chrome trace-event JSON output
+- One-line summary of top-level phases
+- cProfile capture for --profile-startup
+"""
+
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from startup_tracer import StartupTracer
+
+
+class TestStartupTracer:
+    """Test span recording and reporting."""
+
+    def test_nested_spans(self):
+        tracer = StartupTracer()
+        with tracer.span("window"):
+            with tracer.span("init_ui"):
+                time.sleep(0.01)
+            with tracer.span("system_tray"):
+                pass
+
+        by_name = {e["name"]: e for e in tracer.events}
+        window, init_ui, tray = by_name["window"], by_name["init_ui"], by_name["system_tray"]
+        assert window["args"]["depth"] == 0 and init_ui["args"]["depth"] == 1
+        assert init_ui["dur"] >= 10_000  # microseconds
+        assert window["ts"] <= init_ui["ts"]
+        assert init_ui["ts"] + init_ui["dur"] <= tray["ts"]
+        assert tray["ts"] + tray["dur"] <= window["ts"] + window["dur"] + 0.1
+
+    def test_span_recorded_on_exception(self):
+        tracer = StartupTracer()
+        try:
+            with tracer.span("config"):
+                raise ValueError("bad config")
+        except ValueError:
+            pass
+        assert [e["name"] for e in tracer.events] == ["config"]
+        with tracer.span("after"):
+            pass
+        assert tracer.events[-1]["args"]["depth"] == 0
+
+    def test_disabled_tracer_records_nothing(self):
+        tracer = StartupTracer(enabled=False)
+        with tracer.span("qapplication"):
+            tracer.mark("shown")
+        assert tracer.events == []
+
+    def test_chrome_trace_file(self, tmp_path):
+        tracer = StartupTracer()
+        with tracer.span("qapplication"):
+            pass
+        tracer.mark("shown")
+        path = tmp_path / "logs" / "startup_trace.json"
+        tracer.write(str(path))
+
+        trace = json.loads(path.read_text(encoding="utf-8"))
+        events = trace["traceEvents"]
+        assert [e["ph"] for e in events] == ["X", "i"]
+        for key in ("name", "ts", "pid", "tid"):
+            assert key in events[0]
+
+    def test_summary_lists_top_level_phases(self):
+        tracer = StartupTracer()
+        assert tracer.summary() == "Startup: no phases recorded"
+        with tracer.span("qapplication"):
+            pass
+        with tracer.span("main_window"):
+            with tracer.span("init_ui"):
+                pass
+        summary = tracer.summary()
+        assert "\n" not in summary
+        assert summary.startswith("Startup ")
+        assert "qapplication" in summary and "main_window" in summary
+        assert "init_ui" not in summary
+
+
+class TestStartupProfile:
+    """Test cProfile capture."""
+
+    def test_finish_writes_profile(self, tmp_path):
+        tracer = StartupTracer()
+        tracer.start_profile()
+        with tracer.span("work"):
+            sorted(range(1000), reverse=True)
+        trace_path = tmp_path / "trace.json"
+        profile_path = tmp_path / "startup.prof"
+        summary = tracer.finish(str(trace_path), str(profile_path))
+
+        assert "work" in summary
+        assert trace_path.exists() and profile_path.exists()
+        assert "cumulative" in (tmp_path / "startup.prof.txt").read_text(encoding="utf-8")
+        assert tracer._profiler is None
+
+    def test_stop_without_start_is_noop(self, tmp_path):
+        tracer = StartupTracer()
+        tracer.stop_profile(str(tmp_path / "startup.prof"))
+        assert not (tmp_path / "startup.prof").exists()
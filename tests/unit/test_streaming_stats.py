@@ -0,0 +1,118 @@
+"""
+Unit tests for the streaming statistics estimators.
+
+Tests cover:
+- Welford mean and variance against the statistics module
+- EWMA seeding and smoothing
+- P² quantiles: exact for small samples, close on large ones
+- SpeedPractice per-verb timing, improvement, weak spots and summary
+"""
+
+import os
+import random
+import statistics
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from speed_practice import SpeedPractice
+from streaming_stats import EWMA, LatencyStats, P2Quantile, Welford
+
+
+class TestWelford:
+    def test_matches_statistics(self):
+        rng = random.Random(3)
+        values = [rng.uniform(0.5, 6.0) for _ in range(1000)]
+        welford = Welford()
+        for value in values:
+            welford.add(value)
+        assert welford.count == 1000
+        assert welford.mean == pytest.approx(statistics.fmean(values))
+        assert welford.variance == pytest.approx(statistics.variance(values))
+
+    def test_single_sample_has_no_variance(self):
+        welford = Welford()
+        welford.add(2.0)
+        assert (welford.mean, welford.variance) == (2.0, 0.0)
+
+
+class TestEWMA:
+    def test_first_sample_seeds_then_smooths(self):
+        ewma = EWMA(alpha=0.5)
+        assert ewma.value is None
+        ewma.add(4.0)
+        ewma.add(2.0)
+        assert ewma.value == 3.0
+
+    def test_rejects_bad_alpha(self):
+        with pytest.raises(ValueError):
+            EWMA(alpha=0)
+
+
+class TestP2Quantile:
+    def test_exact_for_small_samples(self):
+        estimator = P2Quantile(0.5)
+        assert estimator.value is None
+        for value in (5.0, 1.0, 3.0):
+            estimator.add(value)
+        assert estimator.value == 3.0
+
+    @pytest.mark.parametrize("q", [0.5, 0.9])
+    def test_close_to_exact_quantile(self, q):
+        rng = random.Random(11)
+        values = [rng.lognormvariate(0.5, 0.5) for _ in range(20000)]
+        estimator = P2Quantile(q)
+        for value in values:
+            estimator.add(value)
+        exact = sorted(values)[int(q * len(values))]
+        assert estimator.value == pytest.approx(exact, rel=0.02)
+
+    def test_rejects_bad_quantile(self):
+        with pytest.raises(ValueError):
+            P2Quantile(1.0)
+
+
+class TestLatencyStats:
+    def test_summary(self):
+        stats = LatencyStats()
+        for value in (1.0, 2.0, 3.0, 4.0):
+            stats.add(value)
+        summary = stats.to_dict()
+        assert summary['count'] == 4
+        assert summary['mean'] == 2.5
+        assert (summary['min'], summary['max']) == (1.0, 4.0)
+        assert (summary['p50'], summary['p90']) == (2.0, 4.0)
+
+    def test_empty_summary(self):
+        summary = LatencyStats().to_dict()
+        assert summary['count'] == 0
+        assert summary['mean'] is None and summary['p50'] is None
+
+
+class TestSpeedPracticeStats:
+    def test_improvement_is_against_previous_average(self):
+        practice = SpeedPractice()
+        first = practice.evaluate_speed_response('hablar', 0, 'hablo', 4.0)
+        second = practice.evaluate_speed_response('hablar', 0, 'hablo', 2.0)
+        third = practice.evaluate_speed_response('hablar', 0, 'hablo', 1.0)
+        assert first['improvement'] is None
+        assert second['improvement'] == 2.0
+        assert third['improvement'] == 2.0
+        assert practice.verb_stats['hablar'].count == 3
+
+    def test_weak_spots_and_summary(self):
+        practice = SpeedPractice()
+        for seconds in (4.0, 5.0):
+            practice.evaluate_speed_response('tener', 0, 'tengo', seconds)
+        practice.evaluate_speed_response('hablar', 0, 'hablo', 1.0)
+        assert practice.get_weak_spots() == [('tener', 4.5)]
+
+        summary = practice.get_session_summary()
+        assert summary['conversational_verbs'] == ['hablar']
+        assert summary['need_work'] == [('tener', 4.5)]
+        assert summary['verb_stats']['tener']['count'] == 2
+
+    def test_empty_summary(self):
+        assert SpeedPractice().get_session_summary()['ready'] is False
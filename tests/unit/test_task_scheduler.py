@@ -0,0 +1,231 @@
+"""
+Unit tests for the priority task scheduler.
+
+Tests cover:
+- Priority order when a slot frees up, overall and per-class limits
+- Coroutine and plain-function tasks
+- Cancellation tokens and cancelled futures, queued and running
+- Deadlines while queued and while running
+- Queue depth, wait time and outcome metrics
+- Shutdown and the LLM client's use of the scheduler
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+from concurrent.futures import CancelledError
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from task_scheduler import (QUEUE_DEPTH, TASKS, WAIT_SECONDS, CancellationToken,
+                            DeadlineExceeded, Priority, TaskScheduler, default_limits)
+
+
+@pytest.fixture
+def loop():
+    """An asyncio loop running on its own thread, like the LLM client's."""
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    yield loop
+    loop.call_soon_threadsafe(loop.stop)
+    thread.join(2)
+    loop.close()
+
+
+def make_scheduler(loop, **kwargs):
+    return TaskScheduler(loop.call_soon_threadsafe, **kwargs)
+
+
+def blocker(release: threading.Event):
+    """A plain function holding its slot until ``release`` is set."""
+    assert release.wait(5)
+    return "released"
+
+
+class TestOrdering:
+    def test_most_urgent_class_starts_first(self, loop):
+        scheduler = make_scheduler(loop, max_running=1)
+        release = threading.Event()
+        order = []
+
+        async def record(name):
+            order.append(name)
+
+        first = scheduler.submit(blocker, release, priority=Priority.BACKGROUND)
+        futures = [scheduler.submit(record, name, priority=priority)
+                   for name, priority in (("prefetch", Priority.BACKGROUND),
+                                          ("summary", Priority.VISIBLE),
+                                          ("hint", Priority.INTERACTIVE),
+                                          ("explanation", Priority.INTERACTIVE))]
+        release.set()
+        assert first.result(5) == "released"
+        for future in futures:
+            future.result(5)
+        assert order == ["hint", "explanation", "summary", "prefetch"]
+
+    def test_class_limit_leaves_room_for_interactive(self, loop):
+        scheduler = make_scheduler(loop, max_running=4)
+        release = threading.Event()
+        background = [scheduler.submit(blocker, release) for _ in range(3)]
+
+        async def hint():
+            return "hint"
+
+        assert scheduler.submit(hint, priority=Priority.INTERACTIVE).result(5) == "hint"
+        snapshot = scheduler.snapshot()["background"]
+        assert snapshot == {"queued": 2, "running": 1, "limit": 1}
+        release.set()
+        assert [f.result(5) for f in background] == ["released"] * 3
+
+    def test_default_limits(self):
+        assert default_limits(4) == {Priority.INTERACTIVE: 4, Priority.VISIBLE: 2,
+                                     Priority.BACKGROUND: 1}
+        assert default_limits(1)[Priority.VISIBLE] == 1
+        scheduler = TaskScheduler(lambda *args: None, max_running=4,
+                                  limits={Priority.BACKGROUND: 2})
+        assert scheduler.limits[Priority.BACKGROUND] == 2
+
+    def test_errors_reach_the_future(self, loop):
+        scheduler = make_scheduler(loop)
+
+        async def fail():
+            raise ValueError("bad prompt")
+
+        with pytest.raises(ValueError, match="bad prompt"):
+            scheduler.submit(fail, priority=Priority.INTERACTIVE).result(5)
+        assert scheduler.submit(sum, [1, 2, 3]).result(5) == 6
+
+
+class TestCancellation:
+    def test_token_cancels_queued_task(self, loop):
+        scheduler = make_scheduler(loop, max_running=1)
+        release = threading.Event()
+        ran = []
+        token = CancellationToken()
+
+        async def hint():
+            ran.append("hint")
+
+        first = scheduler.submit(blocker, release, priority=Priority.INTERACTIVE)
+        queued = scheduler.submit(hint, priority=Priority.INTERACTIVE, token=token)
+        token.cancel()
+        with pytest.raises(CancelledError):
+            queued.result(5)
+        release.set()
+        first.result(5)
+        assert ran == []
+
+    def test_token_cancels_running_coroutine_and_frees_slot(self, loop):
+        scheduler = make_scheduler(loop, max_running=1)
+        started = threading.Event()
+        token = CancellationToken()
+
+        async def stream():
+            started.set()
+            await asyncio.sleep(10)
+
+        running = scheduler.submit(stream, priority=Priority.INTERACTIVE, token=token)
+        assert started.wait(5)
+        after = scheduler.submit(sum, [1, 1], priority=Priority.INTERACTIVE)
+        token.cancel()
+        with pytest.raises(CancelledError):
+            running.result(5)
+        assert after.result(5) == 2
+        assert token.cancelled
+
+    def test_cancelling_future_cancels_task(self, loop):
+        scheduler = make_scheduler(loop, max_running=1)
+        release = threading.Event()
+        first = scheduler.submit(blocker, release)
+        queued = scheduler.submit(sum, [1])
+        assert queued.cancel()
+        release.set()
+        first.result(5)
+        time.sleep(0.05)
+        assert scheduler.snapshot()["background"]["queued"] == 0
+
+    def test_token_cancelled_before_submit(self, loop):
+        scheduler = make_scheduler(loop)
+        token = CancellationToken()
+        token.cancel()
+        with pytest.raises(CancelledError):
+            scheduler.submit(sum, [1], token=token).result(5)
+
+
+class TestDeadlines:
+    def test_expires_while_queued(self, loop):
+        scheduler = make_scheduler(loop, max_running=1)
+        release = threading.Event()
+        first = scheduler.submit(blocker, release)
+        queued = scheduler.submit(sum, [1], priority=Priority.BACKGROUND, deadline=0.05)
+        with pytest.raises(DeadlineExceeded, match="waited past"):
+            queued.result(5)
+        release.set()
+        first.result(5)
+
+    def test_expires_while_running(self, loop):
+        scheduler = make_scheduler(loop)
+
+        async def slow():
+            await asyncio.sleep(10)
+
+        with pytest.raises(DeadlineExceeded, match="within its deadline"):
+            scheduler.submit(slow, priority=Priority.INTERACTIVE, deadline=0.05).result(5)
+
+
+class TestMetricsAndShutdown:
+    def test_wait_and_outcome_metrics(self, loop):
+        scheduler = make_scheduler(loop)
+        waits = WAIT_SECONDS.value(priority="visible")
+        finished = TASKS.value(priority="visible", outcome="ok")
+        scheduler.submit(sum, [1], priority=Priority.VISIBLE).result(5)
+        time.sleep(0.05)  # outcomes are counted once the task unwinds
+        assert WAIT_SECONDS.value(priority="visible") == waits + 1
+        assert TASKS.value(priority="visible", outcome="ok") == finished + 1
+        assert QUEUE_DEPTH.value(priority="visible") == 0
+
+    def test_shutdown_cancels_everything(self, loop):
+        scheduler = make_scheduler(loop, max_running=1)
+
+        async def forever():
+            await asyncio.sleep(10)
+
+        running = scheduler.submit(forever, priority=Priority.INTERACTIVE)
+        queued = scheduler.submit(forever, priority=Priority.INTERACTIVE)
+        time.sleep(0.05)
+        loop.call_soon_threadsafe(scheduler.shutdown)
+        for future in (running, queued):
+            with pytest.raises(CancelledError):
+                future.result(5)
+        with pytest.raises(CancelledError):
+            scheduler.submit(sum, [1]).result(5)
+
+
+class TestLLMClient:
+    def test_deadline_message_and_pool_info(self):
+        from llm_client import AsyncLLMClient, describe_api_error
+        assert "too long" in describe_api_error(DeadlineExceeded("late"))
+        client = AsyncLLMClient(api_key="sk-test", max_concurrency=4)
+        assert client.pool_info()["scheduler"]["visible"]["limit"] == 2
+
+    def test_schedule_runs_on_client_loop(self):
+        from llm_client import AsyncLLMClient
+        client = AsyncLLMClient(api_key="sk-test")
+
+        async def loop_thread():
+            return threading.current_thread().name
+
+        try:
+            assert client.schedule(loop_thread).result(5) == "llm-event-loop"
+        finally:
+            client.close()
+        # Closing replaces the scheduler, so the client still works afterwards
+        try:
+            assert client.schedule(loop_thread).result(5) == "llm-event-loop"
+        finally:
+            client.close()
@@ -0,0 +1,179 @@
+"""
+Unit tests for the UI event-loop watchdog.
+
+Tests cover:
+- Heartbeat latency and stall detection with the main thread's stack
+- Stalls attributed to the running instrumented handler and closed on the next beat
+- Handler timing, slow-call counts and Qt-style argument trimming
+- JSON and text reports
+- A real stall caught by the watchdog thread under a Qt event loop
+"""
+
+import os
+import sys
+import time
+
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from ui_watchdog import UIWatchdog
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestHeartbeat:
+    def test_lateness_recorded_in_ms(self):
+        clock = FakeClock()
+        dog = UIWatchdog(interval=0.05, clock=clock)
+        clock.now += 0.05
+        dog.beat()
+        clock.now += 0.08
+        dog.beat()
+        assert dog.heartbeat.count == 2
+        assert dog.heartbeat.minimum == 0.0
+        assert dog.heartbeat.maximum == pytest.approx(30.0)
+
+    def test_no_stall_under_threshold(self):
+        clock = FakeClock()
+        dog = UIWatchdog(interval=0.05, threshold=0.25, clock=clock)
+        clock.now += 0.2
+        assert dog.check() is None and dog.stall_count == 0
+
+    def test_stall_captured_once_and_closed_by_next_beat(self):
+        clock = FakeClock()
+        dog = UIWatchdog(interval=0.05, threshold=0.25, clock=clock)
+        clock.now += 0.4
+        stall = dog.check()
+        assert stall is not None and stall.duration is None
+        assert any("test_stall_captured_once" in line for line in stall.stack)
+        clock.now += 0.1
+        assert dog.check() is None  # still the same stall
+        dog.beat()
+        assert stall.duration == pytest.approx(0.45)
+        assert dog.stall_count == 1
+
+    def test_stall_names_running_handler(self):
+        clock = FakeClock()
+        dog = UIWatchdog(interval=0.05, threshold=0.25, clock=clock)
+        with dog.timed("submitAnswer"), dog.timed("AppConfig.set"):
+            clock.now += 0.5
+            stall = dog.check()
+        assert stall.handler == "submitAnswer > AppConfig.set"
+
+    def test_stall_history_is_bounded(self):
+        clock = FakeClock()
+        dog = UIWatchdog(threshold=0.1, max_stalls=2, clock=clock)
+        for _ in range(3):
+            clock.now += 1.0
+            dog.check()
+            dog.beat()
+        assert len(dog.stalls) == 2 and dog.stall_count == 3
+
+
+class TestHandlerTiming:
+    def test_timed_records_calls_and_slow_calls(self):
+        dog = UIWatchdog(slow_handler=0.01)
+        with dog.timed("updateExercise"):
+            pass
+        with dog.timed("updateExercise"):
+            time.sleep(0.02)
+        stats = dog.handlers["updateExercise"]
+        assert stats.durations.count == 2
+        assert stats.slow == 1
+        assert stats.durations.maximum >= 20.0
+
+    def test_timed_records_on_exception(self):
+        dog = UIWatchdog()
+        with pytest.raises(ValueError):
+            with dog.timed("exportProgress.write"):
+                raise ValueError("disk full")
+        assert dog.handlers["exportProgress.write"].durations.count == 1
+        assert dog._active == []
+
+    def test_instrument_trims_signal_arguments(self):
+        dog = UIWatchdog()
+
+        class Window:
+            @dog.instrument()
+            def submitAnswer(self):
+                return "submitted"
+
+        # QPushButton.clicked passes `checked`
+        assert Window().submitAnswer(False) == "submitted"
+        assert "submitAnswer" in dog.handlers
+        assert Window.submitAnswer.__name__ == "submitAnswer"
+
+    def test_instrument_keeps_varargs(self):
+        dog = UIWatchdog()
+
+        @dog.instrument("collect")
+        def collect(*args):
+            return args
+
+        assert collect(1, 2) == (1, 2)
+
+
+class TestReport:
+    def test_report_is_json_ready(self):
+        import json
+        clock = FakeClock()
+        dog = UIWatchdog(threshold=0.1, clock=clock)
+        with dog.timed("submitAnswer"):
+            clock.now += 1.0
+            dog.check()
+        dog.beat()
+        report = json.loads(json.dumps(dog.report()))
+        assert report["stall_count"] == 1
+        assert report["stalls"][0]["handler"] == "submitAnswer"
+        assert report["stalls"][0]["duration_ms"] == pytest.approx(950.0)
+        assert report["handlers_ms"]["submitAnswer"]["count"] == 1
+
+    def test_format_report(self):
+        clock = FakeClock()
+        dog = UIWatchdog(threshold=0.1, clock=clock)
+        with dog.timed("handleNewExerciseResult"):
+            clock.now += 1.0
+            dog.check()
+        text = dog.format_report()
+        assert "handleNewExerciseResult" in text
+        assert "Stalls: 1" in text and "ongoing" in text
+        assert "test_format_report" in text  # the captured stack
+
+
+class TestQtWatchdog:
+    def test_real_stall_detected(self):
+        os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+        QtWidgets = pytest.importorskip("PyQt5.QtWidgets")
+        from PyQt5.QtCore import QEventLoop, QTimer
+        app = QtWidgets.QApplication.instance() or QtWidgets.QApplication([])
+
+        dog = UIWatchdog(interval=0.01, threshold=0.1)
+        dog.start()
+        try:
+            loop = QEventLoop()
+
+            def block():
+                with dog.timed("slowSlot"):
+                    time.sleep(0.3)
+
+            QTimer.singleShot(30, block)
+            QTimer.singleShot(450, loop.quit)
+            loop.exec_()
+        finally:
+            dog.stop()
+
+        assert not dog.running
+        assert dog.stall_count >= 1
+        stall = dog.stalls[0]
+        assert stall.handler == "slowSlot"
+        assert any("block" in line for line in stall.stack)
+        assert stall.duration is not None and stall.duration >= 0.2
+        assert dog.heartbeat.count > 5
+        assert app is not None
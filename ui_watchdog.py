@@ -0,0 +1,299 @@
+"""
+UI Watchdog
+Event-loop stall detection for the Qt thread: a heartbeat timer measures
+how late the event loop runs, a watchdog thread captures the main thread's
+Python stack when the heartbeat stops for longer than a threshold, and
+instrumented slot handlers keep per-handler timing statistics
+"""
+
+import functools
+import inspect
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Callable, Deque, Dict, Iterator, List, Optional
+
+from sampling_profiler import profiler
+from streaming_stats import LatencyStats
+
+DEFAULT_HEARTBEAT_INTERVAL = 0.05  # seconds between heartbeats
+DEFAULT_STALL_THRESHOLD = 0.25     # seconds without a heartbeat that count as a stall
+DEFAULT_SLOW_HANDLER = 0.05        # handler calls over this count as slow (seconds)
+DEFAULT_MAX_STALLS = 50            # stall reports kept for the diagnostics view
+STACK_DEPTH = 25                   # innermost frames kept per stall
+
+QUANTILES = (0.5, 0.9, 0.99)
+
+logger = logging.getLogger("ui_watchdog")
+
+
+class HandlerStats:
+    """Call count, slow-call count and duration statistics (ms) of one handler."""
+
+    __slots__ = ('durations', 'slow')
+
+    def __init__(self) -> None:
+        self.durations = LatencyStats(QUANTILES)
+        self.slow = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        summary = self.durations.to_dict()
+        summary['slow'] = self.slow
+        return summary
+
+
+class Stall:
+    """One event-loop stall: when it was seen, where the main thread was, how long it lasted."""
+
+    __slots__ = ('detected_at', 'started_at', 'handler', 'stack', 'duration')
+
+    def __init__(self, detected_at: float, started_at: float,
+                 handler: Optional[str], stack: List[str]) -> None:
+        self.detected_at = detected_at
+        self.started_at = started_at
+        self.handler = handler
+        self.stack = stack
+        self.duration: Optional[float] = None  # seconds, once the loop is back
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            'started_at': self.started_at,
+            'duration_ms': None if self.duration is None else round(self.duration * 1000, 1),
+            'handler': self.handler,
+            'stack': self.stack,
+        }
+
+
+def _positional_limit(func: Callable) -> Optional[int]:
+    """How many positional arguments ``func`` takes, or None if it takes ``*args``."""
+    try:
+        parameters = inspect.signature(func).parameters.values()
+    except (TypeError, ValueError):
+        return None
+    if any(p.kind == p.VAR_POSITIONAL for p in parameters):
+        return None
+    return sum(p.kind in (p.POSITIONAL_ONLY, p.POSITIONAL_OR_KEYWORD) for p in parameters)
+
+
+class UIWatchdog:
+    """
+    Heartbeat, stall capture and handler timing for the Qt main thread.
+
+    ``start()`` (on the main thread, with a QApplication) begins the
+    heartbeat QTimer and the watchdog thread. The heartbeat's lateness is
+    the event-loop latency; when no heartbeat arrives for ``threshold``
+    seconds the watchdog thread logs the main thread's stack together with
+    the instrumented handler that was running, and the stall's duration is
+    logged once the loop is back. Handler timing works whether or not the
+    watchdog is started.
+
+    Attributes:
+        heartbeat (LatencyStats): Event-loop latency (ms) per heartbeat.
+        handlers (Dict[str, HandlerStats]): Timing per instrumented handler.
+        stalls (Deque[Stall]): Most recent stalls, oldest first.
+        stall_count (int): Stalls seen since start, including dropped ones.
+    """
+
+    def __init__(self,
+                 interval: float = DEFAULT_HEARTBEAT_INTERVAL,
+                 threshold: float = DEFAULT_STALL_THRESHOLD,
+                 slow_handler: float = DEFAULT_SLOW_HANDLER,
+                 max_stalls: int = DEFAULT_MAX_STALLS,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        self.interval = interval
+        self.threshold = threshold
+        self.slow_handler = slow_handler
+        self.clock = clock
+        self.heartbeat = LatencyStats(QUANTILES)
+        self.handlers: Dict[str, HandlerStats] = {}
+        self.stalls: Deque[Stall] = deque(maxlen=max_stalls)
+        self.stall_count = 0
+        self._active: List[str] = []  # instrumented handlers running on the main thread
+        self._main_ident = threading.main_thread().ident
+        self._last_beat = clock()
+        self._open_stall: Optional[Stall] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._timer = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        """Start the heartbeat and the watchdog thread; call from the Qt main thread."""
+        if self.running:
+            return
+        from PyQt5.QtCore import Qt, QTimer
+
+        self._main_ident = threading.get_ident()
+        self._last_beat = self.clock()
+        self._timer = QTimer()
+        self._timer.setTimerType(Qt.PreciseTimer)
+        self._timer.timeout.connect(self.beat)
+        self._timer.start(int(self.interval * 1000))
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="ui-watchdog", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the heartbeat and the watchdog thread."""
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join(timeout=1.0)
+            self._thread = None
+
+    # -------------------------------------------------------
+    # Heartbeat (main thread) and watchdog (background thread)
+    # -------------------------------------------------------
+    def beat(self) -> None:
+        """Heartbeat: record how late it ran and close any open stall."""
+        now = self.clock()
+        lateness = max(0.0, now - self._last_beat - self.interval)
+        self.heartbeat.add(lateness * 1000)
+        self._last_beat = now
+        with self._lock:
+            stall, self._open_stall = self._open_stall, None
+        if stall is not None:
+            stall.duration = now - stall.started_at
+            logger.warning("UI stall ended after %.0f ms (in %s)",
+                           stall.duration * 1000, stall.handler or "no instrumented handler")
+
+    def check(self) -> Optional[Stall]:
+        """
+        Capture a stall if the heartbeat is overdue and none is open.
+
+        Called by the watchdog thread; returns the new stall, if any.
+        """
+        now = self.clock()
+        last_beat = self._last_beat
+        if now - last_beat - self.interval < self.threshold:
+            return None
+        with self._lock:
+            if self._open_stall is not None:
+                return None
+            handler = " > ".join(self._active) or None
+            stall = Stall(now, last_beat + self.interval, handler, self._main_stack())
+            self._open_stall = stall
+            self.stalls.append(stall)
+            self.stall_count += 1
+        logger.warning("UI event loop stalled for %.0f ms (in %s); main thread stack:\n%s",
+                       (now - stall.started_at) * 1000, handler or "no instrumented handler",
+                       "".join(stall.stack))
+        return stall
+
+    def _watch(self) -> None:
+        poll = min(self.interval, self.threshold / 2)
+        while not self._stop.wait(poll):
+            try:
+                self.check()
+            except Exception:  # never let diagnostics take the app down
+                logger.exception("UI watchdog check failed")
+
+    def _main_stack(self) -> List[str]:
+        frame = sys._current_frames().get(self._main_ident)
+        if frame is None:
+            return []
+        return traceback.format_stack(frame)[-STACK_DEPTH:]
+
+    # -------------------------------------------------------
+    # Handler timing
+    # -------------------------------------------------------
+    @contextmanager
+    def timed(self, name: str) -> Iterator[None]:
+        """Time the enclosed block as one call of handler ``name`` (and profile it, if on)."""
+        self._active.append(name)
+        profiler.enter(name, sys._getframe(2))
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            profiler.leave()
+            self._active.pop()
+            stats = self.handlers.get(name)
+            if stats is None:
+                stats = self.handlers[name] = HandlerStats()
+            stats.durations.add(elapsed * 1000)
+            if elapsed >= self.slow_handler:
+                stats.slow += 1
+
+    def instrument(self, name: Optional[str] = None) -> Callable[[Callable], Callable]:
+        """
+        Decorator timing every call of a slot handler.
+
+        Qt passes signal arguments (e.g. ``clicked``'s ``checked``) only as
+        far as a slot accepts them; the wrapper drops the extras the same
+        way, so decorated methods connect exactly like undecorated ones.
+        """
+        def decorate(func: Callable) -> Callable:
+            label = name or func.__name__
+            limit = _positional_limit(func)
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if limit is not None:
+                    args = args[:limit]
+                with self.timed(label):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorate
+
+    # -------------------------------------------------------
+    # Reporting
+    # -------------------------------------------------------
+    def report(self) -> Dict[str, Any]:
+        """Heartbeat latency, stalls and handler timing as plain JSON-ready data."""
+        with self._lock:
+            stalls = [stall.to_dict() for stall in self.stalls]
+        return {
+            'running': self.running,
+            'threshold_ms': self.threshold * 1000,
+            'heartbeat_ms': self.heartbeat.to_dict(),
+            'stall_count': self.stall_count,
+            'stalls': stalls,
+            'handlers_ms': {name: stats.to_dict() for name, stats in sorted(self.handlers.items())},
+        }
+
+    def format_report(self, stacks: int = 3) -> str:
+        """Readable report; the ``stacks`` most recent stalls include their stack."""
+        def ms(value: Optional[float]) -> str:
+            return "-" if value is None else f"{value:.1f}"
+
+        beat = self.heartbeat
+        lines = [
+            f"Event loop: {'watching' if self.running else 'not watched'}, "
+            f"stall threshold {self.threshold * 1000:.0f} ms",
+            f"Heartbeat latency (ms): p50 {ms(beat.quantile(0.5))}, p90 {ms(beat.quantile(0.9))}, "
+            f"p99 {ms(beat.quantile(0.99))}, max {ms(beat.maximum if beat.count else None)} "
+            f"over {beat.count} beats",
+            "",
+            f"{'Handler':<32}{'calls':>7}{'slow':>6}{'mean':>9}{'p90':>9}{'max':>9}",
+        ]
+        for name, stats in sorted(self.handlers.items(),
+                                  key=lambda item: item[1].durations.maximum, reverse=True):
+            d = stats.durations
+            lines.append(f"{name:<32}{d.count:>7}{stats.slow:>6}{d.mean:>9.1f}"
+                         f"{ms(d.quantile(0.9)):>9}{d.maximum:>9.1f}")
+        lines += ["", f"Stalls: {self.stall_count}"]
+        with self._lock:
+            recent = list(self.stalls)[::-1]
+        for i, stall in enumerate(recent):
+            duration = "ongoing" if stall.duration is None else f"{stall.duration * 1000:.0f} ms"
+            when = time.strftime("%H:%M:%S", time.localtime(time.time() - (self.clock() - stall.started_at)))
+            lines.append(f"- {when} {duration} in {stall.handler or 'no instrumented handler'}")
+            if i < stacks:
+                lines.extend("    " + line for line in "".join(stall.stack).rstrip().splitlines())
+        return "\n".join(lines)
+
+
+# Process-wide watchdog for the Qt main thread
+watchdog = UIWatchdog()